@@ -2,10 +2,28 @@
 FastAPI application exposing API routes related to rainfall data of Barcelona.
 """
 
-from typing import Any, Callable
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Any, Callable
 
 from fastapi import FastAPI
 
+if TYPE_CHECKING:
+    from back.api.dataset import ReloadModel
+
+
+@asynccontextmanager
+async def lifespan(app: "FastAPPI"):
+    from back.api.routes import cache_warmer, dataset_watcher, job_manager
+
+    cache_warmer.start(app)
+    dataset_watcher.start(on_reload=app.on_dataset_reloaded)
+
+    yield
+
+    dataset_watcher.stop()
+    cache_warmer.stop()
+    job_manager.shutdown()
+
 
 class FastAPPI(FastAPI):
     """Overrides FastAPI class to initiate our own app."""
@@ -24,12 +42,49 @@ class FastAPPI(FastAPI):
     @classmethod
     def from_config(cls):
         from back.api.config import Config
-        from back.api.routes import MAX_YEAR_AVAILABLE, MIN_YEAR_AVAILABLE
 
-        return cls(
-            **Config().get_api_settings.fastapi.model_dump(),
-            description=f"Available data is between {MIN_YEAR_AVAILABLE} and {MAX_YEAR_AVAILABLE}.",
+        app = cls(**Config().get_api_settings.fastapi.model_dump(), lifespan=lifespan)
+        app.set_description()
+
+        return app
+
+    def set_description(self):
+        from back.api.routes import rainfall_dataset
+
+        snapshot = rainfall_dataset.snapshot
+        self.description = (
+            f"Available data of default station '{snapshot.station}' "
+            f"is between {snapshot.min_year} and {snapshot.max_year}. "
+            "Other stations are listed by `/stations`."
         )
+        # OpenAPI schema is generated again upon next request
+        self.openapi_schema = None
+
+    def on_dataset_reloaded(self, reload: "ReloadModel"):
+        """
+        Refresh the app once rainfall data of a station has been reloaded:
+        responses cached upon former data are dropped,
+        unless they are about years that have not changed.
+        For default station, description is updated and cache is warmed up again.
+        Must be called from within the running event loop of the app.
+
+        :param reload: The ReloadModel of the reload.
+        """
+        from back.api.routes import cache_warmer, rainfall_dataset, response_cache
+
+        if reload.changed_begin_year is None or reload.changed_end_year is None:
+            response_cache.remove_version(reload.previous_version)
+        else:
+            response_cache.carry_over(
+                reload.previous_version,
+                reload.dataset_version,
+                changed_begin_year=reload.changed_begin_year,
+                changed_end_year=reload.changed_end_year,
+            )
+
+        if reload.station == rainfall_dataset.station:
+            self.set_description()
+            cache_warmer.start(self)
 
     def add_api_route(
         self,
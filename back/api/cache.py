@@ -0,0 +1,503 @@
+"""
+Provides an in-memory cache of API responses, optionally backed by a store on disk,
+and a warmer filling it in background once rainfall data is loaded,
+so that first users do not pay for computing common figures.
+"""
+
+import asyncio
+import inspect
+import math
+import re
+import threading
+from collections import Counter, OrderedDict
+from enum import Enum
+from functools import wraps
+from typing import Any, Callable, Hashable, cast
+
+from pydantic import BaseModel
+
+from back.api.config import APISettings
+from back.api.dataset import DatasetSnapshot
+from back.api.response_store import ResponseStore
+from back.api.utils import send_get_request_in_process
+from back.rainfall.utils import Month, Season, TimeMode
+from back.rainfall.utils.accumulators import NORMAL_YEARS
+
+CACHED_ROUTES_PREFIXES = ("/rainfall/", "/year/", "/graph/")
+ACCESS_LOG_REQUEST_PATTERN = re.compile(r'"GET (?P<target>\S+) HTTP/[\d.]+" 200')
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU cache of values returned by route endpoints.
+    Entries are keyed by dataset version, endpoint and normalized arguments:
+    when data changes, former entries are never hit again and end up evicted.
+    With a store, values are also persisted on disk and looked up there upon misses,
+    so that they are shared by workers and survive restarts.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int,
+        get_version: Callable[[dict[str, Any]], str],
+        store: ResponseStore | None = None,
+    ):
+        self.max_entries = max_entries
+        self.get_version = get_version
+        self.store = store
+        self.hits = 0
+        self.store_hits = 0
+        self.misses = 0
+        self._values: OrderedDict[Hashable, Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(
+        cls,
+        *,
+        get_version: Callable[[dict[str, Any]], str],
+        config_: APISettings | None = None,
+    ):
+        if config_ is None:
+            from back.api.config import Config
+
+            config_ = Config().get_api_settings
+
+        store = None
+        if (disk_settings := config_.cache.disk).path is not None:
+            store = ResponseStore(
+                disk_settings.path,
+                max_bytes=int(disk_settings.max_size_mb * 1024**2),
+            )
+
+        return cls(
+            max_entries=config_.cache.max_entries,
+            get_version=get_version,
+            store=store,
+        )
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def get(self, key: Hashable) -> tuple[bool, Any]:
+        """
+        Retrieve a cached value and mark it as most recently used.
+        A value missing in memory is looked up in store if any, then kept in memory.
+
+        :param key: Key of the cached value.
+        :return: A tuple (found, value) where value is None if it has not been found.
+        """
+        with self._lock:
+            if key in self._values:
+                self.hits += 1
+                self._values.move_to_end(key)
+
+                return True, self._values[key]
+
+        if self.store is not None:
+            found, value = self.store.get(cast(tuple, key))
+            if found:
+                self.store_hits += 1
+                self._put_in_memory(key, value)
+
+                return True, value
+
+        with self._lock:
+            self.misses += 1
+
+        return False, None
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Cache a value, evicting least recently used values beyond max entries.
+
+        :param key: Key of the value.
+        :param value: Value to cache; it is shared between requests and should not be mutated.
+        :return: None
+        """
+        self._put_in_memory(key, value)
+        if self.store is not None:
+            self.store.put(cast(tuple, key), value)
+
+    def _put_in_memory(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._values[key] = value
+            self._values.move_to_end(key)
+            while len(self._values) > self.max_entries:
+                self._values.popitem(last=False)
+
+    def clear(self) -> None:
+        """
+        Remove all cached values, from store as well.
+
+        :return: None
+        """
+        with self._lock:
+            self._values.clear()
+
+        if self.store is not None:
+            self.store.clear()
+
+    def remove_version(self, version: str) -> None:
+        """
+        Remove values cached upon a dataset version.
+
+        :param version: A dataset version.
+        :return: None
+        """
+        with self._lock:
+            for key in [key for key in self._values if cast(tuple, key)[0] == version]:
+                del self._values[key]
+
+        if self.store is not None:
+            self.store.remove_version(version)
+
+    def carry_over(
+        self,
+        previous_version: str,
+        version: str,
+        *,
+        changed_begin_year: int,
+        changed_end_year: int,
+    ) -> int:
+        """
+        Keep values cached upon a former dataset version under the new one,
+        unless they depend on a changed year: when a few years are patched or appended,
+        responses about other years need not be computed again.
+        Values depending on no year range are removed, values of other versions are left as is.
+        In store, values of the former version are carried over then removed.
+
+        :param previous_version: Version of the dataset before change.
+        :param version: Version of the dataset after change.
+        :param changed_begin_year: First changed year.
+        :param changed_end_year: Last changed year.
+        :return: The number of values carried over in memory.
+        """
+
+        def is_kept(arguments: dict[str, Any]) -> bool:
+            year_ranges = get_year_ranges(arguments)
+
+            return bool(year_ranges) and not any(
+                begin_year <= changed_end_year and changed_begin_year <= end_year
+                for begin_year, end_year in year_ranges
+            )
+
+        carried_over = 0
+        with self._lock:
+            values: OrderedDict[Hashable, Any] = OrderedDict()
+            for key, value in self._values.items():
+                key_version, endpoint_name, arguments = cast(
+                    tuple[str, str, tuple[tuple[str, Any], ...]], key
+                )
+                if key_version == previous_version:
+                    if not is_kept(dict(arguments)):
+                        continue
+
+                    key = (version, endpoint_name, arguments)
+                    carried_over += 1
+
+                values.setdefault(key, value)
+
+            self._values = values
+
+        if self.store is not None:
+            self.store.carry_over(previous_version, version, is_kept=is_kept)
+
+        return carried_over
+
+    def get_key(
+        self, endpoint: Callable[..., Any], arguments: dict[str, Any]
+    ) -> Hashable:
+        """
+        Build the key of a response from the endpoint and its arguments, once validated by FastAPI.
+        Query parameters order does not matter, Enum members are replaced by their values
+        and dataset snapshots by their station.
+
+        :param endpoint: A route endpoint.
+        :param arguments: A dict of arguments the endpoint has been called with.
+        :return: A hashable key.
+        """
+        return (
+            self.get_version(arguments),
+            endpoint.__name__,
+            tuple(
+                sorted(
+                    (name, get_hashable_argument(value))
+                    for name, value in arguments.items()
+                )
+            ),
+        )
+
+    def cached(self, endpoint: Callable[..., Any]) -> Callable[..., Any]:
+        """
+        Decorate a route endpoint to cache its responses; errors are not cached.
+        Signature is kept for FastAPI to keep on validating and documenting parameters.
+
+        :param endpoint: A route endpoint, either synchronous or asynchronous.
+        :return: The decorated endpoint.
+        """
+        signature = inspect.signature(endpoint)
+
+        def get_key(*args, **kwargs) -> Hashable:
+            bound_arguments = signature.bind(*args, **kwargs)
+            bound_arguments.apply_defaults()
+
+            return self.get_key(endpoint, bound_arguments.arguments)
+
+        if inspect.iscoroutinefunction(endpoint):
+
+            @wraps(endpoint)
+            async def async_wrapper(*args, **kwargs):
+                key = get_key(*args, **kwargs)
+                found, value = self.get(key)
+                if not found:
+                    value = await endpoint(*args, **kwargs)
+                    self.put(key, value)
+
+                return value
+
+            return async_wrapper
+
+        @wraps(endpoint)
+        def wrapper(*args, **kwargs):
+            key = get_key(*args, **kwargs)
+            found, value = self.get(key)
+            if not found:
+                value = endpoint(*args, **kwargs)
+                self.put(key, value)
+
+            return value
+
+        return wrapper
+
+
+def get_hashable_argument(value: Any) -> Hashable:
+    """
+    Replace an endpoint argument by a hashable value identifying it within a cache key.
+
+    :param value: An argument an endpoint has been called with.
+    :return: The value of an Enum member, the station of a dataset snapshot,
+    a tuple of hashable items of a list, e.g. of a repeated query parameter, or the argument itself.
+    """
+    if isinstance(value, Enum):
+        return value.value
+
+    if isinstance(value, list):
+        return tuple(get_hashable_argument(item) for item in value)
+
+    if isinstance(value, DatasetSnapshot):
+        return value.station
+
+    return value
+
+
+def get_year_ranges(arguments: dict[str, Any]) -> list[tuple[int, float]]:
+    """
+    Return year ranges a response depends upon, according to arguments of its endpoint.
+    Without end year, a range lasts until the last year;
+    an endpoint taking a begin year but no end year computes a normal over 30 years.
+    An endpoint taking a number of months sums rainfall over that many months:
+    its ranges begin as many years earlier as these months may reach back.
+
+    :param arguments: A dict of arguments an endpoint has been called with.
+    :return: A list of ranges as tuples of first and last years, the latter being infinite if unknown.
+    """
+    year_ranges: list[tuple[int, float]] = []
+    if (begin_year := arguments.get("begin_year")) is not None:
+        if "end_year" not in arguments:
+            year_ranges.append((begin_year, begin_year + NORMAL_YEARS - 1))
+        else:
+            end_year = arguments["end_year"]
+            year_ranges.append((begin_year, math.inf if end_year is None else end_year))
+
+    if (normal_year := arguments.get("normal_year")) is not None:
+        year_ranges.append((normal_year, normal_year + NORMAL_YEARS - 1))
+
+    if (months := arguments.get("months")) is not None:
+        years_back = math.ceil(months / 12)
+        year_ranges = [
+            (begin_year - years_back, end_year) for begin_year, end_year in year_ranges
+        ]
+
+    return year_ranges
+
+
+def get_webapp_queries(
+    *, normal_year: int, begin_year: int, end_year: int | None = None
+) -> list[str]:
+    """
+    Return queries of figures displayed by the webapp,
+    along with bar figures of rainfall by year for every month and season.
+
+    :param normal_year: An integer representing the year to start computing the 30 years normal of the rainfall.
+    :param begin_year: An integer representing the year to start getting our rainfall values.
+    :param end_year: An integer representing the year to end getting our rainfall values (optional).
+    :return: A list of queries as targets, i.e. paths with query strings.
+    """
+    years_query_string = f"begin_year={begin_year}" + (
+        f"&end_year={end_year}" if end_year is not None else ""
+    )
+
+    queries = [
+        f"/graph/rainfall_by_year?time_mode={TimeMode.YEARLY.value}&{years_query_string}&plot_average=true",
+        *(
+            f"/graph/rainfall_by_year?time_mode={TimeMode.MONTHLY.value}&month={month.value}"
+            f"&{years_query_string}&plot_average=true"
+            for month in Month
+        ),
+        *(
+            f"/graph/rainfall_by_year?time_mode={TimeMode.SEASONAL.value}&season={season.value}"
+            f"&{years_query_string}&plot_average=true"
+            for season in Season
+        ),
+    ]
+    for time_mode in [TimeMode.MONTHLY, TimeMode.SEASONAL]:
+        queries += [
+            f"/graph/rainfall_averages?time_mode={time_mode.value}&{years_query_string}",
+            f"/graph/rainfall_linreg_slopes?time_mode={time_mode.value}&{years_query_string}",
+            (
+                f"/graph/relative_distances_to_normal?time_mode={time_mode.value}"
+                f"&normal_year={normal_year}&{years_query_string}"
+            ),
+        ]
+
+    return queries
+
+
+def learn_queries_from_access_log(
+    access_log_path: str, *, root_path: str = "", max_queries: int
+) -> list[str]:
+    """
+    Return most frequent successful queries of cached routes found in an Uvicorn access log.
+
+    :param access_log_path: Path to the access log; if it does not exist, no query is learned.
+    :param root_path: Root path the API is served under, stripped from logged targets.
+    :param max_queries: Maximum number of queries to return.
+    :return: A list of queries as targets, i.e. paths with query strings, most frequent first.
+    """
+    target_counter: Counter[str] = Counter()
+    try:
+        with open(access_log_path, encoding="utf-8", errors="replace") as access_log:
+            for line in access_log:
+                if (match := ACCESS_LOG_REQUEST_PATTERN.search(line)) is None:
+                    continue
+
+                target = match["target"]
+                if root_path and target.startswith(f"{root_path}/"):
+                    target = target[len(root_path) :]
+
+                if target.startswith(CACHED_ROUTES_PREFIXES):
+                    target_counter[target] += 1
+    except FileNotFoundError:
+        return []
+
+    return [target for target, _ in target_counter.most_common(max_queries)]
+
+
+class ReadinessModel(BaseModel):
+    """
+    Model for depicting whether the API is ready, i.e. whether response cache has been warmed up.
+    """
+
+    ready: bool
+    dataset_version: str
+    warmed_up_queries: int
+    failed_queries: list[str]
+    total_queries: int
+    cached_responses: int
+
+
+class CacheWarmer:
+    """
+    Runs queries against the app in background to fill the response cache.
+    It should be started every time rainfall data is loaded or reloaded;
+    the app is ready once warm-up has finished.
+    """
+
+    def __init__(self, queries: list[str]):
+        self.queries = list(dict.fromkeys(queries))
+        self.warmed_up_queries = 0
+        self.failed_queries: list[str] = []
+        self._is_ready = False
+        self._task: asyncio.Task | None = None
+
+    @classmethod
+    def from_config(cls, config_: APISettings | None = None):
+        if config_ is None:
+            from back.api.config import Config
+
+            config_ = Config().get_api_settings
+
+        warm_up_settings = config_.cache.warm_up
+        if not warm_up_settings.enabled:
+            return cls([])
+
+        queries = get_webapp_queries(
+            normal_year=warm_up_settings.normal_year,
+            begin_year=warm_up_settings.begin_year,
+            end_year=warm_up_settings.end_year,
+        )
+        queries += warm_up_settings.queries
+        if warm_up_settings.access_log_path is not None:
+            queries += learn_queries_from_access_log(
+                warm_up_settings.access_log_path,
+                root_path=config_.fastapi.root_path,
+                max_queries=warm_up_settings.max_learned_queries,
+            )
+
+        return cls(queries)
+
+    @property
+    def is_ready(self) -> bool:
+        return self._is_ready
+
+    def start(self, app: Callable[..., Any]) -> asyncio.Task:
+        """
+        Start warming up in background, cancelling any previous warm-up.
+        Must be called from within the running event loop of the app.
+
+        :param app: The ASGI app to send queries to.
+        :return: The asyncio Task running warm-up.
+        """
+        self.stop()
+        self.warmed_up_queries = 0
+        self.failed_queries = []
+        self._is_ready = False
+        self._task = asyncio.create_task(self._warm_up(app))
+
+        return self._task
+
+    def stop(self) -> None:
+        """
+        Cancel ongoing warm-up if any.
+
+        :return: None
+        """
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+
+        self._task = None
+
+    async def _warm_up(self, app: Callable[..., Any]):
+        for query in self.queries:
+            try:
+                status_code, _ = await send_get_request_in_process(app, query)
+            except Exception:  # Server errors are re-raised once responded
+                status_code = 500
+
+            if status_code == 200:
+                self.warmed_up_queries += 1
+            else:
+                self.failed_queries.append(query)
+
+        self._is_ready = True
+
+    async def wait(self) -> None:
+        """
+        Wait for ongoing warm-up to finish.
+
+        :return: None
+        """
+        if self._task is not None:
+            await self._task
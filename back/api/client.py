@@ -2,6 +2,8 @@
 API client built to interact with FastAPI application without needing the knowledge of the routes URLs.
 """
 
+from typing import Any
+
 from api_session import APISession, JSONDict
 
 from back.api.config import APISettings
@@ -29,6 +31,10 @@ class APIClient(APISession):
         end_year: int | None = None,
         month: str | None = None,
         season: str | None = None,
+        window: str | None = None,
+        ci=False,
+        replicates=1000,
+        station: str | None = None,
     ) -> JSONDict:
         return self.get_json_api(
             "/rainfall/average",
@@ -38,6 +44,10 @@ class APIClient(APISession):
                 "end_year": end_year,
                 "month": month,
                 "season": season,
+                "window": window,
+                "ci": ci,
+                "replicates": replicates,
+                "station": station,
             },
         )
 
@@ -48,6 +58,10 @@ class APIClient(APISession):
         begin_year: int,
         month: str | None = None,
         season: str | None = None,
+        window: str | None = None,
+        ci=False,
+        replicates=1000,
+        station: str | None = None,
     ) -> JSONDict:
         return self.get_json_api(
             "/rainfall/normal",
@@ -56,6 +70,10 @@ class APIClient(APISession):
                 "begin_year": begin_year,
                 "month": month,
                 "season": season,
+                "window": window,
+                "ci": ci,
+                "replicates": replicates,
+                "station": station,
             },
         )
 
@@ -68,6 +86,8 @@ class APIClient(APISession):
         end_year: int | None = None,
         month: str | None = None,
         season: str | None = None,
+        window: str | None = None,
+        station: str | None = None,
     ) -> JSONDict:
         return self.get_json_api(
             "/rainfall/relative_distance_to_normal",
@@ -78,6 +98,8 @@ class APIClient(APISession):
                 "end_year": end_year,
                 "month": month,
                 "season": season,
+                "window": window,
+                "station": station,
             },
         )
 
@@ -89,7 +111,9 @@ class APIClient(APISession):
         end_year: int | None = None,
         month: str | None = None,
         season: str | None = None,
+        window: str | None = None,
         weigh_by_average=False,
+        station: str | None = None,
     ):
         return self.get_json_api(
             "/rainfall/standard_deviation",
@@ -99,7 +123,79 @@ class APIClient(APISession):
                 "end_year": end_year,
                 "month": month,
                 "season": season,
+                "window": window,
                 "weigh_by_average": weigh_by_average,
+                "station": station,
+            },
+        )
+
+    def get_rainfall_trends(
+        self,
+        *,
+        begin_year: int,
+        end_year: int | None = None,
+        time_mode: str | None = None,
+        ci=False,
+        replicates=1000,
+        station: str | None = None,
+    ) -> list[JSONDict]:
+        return self.get_json_api(
+            "/rainfall/trends",
+            params={
+                "begin_year": begin_year,
+                "end_year": end_year,
+                "time_mode": time_mode,
+                "ci": ci,
+                "replicates": replicates,
+                "station": station,
+            },
+        )
+
+    def get_rainfall_change_points(
+        self,
+        *,
+        begin_year: int,
+        end_year: int | None = None,
+        time_mode: str | None = None,
+        penalty_factors: list[float] | None = None,
+        station: str | None = None,
+    ) -> list[JSONDict]:
+        return self.get_json_api(
+            "/rainfall/change_points",
+            params={
+                "begin_year": begin_year,
+                "end_year": end_year,
+                "time_mode": time_mode,
+                "penalty_factor": penalty_factors,
+                "station": station,
+            },
+        )
+
+    def get_rainfall_return_levels(
+        self,
+        *,
+        time_mode: str,
+        begin_year: int,
+        end_year: int | None = None,
+        month: str | None = None,
+        season: str | None = None,
+        window: str | None = None,
+        distribution: str = "gev",
+        replicates=1000,
+        station: str | None = None,
+    ) -> list[JSONDict]:
+        return self.get_json_api(
+            "/rainfall/return_levels",
+            params={
+                "time_mode": time_mode,
+                "begin_year": begin_year,
+                "end_year": end_year,
+                "month": month,
+                "season": season,
+                "window": window,
+                "distribution": distribution,
+                "replicates": replicates,
+                "station": station,
             },
         )
 
@@ -112,6 +208,8 @@ class APIClient(APISession):
         end_year: int | None = None,
         month: str | None = None,
         season: str | None = None,
+        window: str | None = None,
+        station: str | None = None,
     ) -> JSONDict:
         return self.get_json_api(
             "/year/below_normal",
@@ -122,6 +220,8 @@ class APIClient(APISession):
                 "end_year": end_year,
                 "month": month,
                 "season": season,
+                "window": window,
+                "station": station,
             },
         )
 
@@ -134,6 +234,8 @@ class APIClient(APISession):
         end_year: int | None = None,
         month: str | None = None,
         season: str | None = None,
+        window: str | None = None,
+        station: str | None = None,
     ) -> JSONDict:
         return self.get_json_api(
             "/year/above_normal",
@@ -144,6 +246,8 @@ class APIClient(APISession):
                 "end_year": end_year,
                 "month": month,
                 "season": season,
+                "window": window,
+                "station": station,
             },
         )
 
@@ -154,6 +258,7 @@ class APIClient(APISession):
         end_year: int | None = None,
         month: str | None = None,
         season: str | None = None,
+        station: str | None = None,
     ):
         return self.get_api(
             "/csv/rainfall_by_year",
@@ -163,6 +268,27 @@ class APIClient(APISession):
                 "end_year": end_year,
                 "month": month,
                 "season": season,
+                "station": station,
+            },
+        )
+
+    def get_standardized_precipitation_index_as_csv(
+        self,
+        *,
+        normal_year: int,
+        begin_year: int,
+        end_year: int | None = None,
+        months=3,
+        station: str | None = None,
+    ):
+        return self.get_api(
+            "/csv/spi",
+            params={
+                "normal_year": normal_year,
+                "begin_year": begin_year,
+                "end_year": end_year,
+                "months": months,
+                "station": station,
             },
         )
 
@@ -174,8 +300,13 @@ class APIClient(APISession):
         end_year: int | None = None,
         month: str | None = None,
         season: str | None = None,
+        window: str | None = None,
         plot_average=False,
         plot_linear_regression=False,
+        plot_change_points=False,
+        penalty_factor=1.0,
+        max_points: int | None = None,
+        station: str | None = None,
     ) -> str:
         return self.get_json_api(
             "/graph/rainfall_by_year",
@@ -185,8 +316,13 @@ class APIClient(APISession):
                 "end_year": end_year,
                 "month": month,
                 "season": season,
+                "window": window,
                 "plot_average": plot_average,
                 "plot_linear_regression": plot_linear_regression,
+                "plot_change_points": plot_change_points,
+                "penalty_factor": penalty_factor,
+                "max_points": max_points,
+                "station": station,
             },
         )
 
@@ -196,6 +332,7 @@ class APIClient(APISession):
         time_mode: str,
         begin_year: int,
         end_year: int | None = None,
+        station: str | None = None,
     ) -> str:
         return self.get_json_api(
             "/graph/rainfall_averages",
@@ -203,6 +340,7 @@ class APIClient(APISession):
                 "time_mode": time_mode,
                 "begin_year": begin_year,
                 "end_year": end_year,
+                "station": station,
             },
         )
 
@@ -212,6 +350,7 @@ class APIClient(APISession):
         time_mode: str,
         begin_year: int,
         end_year: int | None = None,
+        station: str | None = None,
     ) -> str:
         return self.get_json_api(
             "/graph/rainfall_linreg_slopes",
@@ -219,6 +358,51 @@ class APIClient(APISession):
                 "time_mode": time_mode,
                 "begin_year": begin_year,
                 "end_year": end_year,
+                "station": station,
+            },
+        )
+
+    def get_rainfall_linreg_slope_matrix_as_plotly_json(
+        self,
+        *,
+        time_mode: str,
+        begin_year: int,
+        end_year: int | None = None,
+        month: str | None = None,
+        season: str | None = None,
+        window: str | None = None,
+        station: str | None = None,
+    ) -> str:
+        return self.get_json_api(
+            "/graph/linreg_slope_matrix",
+            params={
+                "time_mode": time_mode,
+                "begin_year": begin_year,
+                "end_year": end_year,
+                "month": month,
+                "season": season,
+                "window": window,
+                "station": station,
+            },
+        )
+
+    def get_standardized_precipitation_index_as_plotly_json(
+        self,
+        *,
+        normal_year: int,
+        begin_year: int,
+        end_year: int | None = None,
+        months=3,
+        station: str | None = None,
+    ) -> str:
+        return self.get_json_api(
+            "/graph/spi",
+            params={
+                "normal_year": normal_year,
+                "begin_year": begin_year,
+                "end_year": end_year,
+                "months": months,
+                "station": station,
             },
         )
 
@@ -229,6 +413,7 @@ class APIClient(APISession):
         normal_year: int,
         begin_year: int,
         end_year: int | None = None,
+        station: str | None = None,
     ) -> str:
         return self.get_json_api(
             "/graph/relative_distances_to_normal",
@@ -237,6 +422,7 @@ class APIClient(APISession):
                 "normal_year": normal_year,
                 "begin_year": begin_year,
                 "end_year": end_year,
+                "station": station,
             },
         )
 
@@ -249,6 +435,7 @@ class APIClient(APISession):
         end_year: int | None = None,
         month: str | None = None,
         season: str | None = None,
+        station: str | None = None,
     ):
         return self.get_json_api(
             "/graph/percentage_of_years_above_and_below_normal",
@@ -259,5 +446,75 @@ class APIClient(APISession):
                 "end_year": end_year,
                 "month": month,
                 "season": season,
+                "station": station,
             },
         )
+
+    def submit_job(
+        self,
+        *,
+        analysis: str,
+        time_mode: str = "yearly",
+        month: str | None = None,
+        season: str | None = None,
+        kmeans_clusters: int | None = None,
+        window_length: int | None = None,
+        polyorder: int | None = None,
+        replicates: int | None = None,
+        seed: int | None = None,
+        station: str | None = None,
+    ) -> JSONDict:
+        return self.post_json_api(
+            "/jobs",
+            params={"station": station},
+            json={
+                key: value
+                for key, value in {
+                    "analysis": analysis,
+                    "time_mode": time_mode,
+                    "month": month,
+                    "season": season,
+                    "kmeans_clusters": kmeans_clusters,
+                    "window_length": window_length,
+                    "polyorder": polyorder,
+                    "replicates": replicates,
+                    "seed": seed,
+                }.items()
+                if value is not None
+            },
+        )
+
+    def get_job(self, job_id: str) -> JSONDict:
+        return self.get_json_api(f"/jobs/{job_id}")
+
+    def cancel_job(self, job_id: str) -> JSONDict:
+        return self.delete_json_api(f"/jobs/{job_id}")
+
+    def get_readiness(self) -> JSONDict:
+        return self.get_json_api("/health/ready", throw=False)
+
+    def get_stations(self) -> list[JSONDict]:
+        return self.get_json_api("/stations")
+
+    def reload_dataset(
+        self, *, admin_token: str, station: str | None = None
+    ) -> JSONDict:
+        return self.post_json_api(
+            "/admin/reload",
+            params={"station": station},
+            headers={"X-Admin-Token": admin_token},
+        )
+
+    def update_dataset(
+        self,
+        rows: list[dict[str, Any]],
+        *,
+        admin_token: str,
+        station: str | None = None,
+    ) -> JSONDict:
+        return self.post_json_api(
+            "/admin/update",
+            json=rows,
+            params={"station": station},
+            headers={"X-Admin-Token": admin_token},
+        )
@@ -6,7 +6,7 @@ import os
 from functools import cached_property
 from typing import Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PositiveFloat, PositiveInt
 
 from base_config import BaseConfig
 
@@ -29,8 +29,64 @@ class APISettings(BaseModel):
         port: int
         reload: bool | None = Field(None)
 
+    class ProductionServerSettings(BaseModel):
+        """Type definition for settings of preforked Uvicorn workers serving FastAPI app in production."""
+
+        workers: PositiveInt = 4
+        backlog: PositiveInt = 2048
+        keep_alive: PositiveInt = 5
+        shared_dataset_path: str | None = ".shared_dataset/rainfall.bin"
+
+    class JobsSettings(BaseModel):
+        """Type definition for settings of jobs running heavy analyses in a process pool."""
+
+        max_workers: PositiveInt = 2
+        max_pending_jobs: PositiveInt = 16
+        result_store_path: str = ".job_results"
+
+    class ReloadSettings(BaseModel):
+        """Type definition for settings of rainfall data reloading while API is running."""
+
+        admin_token: str | None = None
+        from_file: bool = False
+        poll_interval: PositiveFloat | None = 5.0
+
+    class StationsSettings(BaseModel):
+        """Type definition for settings of weather stations whose data is loaded upon first request."""
+
+        memory_budget_mb: PositiveFloat | None = 1024
+
+    class CacheSettings(BaseModel):
+        """Type definition for settings of the response cache and of its warm-up."""
+
+        class WarmUpSettings(BaseModel):
+            """Type definition for settings of queries run in background to warm up the cache."""
+
+            enabled: bool = True
+            normal_year: int = 1981
+            begin_year: int = 1995
+            end_year: int | None = None
+            queries: list[str] = []
+            access_log_path: str | None = None
+            max_learned_queries: PositiveInt = 32
+
+        class DiskSettings(BaseModel):
+            """Type definition for settings of the store persisting cached responses on disk."""
+
+            path: str | None = None
+            max_size_mb: PositiveFloat = 256
+
+        max_entries: PositiveInt = 1024
+        warm_up: WarmUpSettings = WarmUpSettings()
+        disk: DiskSettings = DiskSettings()
+
     fastapi: FastAPISettings
     server: APIServerSettings
+    production: ProductionServerSettings = ProductionServerSettings()
+    jobs: JobsSettings = JobsSettings()
+    reload: ReloadSettings = ReloadSettings()
+    stations: StationsSettings = StationsSettings()
+    cache: CacheSettings = CacheSettings()
 
 
 class Config(BaseConfig):
@@ -63,6 +119,41 @@ class Config(BaseConfig):
                 "port": 8000,
                 "reload": True,
             },
+            "production": {
+                "workers": 4,
+                "backlog": 2048,
+                "keep_alive": 5,
+                "shared_dataset_path": ".shared_dataset/rainfall.bin",
+            },
+            "jobs": {
+                "max_workers": 2,
+                "max_pending_jobs": 16,
+                "result_store_path": ".job_results",
+            },
+            "reload": {
+                "admin_token": None,
+                "from_file": False,
+                "poll_interval": 5.0,
+            },
+            "stations": {
+                "memory_budget_mb": 1024,
+            },
+            "cache": {
+                "max_entries": 1024,
+                "warm_up": {
+                    "enabled": True,
+                    "normal_year": 1981,
+                    "begin_year": 1995,
+                    "end_year": 2024,
+                    "queries": ["/rainfall/average?time_mode=yearly&begin_year=1991&end_year=2020"],
+                    "access_log_path": None,
+                    "max_learned_queries": 32,
+                },
+                "disk": {
+                    "path": None,
+                    "max_size_mb": 256,
+                },
+            },
         }
 
         """
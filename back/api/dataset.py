@@ -0,0 +1,475 @@
+"""
+Provides a holder of rainfall data served by the API, which reloads it without restarting,
+and a watcher reloading it in background whenever data files change.
+
+New data is loaded aside and validated, then swapped in atomically along with its year bounds.
+Requests read the current snapshot once: those in flight finish upon former data.
+Rows can also be patched or appended without loading whole data again.
+"""
+
+import asyncio
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+import numpy as np
+import pandas as pd
+from fastapi import HTTPException
+from pydantic import BaseModel, Field
+
+from back.api.config import APISettings
+from back.rainfall import AllRainfall
+from back.rainfall.config import DEFAULT_STATION
+from back.rainfall.shared_dataset import SHARED_DATASET_PATH_ENV, write_shared_dataset
+from back.rainfall.utils import Label
+from back.rainfall.utils.accumulators import NORMAL_YEARS
+
+
+class ReloadModel(BaseModel):
+    """
+    Model for depicting the outcome of a reload of rainfall data.
+    """
+
+    station: str
+    reloaded: bool
+    previous_version: str
+    dataset_version: str
+    min_year: int
+    max_year: int
+    changed_begin_year: int | None = None
+    changed_end_year: int | None = None
+
+
+class RawRainfallRow(BaseModel):
+    """
+    Model for depicting a row of raw rainfall data: a year and its rainfall for every month.
+    """
+
+    year: int
+    monthly_rainfall: list[float | None] = Field(
+        min_length=12,
+        max_length=12,
+        description="Rainfall (in mm) from January to December; null if unknown.",
+    )
+
+
+def validate_all_rainfall(all_rainfall: AllRainfall) -> None:
+    """
+    Check that rainfall data can be served: every model has the same years,
+    sorted and unique, enough to compute a normal, and no rainfall is negative.
+
+    :param all_rainfall: An AllRainfall instance.
+    :raise ValueError: If data is not valid.
+    :return: None
+    """
+    years = all_rainfall.yearly_rainfall.data[Label.YEAR.value].to_numpy()
+    if len(years) < NORMAL_YEARS:
+        raise ValueError(
+            f"At least {NORMAL_YEARS} years are expected, got {len(years)}."
+        )
+
+    if np.any(np.diff(years) <= 0):
+        raise ValueError("Years should be sorted and unique.")
+
+    for key, model in all_rainfall.get_rainfall_models().items():
+        if not np.array_equal(model.data[Label.YEAR.value].to_numpy(), years):
+            raise ValueError(f"Years of '{key}' rainfall differ from yearly ones.")
+
+        if (model.data[Label.RAINFALL.value] < 0).any():
+            raise ValueError(f"'{key}' rainfall has negative values.")
+
+
+class DatasetSnapshot:
+    """
+    Rainfall data of a weather station served by the API at some point, along with its year bounds.
+    A snapshot is never altered: reloading data creates another one.
+    """
+
+    def __init__(self, all_rainfall: AllRainfall, *, station: str = DEFAULT_STATION):
+        self.all_rainfall = all_rainfall
+        self.station = station
+        self.version = all_rainfall.version
+        self.min_year = all_rainfall.starting_year
+        self.max_year = all_rainfall.get_last_year()
+        self.max_normal_year = self.max_year - NORMAL_YEARS + 1
+
+    def check_year(self, year: int) -> int:
+        """
+        Check that a year is available.
+
+        :param year: A year to start or end a time frame.
+        :raise ValueError: If year is out of available years.
+        :return: The year.
+        """
+        if not self.min_year <= year <= self.max_year:
+            raise ValueError(
+                f"Year should be between {self.min_year} and {self.max_year}."
+            )
+
+        return year
+
+    def check_normal_year(self, year: int) -> int:
+        """
+        Check that a normal can be computed from a year, i.e. that 30 years are available from it.
+
+        :param year: A year to start computing a normal.
+        :raise ValueError: If year is out of available years.
+        :return: The year.
+        """
+        if not self.min_year <= year <= self.max_normal_year:
+            raise ValueError(
+                f"Normal year should be between {self.min_year} and {self.max_normal_year}."
+            )
+
+        return year
+
+
+class RainfallDataset:
+    """
+    Holds the snapshot of rainfall data of a weather station served by the API and reloads it.
+    Data is either loaded by the process itself or mapped from a shared dataset file:
+    the process reloading it then writes a new file, which other processes attach once they notice it.
+    """
+
+    def __init__(
+        self,
+        all_rainfall: AllRainfall,
+        *,
+        load: Callable[[], AllRainfall],
+        station: str = DEFAULT_STATION,
+        watched_path: str | Path | None = None,
+        shared_dataset_path: str | Path | None = None,
+    ):
+        self.load = load
+        self.station = station
+        self.watched_path = Path(watched_path) if watched_path is not None else None
+        self.shared_dataset_path = (
+            Path(shared_dataset_path) if shared_dataset_path is not None else None
+        )
+        self._snapshot = DatasetSnapshot(all_rainfall, station=station)
+        self._watched_mtime_ns = self._get_watched_mtime_ns()
+        self._reload_lock = threading.Lock()
+
+    @classmethod
+    def from_config(
+        cls, config_: APISettings | None = None, *, station: str | None = None
+    ):
+        if config_ is None:
+            from back.api.config import Config
+
+            config_ = Config().get_api_settings
+
+        from back.rainfall.config import Config as RainfallConfig
+
+        data_settings = RainfallConfig().get_data_settings
+        is_default_station = station is None or station == data_settings.station
+        if station is not None and not is_default_station:
+            data_settings = RainfallConfig().get_stations_settings[station]
+
+        # Stations without local file are loaded from their URL
+        from_file = (
+            config_.reload.from_file and data_settings.local_file_path is not None
+        )
+        watched_path = data_settings.local_file_path if from_file else None
+
+        def load() -> AllRainfall:
+            return AllRainfall.from_config(
+                from_file=from_file, station=data_settings.station
+            )
+
+        # Production workers attach the dataset written by the loader instead of loading their own
+        shared_dataset_path = os.environ.get(SHARED_DATASET_PATH_ENV)
+        if is_default_station and shared_dataset_path:
+            return cls(
+                AllRainfall.from_shared_dataset(shared_dataset_path),
+                load=load,
+                station=data_settings.station,
+                watched_path=watched_path,
+                shared_dataset_path=shared_dataset_path,
+            )
+
+        return cls(
+            load(), load=load, station=data_settings.station, watched_path=watched_path
+        )
+
+    @property
+    def snapshot(self) -> DatasetSnapshot:
+        """Current snapshot; it should be read once per request."""
+        return self._snapshot
+
+    def _get_watched_mtime_ns(self) -> int | None:
+        if self.watched_path is None:
+            return None
+
+        try:
+            return os.stat(self.watched_path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    @contextmanager
+    def _lock_reload(self, *, across_processes: bool) -> Iterator[None]:
+        if not self._reload_lock.acquire(blocking=False):
+            raise HTTPException(
+                status_code=409, detail="Rainfall data is already being reloaded."
+            )
+
+        try:
+            if not across_processes or self.shared_dataset_path is None:
+                yield
+
+                return
+
+            import fcntl
+
+            # Processes sharing the dataset do not reload it concurrently
+            with open(f"{self.shared_dataset_path}.lock", "w") as lock_file:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    raise HTTPException(
+                        status_code=409,
+                        detail="Rainfall data is already being reloaded by another worker.",
+                    )
+
+                yield
+        finally:
+            self._reload_lock.release()
+
+    @staticmethod
+    def _validate(all_rainfall: AllRainfall) -> None:
+        try:
+            validate_all_rainfall(all_rainfall)
+        except ValueError as exc:
+            raise HTTPException(
+                status_code=422,
+                detail=f"Reloaded rainfall data is invalid, former data is kept: {exc}",
+            )
+
+    def _swap(
+        self,
+        all_rainfall: AllRainfall,
+        changed_years: tuple[int, int] | None = None,
+    ) -> ReloadModel:
+        previous_snapshot = self._snapshot
+        # Requests that have already read former snapshot keep on using it
+        self._snapshot = DatasetSnapshot(all_rainfall, station=self.station)
+
+        return self._get_reload_model(previous_snapshot, changed_years)
+
+    def _get_reload_model(
+        self,
+        previous_snapshot: DatasetSnapshot,
+        changed_years: tuple[int, int] | None = None,
+    ) -> ReloadModel:
+        changed_begin_year, changed_end_year = changed_years or (None, None)
+
+        return ReloadModel(
+            station=self.station,
+            reloaded=self._snapshot.version != previous_snapshot.version,
+            previous_version=previous_snapshot.version,
+            dataset_version=self._snapshot.version,
+            min_year=self._snapshot.min_year,
+            max_year=self._snapshot.max_year,
+            changed_begin_year=changed_begin_year,
+            changed_end_year=changed_end_year,
+        )
+
+    def reload(self) -> ReloadModel:
+        """
+        Load rainfall data again, validate it and swap it in if it has changed.
+        If data is shared, a new shared dataset file is written for other processes to attach.
+        Loading blocks: it is meant to be run in a thread.
+
+        :raise HTTPException: If a reload is already in progress,
+        if data cannot be loaded or if it is not valid.
+        :return: A ReloadModel telling whether data has changed.
+        """
+        with self._lock_reload(across_processes=True):
+            # A modification made while loading is caught by the next check
+            self._watched_mtime_ns = self._get_watched_mtime_ns()
+            try:
+                all_rainfall = self.load()
+            except Exception as exc:
+                raise HTTPException(
+                    status_code=503,
+                    detail=f"Rainfall data could not be loaded, former data is kept: {exc!r}",
+                )
+
+            if all_rainfall.version == self._snapshot.version:
+                if self.shared_dataset_path is not None:
+                    # Other processes compare it to watched file to know whether it is up to date
+                    os.utime(self.shared_dataset_path)
+
+                return self._get_reload_model(self._snapshot)
+
+            self._validate(all_rainfall)
+            if self.shared_dataset_path is None:
+                return self._swap(all_rainfall)
+
+            write_shared_dataset(all_rainfall, self.shared_dataset_path)
+
+            return self._swap(AllRainfall.from_shared_dataset(self.shared_dataset_path))
+
+    def apply_update(self, rows: list[RawRainfallRow]) -> ReloadModel:
+        """
+        Patch or append rows of raw data, validate updated data and swap it in if it has changed.
+        Only changed rows are loaded into models.
+        If data is shared, a new shared dataset file is written for other processes to attach.
+
+        :param rows: A list of RawRainfallRow; years should either be known
+        or follow the last one without any gap.
+        :raise HTTPException: If a reload is already in progress,
+        if rows cannot be applied or if updated data is not valid.
+        :return: A ReloadModel telling whether data has changed, and which years have.
+        """
+        raw_rows = pd.DataFrame(
+            [[row.year, *row.monthly_rainfall] for row in rows]
+        ).astype({0: int})
+        with self._lock_reload(across_processes=True):
+            try:
+                all_rainfall, changed_years = self._snapshot.all_rainfall.apply_update(
+                    raw_rows
+                )
+            except ValueError as exc:
+                raise HTTPException(
+                    status_code=422,
+                    detail=f"Rows cannot be applied, former data is kept: {exc}",
+                )
+
+            if changed_years is None:
+                return self._get_reload_model(self._snapshot)
+
+            self._validate(all_rainfall)
+            if self.shared_dataset_path is None:
+                return self._swap(all_rainfall, changed_years)
+
+            write_shared_dataset(all_rainfall, self.shared_dataset_path)
+
+            return self._swap(
+                AllRainfall.from_shared_dataset(self.shared_dataset_path),
+                changed_years,
+            )
+
+    def _has_watched_file_changed(self) -> bool:
+        if (mtime_ns := self._get_watched_mtime_ns()) is None:
+            return False
+
+        if self.shared_dataset_path is None:
+            return mtime_ns != self._watched_mtime_ns
+
+        # Whichever process reloads first writes a shared dataset file newer than watched file
+        try:
+            return mtime_ns > os.stat(self.shared_dataset_path).st_mtime_ns
+        except FileNotFoundError:
+            return True
+
+    def refresh(self) -> ReloadModel | None:
+        """
+        Reload rainfall data if data files have changed:
+        either the shared dataset file has been replaced by another process,
+        or the watched local file has been modified.
+        Loading blocks: it is meant to be run in a thread.
+
+        :raise HTTPException: If a reload is already in progress,
+        if data cannot be loaded or if it is not valid.
+        :return: A ReloadModel if data has been reloaded, None if no file has changed.
+        """
+        shared_dataset = self._snapshot.all_rainfall.shared_dataset
+        if shared_dataset is not None and shared_dataset.is_stale():
+            with self._lock_reload(across_processes=False):
+                all_rainfall = AllRainfall.from_shared_dataset(shared_dataset.path)
+                self._validate(all_rainfall)
+
+                return self._swap(all_rainfall)
+
+        if self._has_watched_file_changed():
+            return self.reload()
+
+        return None
+
+
+class DatasetWatcher:
+    """
+    Checks data files of a rainfall dataset periodically in background, reloading it whenever they change.
+    Errors do not stop watching; the last one is kept.
+    """
+
+    def __init__(self, dataset: RainfallDataset, *, poll_interval: float | None):
+        self.dataset = dataset
+        self.poll_interval = poll_interval
+        self.last_error: str | None = None
+        self._task: asyncio.Task | None = None
+
+    @classmethod
+    def from_config(cls, dataset: RainfallDataset, config_: APISettings | None = None):
+        if config_ is None:
+            from back.api.config import Config
+
+            config_ = Config().get_api_settings
+
+        return cls(dataset, poll_interval=config_.reload.poll_interval)
+
+    @property
+    def is_enabled(self) -> bool:
+        return self.poll_interval is not None and (
+            self.dataset.watched_path is not None
+            or self.dataset.shared_dataset_path is not None
+        )
+
+    def start(self, on_reload: Callable[[ReloadModel], Any]) -> asyncio.Task | None:
+        """
+        Start watching in background, cancelling any previous watch.
+        Must be called from within the running event loop of the app.
+
+        :param on_reload: Function called from within the event loop once data has changed,
+        with the ReloadModel of the reload.
+        :return: The asyncio Task watching, None if watching is disabled.
+        """
+        self.stop()
+        if not self.is_enabled:
+            return None
+
+        self._task = asyncio.create_task(self._watch(on_reload))
+
+        return self._task
+
+    def stop(self) -> None:
+        """
+        Cancel watching if any.
+
+        :return: None
+        """
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+
+        self._task = None
+
+    async def check(
+        self, on_reload: Callable[[ReloadModel], Any]
+    ) -> ReloadModel | None:
+        """
+        Check data files once, reloading data in a thread if they have changed.
+
+        :param on_reload: Function called with the ReloadModel once data has changed.
+        :return: A ReloadModel if data has been reloaded, None otherwise.
+        """
+        try:
+            reload = await asyncio.to_thread(self.dataset.refresh)
+        except Exception as exc:
+            self.last_error = (
+                exc.detail if isinstance(exc, HTTPException) else repr(exc)
+            )
+
+            return None
+
+        if reload is not None and reload.reloaded:
+            on_reload(reload)
+
+        return reload
+
+    async def _watch(self, on_reload: Callable[[ReloadModel], Any]):
+        while True:
+            await asyncio.sleep(self.poll_interval)  # type: ignore
+            await self.check(on_reload)
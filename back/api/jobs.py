@@ -0,0 +1,408 @@
+"""
+Provides a job subsystem to run heavy rainfall analyses in a process pool,
+with results persisted in a local store keyed by dataset version and parameters.
+"""
+
+import hashlib
+import json
+import multiprocessing
+import os
+import threading
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Annotated, Any
+
+import numpy as np
+import pandas as pd
+from fastapi import HTTPException
+from pydantic import BaseModel, Field, NonNegativeInt, PositiveInt
+
+from back.api.config import APISettings
+from back.rainfall import AllRainfall
+from back.rainfall.utils import BaseEnum, Label, Month, Season, TimeMode
+from back.rainfall.utils import bootstrap as boot
+from back.rainfall.utils import rainfall_metrics as rain
+
+
+class Analysis(str, BaseEnum):
+    """
+    An Enum listing analyses that can be run as jobs.
+    """
+
+    KMEANS = "kmeans"
+    SAVITZKY_GOLAY_FILTER = "savgol_filter"
+    BOOTSTRAP_NORMALS = "bootstrap_normals"
+
+
+class JobStatus(str, BaseEnum):
+    """
+    An Enum listing statuses of a job.
+    """
+
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+class JobRequest(BaseModel):
+    """
+    Model for submitting an analysis of rainfall data according to year.
+    Parameters that are irrelevant to the requested analysis are ignored.
+    """
+
+    analysis: Analysis
+    time_mode: TimeMode = TimeMode.YEARLY
+    month: Month | None = None
+    season: Season | None = None
+    kmeans_clusters: PositiveInt = 4
+    window_length: PositiveInt | None = None
+    polyorder: NonNegativeInt | None = None
+    replicates: Annotated[int, Field(ge=100, le=100_000)] = 1000
+    seed: NonNegativeInt = 0
+
+    def get_parameters(self) -> dict[str, Any]:
+        """
+        Return parameters the analysis result depends upon.
+
+        :return: A dict of parameters.
+        """
+        parameters: dict[str, Any] = {
+            "analysis": self.analysis.value,
+            "time_mode": self.time_mode.value,
+            "month": self.month.value
+            if self.month and self.time_mode == TimeMode.MONTHLY
+            else None,
+            "season": self.season.value
+            if self.season and self.time_mode == TimeMode.SEASONAL
+            else None,
+        }
+
+        if self.analysis == Analysis.KMEANS:
+            parameters["kmeans_clusters"] = self.kmeans_clusters
+        elif self.analysis == Analysis.SAVITZKY_GOLAY_FILTER:
+            parameters["window_length"] = self.window_length
+            parameters["polyorder"] = self.polyorder
+        elif self.analysis == Analysis.BOOTSTRAP_NORMALS:
+            parameters["replicates"] = self.replicates
+            parameters["seed"] = self.seed
+
+        return parameters
+
+
+class JobResult(BaseModel):
+    """
+    Model for depicting values computed by an analysis according to year,
+    along with bounds of their confidence intervals if the analysis gives some.
+    """
+
+    years: list[int]
+    values: list[float]
+    lower_bounds: list[float] | None = None
+    upper_bounds: list[float] | None = None
+
+
+class JobModel(BaseModel):
+    """
+    Model for depicting a job and its result once done.
+    """
+
+    id: str
+    status: JobStatus
+    dataset_version: str
+    parameters: dict[str, Any]
+    submitted_at: datetime
+    result: JobResult | None = None
+    error: str | None = None
+
+
+def _run_analysis(
+    yearly_rainfall: pd.DataFrame, parameters: dict[str, Any], round_precision: int
+) -> JobResult:
+    """
+    Run an analysis upon rainfall data according to year.
+    Executed in a worker process: it should only rely on its arguments.
+    """
+    analysis = Analysis(parameters["analysis"])
+    if analysis == Analysis.BOOTSTRAP_NORMALS:
+        years, normals, lower_bounds, upper_bounds = (
+            boot.get_confidence_intervals_of_normals(
+                yearly_rainfall[Label.YEAR.value].to_numpy(),
+                yearly_rainfall[Label.RAINFALL.value].to_numpy(),
+                replicates=parameters["replicates"],
+                seed=parameters["seed"],
+            )
+        )
+        # Time frames without any rainfall value have no normal
+        is_known = ~np.isnan(normals)
+
+        return JobResult(
+            years=years[is_known].tolist(),
+            values=np.round(normals[is_known], round_precision).tolist(),
+            lower_bounds=np.round(lower_bounds[is_known], round_precision).tolist(),
+            upper_bounds=np.round(upper_bounds[is_known], round_precision).tolist(),
+        )
+
+    if analysis == Analysis.KMEANS:
+        values = rain.get_kmeans_labels(
+            yearly_rainfall, kmeans_clusters=parameters["kmeans_clusters"]
+        )
+    else:
+        values = rain.get_savgol_filter(
+            yearly_rainfall,
+            round_precision=round_precision,
+            window_length=parameters["window_length"],
+            polyorder=parameters["polyorder"],
+        )
+
+    return JobResult(
+        years=yearly_rainfall[Label.YEAR.value].tolist(), values=values.tolist()
+    )
+
+
+class ResultStore:
+    """
+    Persists job results as JSON files, under one folder per dataset version
+    and one file per set of parameters.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+
+    def _get_file_path(self, dataset_version: str, parameters: dict[str, Any]) -> Path:
+        parameters_hash = hashlib.sha256(
+            json.dumps(parameters, sort_keys=True).encode()
+        ).hexdigest()
+
+        return self.path / dataset_version / f"{parameters_hash}.json"
+
+    def get(self, dataset_version: str, parameters: dict[str, Any]) -> JobResult | None:
+        """
+        Retrieve a stored result.
+
+        :param dataset_version: Version of the dataset the result has been computed upon.
+        :param parameters: A dict of parameters the result depends upon.
+        :return: The stored result if any, None otherwise.
+        """
+        try:
+            return JobResult.model_validate_json(
+                self._get_file_path(dataset_version, parameters).read_text()
+            )
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def put(
+        self, dataset_version: str, parameters: dict[str, Any], result: JobResult
+    ) -> None:
+        """
+        Store a result. Writing is atomic: concurrent readers never see a partial file.
+
+        :param dataset_version: Version of the dataset the result has been computed upon.
+        :param parameters: A dict of parameters the result depends upon.
+        :param result: The result to store.
+        :return: None
+        """
+        file_path = self._get_file_path(dataset_version, parameters)
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+
+        tmp_file_path = file_path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+        tmp_file_path.write_text(result.model_dump_json())
+        os.replace(tmp_file_path, file_path)
+
+
+MAX_KEPT_JOBS = 1024
+
+
+class JobManager:
+    """
+    Runs analyses in a lazily started process pool, so they never occupy request workers.
+    Concurrency is bounded by the number of worker processes
+    and by the number of jobs that can be pending or running at the same time.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_workers: int,
+        max_pending_jobs: int,
+        result_store_path: str | Path,
+    ):
+        self.max_workers = max_workers
+        self.max_pending_jobs = max_pending_jobs
+        self.result_store = ResultStore(result_store_path)
+        self._executor: ProcessPoolExecutor | None = None
+        self._jobs: dict[str, JobModel] = {}
+        self._futures: dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config_: APISettings | None = None):
+        if config_ is None:
+            from back.api.config import Config
+
+            config_ = Config().get_api_settings
+
+        return cls(**config_.jobs.model_dump())
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is not None and self._executor._broken:
+            # A worker died abruptly (e.g. killed): the pool failed its jobs and
+            # rejects new ones for good, so it is replaced
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+        if self._executor is None:
+            # Spawned workers do not inherit server threads and only import this module
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+
+        return self._executor
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        """
+        Process pool running jobs, started upon first access and replaced once broken;
+        other heavy computations can share it.
+        """
+        with self._lock:
+            return self._get_executor()
+
+    def submit(self, job_request: JobRequest, *, all_rainfall: AllRainfall) -> JobModel:
+        """
+        Submit an analysis; its result is taken from the store if it has already been computed.
+
+        :param job_request: A JobRequest describing the analysis to run.
+        :param all_rainfall: An AllRainfall instance holding data to analyse.
+        :return: The submitted job.
+        :raise HTTPException: If time mode is inconsistent with month or season,
+        or if too many jobs are already pending.
+        """
+        entity = all_rainfall.get_entity_for_time_mode(
+            job_request.time_mode, job_request.month, job_request.season
+        )
+        if entity is None:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Month or season should be set according to {job_request.time_mode=}.",
+            )
+
+        parameters = {
+            **job_request.get_parameters(),
+            "start_year": all_rainfall.starting_year,
+            "round_precision": all_rainfall.round_precision,
+        }
+        job = JobModel(
+            id=uuid.uuid4().hex,
+            status=JobStatus.PENDING,
+            dataset_version=all_rainfall.version,
+            parameters=parameters,
+            submitted_at=datetime.now(timezone.utc),
+        )
+
+        if result := self.result_store.get(all_rainfall.version, parameters):
+            job.status, job.result = JobStatus.DONE, result
+            with self._lock:
+                self._forget_oldest_finished_jobs()
+                self._jobs[job.id] = job
+
+            return job
+
+        with self._lock:
+            if (
+                sum(not future.done() for future in self._futures.values())
+                >= self.max_pending_jobs
+            ):
+                raise HTTPException(
+                    status_code=429,
+                    detail=f"Too many pending jobs ({self.max_pending_jobs}), retry later.",
+                )
+
+            analysis_args = (
+                entity.data[[Label.YEAR.value, Label.RAINFALL.value]],
+                parameters,
+                all_rainfall.round_precision,
+            )
+            try:
+                future = self._get_executor().submit(_run_analysis, *analysis_args)
+            except BrokenProcessPool:
+                # The pool broke since it was checked: submit to a new one
+                future = self._get_executor().submit(_run_analysis, *analysis_args)
+            self._forget_oldest_finished_jobs()
+            self._jobs[job.id] = job
+            self._futures[job.id] = future
+
+        future.add_done_callback(lambda done_future: self._on_done(job, done_future))
+
+        return job
+
+    def _forget_oldest_finished_jobs(self):
+        finished_job_ids = [
+            job_id for job_id in self._jobs.keys() if job_id not in self._futures
+        ]
+        for job_id in finished_job_ids[: max(0, len(self._jobs) - MAX_KEPT_JOBS + 1)]:
+            del self._jobs[job_id]
+
+    def _on_done(self, job: JobModel, future: Future):
+        try:
+            if future.cancelled() or job.status == JobStatus.CANCELLED:
+                job.status = JobStatus.CANCELLED
+            elif exception := future.exception():
+                job.status, job.error = JobStatus.FAILED, repr(exception)
+            else:
+                result = future.result()
+                self.result_store.put(job.dataset_version, job.parameters, result)
+                job.status, job.result = JobStatus.DONE, result
+        except Exception as exception:
+            # E.g. the result could not be stored
+            job.status, job.error = JobStatus.FAILED, repr(exception)
+        finally:
+            with self._lock:
+                self._futures.pop(job.id, None)
+
+    def get(self, job_id: str) -> JobModel | None:
+        """
+        Retrieve a job with its up-to-date status.
+
+        :param job_id: Identifier of the job.
+        :return: The job if it exists, None otherwise.
+        """
+        if (job := self._jobs.get(job_id)) is None:
+            return None
+
+        future = self._futures.get(job_id)
+        if job.status == JobStatus.PENDING and future and future.running():
+            job.status = JobStatus.RUNNING
+
+        return job
+
+    def cancel(self, job_id: str) -> JobModel | None:
+        """
+        Cancel a job. A pending job is removed from the queue;
+        a running job keeps its worker busy until it ends but its result is discarded.
+
+        :param job_id: Identifier of the job.
+        :return: The job if it exists, None otherwise.
+        """
+        if (job := self.get(job_id)) is None:
+            return None
+
+        if job.status in (JobStatus.PENDING, JobStatus.RUNNING):
+            job.status = JobStatus.CANCELLED
+            if future := self._futures.get(job_id):
+                future.cancel()
+
+        return job
+
+    def shutdown(self):
+        """
+        Cancel pending jobs and stop worker processes.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
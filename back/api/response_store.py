@@ -0,0 +1,331 @@
+"""
+Provides a store persisting cached API responses in a local SQLite database,
+shared by API workers and kept across restarts, so that a restarted server answers from it at once.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS response (
+    key TEXT PRIMARY KEY,
+    version TEXT NOT NULL,
+    endpoint TEXT NOT NULL,
+    arguments TEXT NOT NULL,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS response_by_access ON response (accessed_at, size);
+CREATE INDEX IF NOT EXISTS response_by_version ON response (version);
+CREATE TABLE IF NOT EXISTS usage (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    size INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO usage VALUES (0, 0);
+CREATE TRIGGER IF NOT EXISTS response_inserted AFTER INSERT ON response
+BEGIN
+    UPDATE usage SET size = size + NEW.size;
+END;
+CREATE TRIGGER IF NOT EXISTS response_deleted AFTER DELETE ON response
+BEGIN
+    UPDATE usage SET size = size - OLD.size;
+END;
+"""
+
+# Least recently accessed responses beyond max bytes, most recently accessed ones being kept first
+EVICT_QUERY = """
+DELETE FROM response WHERE key IN (
+    SELECT key FROM (
+        SELECT key, SUM(size) OVER (ORDER BY accessed_at DESC, key) AS kept_size
+        FROM response
+    )
+    WHERE kept_size > ?
+)
+"""
+
+
+class ResponseStore:
+    """
+    Persists values returned by route endpoints, keyed by dataset version, endpoint and normalized arguments,
+    as pickles in a SQLite database bounded in size: least recently accessed values are evicted beyond max bytes.
+    Several processes can use the same database at once.
+    Errors of the database are never raised: a value that cannot be read is not found.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        max_bytes: int,
+        access_resolution: float = 60.0,
+        timeout: float = 5.0,
+    ):
+        """
+        :param path: Path to the SQLite database, created if it does not exist.
+        :param max_bytes: Maximum total size of stored values.
+        :param access_resolution: Seconds below which access time of a value is not updated,
+        for reads not to be writes most of the time.
+        :param timeout: Seconds to wait for another process to release its lock on the database.
+        """
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.access_resolution = access_resolution
+        self.timeout = timeout
+        self._connection: sqlite3.Connection | None = None
+        self._pid: int | None = None
+        self._lock = threading.Lock()
+
+    def _get_connection(self) -> sqlite3.Connection:
+        # Connections are not shared with forked processes
+        if self._connection is None or self._pid != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(
+                self.path,
+                timeout=self.timeout,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            connection.execute("PRAGMA journal_mode = WAL")
+            connection.execute("PRAGMA synchronous = NORMAL")
+            connection.executescript(SCHEMA)
+            self._connection, self._pid = connection, os.getpid()
+
+        return self._connection
+
+    def close(self) -> None:
+        """
+        Close connection to the database, opened again upon next use.
+
+        :return: None
+        """
+        with self._lock:
+            if self._connection is not None and self._pid == os.getpid():
+                self._connection.close()
+
+            self._connection = None
+
+    def __len__(self) -> int:
+        try:
+            with self._lock:
+                return (
+                    self._get_connection()
+                    .execute("SELECT COUNT(*) FROM response")
+                    .fetchone()[0]
+                )
+        except sqlite3.Error:
+            return 0
+
+    @property
+    def size(self) -> int:
+        """Total size of stored values, in bytes."""
+        try:
+            with self._lock:
+                return (
+                    self._get_connection()
+                    .execute("SELECT size FROM usage")
+                    .fetchone()[0]
+                )
+        except sqlite3.Error:
+            return 0
+
+    def get(
+        self, key: tuple[str, str, tuple[tuple[str, Any], ...]]
+    ) -> tuple[bool, Any]:
+        """
+        Retrieve a stored value and update its access time.
+
+        :param key: Key of the value, as a tuple of dataset version, endpoint name and sorted arguments.
+        :return: A tuple (found, value) where value is None if it has not been found.
+        """
+        hashed_key = get_hashed_key(*key)
+        now = time.time()
+        try:
+            with self._lock:
+                connection = self._get_connection()
+                row = connection.execute(
+                    "SELECT value, accessed_at FROM response WHERE key = ?",
+                    (hashed_key,),
+                ).fetchone()
+                if row is None:
+                    return False, None
+
+                value, accessed_at = row
+                if now - accessed_at >= self.access_resolution:
+                    connection.execute(
+                        "UPDATE response SET accessed_at = ? WHERE key = ?",
+                        (now, hashed_key),
+                    )
+        except sqlite3.Error:
+            return False, None
+
+        try:
+            return True, pickle.loads(value)
+        except Exception:  # Values stored by another version of the code
+            self._delete(hashed_key)
+
+            return False, None
+
+    def put(
+        self, key: tuple[str, str, tuple[tuple[str, Any], ...]], value: Any
+    ) -> None:
+        """
+        Store a value, evicting least recently accessed values beyond max bytes.
+        A value already stored under the same key is kept, as it has been computed upon the same data.
+
+        :param key: Key of the value, as a tuple of dataset version, endpoint name and sorted arguments.
+        :param value: A picklable value.
+        :return: None
+        """
+        version, endpoint_name, arguments = key
+        try:
+            pickled_value = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            return
+
+        if len(pickled_value) > self.max_bytes:
+            return
+
+        try:
+            with self._lock:
+                connection = self._get_connection()
+                connection.execute("BEGIN IMMEDIATE")
+                try:
+                    connection.execute(
+                        "INSERT INTO response VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT (key) DO NOTHING",
+                        (
+                            get_hashed_key(version, endpoint_name, arguments),
+                            version,
+                            endpoint_name,
+                            json.dumps(arguments, default=str),
+                            pickled_value,
+                            len(pickled_value),
+                            time.time(),
+                        ),
+                    )
+                    (size,) = connection.execute("SELECT size FROM usage").fetchone()
+                    if size > self.max_bytes:
+                        connection.execute(EVICT_QUERY, (self.max_bytes,))
+
+                    connection.execute("COMMIT")
+                except BaseException:
+                    connection.execute("ROLLBACK")
+                    raise
+        except sqlite3.Error:
+            pass
+
+    def _delete(self, hashed_key: str) -> None:
+        try:
+            with self._lock:
+                self._get_connection().execute(
+                    "DELETE FROM response WHERE key = ?", (hashed_key,)
+                )
+        except sqlite3.Error:
+            pass
+
+    def clear(self) -> None:
+        """
+        Remove all stored values.
+
+        :return: None
+        """
+        try:
+            with self._lock:
+                self._get_connection().execute("DELETE FROM response")
+        except sqlite3.Error:
+            pass
+
+    def remove_version(self, version: str) -> None:
+        """
+        Remove values stored upon a dataset version.
+
+        :param version: A dataset version.
+        :return: None
+        """
+        try:
+            with self._lock:
+                self._get_connection().execute(
+                    "DELETE FROM response WHERE version = ?", (version,)
+                )
+        except sqlite3.Error:
+            pass
+
+    def carry_over(
+        self,
+        previous_version: str,
+        version: str,
+        *,
+        is_kept: Callable[[dict[str, Any]], bool],
+    ) -> int:
+        """
+        Store values stored upon a former dataset version under the new one as well, if kept.
+        Values of the former version are removed.
+        Several processes can carry over the same values: they are stored once.
+
+        :param previous_version: Version of the dataset before change.
+        :param version: Version of the dataset after change.
+        :param is_kept: A function telling from arguments of an endpoint whether its value is still valid.
+        :return: The number of values carried over.
+        """
+        carried_over = 0
+        try:
+            with self._lock:
+                connection = self._get_connection()
+                connection.execute("BEGIN IMMEDIATE")
+                try:
+                    rows = connection.execute(
+                        "SELECT endpoint, arguments, value, size, accessed_at FROM response WHERE version = ?",
+                        (previous_version,),
+                    ).fetchall()
+                    for endpoint_name, arguments, value, size, accessed_at in rows:
+                        if not is_kept(dict(json.loads(arguments))):
+                            continue
+
+                        carried_over += connection.execute(
+                            "INSERT INTO response VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT (key) DO NOTHING",
+                            (
+                                get_hashed_key(
+                                    version, endpoint_name, json.loads(arguments)
+                                ),
+                                version,
+                                endpoint_name,
+                                arguments,
+                                value,
+                                size,
+                                accessed_at,
+                            ),
+                        ).rowcount
+
+                    connection.execute(
+                        "DELETE FROM response WHERE version = ?", (previous_version,)
+                    )
+                    connection.execute("COMMIT")
+                except BaseException:
+                    connection.execute("ROLLBACK")
+                    raise
+        except sqlite3.Error:
+            return 0
+
+        return carried_over
+
+
+def get_hashed_key(version: str, endpoint_name: str, arguments: Any) -> str:
+    """
+    Hash the key of a value from dataset version, endpoint name and sorted arguments,
+    the same whether arguments are tuples or lists, e.g. once read from JSON.
+
+    :param version: A dataset version, i.e. a hash of its content.
+    :param endpoint_name: Name of the endpoint.
+    :param arguments: Sorted pairs of names and hashable values of arguments.
+    :return: A hexadecimal SHA-256 digest.
+    """
+    return hashlib.sha256(
+        json.dumps([version, endpoint_name, arguments], default=str).encode()
+    ).hexdigest()
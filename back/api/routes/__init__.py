@@ -2,28 +2,109 @@
 Module to provide a function that returns a dict linking FastAPI routes endpoints to their specifications.
 """
 
-from typing import Any, Callable
+from concurrent.futures import Executor
+from contextvars import ContextVar
+from typing import Annotated, Any, Callable
 
-from pydantic import BaseModel, Field
+from fastapi import Depends, Query
+from pydantic import AfterValidator, BaseModel, Field
 from starlette.responses import JSONResponse, StreamingResponse
 
-from back.api.utils import RainfallModel
-from back.rainfall import AllRainfall
+from back.api.cache import CacheWarmer, ReadinessModel, ResponseCache
+from back.api.dataset import DatasetSnapshot, DatasetWatcher, ReloadModel
+from back.api.jobs import JobManager, JobModel
+from back.api.stations import StationModel, StationRegistry
+from back.api.utils import (
+    RainfallModel,
+    ReturnLevelModel,
+    SegmentModel,
+    TrendModel,
+)
 from back.rainfall.utils import TimeMode
+from back.rainfall.utils.bootstrap import BOOTSTRAP_CHUNK_SIZE
 
-all_rainfall = AllRainfall.from_config()
+station_registry = StationRegistry.from_config()
+rainfall_dataset = station_registry.default_dataset
+dataset_watcher = DatasetWatcher.from_config(rainfall_dataset)
+job_manager = JobManager.from_config()
+response_cache = ResponseCache.from_config(
+    get_version=lambda arguments: arguments["snapshot"].version
+)
+cache_warmer = CacheWarmer.from_config()
 
+_requested_snapshot: ContextVar[DatasetSnapshot] = ContextVar("requested_snapshot")
+
+Station = Annotated[
+    str | None,
+    Query(description="Weather station; if not set, default station is used."),
+]
+
+
+async def get_station_snapshot(station: Station = None) -> DatasetSnapshot:
+    snapshot = (await station_registry.get_async(station)).snapshot
+    # Dependencies are solved before query parameters are validated: years are checked against this snapshot
+    _requested_snapshot.set(snapshot)
+
+    return snapshot
+
+
+def get_requested_snapshot() -> DatasetSnapshot:
+    """Snapshot of the station requested, or of default station outside of requests."""
+    return _requested_snapshot.get(rainfall_dataset.snapshot)
+
+
+StationSnapshot = Annotated[DatasetSnapshot, Depends(get_station_snapshot)]
+
+Window = Annotated[
+    str | None,
+    Query(
+        description="Consecutive months summed instead of a season if time mode is 'seasonal', "
+        "e.g. 'October-September' for hydrological years or 'December-February' for winters; "
+        "months of the former year belong to the year of the last month.",
+    ),
+]
+
+# Bounds are those of station data served when a request is validated, as data can be reloaded
+YearAvailable = Annotated[
+    int,
+    Query(description="A year between first and last years available."),
+    AfterValidator(lambda year: get_requested_snapshot().check_year(year)),
+]
+NormalYearAvailable = Annotated[
+    int,
+    Query(description="A year from which 30 years are available."),
+    AfterValidator(lambda year: get_requested_snapshot().check_normal_year(year)),
+]
+Replicates = Annotated[
+    int,
+    Query(
+        ge=100,
+        le=100_000,
+        description="Number of bootstrap replicates; beyond 10000, they are drawn in a process pool.",
+    ),
+]
+
+
+def get_bootstrap_executor(replicates: int) -> Executor | None:
+    """Process pool of jobs if replicates span several chunks, none otherwise so that it is not started for nothing."""
+    return job_manager.executor if replicates > BOOTSTRAP_CHUNK_SIZE else None
 
-MIN_YEAR_AVAILABLE = all_rainfall.starting_year
-MAX_YEAR_AVAILABLE = all_rainfall.get_last_year()
-MAX_NORMAL_YEAR_AVAILABLE = MAX_YEAR_AVAILABLE - 29
 
 __all__ = [
-    "all_rainfall",
+    "station_registry",
+    "rainfall_dataset",
+    "dataset_watcher",
+    "job_manager",
+    "response_cache",
+    "cache_warmer",
     "get_endpoint_to_api_route_specs",
-    "MIN_YEAR_AVAILABLE",
-    "MAX_YEAR_AVAILABLE",
-    "MAX_NORMAL_YEAR_AVAILABLE",
+    "Station",
+    "StationSnapshot",
+    "Window",
+    "YearAvailable",
+    "NormalYearAvailable",
+    "Replicates",
+    "get_bootstrap_executor",
 ]
 
 
@@ -34,35 +115,51 @@ class APIRouteSpecs(BaseModel):
     response_model: Any = Field(default=None)
     tags: list[str] = Field(default_factory=list)
     response_class: Any = Field(default=JSONResponse)
+    methods: list[str] | None = Field(default=None)
+    status_code: int | None = Field(default=None)
 
 
 def get_endpoint_to_api_route_specs() -> dict[Callable[..., Any], APIRouteSpecs]:
-    from back.api.routes.csv import get_rainfall_by_year_as_csv
+    from back.api.routes.admin import reload_dataset, update_dataset
+    from back.api.routes.csv import (
+        get_rainfall_by_year_as_csv,
+        get_standardized_precipitation_index_as_csv,
+    )
     from back.api.routes.graph import (
         get_percentage_of_years_above_and_below_normal_as_plotly_json,
         get_rainfall_averages_as_plotly_json,
         get_rainfall_by_year_as_plotly_json,
+        get_rainfall_linreg_slope_matrix_as_plotly_json,
         get_rainfall_linreg_slopes_as_plotly_json,
         get_relative_distances_to_normal_as_plotly_json,
+        get_standardized_precipitation_index_as_plotly_json,
     )
+    from back.api.routes.health import get_readiness
+    from back.api.routes.job import cancel_job, get_job, submit_job
     from back.api.routes.rainfall import (
         get_rainfall_average,
+        get_rainfall_change_points,
         get_rainfall_normal,
         get_rainfall_relative_distance_to_normal,
+        get_rainfall_return_levels,
         get_rainfall_standard_deviation,
+        get_rainfall_trends,
     )
+    from back.api.routes.station import get_stations
     from back.api.routes.year import get_years_above_normal, get_years_below_normal
 
     endpoint_to_rainfall_api_route_specs: dict[Callable[..., Any], APIRouteSpecs] = {
         get_rainfall_average: APIRouteSpecs(
             path="/rainfall/average",
             summary="Retrieve rainfall average for Barcelona between two years.",
-            description=f"If no ending year is precised, most recent year available is taken: {MAX_YEAR_AVAILABLE}.",
+            description="If `ci` is set, a 95% bootstrap confidence interval is given along with the average.<br>"
+            "If no ending year is precised, most recent year available is taken.",
         ),
         get_rainfall_normal: APIRouteSpecs(
             path="/rainfall/normal",
             summary="Retrieve 30 years rainfall average for Barcelona after a given year.",
-            description="Commonly called rainfall normal.",
+            description="Commonly called rainfall normal.<br>"
+            "If `ci` is set, a 95% bootstrap confidence interval is given along with the normal.",
         ),
         get_rainfall_relative_distance_to_normal: APIRouteSpecs(
             path="/rainfall/relative_distance_to_normal",
@@ -73,12 +170,12 @@ def get_endpoint_to_api_route_specs() -> dict[Callable[..., Any], APIRouteSpecs]
             "2. `normal` is normal rainfall computed from `normal_year`<br>"
             "If 100%, average is twice the normal. <br>"
             "If -50%, average is half the normal. <br>"
-            f"If no ending year is precised, most recent year available is taken: {MAX_YEAR_AVAILABLE}.",
+            "If no ending year is precised, most recent year available is taken.",
         ),
         get_rainfall_standard_deviation: APIRouteSpecs(
             path="/rainfall/standard_deviation",
             summary="Compute the standard deviation of rainfall for Barcelona between two years.",
-            description=f"If no ending year is precised, most recent year available is taken: {MAX_YEAR_AVAILABLE}.",
+            description="If no ending year is precised, most recent year available is taken.",
         ),
     }
 
@@ -86,20 +183,54 @@ def get_endpoint_to_api_route_specs() -> dict[Callable[..., Any], APIRouteSpecs]
         endpoint_to_rainfall_api_route_specs[endpoint].response_model = RainfallModel
         endpoint_to_rainfall_api_route_specs[endpoint].tags = ["Rainfall"]
 
+    endpoint_to_rainfall_api_route_specs[get_rainfall_trends] = APIRouteSpecs(
+        path="/rainfall/trends",
+        summary="Compute rainfall trends for Barcelona between two years, for whole years, every month and every season.",
+        description="Linear regression slope is given next to Sen's slope, i.e. the median of slopes between every two years, "
+        "and Mann–Kendall trend test, corrected for ties: a p-value below 0.05 tells a significant trend.<br>"
+        "If a time mode is precised, only its trends are given.<br>"
+        "If `ci` is set, a 95% bootstrap confidence interval of linear regression slope is given.<br>"
+        "If no ending year is precised, most recent year available is taken.",
+        response_model=list[TrendModel],
+        tags=["Rainfall"],
+    )
+    endpoint_to_rainfall_api_route_specs[get_rainfall_change_points] = APIRouteSpecs(
+        path="/rainfall/change_points",
+        summary="Detect regime shifts of rainfall for Barcelona between two years, for whole years, every month and every season.",
+        description="Rainfall is split with PELT into segments of at least 5 years with different averages, "
+        "a change costing a penalty: its default is the Bayesian Information Criterion, "
+        "`penalty_factor` scales it and can be repeated to compare segmentations.<br>"
+        "If a time mode is precised, only its segments are given.<br>"
+        "If no ending year is precised, most recent year available is taken.",
+        response_model=list[SegmentModel],
+        tags=["Rainfall"],
+    )
+    endpoint_to_rainfall_api_route_specs[get_rainfall_return_levels] = APIRouteSpecs(
+        path="/rainfall/return_levels",
+        summary="Compute 10, 50 and 100 years return levels of maximum monthly rainfall for Barcelona between two years.",
+        description="Maximum monthly rainfall of every year, month or season is fitted to a GEV or Gumbel distribution "
+        "with L-moments; a return level is exceeded once every return period on average.<br>"
+        "95% confidence intervals come from a parametric bootstrap: `replicates` samples are drawn "
+        "from the fitted distribution and fitted in turn, in a process pool beyond 10000 replicates.<br>"
+        "If no ending year is precised, most recent year available is taken.",
+        response_model=list[ReturnLevelModel],
+        tags=["Rainfall"],
+    )
+
     endpoint_to_year_api_route_specs: dict[Callable[..., Any], APIRouteSpecs] = {
         get_years_below_normal: APIRouteSpecs(
             path="/year/below_normal",
             summary="Compute the number of years below normal for a specific year range.",
             description="Normal is computed as a 30 years average "
-            f"starting from the year set via normal_year. <br>"
-            f"If no ending year is precised, most recent year available is taken: {MAX_YEAR_AVAILABLE}.",
+            "starting from the year set via normal_year. <br>"
+            "If no ending year is precised, most recent year available is taken.",
         ),
         get_years_above_normal: APIRouteSpecs(
             path="/year/above_normal",
             summary="Compute the number of years above normal for a specific year range.",
             description="Normal is computed as a 30 years average "
-            f"starting from the year set via normal_year. <br>"
-            f"If no ending year is precised, most recent year available is taken: {MAX_YEAR_AVAILABLE}.",
+            "starting from the year set via normal_year. <br>"
+            "If no ending year is precised, most recent year available is taken.",
         ),
     }
 
@@ -112,30 +243,50 @@ def get_endpoint_to_api_route_specs() -> dict[Callable[..., Any], APIRouteSpecs]
             path="/graph/rainfall_by_year",
             summary="Retrieve rainfall by year as a PNG or as a JSON.",
             description="Could either be for rainfall upon a whole year, a specific month or a given season.<br>"
-            f"If no ending year is precised, most recent year available is taken: {MAX_YEAR_AVAILABLE}.",
+            "If `max_points` is set, rainfall is downsampled with the Largest-Triangle-Three-Buckets algorithm, "
+            "keeping minimum and maximum; `layout.meta.decimation_ratio` then reports original over plotted years.<br>"
+            "If `plot_change_points` is set, averages of regimes between change points detected with PELT are drawn, "
+            "fewer changes being detected as `penalty_factor` increases.<br>"
+            "If no ending year is precised, most recent year available is taken.",
         ),
         get_rainfall_averages_as_plotly_json: APIRouteSpecs(
             path="/graph/rainfall_averages",
             summary="Retrieve rainfall monthly or seasonal averages of data as a PNG or as a JSON.",
             description=f"Time mode should be either '{TimeMode.MONTHLY.value}' or '{TimeMode.SEASONAL.value}'.<br>"
-            f"If no ending year is precised, most recent year available is taken: {MAX_YEAR_AVAILABLE}.",
+            "If no ending year is precised, most recent year available is taken.",
         ),
         get_rainfall_linreg_slopes_as_plotly_json: APIRouteSpecs(
             path="/graph/rainfall_linreg_slopes",
             summary="Retrieve rainfall monthly or seasonal linear regression slopes of data as a PNG or as a JSON.",
             description=f"Time mode should be either '{TimeMode.MONTHLY.value}' or '{TimeMode.SEASONAL.value}'.<br>"
-            f"If no ending year is precised, most recent year available is taken: {MAX_YEAR_AVAILABLE}.",
+            "If no ending year is precised, most recent year available is taken.",
+        ),
+        get_rainfall_linreg_slope_matrix_as_plotly_json: APIRouteSpecs(
+            path="/graph/linreg_slope_matrix",
+            summary="Retrieve rainfall linear regression slopes for every pair of first and last years as a heat map JSON.",
+            description="Could either be for rainfall upon a whole year, a specific month or a given season.<br>"
+            "Rows are first years and columns last years; R2 scores are given along slopes.<br>"
+            "If no ending year is precised, most recent year available is taken.",
+        ),
+        get_standardized_precipitation_index_as_plotly_json: APIRouteSpecs(
+            path="/graph/spi",
+            summary="Retrieve Standardized Precipitation Index (SPI) by month as a JSON.",
+            description="Rainfall is summed over the former `months` at every month, e.g. 1, 3, 6, 12 or 24; "
+            "sums of every calendar month are fitted to a gamma distribution, accounting for months without rainfall, "
+            "upon the 30 years starting from `normal_year`. "
+            "Negative values tell droughts, below -2 extreme ones, positive values wet spells.<br>"
+            "If no ending year is precised, most recent year available is taken.",
         ),
         get_relative_distances_to_normal_as_plotly_json: APIRouteSpecs(
             path="/graph/relative_distances_to_normal",
             summary="Retrieve monthly or seasonal relative distances to normal (%) of data as a PNG or as a JSON.",
             description=f"Time mode should be either '{TimeMode.MONTHLY.value}' or '{TimeMode.SEASONAL.value}'.<br>"
-            f"If no ending year is precised, most recent year available is taken: {MAX_YEAR_AVAILABLE}.",
+            "If no ending year is precised, most recent year available is taken.",
         ),
         get_percentage_of_years_above_and_below_normal_as_plotly_json: APIRouteSpecs(
             path="/graph/percentage_of_years_above_and_below_normal",
             summary="Retrieve pie chart of years above compared to years below normal (%) of data as a JSON.",
-            description=f"If no ending year is precised, most recent year available is taken: {MAX_YEAR_AVAILABLE}.",
+            description="If no ending year is precised, most recent year available is taken.",
         ),
     }
 
@@ -147,15 +298,106 @@ def get_endpoint_to_api_route_specs() -> dict[Callable[..., Any], APIRouteSpecs]
             path="/csv/rainfall_by_year",
             summary="Retrieve CSV of rainfall by year data: ['Year', 'Rainfall'] columns.",
             description="Could either be for rainfall upon a whole year, a specific month or a given season.<br>"
-            f"If no ending year is precised, most recent year available is taken: {MAX_YEAR_AVAILABLE}.",
+            "If no ending year is precised, most recent year available is taken.",
+            response_class=StreamingResponse,
+            tags=["CSV"],
+        ),
+        get_standardized_precipitation_index_as_csv: APIRouteSpecs(
+            path="/csv/spi",
+            summary="Retrieve CSV of Standardized Precipitation Index (SPI) by month: ['Year', 'Month', 'Standardized precipitation index'] columns.",
+            description="Rainfall is summed over the former `months` at every month, e.g. 1, 3, 6, 12 or 24; "
+            "sums of every calendar month are fitted to a gamma distribution, accounting for months without rainfall, "
+            "upon the 30 years starting from `normal_year`. "
+            "Negative values tell droughts, below -2 extreme ones, positive values wet spells.<br>"
+            "If no ending year is precised, most recent year available is taken.",
             response_class=StreamingResponse,
             tags=["CSV"],
         ),
     }
 
+    endpoint_to_job_api_route_specs: dict[Callable[..., Any], APIRouteSpecs] = {
+        submit_job: APIRouteSpecs(
+            path="/jobs",
+            summary="Submit a heavy analysis of rainfall data to be run in background.",
+            description="Available analyses are K-Means clustering, Savitzky–Golay filter "
+            "and normals starting from every year with their bootstrap confidence intervals. <br>"
+            "Job status and result are retrieved by polling `/jobs/{job_id}`. <br>"
+            "Results are stored and reused as long as data remains the same.",
+            methods=["POST"],
+            status_code=202,
+        ),
+        get_job: APIRouteSpecs(
+            path="/jobs/{job_id}",
+            summary="Retrieve status of a job, and its result once done.",
+        ),
+        cancel_job: APIRouteSpecs(
+            path="/jobs/{job_id}",
+            summary="Cancel a job.",
+            description="A running job cannot be interrupted but its result is discarded.",
+            methods=["DELETE"],
+        ),
+    }
+
+    for endpoint in endpoint_to_job_api_route_specs.keys():
+        endpoint_to_job_api_route_specs[endpoint].response_model = JobModel
+        endpoint_to_job_api_route_specs[endpoint].tags = ["Job"]
+
+    endpoint_to_health_api_route_specs: dict[Callable[..., Any], APIRouteSpecs] = {
+        get_readiness: APIRouteSpecs(
+            path="/health/ready",
+            summary="Check whether API is ready to serve requests quickly.",
+            description="Responses of rainfall, year and graph routes are cached. <br>"
+            "Once data is loaded, most frequent queries are run in background to warm up the cache: "
+            "until it is done, status code is 503.",
+            response_model=ReadinessModel,
+            tags=["Health"],
+        ),
+    }
+
+    endpoint_to_station_api_route_specs: dict[Callable[..., Any], APIRouteSpecs] = {
+        get_stations: APIRouteSpecs(
+            path="/stations",
+            summary="List weather stations whose rainfall data can be requested.",
+            description="Every rainfall, year, graph, csv and job route takes a `station` parameter. <br>"
+            "Data of a station is loaded upon first request for it; "
+            "beyond memory budget set in configuration, least recently requested stations are unloaded.",
+            response_model=list[StationModel],
+            tags=["Station"],
+        ),
+    }
+
+    endpoint_to_admin_api_route_specs: dict[Callable[..., Any], APIRouteSpecs] = {
+        reload_dataset: APIRouteSpecs(
+            path="/admin/reload",
+            summary="Reload rainfall data without restarting API.",
+            description="Token set in configuration is expected in `X-Admin-Token` header. <br>"
+            "New data is loaded in background and validated, then swapped in along with available years; "
+            "requests in progress are served upon former data. <br>"
+            "If data has changed, responses are cached again under its new version.",
+            response_model=ReloadModel,
+            methods=["POST"],
+            tags=["Admin"],
+        ),
+        update_dataset: APIRouteSpecs(
+            path="/admin/update",
+            summary="Patch or append years of rainfall data without reloading it.",
+            description="Token set in configuration is expected in `X-Admin-Token` header. <br>"
+            "Body lists rows of raw data: years either already available, e.g. the current year once revised, "
+            "or following the last one. Only these rows are loaded, then updated data is validated and swapped in. <br>"
+            "Cached responses about years that have not changed are kept.",
+            response_model=ReloadModel,
+            methods=["POST"],
+            tags=["Admin"],
+        ),
+    }
+
     return {
         **endpoint_to_rainfall_api_route_specs,
         **endpoint_to_year_api_route_specs,
         **endpoint_to_graph_api_route_specs,
         **endpoint_to_csv_api_route_specs,
+        **endpoint_to_job_api_route_specs,
+        **endpoint_to_health_api_route_specs,
+        **endpoint_to_station_api_route_specs,
+        **endpoint_to_admin_api_route_specs,
     }
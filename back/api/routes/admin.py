@@ -0,0 +1,53 @@
+import asyncio
+import hmac
+from typing import Annotated
+
+from fastapi import Header, HTTPException, Request
+
+from back.api.dataset import RawRainfallRow, ReloadModel
+from back.api.routes import Station, station_registry
+
+
+def check_admin_token(x_admin_token: str | None) -> None:
+    from back.api.config import Config
+
+    admin_token = Config().get_api_settings.reload.admin_token
+    if admin_token is None:
+        raise HTTPException(
+            status_code=403, detail="Reloading data through API is disabled."
+        )
+
+    if x_admin_token is None or not hmac.compare_digest(x_admin_token, admin_token):
+        raise HTTPException(status_code=401, detail="Invalid admin token.")
+
+
+async def reload_dataset(
+    request: Request,
+    station: Station = None,
+    x_admin_token: Annotated[str | None, Header()] = None,
+) -> ReloadModel:
+    check_admin_token(x_admin_token)
+
+    rainfall_dataset = await station_registry.get_async(station)
+    # Requests keep on being served upon former data while new data is loaded
+    reload = await asyncio.to_thread(rainfall_dataset.reload)
+    if reload.reloaded:
+        request.app.on_dataset_reloaded(reload)
+
+    return reload
+
+
+async def update_dataset(
+    request: Request,
+    rows: list[RawRainfallRow],
+    station: Station = None,
+    x_admin_token: Annotated[str | None, Header()] = None,
+) -> ReloadModel:
+    check_admin_token(x_admin_token)
+
+    rainfall_dataset = await station_registry.get_async(station)
+    reload = await asyncio.to_thread(rainfall_dataset.apply_update, rows)
+    if reload.reloaded:
+        request.app.on_dataset_reloaded(reload)
+
+    return reload
@@ -4,9 +4,9 @@ from fastapi import Query
 from starlette.responses import StreamingResponse
 
 from back.api.routes import (
-    MAX_YEAR_AVAILABLE,
-    MIN_YEAR_AVAILABLE,
-    all_rainfall,
+    NormalYearAvailable,
+    StationSnapshot,
+    YearAvailable,
 )
 from back.api.utils import (
     raise_time_mode_error_or_do_nothing,
@@ -17,19 +17,19 @@ from back.rainfall.utils import Month, Season, TimeMode
 
 def get_rainfall_by_year_as_csv(
     time_mode: TimeMode,
-    begin_year: Annotated[int, Query(ge=MIN_YEAR_AVAILABLE, le=MAX_YEAR_AVAILABLE)],
-    end_year: Annotated[int, Query(ge=MIN_YEAR_AVAILABLE, le=MAX_YEAR_AVAILABLE)]
-    | None = None,
+    snapshot: StationSnapshot,
+    begin_year: YearAvailable,
+    end_year: YearAvailable | None = None,
     month: Month | None = None,
     season: Season | None = None,
 ):
     if end_year is None:
-        end_year = MAX_YEAR_AVAILABLE
+        end_year = snapshot.max_year
 
     raise_year_related_error_or_do_nothing(begin_year, end_year)
     raise_time_mode_error_or_do_nothing(time_mode, month, season)
 
-    csv_str = all_rainfall.export_as_csv(
+    csv_str = snapshot.all_rainfall.export_as_csv(
         time_mode,
         begin_year=begin_year,
         end_year=end_year,
@@ -44,7 +44,32 @@ def get_rainfall_by_year_as_csv(
         filename = f"{filename}_{season.value}"  # type: ignore
 
     return StreamingResponse(
-        iter(csv_str),
+        iter(csv_str),  # type: ignore
         headers={"Content-Disposition": f'inline; filename="{filename}.csv"'},
         media_type="text/csv",
     )
+
+
+def get_standardized_precipitation_index_as_csv(
+    snapshot: StationSnapshot,
+    normal_year: NormalYearAvailable,
+    begin_year: YearAvailable,
+    end_year: YearAvailable | None = None,
+    months: Annotated[int, Query(ge=1, le=48)] = 3,
+):
+    if end_year is None:
+        end_year = snapshot.max_year
+
+    raise_year_related_error_or_do_nothing(begin_year, end_year)
+
+    csv_str = snapshot.all_rainfall.get_standardized_precipitation_index(
+        months, normal_year=normal_year, begin_year=begin_year, end_year=end_year
+    ).to_csv(index=False)
+
+    return StreamingResponse(
+        iter(csv_str),
+        headers={
+            "Content-Disposition": f'inline; filename="spi_{months}_{begin_year}_{end_year}.csv"'
+        },
+        media_type="text/csv",
+    )
@@ -3,42 +3,54 @@ from typing import Annotated
 from fastapi import HTTPException, Query
 
 from back.api.routes import (
-    MAX_NORMAL_YEAR_AVAILABLE,
-    MAX_YEAR_AVAILABLE,
-    MIN_YEAR_AVAILABLE,
-    all_rainfall,
+    NormalYearAvailable,
+    StationSnapshot,
+    Window,
+    YearAvailable,
+    response_cache,
 )
 from back.api.utils import (
+    get_month_window,
     raise_time_mode_error_or_do_nothing,
     raise_year_related_error_or_do_nothing,
 )
 from back.rainfall.utils import Label, Month, Season, TimeMode
 
 
+@response_cache.cached
 def get_rainfall_by_year_as_plotly_json(
     time_mode: TimeMode,
-    begin_year: Annotated[int, Query(ge=MIN_YEAR_AVAILABLE, le=MAX_YEAR_AVAILABLE)],
-    end_year: Annotated[int, Query(ge=MIN_YEAR_AVAILABLE, le=MAX_YEAR_AVAILABLE)]
-    | None = None,
+    snapshot: StationSnapshot,
+    begin_year: YearAvailable,
+    end_year: YearAvailable | None = None,
     month: Month | None = None,
     season: Season | None = None,
+    window: Window = None,
     plot_average: bool = False,
     plot_linear_regression: bool = False,
+    plot_change_points: bool = False,
+    penalty_factor: Annotated[float, Query(gt=0)] = 1.0,
+    max_points: Annotated[int, Query(ge=4)] | None = None,
 ):
     if end_year is None:
-        end_year = MAX_YEAR_AVAILABLE
+        end_year = snapshot.max_year
 
     raise_year_related_error_or_do_nothing(begin_year, end_year)
-    raise_time_mode_error_or_do_nothing(time_mode, month, season)
+    month_window = get_month_window(window)
+    raise_time_mode_error_or_do_nothing(time_mode, month, season, month_window)
 
-    figure = all_rainfall.get_bar_figure_of_rainfall_according_to_year(
+    figure = snapshot.all_rainfall.get_bar_figure_of_rainfall_according_to_year(
         time_mode,
         begin_year=begin_year,
         end_year=end_year,
         month=month,
         season=season,
+        window=month_window,
         plot_average=plot_average,
         plot_linear_regression=plot_linear_regression,
+        plot_change_points=plot_change_points,
+        penalty_factor=penalty_factor,
+        max_points=max_points,
     )
     if figure is None:
         raise HTTPException(
@@ -50,11 +62,12 @@ def get_rainfall_by_year_as_plotly_json(
     return figure.to_json()
 
 
+@response_cache.cached
 def get_rainfall_averages_as_plotly_json(
     time_mode: TimeMode,
-    begin_year: Annotated[int, Query(ge=MIN_YEAR_AVAILABLE, le=MAX_YEAR_AVAILABLE)],
-    end_year: Annotated[int, Query(ge=MIN_YEAR_AVAILABLE, le=MAX_YEAR_AVAILABLE)]
-    | None = None,
+    snapshot: StationSnapshot,
+    begin_year: YearAvailable,
+    end_year: YearAvailable | None = None,
 ):
     if time_mode == TimeMode.YEARLY:
         raise HTTPException(
@@ -63,20 +76,21 @@ def get_rainfall_averages_as_plotly_json(
         )
 
     if end_year is None:
-        end_year = MAX_YEAR_AVAILABLE
+        end_year = snapshot.max_year
 
     raise_year_related_error_or_do_nothing(begin_year, end_year)
 
-    return all_rainfall.get_bar_figure_of_rainfall_averages(
+    return snapshot.all_rainfall.get_bar_figure_of_rainfall_averages(
         time_mode=time_mode, begin_year=begin_year, end_year=end_year
-    ).to_json()
+    ).to_json()  # type: ignore
 
 
+@response_cache.cached
 def get_rainfall_linreg_slopes_as_plotly_json(
     time_mode: TimeMode,
-    begin_year: Annotated[int, Query(ge=MIN_YEAR_AVAILABLE, le=MAX_YEAR_AVAILABLE)],
-    end_year: Annotated[int, Query(ge=MIN_YEAR_AVAILABLE, le=MAX_YEAR_AVAILABLE)]
-    | None = None,
+    snapshot: StationSnapshot,
+    begin_year: YearAvailable,
+    end_year: YearAvailable | None = None,
 ):
     if time_mode == TimeMode.YEARLY:
         raise HTTPException(
@@ -85,23 +99,67 @@ def get_rainfall_linreg_slopes_as_plotly_json(
         )
 
     if end_year is None:
-        end_year = MAX_YEAR_AVAILABLE
+        end_year = snapshot.max_year
 
     raise_year_related_error_or_do_nothing(begin_year, end_year)
 
-    return all_rainfall.get_bar_figure_of_rainfall_linreg_slopes(
+    return snapshot.all_rainfall.get_bar_figure_of_rainfall_linreg_slopes(
         time_mode=time_mode, begin_year=begin_year, end_year=end_year
+    ).to_json()  # type: ignore
+
+
+@response_cache.cached
+def get_rainfall_linreg_slope_matrix_as_plotly_json(
+    time_mode: TimeMode,
+    snapshot: StationSnapshot,
+    begin_year: YearAvailable,
+    end_year: YearAvailable | None = None,
+    month: Month | None = None,
+    season: Season | None = None,
+    window: Window = None,
+):
+    if end_year is None:
+        end_year = snapshot.max_year
+
+    raise_year_related_error_or_do_nothing(begin_year, end_year)
+    month_window = get_month_window(window)
+    raise_time_mode_error_or_do_nothing(time_mode, month, season, month_window)
+
+    return snapshot.all_rainfall.get_heatmap_figure_of_rainfall_linreg_slopes(
+        time_mode,
+        begin_year=begin_year,
+        end_year=end_year,
+        month=month,
+        season=season,
+        window=month_window,
+    ).to_json()  # type: ignore
+
+
+@response_cache.cached
+def get_standardized_precipitation_index_as_plotly_json(
+    snapshot: StationSnapshot,
+    normal_year: NormalYearAvailable,
+    begin_year: YearAvailable,
+    end_year: YearAvailable | None = None,
+    months: Annotated[int, Query(ge=1, le=48)] = 3,
+):
+    if end_year is None:
+        end_year = snapshot.max_year
+
+    raise_year_related_error_or_do_nothing(begin_year, end_year)
+
+    return snapshot.all_rainfall.get_bar_figure_of_standardized_precipitation_index(
+        months, normal_year=normal_year, begin_year=begin_year, end_year=end_year
     ).to_json()
 
 
+@response_cache.cached
 def get_relative_distances_to_normal_as_plotly_json(
     time_mode: TimeMode,
-    normal_year: Annotated[
-        int, Query(ge=MIN_YEAR_AVAILABLE, le=MAX_NORMAL_YEAR_AVAILABLE)
-    ],
-    begin_year: Annotated[int, Query(ge=MIN_YEAR_AVAILABLE, le=MAX_YEAR_AVAILABLE)],
-    end_year: Annotated[int, Query(ge=MIN_YEAR_AVAILABLE, le=MAX_YEAR_AVAILABLE)]
-    | None = None,
+    snapshot: StationSnapshot,
+    normal_year: NormalYearAvailable,
+    begin_year: YearAvailable,
+    end_year: YearAvailable | None = None,
 ):
     if time_mode == TimeMode.YEARLY:
         raise HTTPException(
@@ -110,40 +168,39 @@ def get_relative_distances_to_normal_as_plotly_json(
         )
 
     if end_year is None:
-        end_year = MAX_YEAR_AVAILABLE
+        end_year = snapshot.max_year
 
     raise_year_related_error_or_do_nothing(begin_year, end_year)
 
-    return all_rainfall.get_bar_figure_of_relative_distance_to_normal(
+    return snapshot.all_rainfall.get_bar_figure_of_relative_distance_to_normal(
         time_mode=time_mode,
         normal_year=normal_year,
         begin_year=begin_year,
         end_year=end_year,
-    ).to_json()
+    ).to_json()  # type: ignore
 
 
+@response_cache.cached
 def get_percentage_of_years_above_and_below_normal_as_plotly_json(
     time_mode: TimeMode,
-    normal_year: Annotated[
-        int, Query(ge=MIN_YEAR_AVAILABLE, le=MAX_NORMAL_YEAR_AVAILABLE)
-    ],
-    begin_year: Annotated[int, Query(ge=MIN_YEAR_AVAILABLE, le=MAX_YEAR_AVAILABLE)],
-    end_year: Annotated[int, Query(ge=MIN_YEAR_AVAILABLE, le=MAX_YEAR_AVAILABLE)]
-    | None = None,
+    snapshot: StationSnapshot,
+    normal_year: NormalYearAvailable,
+    begin_year: YearAvailable,
+    end_year: YearAvailable | None = None,
     month: Month | None = None,
     season: Season | None = None,
 ):
     if end_year is None:
-        end_year = MAX_YEAR_AVAILABLE
+        end_year = snapshot.max_year
 
     raise_year_related_error_or_do_nothing(begin_year, end_year)
     raise_time_mode_error_or_do_nothing(time_mode, month, season)
 
-    return all_rainfall.get_pie_figure_of_years_above_and_below_normal(
+    return snapshot.all_rainfall.get_pie_figure_of_years_above_and_below_normal(
         time_mode=time_mode,
         normal_year=normal_year,
         begin_year=begin_year,
         end_year=end_year,
         month=month,
         season=season,
-    ).to_json()
+    ).to_json()  # type: ignore
@@ -0,0 +1,18 @@
+from fastapi import Response
+
+from back.api.cache import ReadinessModel
+from back.api.routes import cache_warmer, rainfall_dataset, response_cache
+
+
+async def get_readiness(response: Response) -> ReadinessModel:
+    if not cache_warmer.is_ready:
+        response.status_code = 503
+
+    return ReadinessModel(
+        ready=cache_warmer.is_ready,
+        dataset_version=rainfall_dataset.snapshot.version,
+        warmed_up_queries=cache_warmer.warmed_up_queries,
+        failed_queries=cache_warmer.failed_queries,
+        total_queries=len(cache_warmer.queries),
+        cached_responses=len(response_cache),
+    )
@@ -0,0 +1,27 @@
+from fastapi import HTTPException
+
+from back.api.jobs import JobModel, JobRequest
+from back.api.routes import StationSnapshot, job_manager
+from back.api.utils import raise_time_mode_error_or_do_nothing
+
+
+async def submit_job(job_request: JobRequest, snapshot: StationSnapshot) -> JobModel:
+    raise_time_mode_error_or_do_nothing(
+        job_request.time_mode, job_request.month, job_request.season
+    )
+
+    return job_manager.submit(job_request, all_rainfall=snapshot.all_rainfall)
+
+
+async def get_job(job_id: str) -> JobModel:
+    if (job := job_manager.get(job_id)) is None:
+        raise HTTPException(status_code=404, detail=f"No job found with {job_id=}.")
+
+    return job
+
+
+async def cancel_job(job_id: str) -> JobModel:
+    if (job := job_manager.cancel(job_id)) is None:
+        raise HTTPException(status_code=404, detail=f"No job found with {job_id=}.")
+
+    return job
@@ -1,106 +1,176 @@
+import asyncio
 from typing import Annotated
 
 from fastapi import Query
+from pydantic import PositiveFloat
 
 from back.api.routes import (
-    MAX_NORMAL_YEAR_AVAILABLE,
-    MAX_YEAR_AVAILABLE,
-    MIN_YEAR_AVAILABLE,
-    all_rainfall,
+    NormalYearAvailable,
+    Replicates,
+    StationSnapshot,
+    Window,
+    YearAvailable,
+    get_bootstrap_executor,
+    response_cache,
 )
 from back.api.utils import (
     RainfallModel,
+    ReturnLevelModel,
+    SegmentModel,
+    TrendModel,
+    get_confidence_interval_bounds,
+    get_month_window,
+    get_time_mode_of_key,
     raise_time_mode_error_or_do_nothing,
     raise_year_related_error_or_do_nothing,
 )
-from back.rainfall.utils import Month, Season, TimeMode
+from back.rainfall.utils import Label, Month, Season, TimeMode
+from back.rainfall.utils.bootstrap import Statistic
+from back.rainfall.utils.extremes import Distribution
 
 
+@response_cache.cached
 async def get_rainfall_average(
     time_mode: TimeMode,
-    begin_year: Annotated[int, Query(ge=MIN_YEAR_AVAILABLE, le=MAX_YEAR_AVAILABLE)],
-    end_year: Annotated[int, Query(ge=MIN_YEAR_AVAILABLE, le=MAX_YEAR_AVAILABLE)]
-    | None = None,
+    snapshot: StationSnapshot,
+    begin_year: YearAvailable,
+    end_year: YearAvailable | None = None,
     month: Month | None = None,
     season: Season | None = None,
+    window: Window = None,
+    ci: bool = False,
+    replicates: Replicates = 1000,
 ):
     if end_year is None:
-        end_year = MAX_YEAR_AVAILABLE
+        end_year = snapshot.max_year
 
     raise_year_related_error_or_do_nothing(begin_year, end_year)
-    raise_time_mode_error_or_do_nothing(time_mode, month, season)
+    month_window = get_month_window(window)
+    raise_time_mode_error_or_do_nothing(time_mode, month, season, month_window)
 
-    rainfall_average = all_rainfall.get_rainfall_average(
+    rainfall_average = snapshot.all_rainfall.get_rainfall_average(
         time_mode,
         begin_year=begin_year,
         end_year=end_year,
         month=month,
         season=season,
+        window=month_window,
     )
 
+    lower_bound = upper_bound = None
+    if ci:
+        lower_bound, upper_bound = get_confidence_interval_bounds(
+            await asyncio.to_thread(
+                snapshot.all_rainfall.get_confidence_interval,
+                Statistic.AVERAGE,
+                time_mode,
+                begin_year=begin_year,
+                end_year=end_year,
+                month=month,
+                season=season,
+                window=month_window,
+                replicates=replicates,
+                executor=get_bootstrap_executor(replicates),
+            )
+        )
+
     return RainfallModel(
         name="rainfall average (mm)",
         value=rainfall_average,  # type: ignore
+        lower_bound=lower_bound,
+        upper_bound=upper_bound,
         begin_year=begin_year,
         end_year=end_year,
         time_mode=time_mode,
         month=month if time_mode == TimeMode.MONTHLY else None,
-        season=season if time_mode == TimeMode.SEASONAL else None,
+        season=season if time_mode == TimeMode.SEASONAL and not month_window else None,
+        window=str(month_window)
+        if time_mode == TimeMode.SEASONAL and month_window
+        else None,
     )
 
 
+@response_cache.cached
 async def get_rainfall_normal(
     time_mode: TimeMode,
-    begin_year: Annotated[
-        int, Query(ge=MIN_YEAR_AVAILABLE, le=MAX_NORMAL_YEAR_AVAILABLE)
-    ],
+    snapshot: StationSnapshot,
+    begin_year: NormalYearAvailable,
     month: Month | None = None,
     season: Season | None = None,
+    window: Window = None,
+    ci: bool = False,
+    replicates: Replicates = 1000,
 ):
-    raise_time_mode_error_or_do_nothing(time_mode, month, season)
+    month_window = get_month_window(window)
+    raise_time_mode_error_or_do_nothing(time_mode, month, season, month_window)
 
-    normal = all_rainfall.get_normal(
+    normal = snapshot.all_rainfall.get_normal(
         time_mode,
         begin_year=begin_year,
         month=month,
         season=season,
+        window=month_window,
     )
 
+    lower_bound = upper_bound = None
+    if ci:
+        lower_bound, upper_bound = get_confidence_interval_bounds(
+            await asyncio.to_thread(
+                snapshot.all_rainfall.get_confidence_interval,
+                Statistic.AVERAGE,
+                time_mode,
+                begin_year=begin_year,
+                end_year=begin_year + 29,
+                month=month,
+                season=season,
+                window=month_window,
+                replicates=replicates,
+                executor=get_bootstrap_executor(replicates),
+            )
+        )
+
     return RainfallModel(
         name="rainfall normal (mm)",
         value=normal,  # type: ignore
+        lower_bound=lower_bound,
+        upper_bound=upper_bound,
         begin_year=begin_year,
         end_year=begin_year + 29,
         time_mode=time_mode,
         month=month if time_mode == TimeMode.MONTHLY else None,
-        season=season if time_mode == TimeMode.SEASONAL else None,
+        season=season if time_mode == TimeMode.SEASONAL and not month_window else None,
+        window=str(month_window)
+        if time_mode == TimeMode.SEASONAL and month_window
+        else None,
     )
 
 
+@response_cache.cached
 async def get_rainfall_relative_distance_to_normal(
     time_mode: TimeMode,
-    begin_year: Annotated[int, Query(ge=MIN_YEAR_AVAILABLE, le=MAX_YEAR_AVAILABLE)],
-    normal_year: Annotated[
-        int, Query(ge=MIN_YEAR_AVAILABLE, le=MAX_NORMAL_YEAR_AVAILABLE)
-    ],
-    end_year: Annotated[int, Query(ge=MIN_YEAR_AVAILABLE, le=MAX_YEAR_AVAILABLE)]
-    | None = None,
+    snapshot: StationSnapshot,
+    begin_year: YearAvailable,
+    normal_year: NormalYearAvailable,
+    end_year: YearAvailable | None = None,
     month: Month | None = None,
     season: Season | None = None,
+    window: Window = None,
 ):
     if end_year is None:
-        end_year = MAX_YEAR_AVAILABLE
+        end_year = snapshot.max_year
 
     raise_year_related_error_or_do_nothing(begin_year, end_year)
-    raise_time_mode_error_or_do_nothing(time_mode, month, season)
+    month_window = get_month_window(window)
+    raise_time_mode_error_or_do_nothing(time_mode, month, season, month_window)
 
-    relative_distance_to_normal = all_rainfall.get_relative_distance_to_normal(
+    relative_distance_to_normal = snapshot.all_rainfall.get_relative_distance_to_normal(
         time_mode,
         normal_year=normal_year,
         begin_year=begin_year,
         end_year=end_year,
         month=month,
         season=season,
+        window=month_window,
     )
 
     return RainfallModel(
@@ -111,31 +181,38 @@ async def get_rainfall_relative_distance_to_normal(
         end_year=end_year,
         time_mode=time_mode,
         month=month if time_mode == TimeMode.MONTHLY else None,
-        season=season if time_mode == TimeMode.SEASONAL else None,
+        season=season if time_mode == TimeMode.SEASONAL and not month_window else None,
+        window=str(month_window)
+        if time_mode == TimeMode.SEASONAL and month_window
+        else None,
     )
 
 
+@response_cache.cached
 async def get_rainfall_standard_deviation(
     time_mode: TimeMode,
-    begin_year: Annotated[int, Query(ge=MIN_YEAR_AVAILABLE, le=MAX_YEAR_AVAILABLE)],
-    end_year: Annotated[int, Query(ge=MIN_YEAR_AVAILABLE, le=MAX_YEAR_AVAILABLE)]
-    | None = None,
+    snapshot: StationSnapshot,
+    begin_year: YearAvailable,
+    end_year: YearAvailable | None = None,
     month: Month | None = None,
     season: Season | None = None,
+    window: Window = None,
     weigh_by_average: bool = False,
 ):
     if end_year is None:
-        end_year = MAX_YEAR_AVAILABLE
+        end_year = snapshot.max_year
 
     raise_year_related_error_or_do_nothing(begin_year, end_year)
-    raise_time_mode_error_or_do_nothing(time_mode, month, season)
+    month_window = get_month_window(window)
+    raise_time_mode_error_or_do_nothing(time_mode, month, season, month_window)
 
-    rainfall_standard_deviation = all_rainfall.get_rainfall_standard_deviation(
+    rainfall_standard_deviation = snapshot.all_rainfall.get_rainfall_standard_deviation(
         time_mode,
         begin_year=begin_year,
         end_year=end_year,
         month=month,
         season=season,
+        window=month_window,
         weigh_by_average=weigh_by_average,
     )
 
@@ -146,5 +223,165 @@ async def get_rainfall_standard_deviation(
         end_year=end_year,
         time_mode=time_mode,
         month=month if time_mode == TimeMode.MONTHLY else None,
-        season=season if time_mode == TimeMode.SEASONAL else None,
+        season=season if time_mode == TimeMode.SEASONAL and not month_window else None,
+        window=str(month_window)
+        if time_mode == TimeMode.SEASONAL and month_window
+        else None,
+    )
+
+
+@response_cache.cached
+async def get_rainfall_trends(
+    snapshot: StationSnapshot,
+    begin_year: YearAvailable,
+    end_year: YearAvailable | None = None,
+    time_mode: TimeMode | None = None,
+    ci: bool = False,
+    replicates: Replicates = 1000,
+):
+    if end_year is None:
+        end_year = snapshot.max_year
+
+    raise_year_related_error_or_do_nothing(begin_year, end_year)
+
+    trend_tests = snapshot.all_rainfall.get_trend_tests(begin_year, end_year)
+    trend_tests = trend_tests.astype(object).where(trend_tests.notna(), None)
+
+    def get_linear_regression_confidence_intervals():
+        rainfall_models = snapshot.all_rainfall.get_rainfall_models()
+
+        return {
+            key: model.get_confidence_interval(
+                Statistic.LINEAR_REGRESSION,
+                begin_year,
+                end_year,
+                replicates=replicates,
+                executor=get_bootstrap_executor(replicates),
+            )
+            for key, model in rainfall_models.items()
+        }
+
+    confidence_intervals = (
+        await asyncio.to_thread(get_linear_regression_confidence_intervals)
+        if ci
+        else {}
+    )
+
+    trends: list[TrendModel] = []
+    for key, trend in trend_tests.iterrows():
+        key_time_mode = get_time_mode_of_key(key)  # type: ignore
+        if time_mode is not None and key_time_mode != time_mode:
+            continue
+
+        lower_bound, upper_bound = get_confidence_interval_bounds(
+            confidence_intervals.get(key)
+        )
+        trends.append(
+            TrendModel(
+                begin_year=begin_year,
+                end_year=end_year,
+                time_mode=key_time_mode,
+                month=Month(key) if key_time_mode == TimeMode.MONTHLY else None,
+                season=Season(key) if key_time_mode == TimeMode.SEASONAL else None,
+                linear_regression_slope=trend[Label.LINEAR_REGRESSION.value],
+                linear_regression_lower_bound=lower_bound,
+                linear_regression_upper_bound=upper_bound,
+                sens_slope=trend[Label.SENS_SLOPE.value],
+                mann_kendall_z_score=trend[Label.MANN_KENDALL_Z_SCORE.value],
+                p_value=trend[Label.P_VALUE.value],
+            )
+        )
+
+    return trends
+
+
+@response_cache.cached
+async def get_rainfall_change_points(
+    snapshot: StationSnapshot,
+    begin_year: YearAvailable,
+    end_year: YearAvailable | None = None,
+    time_mode: TimeMode | None = None,
+    penalty_factor: Annotated[list[PositiveFloat], Query()] = [1.0],
+):
+    if end_year is None:
+        end_year = snapshot.max_year
+
+    raise_year_related_error_or_do_nothing(begin_year, end_year)
+
+    segments = snapshot.all_rainfall.get_change_points(
+        begin_year, end_year, penalty_factors=tuple(penalty_factor)
+    )
+
+    segment_models: list[SegmentModel] = []
+    for key, segment in zip(segments.index, segments.itertuples(index=False)):
+        key_time_mode = get_time_mode_of_key(key)
+        if time_mode is not None and key_time_mode != time_mode:
+            continue
+
+        segment_models.append(
+            SegmentModel(
+                begin_year=segment[1],
+                end_year=segment[2],
+                average_rainfall=segment[3],
+                penalty_factor=segment[0],
+                time_mode=key_time_mode,
+                month=Month(key) if key_time_mode == TimeMode.MONTHLY else None,
+                season=Season(key) if key_time_mode == TimeMode.SEASONAL else None,
+            )
+        )
+
+    return segment_models
+
+
+@response_cache.cached
+def get_rainfall_return_levels(
+    time_mode: TimeMode,
+    snapshot: StationSnapshot,
+    begin_year: YearAvailable,
+    end_year: YearAvailable | None = None,
+    month: Month | None = None,
+    season: Season | None = None,
+    window: Window = None,
+    distribution: Distribution = Distribution.GEV,
+    replicates: Replicates = 1000,
+):
+    if end_year is None:
+        end_year = snapshot.max_year
+
+    raise_year_related_error_or_do_nothing(begin_year, end_year)
+    month_window = get_month_window(window)
+    raise_time_mode_error_or_do_nothing(time_mode, month, season, month_window)
+
+    return_levels = snapshot.all_rainfall.get_return_levels(
+        time_mode,
+        begin_year=begin_year,
+        end_year=end_year,
+        month=month,
+        season=season,
+        window=month_window,
+        distribution=distribution,
+        replicates=replicates,
+        executor=get_bootstrap_executor(replicates),
     )
+    return_levels = return_levels.astype(object).where(return_levels.notna(), None)  # type: ignore
+
+    return [
+        ReturnLevelModel(
+            return_period=return_level[Label.RETURN_PERIOD.value],
+            return_level=return_level[Label.RETURN_LEVEL.value],
+            lower_bound=return_level[Label.LOWER_BOUND.value],
+            upper_bound=return_level[Label.UPPER_BOUND.value],
+            distribution=distribution,
+            begin_year=begin_year,
+            end_year=end_year,
+            time_mode=time_mode,
+            month=month if time_mode == TimeMode.MONTHLY else None,
+            season=season
+            if time_mode == TimeMode.SEASONAL and not month_window
+            else None,
+            window=str(month_window)
+            if time_mode == TimeMode.SEASONAL and month_window
+            else None,
+        )
+        for _, return_level in return_levels.iterrows()
+    ]
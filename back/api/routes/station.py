@@ -0,0 +1,6 @@
+from back.api.routes import station_registry
+from back.api.stations import StationModel
+
+
+async def get_stations() -> list[StationModel]:
+    return station_registry.get_station_models()
@@ -1,45 +1,45 @@
-from typing import Annotated
-
-from fastapi import Query
-
 from back.api.routes import (
-    MAX_NORMAL_YEAR_AVAILABLE,
-    MAX_YEAR_AVAILABLE,
-    MIN_YEAR_AVAILABLE,
-    all_rainfall,
+    NormalYearAvailable,
+    StationSnapshot,
+    Window,
+    YearAvailable,
+    response_cache,
 )
 from back.api.utils import (
     RainfallModel,
+    get_month_window,
     raise_time_mode_error_or_do_nothing,
     raise_year_related_error_or_do_nothing,
 )
 from back.rainfall.utils import Month, Season, TimeMode
 
 
+@response_cache.cached
 async def get_years_below_normal(
     time_mode: TimeMode,
-    normal_year: Annotated[
-        int, Query(ge=MIN_YEAR_AVAILABLE, le=MAX_NORMAL_YEAR_AVAILABLE)
-    ],
-    begin_year: Annotated[int, Query(ge=MIN_YEAR_AVAILABLE, le=MAX_YEAR_AVAILABLE)],
-    end_year: Annotated[int, Query(ge=MIN_YEAR_AVAILABLE, le=MAX_YEAR_AVAILABLE)]
-    | None = None,
+    snapshot: StationSnapshot,
+    normal_year: NormalYearAvailable,
+    begin_year: YearAvailable,
+    end_year: YearAvailable | None = None,
     month: Month | None = None,
     season: Season | None = None,
+    window: Window = None,
 ):
     if end_year is None:
-        end_year = MAX_YEAR_AVAILABLE
+        end_year = snapshot.max_year
 
     raise_year_related_error_or_do_nothing(begin_year, end_year)
-    raise_time_mode_error_or_do_nothing(time_mode, month, season)
+    month_window = get_month_window(window)
+    raise_time_mode_error_or_do_nothing(time_mode, month, season, month_window)
 
-    years_below_normal = all_rainfall.get_years_below_normal(
+    years_below_normal = snapshot.all_rainfall.get_years_below_normal(
         time_mode,
         normal_year=normal_year,
         begin_year=begin_year,
         end_year=end_year,
         month=month,
         season=season,
+        window=month_window,
     )
 
     return RainfallModel(
@@ -50,34 +50,39 @@ async def get_years_below_normal(
         end_year=end_year,
         time_mode=time_mode,
         month=month if time_mode == TimeMode.MONTHLY else None,
-        season=season if time_mode == TimeMode.SEASONAL else None,
+        season=season if time_mode == TimeMode.SEASONAL and not month_window else None,
+        window=str(month_window)
+        if time_mode == TimeMode.SEASONAL and month_window
+        else None,
     )
 
 
+@response_cache.cached
 async def get_years_above_normal(
     time_mode: TimeMode,
-    normal_year: Annotated[
-        int, Query(ge=MIN_YEAR_AVAILABLE, le=MAX_NORMAL_YEAR_AVAILABLE)
-    ],
-    begin_year: Annotated[int, Query(ge=MIN_YEAR_AVAILABLE, le=MAX_YEAR_AVAILABLE)],
-    end_year: Annotated[int, Query(ge=MIN_YEAR_AVAILABLE, le=MAX_YEAR_AVAILABLE)]
-    | None = None,
+    snapshot: StationSnapshot,
+    normal_year: NormalYearAvailable,
+    begin_year: YearAvailable,
+    end_year: YearAvailable | None = None,
     month: Month | None = None,
     season: Season | None = None,
+    window: Window = None,
 ):
     if end_year is None:
-        end_year = MAX_YEAR_AVAILABLE
+        end_year = snapshot.max_year
 
     raise_year_related_error_or_do_nothing(begin_year, end_year)
-    raise_time_mode_error_or_do_nothing(time_mode, month, season)
+    month_window = get_month_window(window)
+    raise_time_mode_error_or_do_nothing(time_mode, month, season, month_window)
 
-    years_above_normal = all_rainfall.get_years_above_normal(
+    years_above_normal = snapshot.all_rainfall.get_years_above_normal(
         time_mode,
         normal_year=normal_year,
         begin_year=begin_year,
         end_year=end_year,
         month=month,
         season=season,
+        window=month_window,
     )
 
     return RainfallModel(
@@ -88,5 +93,8 @@ async def get_years_above_normal(
         end_year=end_year,
         time_mode=time_mode,
         month=month if time_mode == TimeMode.MONTHLY else None,
-        season=season if time_mode == TimeMode.SEASONAL else None,
+        season=season if time_mode == TimeMode.SEASONAL and not month_window else None,
+        window=str(month_window)
+        if time_mode == TimeMode.SEASONAL and month_window
+        else None,
     )
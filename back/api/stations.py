@@ -0,0 +1,195 @@
+"""
+Provides a registry of weather stations served by the API, each one holding its own rainfall dataset.
+
+Datasets are loaded upon first request for their station.
+Beyond a memory budget, least recently used stations are unloaded, except the default one:
+they are loaded again upon next request.
+"""
+
+import asyncio
+import threading
+from collections import OrderedDict
+from typing import Callable
+
+from fastapi import HTTPException
+from pydantic import BaseModel
+
+from back.api.config import APISettings
+from back.api.dataset import RainfallDataset
+
+
+class StationModel(BaseModel):
+    """
+    Model for depicting a weather station and whether its rainfall data is loaded.
+    """
+
+    station: str
+    default: bool
+    loaded: bool
+    dataset_version: str | None = None
+    min_year: int | None = None
+    max_year: int | None = None
+    memory_bytes: int | None = None
+
+
+class StationRegistry:
+    """
+    Maps weather stations to their rainfall datasets, loaded lazily and unloaded in LRU order
+    once their total memory exceeds a budget. Default station is loaded at once and never unloaded.
+    Requests still using the snapshot of an unloaded station finish upon it.
+    """
+
+    def __init__(
+        self,
+        stations: list[str],
+        *,
+        default_station: str,
+        load_dataset: Callable[[str], RainfallDataset],
+        memory_budget: int | None = None,
+    ):
+        if default_station not in stations:
+            raise ValueError(f"Default station '{default_station}' is not a station.")
+
+        self.stations = stations
+        self.default_station = default_station
+        self.load_dataset = load_dataset
+        self.memory_budget = memory_budget
+        self.evictions = 0
+        self._datasets: OrderedDict[str, RainfallDataset] = OrderedDict()
+        self._memory_bytes: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._loading_locks = {station: threading.Lock() for station in stations}
+
+        self.get(default_station)
+
+    @classmethod
+    def from_config(cls, config_: APISettings | None = None):
+        if config_ is None:
+            from back.api.config import Config
+
+            config_ = Config().get_api_settings
+
+        from back.rainfall.config import Config as RainfallConfig
+
+        memory_budget_mb = config_.stations.memory_budget_mb
+
+        return cls(
+            list(RainfallConfig().get_stations_settings),
+            default_station=RainfallConfig().get_data_settings.station,
+            load_dataset=lambda station: RainfallDataset.from_config(
+                config_, station=station
+            ),
+            memory_budget=int(memory_budget_mb * 2**20)
+            if memory_budget_mb is not None
+            else None,
+        )
+
+    @property
+    def default_dataset(self) -> RainfallDataset:
+        """Dataset of the default station, always loaded."""
+        return self._datasets[self.default_station]
+
+    def _get_loaded(self, station: str) -> RainfallDataset | None:
+        with self._lock:
+            if (dataset := self._datasets.get(station)) is not None:
+                self._datasets.move_to_end(station)
+
+            return dataset
+
+    def get(self, station: str | None = None) -> RainfallDataset:
+        """
+        Retrieve the dataset of a station, loading it if needed.
+        Loading blocks: within the event loop, use `get_async` instead.
+
+        :param station: A station identifier (optional). If not given, default station is used.
+        :raise HTTPException: If station is unknown, or if its data cannot be loaded.
+        :return: The RainfallDataset of the station.
+        """
+        station = station or self.default_station
+        if station not in self._loading_locks:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Unknown station '{station}', it should be one of {self.stations}.",
+            )
+
+        if (dataset := self._get_loaded(station)) is not None:
+            return dataset
+
+        # Concurrent requests for a station that is not loaded wait for a single loading
+        with self._loading_locks[station]:
+            if (dataset := self._get_loaded(station)) is not None:
+                return dataset
+
+            try:
+                dataset = self.load_dataset(station)
+            except Exception as exc:
+                raise HTTPException(
+                    status_code=503,
+                    detail=f"Rainfall data of station '{station}' could not be loaded: {exc!r}",
+                )
+
+            with self._lock:
+                self._datasets[station] = dataset
+                self._evict(kept_station=station)
+
+        return dataset
+
+    async def get_async(self, station: str | None = None) -> RainfallDataset:
+        """
+        Retrieve the dataset of a station, loading it in a thread if needed.
+
+        :param station: A station identifier (optional). If not given, default station is used.
+        :raise HTTPException: If station is unknown, or if its data cannot be loaded.
+        :return: The RainfallDataset of the station.
+        """
+        if (dataset := self._get_loaded(station or self.default_station)) is not None:
+            return dataset
+
+        return await asyncio.to_thread(self.get, station)
+
+    def _evict(self, *, kept_station: str) -> None:
+        # Memory grows with derived values computed since loading: it is measured again
+        for station, dataset in self._datasets.items():
+            self._memory_bytes[station] = dataset.snapshot.all_rainfall.memory_report()[
+                "total"
+            ]
+
+        if self.memory_budget is None:
+            return
+
+        for station in list(self._datasets):
+            if sum(self._memory_bytes.values()) <= self.memory_budget:
+                break
+
+            if station not in (self.default_station, kept_station):
+                del self._datasets[station]
+                del self._memory_bytes[station]
+                self.evictions += 1
+
+    def get_station_models(self) -> list[StationModel]:
+        """
+        Describe every station, loaded or not.
+
+        :return: A list of StationModel, one per station.
+        """
+        with self._lock:
+            datasets = dict(self._datasets)
+            memory_bytes = dict(self._memory_bytes)
+
+        station_models = []
+        for station in self.stations:
+            station_model = StationModel(
+                station=station,
+                default=station == self.default_station,
+                loaded=station in datasets,
+            )
+            if (dataset := datasets.get(station)) is not None:
+                snapshot = dataset.snapshot
+                station_model.dataset_version = snapshot.version
+                station_model.min_year = snapshot.min_year
+                station_model.max_year = snapshot.max_year
+                station_model.memory_bytes = memory_bytes.get(station)
+
+            station_models.append(station_model)
+
+        return station_models
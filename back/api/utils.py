@@ -2,32 +2,132 @@
 Collection of utility functions for API purposes.
 """
 
+import asyncio
+import math
+from typing import Any, Callable
+
 from fastapi import HTTPException
 from pydantic import BaseModel
 
 from back.rainfall.utils import Month, Season, TimeMode
+from back.rainfall.utils.extremes import Distribution
+from back.rainfall.utils.month_windows import MonthWindow
 
 
 class RainfallModel(BaseModel):
     """
     Model for depicting a value linked to rainfall data.
     It could be either a float value for a rainfall value, a percentage, etc. or an integer value for years.
+    Bounds of its confidence interval are set if requested.
     """
 
     name: str
     value: float | int
+    lower_bound: float | None = None
+    upper_bound: float | None = None
     begin_year: int
     end_year: int
     normal_year: int | None = None
     time_mode: TimeMode = TimeMode.YEARLY
     month: Month | None = None
     season: Season | None = None
+    window: str | None = None
+
+
+class TrendModel(BaseModel):
+    """
+    Model for depicting trends of rainfall for a whole year, a month or a season:
+    linear regression slope, Sen's slope and Mann–Kendall trend test.
+    """
+
+    begin_year: int
+    end_year: int
+    time_mode: TimeMode = TimeMode.YEARLY
+    month: Month | None = None
+    season: Season | None = None
+    linear_regression_slope: float | None = None
+    linear_regression_lower_bound: float | None = None
+    linear_regression_upper_bound: float | None = None
+    sens_slope: float | None = None
+    mann_kendall_z_score: float | None = None
+    p_value: float | None = None
+
+
+class SegmentModel(BaseModel):
+    """
+    Model for depicting a regime of rainfall between two change points, for a whole year, a month or a season.
+    """
+
+    begin_year: int
+    end_year: int
+    average_rainfall: float
+    penalty_factor: float = 1.0
+    time_mode: TimeMode = TimeMode.YEARLY
+    month: Month | None = None
+    season: Season | None = None
+
+
+class ReturnLevelModel(BaseModel):
+    """
+    Model for depicting the return level of maximum monthly rainfall for a return period,
+    along with its confidence interval.
+    """
+
+    return_period: int
+    return_level: float | None = None
+    lower_bound: float | None = None
+    upper_bound: float | None = None
+    distribution: Distribution = Distribution.GEV
+    begin_year: int
+    end_year: int
+    time_mode: TimeMode = TimeMode.YEARLY
+    month: Month | None = None
+    season: Season | None = None
+    window: str | None = None
+
+
+def get_time_mode_of_key(key: str) -> TimeMode:
+    """
+    Retrieve time mode of a rainfall model from its key: 'yearly', a month or a season.
+
+    :param key: A string among 'yearly', Month values and Season values.
+    :return: A TimeMode Enum: ['yearly', 'monthly', 'seasonal'].
+    """
+    if key == TimeMode.YEARLY.value:
+        return TimeMode.YEARLY
+
+    if key in Month.values():
+        return TimeMode.MONTHLY
+
+    return TimeMode.SEASONAL
+
+
+def get_month_window(window: str | None) -> MonthWindow | None:
+    """
+    Parse a window of consecutive months given as query parameter.
+
+    :param window: First and last months separated by a dash, e.g. 'October-September', or a single month (optional).
+    :raise HTTPException: if a month is unknown.
+    :return: A MonthWindow, None if window is None.
+    """
+    if window is None:
+        return None
+
+    try:
+        return MonthWindow.from_string(window)
+    except ValueError:
+        raise HTTPException(
+            status_code=400,
+            detail=f"You gave {window=}, it should be one month or two months separated by a dash, "
+            f"amongst these values: {Month.values()}.",
+        )
 
 
 def raise_time_mode_error_or_do_nothing(
     time_mode: TimeMode,
     month: Month | None = None,
     season: Season | None = None,
+    window: MonthWindow | None = None,
 ):
     """
     Manage errors related to time mode issues.
@@ -37,8 +137,10 @@ def raise_time_mode_error_or_do_nothing(
     Set if time_mode is 'monthly' (optional).
     :param season: A Season Enum ['winter', 'spring', 'summer', 'fall'].
     Set if time_mode is 'seasonal' (optional).
+    :param window: A MonthWindow summed instead of a season.
+    Set if time_mode is 'seasonal' (optional).
     :raise HTTPException: if time_mode is 'monthly' and month is None or
-    if time_mode is 'seasonal' and season is None.
+    if time_mode is 'seasonal' and both season and window are None.
     :return: None.
     """
     if time_mode == TimeMode.MONTHLY and month is None:
@@ -47,10 +149,11 @@ def raise_time_mode_error_or_do_nothing(
             detail=f"You gave {time_mode=}, month cannot be null and should be one these values: {Month.values()}.",
         )
 
-    if time_mode == TimeMode.SEASONAL and season is None:
+    if time_mode == TimeMode.SEASONAL and season is None and window is None:
         raise HTTPException(
             status_code=400,
-            detail=f"You gave {time_mode=}, season cannot be null and should be one these values: {Season.values()}.",
+            detail=f"You gave {time_mode=}, season cannot be null and should be one these values: {Season.values()}, "
+            "unless window is set.",
         )
 
 
@@ -68,3 +171,82 @@ def raise_year_related_error_or_do_nothing(begin_year: int, end_year: int):
             status_code=400,
             detail=f"{begin_year=} must be lower or equal than {end_year=}.",
         )
+
+
+def get_confidence_interval_bounds(
+    confidence_interval: tuple[float, float] | None,
+) -> tuple[float | None, float | None]:
+    """
+    Convert bounds of a confidence interval into values that can be serialized as JSON.
+
+    :param confidence_interval: A tuple of floats: lower and upper bounds (optional).
+    :return: A tuple of lower and upper bounds, None if not given or NaN.
+    """
+    if confidence_interval is None:
+        return None, None
+
+    lower_bound, upper_bound = confidence_interval
+
+    return (
+        None if math.isnan(lower_bound) else lower_bound,
+        None if math.isnan(upper_bound) else upper_bound,
+    )
+
+
+async def send_get_request_in_process(
+    app: Callable[..., Any], target: str
+) -> tuple[int, int]:
+    """
+    Send a GET request to an ASGI app in-process, without any network, and read its whole response.
+
+    :param app: An ASGI app.
+    :param target: Path of the route with its query string.
+    :return: A tuple (status code, number of bytes of body).
+    """
+    path, _, query_string = target.partition("?")
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": query_string.encode(),
+        "headers": [],
+        "client": ("in-process", 0),
+        "server": ("in-process", 80),
+    }
+    status_code = 500
+    body_size = 0
+    request_sent = False
+    response_complete = asyncio.Event()
+
+    async def receive() -> dict[str, Any]:
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        # Streaming responses listen for client disconnection while sending body
+        await response_complete.wait()
+
+        return {"type": "http.disconnect"}
+
+    async def send(message: dict[str, Any]):
+        nonlocal status_code, body_size
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+        elif message["type"] == "http.response.body":
+            body_size += len(message.get("body", b""))
+            if not message.get("more_body", False):
+                response_complete.set()
+
+    try:
+        await app(scope, receive, send)
+    finally:
+        response_complete.set()
+
+    return status_code, body_size
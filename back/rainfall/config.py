@@ -10,10 +10,13 @@ from pydantic import BaseModel, Field
 
 from base_config import BaseConfig
 
+DEFAULT_STATION = "barcelona"
+
 
 class DataSettings(BaseModel):
     """Type definition for data settings."""
 
+    station: str = DEFAULT_STATION
     file_url: str
     local_file_path: str | None = Field(None)
     start_year: int
@@ -47,3 +50,38 @@ class Config(BaseConfig):
         }
         """
         return DataSettings(**self.yaml_config["data"])
+
+    @cached_property
+    def get_stations_settings(self) -> dict[str, DataSettings]:
+        """
+        Return data settings of every weather station, keyed by station identifier:
+        the station of data settings, then other stations.
+
+        Example:
+        {
+            "barcelona": {
+                "station": "barcelona",
+                "file_url": "https://opendata-ajuntament.barcelona.cat/...",
+                "local_file_path": "resources/bcn_rainfall_1786_2024.csv",
+                "start_year": 1971,
+                "rainfall_precision": 1,
+            },
+            "fabra": {
+                "station": "fabra",
+                "file_url": "https://example.org/fabra_rainfall.csv",
+                "start_year": 1971,
+                "rainfall_precision": 1,
+            },
+        }
+        """
+        data_settings = self.get_data_settings
+
+        return {
+            data_settings.station: data_settings,
+            **{
+                station: DataSettings(station=station, **settings)
+                for station, settings in (
+                    self.yaml_config.get("stations") or {}
+                ).items()
+            },
+        }
@@ -0,0 +1,208 @@
+"""
+Provides a compact store of daily rainfall, as recorded by rain gauges,
+rolled up to monthly raw data that rainfall models are loaded upon.
+
+Days are held in a single numpy array indexed by their offset from the first day, missing days being NaN:
+monthly and yearly aggregates are computed in one vectorized pass over month boundaries,
+without building any per-day Python object.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from back.rainfall.utils import DataFormatError, Label, Month
+
+DEFAULT_CHUNK_ROWS = 500_000
+# Days with at least this much rainfall (in mm) are rainy ones, as defined by the WMO
+RAINY_DAY_THRESHOLD = 1.0
+
+
+class DailyRainfall:
+    """
+    Rainfall of each day from the first day of a year to the last day of a year,
+    stored as a contiguous float array. Days without any record are NaN.
+    """
+
+    def __init__(self, days: np.ndarray, rainfall: np.ndarray):
+        days = np.asarray(days, dtype="datetime64[D]")
+        rainfall = np.asarray(rainfall, dtype=float)
+        if len(days) != len(rainfall) or not len(days):
+            raise DataFormatError("as many days as rainfall values, at least one")
+        if np.isnat(days).any():
+            raise DataFormatError("a date for every rainfall value")
+
+        first_year, last_year = (
+            days.min().astype("datetime64[Y]"),
+            days.max().astype("datetime64[Y]"),
+        )
+        self.first_day = first_year.astype("datetime64[D]")
+        self.first_year = int(first_year.astype(int)) + 1970
+        self.last_year = int(last_year.astype(int)) + 1970
+        end_day = (last_year + 1).astype("datetime64[D]")
+
+        # Later records override former ones for the same day
+        self.rainfall = np.full(int((end_day - self.first_day).astype(int)), np.nan)
+        self.rainfall[(days - self.first_day).astype(np.int64)] = rainfall
+        self.rainfall.flags.writeable = False
+
+        # Position of the first day of every month, from first year to last year
+        months = np.arange(
+            first_year.astype("datetime64[M]"),
+            (last_year + 1).astype("datetime64[M]"),
+        )
+        self.month_starts = (months.astype("datetime64[D]") - self.first_day).astype(
+            np.int64
+        )
+
+    @classmethod
+    def from_csv(cls, csv_path: str | Path, *, chunk_rows: int = DEFAULT_CHUNK_ROWS):
+        """
+        Instantiate class upon a CSV of daily rainfall, read chunk by chunk:
+        its first column holds ISO dates, its second one rainfall (in mm).
+
+        :param csv_path: Path to a CSV with a header.
+        :param chunk_rows: Number of rows parsed at once.
+        :return: A DailyRainfall instance.
+        :raise DataFormatError: If a date is missing or cannot be parsed.
+        """
+        days: list[np.ndarray] = []
+        rainfall: list[np.ndarray] = []
+        for chunk in pd.read_csv(csv_path, usecols=[0, 1], chunksize=chunk_rows):
+            try:
+                dates = pd.to_datetime(chunk.iloc[:, 0], format="ISO8601")
+            except ValueError:
+                raise DataFormatError("[Date (ISO 8601), Rainfall] (CSV)")
+            # Empty dates are parsed as NaT
+            if dates.isna().any():
+                raise DataFormatError("[Date (ISO 8601), Rainfall] (CSV)")
+
+            days.append(dates.to_numpy().astype("datetime64[D]"))
+            rainfall.append(chunk.iloc[:, 1].to_numpy(dtype=float))
+
+        return cls(np.concatenate(days), np.concatenate(rainfall))
+
+    @property
+    def days(self) -> np.ndarray:
+        """Every day of the store, as a numpy array of datetime64."""
+        return self.first_day + np.arange(len(self.rainfall))
+
+    @property
+    def years(self) -> np.ndarray:
+        return np.arange(self.first_year, self.last_year + 1)
+
+    def _reduce_by_month(self, ufunc: np.ufunc, values: np.ndarray) -> np.ndarray:
+        # Every month has days, so that no segment of reduceat is empty
+        return ufunc.reduceat(values, self.month_starts).reshape(-1, len(Month))
+
+    def get_monthly_rainfall(self) -> np.ndarray:
+        """
+        Sum rainfall of every month; months having any day missing are NaN.
+
+        :return: A numpy array with one row per year and one column per month.
+        """
+        is_known = ~np.isnan(self.rainfall)
+        totals = self._reduce_by_month(np.add, np.where(is_known, self.rainfall, 0.0))
+        missing_days = self._reduce_by_month(np.add, ~is_known)
+
+        return np.where(missing_days == 0, totals, np.nan)
+
+    def to_raw_data(self) -> pd.DataFrame:
+        """
+        Roll daily rainfall up to raw data, to load rainfall models upon,
+        e.g. with AllRainfall.from_raw_data.
+
+        :return: A pandas DataFrame with year and rainfall (in mm) of each month.
+        """
+        monthly_rainfall = self.get_monthly_rainfall()
+
+        return pd.DataFrame(
+            {
+                Label.YEAR.value: self.years,
+                **{
+                    month.value: monthly_rainfall[:, rank]
+                    for rank, month in enumerate(Month)
+                },
+            }
+        )
+
+    def _get_yearly_metric(
+        self,
+        monthly_values: np.ndarray,
+        reduce: np.ufunc,
+        label: Label,
+        *,
+        begin_year: int | None,
+        end_year: int | None,
+        month: Month | None,
+    ) -> pd.DataFrame:
+        values = (
+            monthly_values[:, month.get_rank() - 1]
+            if month is not None
+            else reduce.reduce(monthly_values, axis=1)
+        )
+        data = pd.DataFrame({Label.YEAR.value: self.years, label.value: values})
+
+        return data[
+            data[Label.YEAR.value].between(
+                begin_year if begin_year is not None else self.first_year,
+                end_year if end_year is not None else self.last_year,
+            )
+        ].reset_index(drop=True)
+
+    def get_max_daily_rainfall(
+        self,
+        *,
+        begin_year: int | None = None,
+        end_year: int | None = None,
+        month: Month | None = None,
+    ) -> pd.DataFrame:
+        """
+        Compute maximum rainfall fallen in a single day of each year, or of a month of each year.
+        Missing days are left out; a year without any known day is NaN.
+
+        :param begin_year: An integer representing the year to start getting rainfall values (optional).
+        :param end_year: An integer representing the year to end getting rainfall values (optional).
+        :param month: A Month Enum to restrict days to (optional).
+        :return: A pandas DataFrame displaying maximum daily rainfall (in mm) according to year.
+        """
+        return self._get_yearly_metric(
+            self._reduce_by_month(np.fmax, self.rainfall),
+            np.fmax,
+            Label.MAX_DAILY_RAINFALL,
+            begin_year=begin_year,
+            end_year=end_year,
+            month=month,
+        )
+
+    def get_rainy_days(
+        self,
+        *,
+        begin_year: int | None = None,
+        end_year: int | None = None,
+        month: Month | None = None,
+        threshold: float = RAINY_DAY_THRESHOLD,
+    ) -> pd.DataFrame:
+        """
+        Count days with at least some rainfall in each year, or in a month of each year.
+        Missing days are not counted.
+
+        :param begin_year: An integer representing the year to start getting rainfall values (optional).
+        :param end_year: An integer representing the year to end getting rainfall values (optional).
+        :param month: A Month Enum to restrict days to (optional).
+        :param threshold: Rainfall (in mm) from which a day is rainy. Defaults to 1 mm.
+        :return: A pandas DataFrame displaying the number of rainy days according to year.
+        """
+        # NaN compares as False: missing days are not rainy
+        with np.errstate(invalid="ignore"):
+            is_rainy = self.rainfall >= threshold
+
+        return self._get_yearly_metric(
+            self._reduce_by_month(np.add, is_rainy.astype(np.int64)),
+            np.add,
+            Label.RAINY_DAYS,
+            begin_year=begin_year,
+            end_year=end_year,
+            month=month,
+        )
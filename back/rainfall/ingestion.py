@@ -0,0 +1,271 @@
+"""
+Provides streaming ingestion of CSV files holding monthly rainfall of many weather stations,
+possibly far larger than memory, into one shared dataset file per station.
+
+File is parsed in chunks of rows, each chunk being routed to a year by month matrix per station:
+memory holds a single chunk along with these matrices, whatever the file size.
+Two layouts are supported, the station identifier always coming first:
+- wide: station, year, then rainfall of each month from January to December;
+- long: station, year, month from 1 to 12, then rainfall.
+"""
+
+import os
+import re
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from back.rainfall.utils import DataFormatError, Label, Month
+
+DEFAULT_CHUNK_ROWS = 500_000
+WIDE_COLUMN_COUNT = 2 + len(Month)
+LONG_COLUMN_COUNT = 4
+# Station identifiers name their shared dataset files
+STATION_PATTERN = re.compile(r"[\w.-]+")
+
+
+@dataclass
+class IngestionProgress:
+    """
+    Progress of an ingestion, reported once each chunk is parsed.
+    """
+
+    rows: int
+    bytes_read: int
+    total_bytes: int
+    elapsed_s: float
+    stations: int
+    written_stations: int
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.elapsed_s if self.elapsed_s > 0 else 0.0
+
+    @property
+    def fraction(self) -> float:
+        return min(self.bytes_read / self.total_bytes, 1.0) if self.total_bytes else 1.0
+
+
+class StationMatrix:
+    """
+    Monthly rainfall of a weather station, one row per year from its first one,
+    grown as rows of the station arrive. Later rows override former ones for the same year and month.
+    """
+
+    def __init__(self):
+        self.first_year = 0
+        self.values = np.empty((0, len(Month)))
+        self.has_year = np.zeros(0, dtype=bool)
+
+    @property
+    def nbytes(self) -> int:
+        return self.values.nbytes + self.has_year.nbytes
+
+    def _reserve(self, min_year: int, max_year: int) -> None:
+        if not len(self.values):
+            self.first_year = min_year
+
+        first_year = min(self.first_year, min_year)
+        shift = self.first_year - first_year
+        span = max_year - first_year + 1
+        if shift == 0 and span <= len(self.values):
+            return
+
+        # Capacity is doubled, so that stations growing year after year are copied only a few times
+        capacity = max(span, shift + 2 * len(self.values))
+        values = np.full((capacity, len(Month)), np.nan)
+        has_year = np.zeros(capacity, dtype=bool)
+        values[shift : shift + len(self.values)] = self.values
+        has_year[shift : shift + len(self.has_year)] = self.has_year
+
+        self.first_year, self.values, self.has_year = first_year, values, has_year
+
+    def put(
+        self, years: np.ndarray, rainfall: np.ndarray, months: np.ndarray | None = None
+    ) -> None:
+        """
+        Set rainfall of some years.
+
+        :param years: A numpy array of years.
+        :param rainfall: A numpy array of rainfall values: one row of 12 months per year if months are not given,
+        else one value per year.
+        :param months: A numpy array of month ranks from 0 to 11, one per year (optional).
+        :return: None
+        """
+        if not len(years):
+            return
+
+        self._reserve(int(years.min()), int(years.max()))
+        positions = years - self.first_year
+        if months is None:
+            self.values[positions] = rainfall
+        else:
+            self.values[positions, months] = rainfall
+
+        self.has_year[positions] = True
+
+    def get_raw_data(self, columns: list[str]) -> pd.DataFrame:
+        """
+        Build raw data of the station, holding only years having at least one row.
+
+        :param columns: Labels of the year column then of the 12 month columns.
+        :return: A pandas DataFrame shaped as the original CSV of a single station.
+        """
+        positions = np.flatnonzero(self.has_year)
+        values = self.values[positions]
+
+        return pd.DataFrame(
+            {
+                columns[0]: (positions + self.first_year).astype(np.int64),
+                **{column: values[:, rank] for rank, column in enumerate(columns[1:])},
+            }
+        )
+
+
+def _get_integers(column: pd.Series, name: str) -> np.ndarray:
+    if not pd.api.types.is_integer_dtype(column):
+        raise DataFormatError(f"{name} as integers, without missing values")
+
+    return column.to_numpy(dtype=np.int64)
+
+
+def ingest_multi_station_csv(
+    csv_path: str | Path,
+    output_path: str | Path,
+    *,
+    start_year: int,
+    round_precision: int,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    sorted_by_station=False,
+    on_progress: Callable[[IngestionProgress], None] | None = None,
+) -> dict[str, Path]:
+    """
+    Parse a CSV of monthly rainfall of many weather stations chunk by chunk,
+    then write a shared dataset file per station, named after it.
+    If rows of each station are contiguous, files are written as soon as rows of the next station arrive,
+    so that memory holds a single station matrix.
+
+    :param csv_path: Path to a CSV in wide or long layout, with a header.
+    :param output_path: Path to the folder where shared dataset files are written.
+    :param start_year: An integer representing the year to start getting our rainfall values.
+    :param round_precision: An integer representing the rainfall precision.
+    :param chunk_rows: Number of rows parsed at once.
+    :param sorted_by_station: Whether rows of each station are contiguous. Defaults to False.
+    :param on_progress: Function called with an IngestionProgress once each chunk is parsed,
+    and once every file is written (optional).
+    :return: A dict of paths to shared dataset files keyed by station, in order of appearance.
+    :raise DataFormatError: If CSV is in neither layout, if a station identifier is invalid,
+    or if rows of a station are not contiguous despite sorted_by_station being set.
+    """
+    from back.rainfall import AllRainfall
+    from back.rainfall.shared_dataset import write_shared_dataset
+
+    output_path = Path(output_path)
+    total_bytes = os.path.getsize(csv_path)
+    started_at = time.perf_counter()
+    matrices: dict[str, StationMatrix] = {}
+    paths: dict[str, Path] = {}
+    rows = 0
+
+    with open(csv_path, "rb") as file:
+        columns = [str(column) for column in pd.read_csv(file, nrows=0).columns]
+        if len(columns) not in (WIDE_COLUMN_COUNT, LONG_COLUMN_COUNT):
+            raise DataFormatError(
+                "[Station, Year, Jan_rain, Feb_rain, ..., Dec_rain] or [Station, Year, Month, Rainfall] (CSV)"
+            )
+
+        is_wide = len(columns) == WIDE_COLUMN_COUNT
+        raw_columns = (
+            columns[1:]
+            if is_wide
+            else [Label.YEAR.value, *(month.value for month in Month)]
+        )
+
+        def write(station: str) -> None:
+            paths[station] = write_shared_dataset(
+                AllRainfall.from_raw_data(
+                    matrices.pop(station).get_raw_data(raw_columns),
+                    start_year=start_year,
+                    round_precision=round_precision,
+                    dataset_url=str(csv_path),
+                ),
+                output_path / f"{station}.bin",
+            )
+
+        def report() -> None:
+            if on_progress is not None:
+                on_progress(
+                    IngestionProgress(
+                        rows=rows,
+                        bytes_read=min(file.tell(), total_bytes),
+                        total_bytes=total_bytes,
+                        elapsed_s=time.perf_counter() - started_at,
+                        stations=len(matrices) + len(paths),
+                        written_stations=len(paths),
+                    )
+                )
+
+        file.seek(0)
+        for chunk in pd.read_csv(
+            file, chunksize=chunk_rows, dtype={columns[0]: str}, skipinitialspace=True
+        ):
+            codes, stations = pd.factorize(chunk.iloc[:, 0])
+            if np.any(codes < 0):
+                raise DataFormatError("a station identifier on every row")
+
+            # Codes follow order of appearance: they decrease once a former station appears again
+            if sorted_by_station and np.any(np.diff(codes) < 0):
+                raise DataFormatError("contiguous rows for each station")
+
+            years = _get_integers(chunk.iloc[:, 1], columns[1])
+            if is_wide:
+                months = None
+                rainfall = chunk.iloc[:, 2:].to_numpy(dtype=float)
+            else:
+                months = _get_integers(chunk.iloc[:, 2], columns[2]) - 1
+                if np.any((months < 0) | (months >= len(Month))):
+                    raise DataFormatError(f"{columns[2]} from 1 to 12")
+
+                rainfall = chunk.iloc[:, 3].to_numpy(dtype=float)
+
+            # Rows are grouped by station, stations keeping their order of appearance
+            order = np.argsort(codes, kind="stable")
+            bounds = np.searchsorted(codes[order], np.arange(len(stations) + 1))
+            for code, station in enumerate(stations):
+                if station not in matrices:
+                    if not STATION_PATTERN.fullmatch(station):
+                        raise DataFormatError(
+                            f"station identifiers made of letters, digits, '_', '.' or '-', not '{station}'"
+                        )
+
+                    if station in paths:
+                        raise DataFormatError(
+                            f"contiguous rows for each station, '{station}' appearing again"
+                        )
+
+                    if sorted_by_station:
+                        for former_station in list(matrices):
+                            write(former_station)
+
+                    matrices[station] = StationMatrix()
+
+                rows_of_station = order[bounds[code] : bounds[code + 1]]
+                matrices[station].put(
+                    years[rows_of_station],
+                    rainfall[rows_of_station],
+                    months[rows_of_station] if months is not None else None,
+                )
+
+            rows += len(chunk)
+            report()
+
+        for station in list(matrices):
+            write(station)
+
+        report()
+
+    return paths
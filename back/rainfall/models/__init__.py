@@ -1,5 +1,6 @@
 from back.rainfall.models.monthly_rainfall import MonthlyRainfall
 from back.rainfall.models.seasonal_rainfall import SeasonalRainfall
+from back.rainfall.models.window_rainfall import WindowRainfall
 from back.rainfall.models.yearly_rainfall import YearlyRainfall
 
-__all__ = ["MonthlyRainfall", "SeasonalRainfall", "YearlyRainfall"]
+__all__ = ["MonthlyRainfall", "SeasonalRainfall", "WindowRainfall", "YearlyRainfall"]
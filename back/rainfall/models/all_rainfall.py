@@ -3,15 +3,38 @@ Provides an all-in-one class to manipulate rainfall data for every timeframe.
 At a yearly, monthly and seasonal level.
 """
 
+import copy
+import threading
+from collections import OrderedDict
+from concurrent.futures import Executor
 from pathlib import Path
-from typing import Union
+from typing import TYPE_CHECKING, Any, Union
 
+import numpy as np
 import pandas as pd
-import plotly.graph_objs as go
 
 import back.rainfall.models as models
-from back.rainfall.utils import Month, Season, TimeMode
+from back.rainfall.utils import DataFormatError, Label, Month, Season, TimeMode
+from back.rainfall.utils import change_points as cp
+from back.rainfall.utils import dataframe_operations as df_opr
 from back.rainfall.utils import plotly_figures as plot
+from back.rainfall.utils import rainfall_metrics as rain
+from back.rainfall.utils.accumulators import RainfallAccumulators
+from back.rainfall.utils.bootstrap import Statistic
+from back.rainfall.utils.extremes import RETURN_PERIODS, Distribution, get_return_levels
+from back.rainfall.utils.month_windows import CumulativeMonthlyRainfall, MonthWindow
+from back.rainfall.utils.spi import get_standardized_precipitation_index
+
+if TYPE_CHECKING:
+    import plotly.graph_objs as go
+
+    from back.rainfall.shared_dataset import SharedDataset
+
+
+# Return levels are costly to bootstrap but their parameters are many: only latest ones are kept
+MAX_MEMOIZED_RETURN_LEVELS = 16
+# SPI are keyed by summed months and normal year: only latest ones are kept as well
+MAX_MEMOIZED_SPI = 32
 
 
 class AllRainfall:
@@ -22,6 +45,7 @@ class AllRainfall:
     - SeasonalRainfall data for all seasons within a dictionary
 
     A bit costly to instantiate but contains all necessary data.
+    Its version identifies the content of raw data, to key results computed upon it.
     """
 
     def __init__(
@@ -35,15 +59,35 @@ class AllRainfall:
         self.starting_year = start_year
         self.round_precision = round_precision
         self.raw_data: pd.DataFrame = pd.read_csv(dataset_url_or_path)
+        self.shared_dataset: SharedDataset | None = None
+        self._load_models()
+
+    def _load_models(
+        self,
+        preloaded_data_by_key: dict[str, pd.DataFrame] | None = None,
+        preloaded_accumulators_by_key: dict[str, RainfallAccumulators] | None = None,
+    ):
+        preloaded_data_by_key = preloaded_data_by_key or {}
+        preloaded_accumulators_by_key = preloaded_accumulators_by_key or {}
+
+        self.version = df_opr.get_content_hash(self.raw_data)[:16]
         self.yearly_rainfall = models.YearlyRainfall(
-            self.raw_data, start_year=start_year, round_precision=round_precision
+            self.raw_data,
+            start_year=self.starting_year,
+            round_precision=self.round_precision,
+            preloaded_data=preloaded_data_by_key.get(TimeMode.YEARLY.value),
+            preloaded_accumulators=preloaded_accumulators_by_key.get(
+                TimeMode.YEARLY.value
+            ),
         )
         self.monthly_rainfalls = {
             month.value: models.MonthlyRainfall(
                 self.raw_data,
                 month,
-                start_year=start_year,
-                round_precision=round_precision,
+                start_year=self.starting_year,
+                round_precision=self.round_precision,
+                preloaded_data=preloaded_data_by_key.get(month.value),
+                preloaded_accumulators=preloaded_accumulators_by_key.get(month.value),
             )
             for month in Month
         }
@@ -51,17 +95,34 @@ class AllRainfall:
             season.value: models.SeasonalRainfall(
                 self.raw_data,
                 season,
-                start_year=start_year,
-                round_precision=round_precision,
+                start_year=self.starting_year,
+                round_precision=self.round_precision,
+                preloaded_data=preloaded_data_by_key.get(season.value),
+                preloaded_accumulators=preloaded_accumulators_by_key.get(season.value),
             )
             for season in Season
         }
+        self.window_rainfalls: dict[MonthWindow, models.WindowRainfall] = {}
+        self._cumulative_rainfall: CumulativeMonthlyRainfall | None = None
+        self.spi_by_key: OrderedDict[tuple[int, int], np.ndarray] = OrderedDict()
+        self._spi_lock = threading.Lock()
+        self.return_levels_by_key: OrderedDict[tuple, pd.DataFrame] = OrderedDict()
+        self._return_levels_lock = threading.Lock()
 
     @classmethod
-    def from_config(cls, from_file=False):
+    def from_config(cls, from_file=False, station: str | None = None):
         from back.rainfall.config import Config
 
         data_settings = Config().get_data_settings
+        if station is not None:
+            stations_settings = Config().get_stations_settings
+            if station not in stations_settings:
+                raise ValueError(
+                    f"Unknown station '{station}': it should be one of {list(stations_settings)}."
+                )
+
+            data_settings = stations_settings[station]
+
         if from_file and data_settings.local_file_path is None:
             raise RuntimeError(
                 f"Cannot init class because you have set {from_file=} "
@@ -74,6 +135,421 @@ class AllRainfall:
             round_precision=data_settings.rainfall_precision,
         )
 
+    @classmethod
+    def from_raw_data(
+        cls,
+        raw_data: pd.DataFrame,
+        *,
+        start_year: int,
+        round_precision: int,
+        dataset_url: str = "",
+    ):
+        """
+        Instantiate class upon raw data already in memory, e.g. parsed from a larger file.
+
+        :param raw_data: A pandas DataFrame shaped as the original CSV: the year, then rainfall for every month.
+        :param start_year: An integer representing the year to start getting our rainfall values.
+        :param round_precision: An integer representing the rainfall precision.
+        :param dataset_url: Where raw data comes from, for information only (optional).
+        :return: An AllRainfall instance.
+        """
+        all_rainfall = cls.__new__(cls)
+        all_rainfall.dataset_url = dataset_url
+        all_rainfall.starting_year = start_year
+        all_rainfall.round_precision = round_precision
+        all_rainfall.raw_data = raw_data
+        all_rainfall.shared_dataset = None
+        all_rainfall._load_models()
+
+        return all_rainfall
+
+    @classmethod
+    def from_shared_dataset(cls, path: str | Path):
+        """
+        Instantiate class upon a shared dataset file, without reading CSV nor loading models:
+        raw data, models data and their accumulators are zero-copy read-only views upon the file mapped in memory.
+
+        :param path: Path to a file written by back.rainfall.shared_dataset.write_shared_dataset.
+        :return: An AllRainfall instance, its shared dataset being set.
+        """
+        from back.rainfall.shared_dataset import SharedDataset
+
+        shared_dataset = SharedDataset(path)
+
+        all_rainfall = cls.__new__(cls)
+        all_rainfall.dataset_url = str(path)
+        all_rainfall.starting_year = shared_dataset.start_year
+        all_rainfall.round_precision = shared_dataset.round_precision
+        all_rainfall.raw_data = shared_dataset.get_raw_data()
+        all_rainfall.shared_dataset = shared_dataset
+        all_rainfall._load_models(
+            {key: shared_dataset.get_data(key) for key in shared_dataset.series_keys},
+            {
+                key: shared_dataset.get_accumulators(key)
+                for key in shared_dataset.series_keys
+            },
+        )
+
+        return all_rainfall
+
+    def get_rainfall_models(self) -> dict[str, "models.YearlyRainfall"]:
+        """
+        Gather every rainfall model.
+
+        :return: A dict of models keyed by 'yearly', month or season.
+        """
+        return {
+            TimeMode.YEARLY.value: self.yearly_rainfall,
+            **self.monthly_rainfalls,
+            **self.seasonal_rainfalls,
+        }
+
+    @property
+    def cumulative_rainfall(self) -> CumulativeMonthlyRainfall:
+        """
+        Running sums of monthly rainfall, built upon first access.
+
+        :return: A CumulativeMonthlyRainfall instance.
+        """
+        if self._cumulative_rainfall is None:
+            self._cumulative_rainfall = CumulativeMonthlyRainfall.from_raw_data(
+                self.raw_data
+            )
+
+        return self._cumulative_rainfall
+
+    def get_window_rainfall(self, window: MonthWindow) -> "models.WindowRainfall":
+        """
+        Retrieve the model of rainfall summed over a window of consecutive months,
+        loaded upon first request as windows are too many to be loaded beforehand.
+
+        :param window: A MonthWindow, e.g. a hydrological year or a custom season.
+        :return: A WindowRainfall instance.
+        """
+        if (window_rainfall := self.window_rainfalls.get(window)) is None:
+            window_rainfall = models.WindowRainfall(
+                self.raw_data,
+                window,
+                start_year=self.starting_year,
+                round_precision=self.round_precision,
+            )
+            self.window_rainfalls[window] = window_rainfall
+
+        return window_rainfall
+
+    def get_rolling_rainfall(
+        self, months: int, *, begin_year: int, end_year: int
+    ) -> pd.DataFrame:
+        """
+        Compute rainfall summed over the former months at every month, e.g. 3, 6 or 12-month totals.
+
+        :param months: Number of months summed, including the current one.
+        :param begin_year: An integer representing the year
+        to start getting our rainfall values.
+        :param end_year: An integer representing the year
+        to end getting our rainfall values.
+        :return: A pandas DataFrame of year, month and rainfall (in mm) summed until this month,
+        missing if months reach a year missing from raw data.
+        """
+        cumulative_rainfall = self.cumulative_rainfall
+        rolling_rainfall = pd.DataFrame(
+            {
+                Label.YEAR.value: np.repeat(cumulative_rainfall.years, len(Month)),
+                Label.MONTH.value: np.tile(
+                    Month.values(), len(cumulative_rainfall.years)
+                ),
+                Label.RAINFALL.value: np.round(
+                    cumulative_rainfall.get_rolling_rainfall(months).ravel(),
+                    self.round_precision,
+                ),
+            }
+        )
+
+        return df_opr.get_rainfall_within_year_interval(
+            rolling_rainfall, begin_year=begin_year, end_year=end_year
+        ).reset_index(drop=True)
+
+    def get_standardized_precipitation_index(
+        self, months: int, *, normal_year: int, begin_year: int, end_year: int
+    ) -> pd.DataFrame:
+        """
+        Compute the Standardized Precipitation Index (SPI) of rainfall summed over the former months at every month,
+        gamma distributions of every calendar month being fitted upon the 30 years of a normal.
+        Values are memoized per number of months and normal.
+
+        :param months: Number of months summed, including the current one, e.g. 1, 3, 6, 12 or 24.
+        :param normal_year: An integer representing the year
+        to start the 30 years distributions are fitted upon.
+        :param begin_year: An integer representing the year
+        to start getting our rainfall values.
+        :param end_year: An integer representing the year
+        to end getting our rainfall values.
+        :return: A pandas DataFrame of year, month and SPI, negative for droughts and positive for wet spells,
+        missing if months reach a year missing from raw data.
+        """
+        cumulative_rainfall = self.cumulative_rainfall
+        key = (months, normal_year)
+        with self._spi_lock:
+            if (spi := self.spi_by_key.get(key)) is not None:
+                self.spi_by_key.move_to_end(key)
+
+        if spi is None:
+            rolling_rainfall = cumulative_rainfall.get_rolling_rainfall(months)
+            is_reference = (cumulative_rainfall.years >= normal_year) & (
+                cumulative_rainfall.years <= normal_year + 29
+            )
+            spi = get_standardized_precipitation_index(
+                rolling_rainfall, rolling_rainfall[is_reference]
+            )
+            spi.flags.writeable = False
+            with self._spi_lock:
+                self.spi_by_key[key] = spi
+                while len(self.spi_by_key) > MAX_MEMOIZED_SPI:
+                    self.spi_by_key.popitem(last=False)
+
+        spi_data = pd.DataFrame(
+            {
+                Label.YEAR.value: np.repeat(cumulative_rainfall.years, len(Month)),
+                Label.MONTH.value: np.tile(
+                    Month.values(), len(cumulative_rainfall.years)
+                ),
+                Label.STANDARDIZED_PRECIPITATION_INDEX.value: np.round(spi.ravel(), 2),
+            }
+        )
+
+        return df_opr.get_rainfall_within_year_interval(
+            spi_data, begin_year=begin_year, end_year=end_year
+        ).reset_index(drop=True)
+
+    def get_bar_figure_of_standardized_precipitation_index(
+        self, months: int, *, normal_year: int, begin_year: int, end_year: int
+    ) -> "go.Figure":
+        """
+        Return a bar graphic displaying the Standardized Precipitation Index (SPI) at every month.
+
+        :param months: Number of months summed, including the current one, e.g. 1, 3, 6, 12 or 24.
+        :param normal_year: An integer representing the year
+        to start the 30 years distributions are fitted upon.
+        :param begin_year: An integer representing the year
+        to start getting our rainfall values.
+        :param end_year: An integer representing the year
+        to end getting our rainfall values.
+        :return: A plotly Figure object of the SPI according to month.
+        """
+        return plot.get_bar_figure_of_standardized_precipitation_index(
+            self.get_standardized_precipitation_index(
+                months,
+                normal_year=normal_year,
+                begin_year=begin_year,
+                end_year=end_year,
+            ),
+            months=months,
+            normal_year=normal_year,
+        )
+
+    def get_return_levels(
+        self,
+        time_mode: TimeMode,
+        *,
+        begin_year: int,
+        end_year: int,
+        month: Month | None = None,
+        season: Season | None = None,
+        window: MonthWindow | None = None,
+        distribution: Distribution = Distribution.GEV,
+        return_periods: tuple[int, ...] = RETURN_PERIODS,
+        replicates=1000,
+        executor: Executor | None = None,
+    ) -> pd.DataFrame | None:
+        """
+        Compute return levels of maximum monthly rainfall of every year, month or season,
+        i.e. values exceeded once every return period on average, along with 95% confidence intervals
+        from a parametric bootstrap. Values of the latest parameters are memoized.
+
+        :param time_mode: A TimeMode Enum: ['yearly', 'monthly', 'seasonal'].
+        :param begin_year: An integer representing the year
+        to start getting our rainfall values.
+        :param end_year: An integer representing the year
+        to end getting our rainfall values.
+        :param month: A Month Enum: ['January', 'February', ..., 'December']
+        Set if time_mode is 'monthly' (optional).
+        :param season: A Season Enum: ['winter', 'spring', 'summer', 'fall'].
+        Set if time_mode is 'seasonal' (optional).
+        :param window: A MonthWindow of consecutive months instead of a season,
+        e.g. a hydrological year; set if time_mode is 'seasonal' (optional).
+        :param distribution: A Distribution Enum: ['gev', 'gumbel']. Defaults to 'gev'.
+        :param return_periods: A tuple of return periods, in years. Defaults to (10, 50, 100).
+        :param replicates: Number of bootstrap replicates. Defaults to 1000.
+        :param executor: An executor, e.g. a process pool, to fit bootstrap replicates in parallel (optional).
+        :return: A pandas DataFrame of return period, return level (in mm), lower and upper bounds.
+        None if time mode is 'monthly' and month is None or time mode is 'seasonal' and both season and window are None.
+        """
+        entity = self.get_entity_for_time_mode(time_mode, month, season, window)
+        if entity is None:
+            return None
+
+        month_window = MonthWindow(Month.DECEMBER, len(Month))
+        if isinstance(entity, models.WindowRainfall):
+            month_window = entity.window
+        elif isinstance(entity, models.MonthlyRainfall):
+            month_window = MonthWindow(entity.month, 1)
+
+        key = (
+            month_window,
+            begin_year,
+            end_year,
+            distribution,
+            return_periods,
+            replicates,
+        )
+        with self._return_levels_lock:
+            if (return_levels := self.return_levels_by_key.get(key)) is not None:
+                self.return_levels_by_key.move_to_end(key)
+
+        if return_levels is None:
+            cumulative_rainfall = self.cumulative_rainfall
+            is_within = (cumulative_rainfall.years >= begin_year) & (
+                cumulative_rainfall.years <= end_year
+            )
+            levels, lower_bounds, upper_bounds = get_return_levels(
+                cumulative_rainfall.get_window_maxima(month_window)[is_within],
+                distribution=distribution,
+                return_periods=return_periods,
+                replicates=replicates,
+                executor=executor,
+            )
+            return_levels = pd.DataFrame(
+                {
+                    Label.RETURN_PERIOD.value: return_periods,
+                    Label.RETURN_LEVEL.value: np.round(levels, self.round_precision),
+                    Label.LOWER_BOUND.value: np.round(
+                        lower_bounds, self.round_precision
+                    ),
+                    Label.UPPER_BOUND.value: np.round(
+                        upper_bounds, self.round_precision
+                    ),
+                }
+            )
+            with self._return_levels_lock:
+                self.return_levels_by_key[key] = return_levels
+                while len(self.return_levels_by_key) > MAX_MEMOIZED_RETURN_LEVELS:
+                    self.return_levels_by_key.popitem(last=False)
+
+        return return_levels.copy()
+
+    def apply_update(
+        self, rows: pd.DataFrame
+    ) -> tuple["AllRainfall", tuple[int, int] | None]:
+        """
+        Patch or append rows of raw data, e.g. the revised current year or a new one,
+        without reading the whole dataset again nor loading models from scratch:
+        only changed rows are loaded, and accumulators are updated from the first changed year.
+
+        :param rows: A pandas DataFrame of raw data rows, shaped as raw data:
+        the year, then rainfall for every month. Years should either be known
+        or follow the last one without any gap.
+        :return: A tuple of an AllRainfall instance holding updated data,
+        and of the first and last changed years, the year after a changed one included
+        as winters begin in December of the former year; the present instance is left untouched.
+        If no row changes data, the present instance and None are returned.
+        :raise DataFormatError: If rows do not have exactly 13 columns.
+        :raise ValueError: If a year is repeated, neither known nor after the last one,
+        or if appended years leave a gap after the last one.
+        """
+        if len(rows.columns) != len(self.raw_data.columns):
+            raise DataFormatError(
+                "[Year, Jan_rain, Feb_rain, ..., Dec_rain] (pandas DataFrame)"
+            )
+
+        rows = (
+            rows.set_axis(self.raw_data.columns, axis="columns")
+            .astype(self.raw_data.dtypes.to_dict())
+            .sort_values(self.raw_data.columns[0])
+        )
+        raw_years = self.raw_data.iloc[:, 0].to_numpy()
+        years = rows.iloc[:, 0].to_numpy()
+        if len(np.unique(years)) != len(years):
+            raise ValueError("Updated years should be unique.")
+
+        positions = np.searchsorted(raw_years, years)
+        is_patched = positions < len(raw_years)
+        if np.any(raw_years[positions[is_patched]] != years[is_patched]):
+            raise ValueError(
+                "Updated years should either be known or follow the last one."
+            )
+
+        appended_years = years[~is_patched]
+        if np.any(appended_years != raw_years[-1] + 1 + np.arange(len(appended_years))):
+            raise ValueError(
+                f"Appended years should follow the last one ({raw_years[-1]}) without any gap."
+            )
+
+        # Rows identical to known ones are left out
+        values = rows.iloc[:, 1:].to_numpy(dtype=float)
+        known_values = self.raw_data.iloc[positions[is_patched], 1:].to_numpy(
+            dtype=float
+        )
+        is_changed = ~is_patched
+        is_changed[is_patched] = ~np.all(
+            (values[is_patched] == known_values)
+            | (np.isnan(values[is_patched]) & np.isnan(known_values)),
+            axis=1,
+        )
+        if not is_changed.any():
+            return self, None
+
+        raw_data = self.raw_data.copy()
+        patched_positions = positions[is_patched & is_changed]
+        raw_data.iloc[patched_positions, 1:] = rows.iloc[
+            is_patched & is_changed, 1:
+        ].to_numpy()
+        raw_data = pd.concat(
+            [
+                raw_data,
+                rows[~is_patched].set_axis(
+                    pd.RangeIndex(len(raw_years), len(raw_years) + (~is_patched).sum())
+                ),
+            ]
+        )
+        updated_raw_data = raw_data.iloc[
+            np.concatenate(
+                [patched_positions, np.arange(len(raw_years), len(raw_data))]
+            )
+        ]
+
+        all_rainfall = copy.copy(self)
+        all_rainfall.raw_data = raw_data
+        all_rainfall.shared_dataset = None
+        all_rainfall.version = df_opr.get_content_hash(raw_data)[:16]
+        all_rainfall.yearly_rainfall = self.yearly_rainfall.apply_update(
+            raw_data, updated_raw_data
+        )
+        all_rainfall.monthly_rainfalls = {
+            key: model.apply_update(raw_data, updated_raw_data)
+            for key, model in self.monthly_rainfalls.items()
+        }
+        all_rainfall.seasonal_rainfalls = {
+            key: model.apply_update(raw_data, updated_raw_data)
+            for key, model in self.seasonal_rainfalls.items()
+        }
+        all_rainfall._cumulative_rainfall = None
+        all_rainfall.spi_by_key = OrderedDict()
+        all_rainfall._spi_lock = threading.Lock()
+        all_rainfall.return_levels_by_key = OrderedDict()
+        all_rainfall._return_levels_lock = threading.Lock()
+        all_rainfall.window_rainfalls = {
+            window: model.apply_update(raw_data, updated_raw_data)
+            for window, model in self.window_rainfalls.items()
+        }
+
+        changed_years = years[is_changed]
+        # Winters and other windows spanning two years also depend upon months of the former year
+        last_changed_year = min(
+            int(changed_years.max()) + 1, int(raw_data.iloc[:, 0].max())
+        )
+
+        return all_rainfall, (int(changed_years.min()), last_changed_year)
+
     def export_all_data_to_csv(
         self, begin_year: int, end_year: int, *, folder_path="csv_data"
     ) -> str:
@@ -129,6 +605,7 @@ class AllRainfall:
         end_year: int,
         month: Month | None = None,
         season: Season | None = None,
+        window: MonthWindow | None = None,
         path: str | Path | None = None,
     ) -> str | None:
         """
@@ -144,11 +621,13 @@ class AllRainfall:
         Set if time_mode is 'monthly' (optional).
         :param season: A Season Enum: ['winter', 'spring', 'summer', 'fall'].
         Set if time_mode is 'seasonal' (optional).
+        :param window: A MonthWindow of consecutive months summed instead of a season,
+        e.g. a hydrological year; set if time_mode is 'seasonal' (optional).
         :param path: path to csv file to save our data (optional).
         :return: CSV data as a string if no path is set.
         None otherwise.
         """
-        if entity := self.get_entity_for_time_mode(time_mode, month, season):
+        if entity := self.get_entity_for_time_mode(time_mode, month, season, window):
             return entity.export_as_csv(
                 begin_year=begin_year, end_year=end_year, path=path
             )
@@ -163,6 +642,7 @@ class AllRainfall:
         end_year: int,
         month: Month | None = None,
         season: Season | None = None,
+        window: MonthWindow | None = None,
     ) -> float | None:
         """
         Computes Rainfall average for a specific year range and time mode.
@@ -176,9 +656,11 @@ class AllRainfall:
         Set if time_mode is 'monthly' (optional).
         :param season: A Season Enum: ['winter', 'spring', 'summer', 'fall'].
         Set if time_mode is 'seasonal' (optional).
+        :param window: A MonthWindow of consecutive months summed instead of a season,
+        e.g. a hydrological year; set if time_mode is 'seasonal' (optional).
         :return: A float representing the average Rainfall.
         """
-        if entity := self.get_entity_for_time_mode(time_mode, month, season):
+        if entity := self.get_entity_for_time_mode(time_mode, month, season, window):
             return entity.get_average_yearly_rainfall(begin_year, end_year)
 
         return None
@@ -190,6 +672,7 @@ class AllRainfall:
         begin_year: int,
         month: Month | None = None,
         season: Season | None = None,
+        window: MonthWindow | None = None,
     ) -> float | None:
         """
         Computes Rainfall normal from a specific year and time mode.
@@ -201,13 +684,65 @@ class AllRainfall:
         Set if time_mode is 'monthly' (optional).
         :param season: A Season Enum: ['winter', 'spring', 'summer', 'fall'].
         Set if time_mode is 'seasonal' (optional).
+        :param window: A MonthWindow of consecutive months summed instead of a season,
+        e.g. a hydrological year; set if time_mode is 'seasonal' (optional).
         :return: A float representing the Rainfall normal.
         """
-        if entity := self.get_entity_for_time_mode(time_mode, month, season):
+        if entity := self.get_entity_for_time_mode(time_mode, month, season, window):
             return entity.get_normal(begin_year)
 
         return None
 
+    def get_confidence_interval(
+        self,
+        statistic: Statistic,
+        time_mode: TimeMode,
+        *,
+        begin_year: int,
+        end_year: int,
+        month: Month | None = None,
+        season: Season | None = None,
+        window: MonthWindow | None = None,
+        replicates=1000,
+        confidence=0.95,
+        seed=0,
+        executor: Executor | None = None,
+    ) -> tuple[float, float] | None:
+        """
+        Computes bootstrap confidence interval of Rainfall average or of linear regression slope
+        for a specific year range and time mode; for a normal, year range spans 30 years.
+
+        :param statistic: A Statistic Enum: ['average', 'linear_regression'].
+        :param time_mode: A TimeMode Enum: ['yearly', 'monthly', 'seasonal'].
+        :param begin_year: An integer representing the year
+        to start getting our rainfall values.
+        :param end_year: An integer representing the year
+        to end getting our rainfall values.
+        :param month: A Month Enum: ['January', 'February', ..., 'December']
+        Set if time_mode is 'monthly' (optional).
+        :param season: A Season Enum: ['winter', 'spring', 'summer', 'fall'].
+        Set if time_mode is 'seasonal' (optional).
+        :param window: A MonthWindow of consecutive months summed instead of a season,
+        e.g. a hydrological year; set if time_mode is 'seasonal' (optional).
+        :param replicates: Number of bootstrap replicates. Defaults to 1000.
+        :param confidence: Probability covered by confidence interval. Defaults to 0.95.
+        :param seed: Seed of the random generator. Defaults to 0.
+        :param executor: An executor, e.g. a process pool, to run chunks of replicates in parallel (optional).
+        :return: A tuple of floats: lower and upper bounds.
+        """
+        if entity := self.get_entity_for_time_mode(time_mode, month, season, window):
+            return entity.get_confidence_interval(
+                statistic,
+                begin_year,
+                end_year,
+                replicates=replicates,
+                confidence=confidence,
+                seed=seed,
+                executor=executor,
+            )
+
+        return None
+
     def get_relative_distance_to_normal(
         self,
         time_mode: TimeMode,
@@ -217,6 +752,7 @@ class AllRainfall:
         end_year: int,
         month: Month | None = None,
         season: Season | None = None,
+        window: MonthWindow | None = None,
     ) -> float | None:
         """
         Computes relative distance to Rainfall normal for a specific year range and time mode.
@@ -232,9 +768,11 @@ class AllRainfall:
         Set if time_mode is 'monthly' (optional).
         :param season: A Season Enum: ['winter', 'spring', 'summer', 'fall'].
         Set if time_mode is 'seasonal' (optional).
+        :param window: A MonthWindow of consecutive months summed instead of a season,
+        e.g. a hydrological year; set if time_mode is 'seasonal' (optional).
         :return: A float representing the relative distance to rainfall normal.
         """
-        if entity := self.get_entity_for_time_mode(time_mode, month, season):
+        if entity := self.get_entity_for_time_mode(time_mode, month, season, window):
             return entity.get_relative_distance_to_normal(
                 normal_year, begin_year, end_year
             )
@@ -249,6 +787,7 @@ class AllRainfall:
         end_year: int,
         month: Month | None = None,
         season: Season | None = None,
+        window: MonthWindow | None = None,
         weigh_by_average=False,
     ) -> float | None:
         """
@@ -265,12 +804,14 @@ class AllRainfall:
         Set if time_mode is 'monthly' (optional).
         :param season: A Season Enum: ['winter', 'spring', 'summer', 'fall'].
         Set if time_mode is 'seasonal' (optional).
+        :param window: A MonthWindow of consecutive months summed instead of a season,
+        e.g. a hydrological year; set if time_mode is 'seasonal' (optional).
         :param bool weigh_by_average: whether to divide standard deviation by average or not (optional).
         Default to False.
         :return: The standard deviation as a float.
         Nothing if the specified column does not exist.
         """
-        if entity := self.get_entity_for_time_mode(time_mode, month, season):
+        if entity := self.get_entity_for_time_mode(time_mode, month, season, window):
             return entity.get_standard_deviation(
                 begin_year, end_year, weigh_by_average=weigh_by_average
             )
@@ -286,6 +827,7 @@ class AllRainfall:
         end_year: int,
         month: Month | None = None,
         season: Season | None = None,
+        window: MonthWindow | None = None,
     ) -> int | None:
         """
         Computes the number of years below rainfall normal for a specific year range and time mode.
@@ -301,9 +843,11 @@ class AllRainfall:
         Set if time_mode is 'monthly' (optional).
         :param season: A Season Enum: ['winter', 'spring', 'summer', 'fall'].
         Set if time_mode is 'seasonal' (optional).
+        :param window: A MonthWindow of consecutive months summed instead of a season,
+        e.g. a hydrological year; set if time_mode is 'seasonal' (optional).
         :return: A float representing the relative distance to rainfall normal.
         """
-        if entity := self.get_entity_for_time_mode(time_mode, month, season):
+        if entity := self.get_entity_for_time_mode(time_mode, month, season, window):
             return entity.get_years_below_normal(normal_year, begin_year, end_year)
 
         return None
@@ -317,6 +861,7 @@ class AllRainfall:
         end_year: int,
         month: Month | None = None,
         season: Season | None = None,
+        window: MonthWindow | None = None,
     ) -> int | None:
         """
         Computes the number of years above rainfall normal for a specific year range and time mode.
@@ -332,13 +877,84 @@ class AllRainfall:
         Set if time_mode is 'monthly' (optional).
         :param season: A Season Enum: ['winter', 'spring', 'summer', 'fall'].
         Set if time_mode is 'seasonal' (optional).
+        :param window: A MonthWindow of consecutive months summed instead of a season,
+        e.g. a hydrological year; set if time_mode is 'seasonal' (optional).
         :return: A float representing the relative distance to rainfall normal.
         """
-        if entity := self.get_entity_for_time_mode(time_mode, month, season):
+        if entity := self.get_entity_for_time_mode(time_mode, month, season, window):
             return entity.get_years_above_normal(normal_year, begin_year, end_year)
 
         return None
 
+    def get_trend_tests(self, begin_year: int, end_year: int) -> pd.DataFrame:
+        """
+        Compute trends of rainfall for whole years, every month and every season at once:
+        linear regression slope, Sen's slope and Mann–Kendall trend test, corrected for ties.
+
+        :param begin_year: An integer representing the year
+        to start getting our rainfall values.
+        :param end_year: An integer representing the year
+        to end getting our rainfall values.
+        :return: A pandas DataFrame indexed by 'yearly', month or season, displaying linear regression slope,
+        Sen's slope (mm/year), Mann–Kendall Z score and p-value.
+        """
+        rainfall_models = self.get_rainfall_models()
+        trend_tests = rain.get_trend_tests(
+            {
+                key: model.get_yearly_rainfall(begin_year, end_year)
+                for key, model in rainfall_models.items()
+            },
+            round_precision=self.round_precision,
+        )
+
+        linear_regressions = [
+            model.accumulators.get_linear_regression(begin_year, end_year)
+            for model in rainfall_models.values()
+        ]
+        trend_tests.insert(
+            0,
+            Label.LINEAR_REGRESSION.value,
+            [
+                round(linear_regression[0], self.round_precision)
+                if linear_regression
+                else np.nan
+                for linear_regression in linear_regressions
+            ],
+        )
+
+        return trend_tests
+
+    def get_change_points(
+        self,
+        begin_year: int,
+        end_year: int,
+        *,
+        penalty_factors: tuple[float, ...] = (1.0,),
+    ) -> pd.DataFrame:
+        """
+        Detect regime shifts of rainfall for whole years, every month and every season at once with PELT,
+        for several penalties: rainfall is split into segments of at least 5 years with different averages.
+
+        :param begin_year: An integer representing the year
+        to start getting our rainfall values.
+        :param end_year: An integer representing the year
+        to end getting our rainfall values.
+        :param penalty_factors: A tuple of factors of the default penalty of a change:
+        the higher, the fewer changes. Defaults to (1.0,).
+        :return: A pandas DataFrame indexed by 'yearly', month or season, with a row per segment and penalty factor:
+        penalty factor, first and last years of segment and its average rainfall.
+        The first year of every segment but the first one is a change year.
+        """
+
+        return cp.get_segments(
+            {
+                key: model.get_yearly_rainfall(begin_year, end_year)
+                for key, model in self.get_rainfall_models().items()
+            },
+            penalty_factors=penalty_factors,
+            round_precision=self.round_precision,
+        )
+
     def get_last_year(self) -> int:
         """
         Retrieves the last element of the 'Year' column from the pandas DataFrames.
@@ -349,6 +965,53 @@ class AllRainfall:
 
         return self.yearly_rainfall.get_last_year()
 
+    def memory_report(self) -> dict[str, Any]:
+        """
+        Compute memory used by raw data, by every model and by memoized values, in bytes.
+        For each model: its data, its snapshot with derived columns, its memoized derived values
+        and its accumulators.
+
+        :return: A dict with bytes of raw data, a report per model (keyed by 'yearly', month or season),
+        a report per window model (keyed by window), bytes of running sums of monthly rainfall,
+        of memoized SPI and return levels, and their total.
+        """
+        model_reports = {
+            key: model.get_memory_usage()
+            for key, model in self.get_rainfall_models().items()
+        }
+        window_model_reports = {
+            str(window): model.get_memory_usage()
+            for window, model in list(self.window_rainfalls.items())
+        }
+        memory_report: dict[str, Any] = {
+            "raw_data": df_opr.get_deep_size(self.raw_data),
+            "models": model_reports,
+            "window_models": window_model_reports,
+            "cumulative_rainfall": 0
+            if self._cumulative_rainfall is None
+            else self._cumulative_rainfall.nbytes,
+            "spi": sum(spi.nbytes for spi in list(self.spi_by_key.values())),
+            "return_levels": sum(
+                df_opr.get_deep_size(return_levels)
+                for return_levels in list(self.return_levels_by_key.values())
+            ),
+        }
+        memory_report["total"] = (
+            memory_report["raw_data"]
+            + sum(
+                model_report["total"]
+                for model_report in [
+                    *model_reports.values(),
+                    *window_model_reports.values(),
+                ]
+            )
+            + memory_report["cumulative_rainfall"]
+            + memory_report["spi"]
+            + memory_report["return_levels"]
+        )
+
+        return memory_report
+
     def get_bar_figure_of_rainfall_according_to_year(
         self,
         time_mode: TimeMode,
@@ -357,9 +1020,13 @@ class AllRainfall:
         end_year: int,
         month: Month | None = None,
         season: Season | None = None,
+        window: MonthWindow | None = None,
         plot_average=False,
         plot_linear_regression=False,
-    ) -> go.Figure | None:
+        plot_change_points=False,
+        penalty_factor=1.0,
+        max_points: int | None = None,
+    ) -> "go.Figure | None":
         """
         Return a bar graphic displaying rainfall by year computed upon whole years, specific months or seasons.
 
@@ -372,18 +1039,28 @@ class AllRainfall:
         Set if time_mode is 'monthly' (optional).
         :param season: A Season Enum: ['winter', 'spring', 'summer', 'fall'].
         Set if time_mode is 'seasonal' (optional).
+        :param window: A MonthWindow of consecutive months summed instead of a season,
+        e.g. a hydrological year; set if time_mode is 'seasonal' (optional).
         :param plot_average: Whether to plot average rainfall as a horizontal line or not.
         Defaults to False.
         :param plot_linear_regression: Whether to plot linear regression of rainfall or not.
         Defaults to False.
+        :param plot_change_points: Whether to plot averages of regimes between change points or not.
+        Defaults to False.
+        :param penalty_factor: A factor of the default penalty of a change point:
+        the higher, the fewer changes. Defaults to 1.0.
+        :param max_points: Maximum number of years to plot, downsampling rainfall if needed (optional).
         :return: A plotly Figure object if data has been successfully plotted, None otherwise.
         """
-        if entity := self.get_entity_for_time_mode(time_mode, month, season):
+        if entity := self.get_entity_for_time_mode(time_mode, month, season, window):
             return entity.get_bar_figure_of_rainfall_according_to_year(
                 begin_year,
                 end_year,
                 plot_average=plot_average,
                 plot_linear_regression=plot_linear_regression,
+                plot_change_points=plot_change_points,
+                penalty_factor=penalty_factor,
+                max_points=max_points,
             )
 
         return None
@@ -396,7 +1073,8 @@ class AllRainfall:
         end_year: int,
         month: Month | None = None,
         season: Season | None = None,
-    ) -> go.Figure | None:
+        window: MonthWindow | None = None,
+    ) -> "go.Figure | None":
         """
         Return plotly figure with scatter trace of rainfall linear regression according to year,
         computed upon whole years, specific months or seasons.
@@ -410,9 +1088,11 @@ class AllRainfall:
         Set if time_mode is 'monthly' (optional).
         :param season: A Season Enum: ['winter', 'spring', 'summer', 'fall'].
         Set if time_mode is 'seasonal' (optional).
+        :param window: A MonthWindow of consecutive months summed instead of a season,
+        e.g. a hydrological year; set if time_mode is 'seasonal' (optional).
         :return: A plotly Figure object if data has been successfully plotted, None otherwise.
         """
-        if entity := self.get_entity_for_time_mode(time_mode, month, season):
+        if entity := self.get_entity_for_time_mode(time_mode, month, season, window):
             return entity.get_scatter_figure_of_linear_regression(begin_year, end_year)
 
         return None
@@ -423,7 +1103,7 @@ class AllRainfall:
         *,
         begin_year: int,
         end_year: int,
-    ) -> go.Figure | None:
+    ) -> "go.Figure | None":
         """
         Return a bar graphic displaying average rainfall for each month or each season.
 
@@ -459,7 +1139,7 @@ class AllRainfall:
         *,
         begin_year: int,
         end_year: int,
-    ) -> go.Figure | None:
+    ) -> "go.Figure | None":
         """
         Return a bar graphic displaying linear regression slope for each month or each season.
 
@@ -490,6 +1170,46 @@ class AllRainfall:
             end_year=end_year,
         )
 
+    def get_heatmap_figure_of_rainfall_linreg_slopes(
+        self,
+        time_mode: TimeMode,
+        *,
+        begin_year: int,
+        end_year: int,
+        month: Month | None = None,
+        season: Season | None = None,
+        window: MonthWindow | None = None,
+    ) -> "go.Figure | None":
+        """
+        Return a heat map displaying linear regression slope for every pair of first and last years,
+        computed upon whole years, specific months or seasons.
+
+        :param time_mode: A TimeMode Enum: ['yearly', 'monthly', 'seasonal'].
+        :param begin_year: An integer representing the year
+        to start getting our rainfall values.
+        :param end_year: An integer representing the year
+        to end getting our rainfall values.
+        :param month: A Month Enum: ['January', 'February', ..., 'December']
+        Set if time_mode is 'monthly' (optional).
+        :param season: A Season Enum: ['winter', 'spring', 'summer', 'fall'].
+        Set if time_mode is 'seasonal' (optional).
+        :param window: A MonthWindow of consecutive months summed instead of a season,
+        e.g. a hydrological year; set if time_mode is 'seasonal' (optional).
+        :return: A plotly Figure object of the rainfall LinReg slopes for every year range.
+        None if time_mode is 'monthly' but 'month' is None or if time_mode is 'seasonal' but 'season' is None.
+        """
+        rainfall_instance = self.get_entity_for_time_mode(
+            time_mode, month, season, window
+        )
+        if rainfall_instance is None:
+            return None
+
+        return plot.get_heatmap_figure_of_rainfall_linreg_slopes(
+            rainfall_instance,
+            begin_year=begin_year,
+            end_year=end_year,
+        )
+
     def get_bar_figure_of_relative_distance_to_normal(
         self,
         time_mode: TimeMode,
@@ -497,7 +1217,7 @@ class AllRainfall:
         normal_year: int,
         begin_year: int,
         end_year: int,
-    ) -> go.Figure | None:
+    ) -> "go.Figure | None":
         """
         Return a bar graphic displaying relative distances to normal for each month or each season.
 
@@ -540,7 +1260,8 @@ class AllRainfall:
         end_year: int,
         month: Month | None = None,
         season: Season | None = None,
-    ) -> go.Figure | None:
+        window: MonthWindow | None = None,
+    ) -> "go.Figure | None":
         """
         Return plotly pie figure displaying the percentage of years above and below normal for the given time mode,
         between the given years, and for the normal computed from the given year.
@@ -556,22 +1277,14 @@ class AllRainfall:
         Set if time_mode is 'monthly' (optional).
         :param season: A Season Enum: ['winter', 'spring', 'summer', 'fall'].
         Set if time_mode is 'seasonal' (optional).
+        :param window: A MonthWindow of consecutive months summed instead of a season,
+        e.g. a hydrological year; set if time_mode is 'seasonal' (optional).
         :return: A plotly Figure object of the percentage of years above and below normal as a pie chart.
         None if time_mode is 'monthly' but 'month' is None or if time_mode is 'seasonal' but 'season' is None.
         """
-        rainfall_instance: (
-            models.YearlyRainfall
-            | models.MonthlyRainfall
-            | models.SeasonalRainfall
-            | None
-        ) = None
-        if time_mode == TimeMode.YEARLY:
-            rainfall_instance = self.yearly_rainfall
-        elif time_mode == TimeMode.MONTHLY and month:
-            rainfall_instance = self.monthly_rainfalls[month.value]
-        elif time_mode == TimeMode.SEASONAL and season:
-            rainfall_instance = self.seasonal_rainfalls[season.value]
-
+        rainfall_instance = self.get_entity_for_time_mode(
+            time_mode, month, season, window
+        )
         if rainfall_instance is None:
             return None
 
@@ -587,30 +1300,35 @@ class AllRainfall:
         time_mode: TimeMode,
         month: Month | None = None,
         season: Season | None = None,
+        window: MonthWindow | None = None,
     ) -> Union[
         "models.YearlyRainfall",
         "models.MonthlyRainfall",
         "models.SeasonalRainfall",
+        "models.WindowRainfall",
         None,
     ]:
         """
         Retrieve current entity for specified time mode,
-        amongst instances of YearlyRainfall, MonthlyRainfall or SeasonsalRainfall.
-        Month or Season should be specified according to time mode.
+        amongst instances of YearlyRainfall, MonthlyRainfall, SeasonsalRainfall or WindowRainfall.
+        Month or Season should be specified according to time mode; a window takes precedence over a season.
 
         :param time_mode: A TimeMode Enum: ['yearly', 'monthly', 'seasonal'].
         :param month: A Month Enum: ['January', 'February', ..., 'December']
         Set if time_mode is 'monthly' (optional).
         :param season: A Season Enum: ['winter', 'spring', 'summer', 'fall'].
         Set if time_mode is 'seasonal' (optional).
+        :param window: A MonthWindow of consecutive months summed instead of a season,
+        e.g. a hydrological year; set if time_mode is 'seasonal' (optional).
         :return: Corresponding entity as a class instance.
         None if time mode is unknown, time mode is 'monthly' and month is None
-        or time mode is 'seasonal' and season is None.
+        or time mode is 'seasonal' and both season and window are None.
         """
         entity: (
             models.YearlyRainfall
             | models.MonthlyRainfall
             | models.SeasonalRainfall
+            | models.WindowRainfall
             | None
         ) = None
 
@@ -618,6 +1336,8 @@ class AllRainfall:
             entity = self.yearly_rainfall
         elif time_mode == TimeMode.MONTHLY and month:
             entity = self.monthly_rainfalls[month.value]
+        elif time_mode == TimeMode.SEASONAL and window:
+            entity = self.get_window_rainfall(window)
         elif time_mode == TimeMode.SEASONAL and season:
             entity = self.seasonal_rainfalls[season.value]
 
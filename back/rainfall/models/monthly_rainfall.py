@@ -2,11 +2,16 @@
 Provides a rich class to manipulate Monthly Rainfall data.
 """
 
+from typing import TYPE_CHECKING
+
 import pandas as pd
-import plotly.graph_objs as go
 
 from back.rainfall.models.yearly_rainfall import YearlyRainfall
 from back.rainfall.utils import Month
+from back.rainfall.utils.accumulators import RainfallAccumulators
+
+if TYPE_CHECKING:
+    import plotly.graph_objs as go
 
 
 class MonthlyRainfall(YearlyRainfall):
@@ -21,21 +26,31 @@ class MonthlyRainfall(YearlyRainfall):
         *,
         start_year: int,
         round_precision: int,
+        preloaded_data: pd.DataFrame | None = None,
+        preloaded_accumulators: RainfallAccumulators | None = None,
     ):
         self.month = month
         super().__init__(
-            raw_data, start_year=start_year, round_precision=round_precision
+            raw_data,
+            start_year=start_year,
+            round_precision=round_precision,
+            preloaded_data=preloaded_data,
+            preloaded_accumulators=preloaded_accumulators,
         )
 
-    def load_yearly_rainfall(self) -> pd.DataFrame:
+    def load_yearly_rainfall(
+        self, raw_data: pd.DataFrame | None = None
+    ) -> pd.DataFrame:
         """
         Load Yearly Rainfall for instance month variable into pandas DataFrame.
 
+        :param raw_data: Rows of raw data to load (optional).
+        If not given, raw_data attribute of instance is loaded.
         :return: A pandas DataFrame displaying rainfall data (in mm)
         for instance month according to year.
         """
 
-        return self.load_rainfall(self.month)
+        return self.load_rainfall(self.month, raw_data=raw_data)
 
     def get_bar_figure_of_rainfall_according_to_year(
         self,
@@ -46,7 +61,10 @@ class MonthlyRainfall(YearlyRainfall):
         trace_label: str | None = None,
         plot_average=False,
         plot_linear_regression=False,
-    ) -> go.Figure | None:
+        plot_change_points=False,
+        penalty_factor=1.0,
+        max_points: int | None = None,
+    ) -> "go.Figure | None":
         """
         Overrides parent method by customizing figure and trace labels.
         """
@@ -58,4 +76,7 @@ class MonthlyRainfall(YearlyRainfall):
             trace_label=f"{self.month.value} rainfall",
             plot_average=plot_average,
             plot_linear_regression=plot_linear_regression,
+            plot_change_points=plot_change_points,
+            penalty_factor=penalty_factor,
+            max_points=max_points,
         )
@@ -2,16 +2,23 @@
 Provides a rich class to manipulate Seasonal Rainfall data.
 """
 
+from typing import TYPE_CHECKING
+
 import pandas as pd
-import plotly.graph_objs as go
 
-from back.rainfall.models.yearly_rainfall import YearlyRainfall
+from back.rainfall.models.window_rainfall import WindowRainfall
 from back.rainfall.utils import Season
+from back.rainfall.utils.accumulators import RainfallAccumulators
+from back.rainfall.utils.month_windows import MonthWindow
+
+if TYPE_CHECKING:
+    import plotly.graph_objs as go
 
 
-class SeasonalRainfall(YearlyRainfall):
+class SeasonalRainfall(WindowRainfall):
     """
     Provides numerous functions to load, manipulate and export Seasonal Rainfall data.
+    Winter of a year lasts from December of the former year to February.
     """
 
     def __init__(
@@ -21,24 +28,18 @@ class SeasonalRainfall(YearlyRainfall):
         *,
         start_year: int,
         round_precision: int,
+        preloaded_data: pd.DataFrame | None = None,
+        preloaded_accumulators: RainfallAccumulators | None = None,
     ):
         self.season = season
+        months = season.get_months()
         super().__init__(
-            raw_data, start_year=start_year, round_precision=round_precision
-        )
-
-    def load_yearly_rainfall(self) -> pd.DataFrame:
-        """
-        Load Yearly Rainfall for instance season variable into pandas DataFrame.
-
-        :return: A pandas DataFrame displaying rainfall data (in mm)
-        for instance season according to year.
-        """
-        months = self.season.get_months()
-
-        return self.load_rainfall(
-            months[0],
-            months[-1],
+            raw_data,
+            MonthWindow.from_months(months[0], months[-1]),
+            start_year=start_year,
+            round_precision=round_precision,
+            preloaded_data=preloaded_data,
+            preloaded_accumulators=preloaded_accumulators,
         )
 
     def get_bar_figure_of_rainfall_according_to_year(
@@ -50,7 +51,10 @@ class SeasonalRainfall(YearlyRainfall):
         trace_label: str | None = None,
         plot_average=False,
         plot_linear_regression=False,
-    ) -> go.Figure | None:
+        plot_change_points=False,
+        penalty_factor=1.0,
+        max_points: int | None = None,
+    ) -> "go.Figure | None":
         """
         Overrides parent method by customizing figure and trace labels.
         """
@@ -62,4 +66,7 @@ class SeasonalRainfall(YearlyRainfall):
             trace_label=f"{self.season.value.capitalize()} rainfall",
             plot_average=plot_average,
             plot_linear_regression=plot_linear_regression,
+            plot_change_points=plot_change_points,
+            penalty_factor=penalty_factor,
+            max_points=max_points,
         )
@@ -0,0 +1,118 @@
+"""
+Provides a rich class to manipulate rainfall data summed over a window of consecutive months.
+"""
+
+from typing import TYPE_CHECKING
+
+import pandas as pd
+
+from back.rainfall.models.yearly_rainfall import YearlyRainfall
+from back.rainfall.utils import DataFormatError, Label, Month
+from back.rainfall.utils import dataframe_operations as df_opr
+from back.rainfall.utils.accumulators import RainfallAccumulators
+from back.rainfall.utils.month_windows import MonthWindow
+
+if TYPE_CHECKING:
+    import plotly.graph_objs as go
+
+
+class WindowRainfall(YearlyRainfall):
+    """
+    Provides numerous functions to load, manipulate and export rainfall data
+    summed over a window of consecutive months, e.g. a hydrological year or a custom season.
+    A window spanning two years belongs to the year of its last month.
+    """
+
+    def __init__(
+        self,
+        raw_data: pd.DataFrame,
+        window: MonthWindow,
+        *,
+        start_year: int,
+        round_precision: int,
+        preloaded_data: pd.DataFrame | None = None,
+        preloaded_accumulators: RainfallAccumulators | None = None,
+    ):
+        self.window = window
+        super().__init__(
+            raw_data,
+            start_year=start_year,
+            round_precision=round_precision,
+            preloaded_data=preloaded_data,
+            preloaded_accumulators=preloaded_accumulators,
+        )
+
+    def load_yearly_rainfall(
+        self, raw_data: pd.DataFrame | None = None
+    ) -> pd.DataFrame:
+        """
+        Load Yearly Rainfall for instance window variable into pandas DataFrame.
+
+        :param raw_data: Rows of raw data to load (optional).
+        If not given, raw_data attribute of instance is loaded.
+        :return: A pandas DataFrame displaying rainfall data (in mm)
+        for instance window according to year.
+        :raise DataFormatError: If raw data doesn't have exactly 13 columns.
+        1 for the year; 12 for every monthly rainfall.
+        """
+        if raw_data is None:
+            raw_data = self.raw_data
+
+        if not isinstance(raw_data, pd.DataFrame) or len(raw_data.columns) != 1 + len(
+            Month
+        ):
+            raise DataFormatError(
+                "[Year, Jan_rain, Feb_rain, ..., Dec_rain] (pandas DataFrame)"
+            )
+
+        return df_opr.retrieve_rainfall_data_within_window(
+            raw_data,
+            window=self.window,
+            starting_year=self.starting_year,
+            round_precision=self.round_precision,
+        )
+
+    def _load_updated_yearly_rainfall(
+        self, raw_data: pd.DataFrame, updated_raw_data: pd.DataFrame
+    ) -> pd.DataFrame:
+        if not self.window.spans_two_years:
+            return super()._load_updated_yearly_rainfall(raw_data, updated_raw_data)
+
+        # Rainfall of a year also depends upon the former year, and changes that of the next year
+        years = raw_data.iloc[:, 0]
+        updated_years = updated_raw_data.iloc[:, 0]
+        is_changed = years.isin(updated_years) | years.isin(updated_years + 1)
+        data = self.load_yearly_rainfall(
+            raw_data[is_changed | years.isin(updated_years - 1)]
+        )
+
+        return data[data[Label.YEAR.value].isin(years[is_changed])]
+
+    def get_bar_figure_of_rainfall_according_to_year(
+        self,
+        begin_year: int,
+        end_year: int,
+        *,
+        figure_label: str | None = None,
+        trace_label: str | None = None,
+        plot_average=False,
+        plot_linear_regression=False,
+        plot_change_points=False,
+        penalty_factor=1.0,
+        max_points: int | None = None,
+    ) -> "go.Figure | None":
+        """
+        Overrides parent method by customizing figure and trace labels.
+        """
+        return super().get_bar_figure_of_rainfall_according_to_year(
+            begin_year,
+            end_year,
+            figure_label=figure_label
+            or f"Rainfall (mm) from {self.window} between {begin_year} and {end_year}",
+            trace_label=trace_label or f"{self.window} rainfall",
+            plot_average=plot_average,
+            plot_linear_regression=plot_linear_regression,
+            plot_change_points=plot_change_points,
+            penalty_factor=penalty_factor,
+            max_points=max_points,
+        )
@@ -2,23 +2,28 @@
 Provides a rich class to manipulate Yearly Rainfall data.
 """
 
+import copy
 import operator as opr
+from concurrent.futures import Executor
 from pathlib import Path
+from typing import Any, Self
 
 import numpy as np
 import pandas as pd
 import plotly.graph_objs as go
 from pydantic import PositiveFloat
-from scipy import signal
-from sklearn.cluster import KMeans
-from sklearn.linear_model import LinearRegression
-from sklearn.metrics import r2_score
 
 from back.rainfall.utils import (
     DataFormatError,
     Label,
     Month,
 )
+from back.rainfall.utils import (
+    bootstrap as boot,
+)
+from back.rainfall.utils import (
+    change_points as cp,
+)
 from back.rainfall.utils import (
     dataframe_operations as df_opr,
 )
@@ -28,6 +33,11 @@ from back.rainfall.utils import (
 from back.rainfall.utils import (
     rainfall_metrics as rain,
 )
+from back.rainfall.utils.accumulators import (
+    RainfallAccumulators,
+    is_near_rounding_tie,
+)
+from back.rainfall.utils.derived_columns import DerivedColumns
 
 
 class YearlyRainfall:
@@ -41,26 +51,81 @@ class YearlyRainfall:
         *,
         start_year: int,
         round_precision: int,
+        preloaded_data: pd.DataFrame | None = None,
+        preloaded_accumulators: RainfallAccumulators | None = None,
     ):
         self.raw_data = raw_data
         self.starting_year = start_year
         self.round_precision = round_precision
-        self.data = self.load_yearly_rainfall()
+        self.derived_columns = DerivedColumns(
+            self.load_yearly_rainfall() if preloaded_data is None else preloaded_data
+        )
+        self._accumulators: RainfallAccumulators | None = preloaded_accumulators
 
     def __str__(self):
         return self.data.to_string()
 
-    def load_yearly_rainfall(self) -> pd.DataFrame:
+    @property
+    def data(self) -> pd.DataFrame:
+        """
+        Snapshot of Yearly Rainfall data with every derived column that has been added.
+        Adding or removing a column replaces the snapshot instead of modifying it:
+        do not mutate it, and retrieve it once when reading it several times.
+
+        :return: A pandas DataFrame displaying rainfall data (in mm) according to year.
+        """
+
+        return self.derived_columns.snapshot
+
+    @property
+    def accumulators(self) -> RainfallAccumulators:
+        """
+        Running sums of rainfall according to year, built upon first access.
+
+        :return: A RainfallAccumulators instance.
+        """
+        if self._accumulators is None:
+            self._accumulators = RainfallAccumulators.from_data(
+                self.derived_columns.base_data
+            )
+
+        return self._accumulators
+
+    def get_memory_usage(self) -> dict[str, Any]:
+        """
+        Compute memory used by data, its snapshot with derived columns, memoized derived values
+        and accumulators once built, in bytes.
+
+        :return: A dict with bytes of base data, of snapshot, of each memoized derived values,
+        of accumulators and their total.
+        """
+        memory_usage = self.derived_columns.get_memory_usage()
+        memory_usage["accumulators"] = (
+            0 if self._accumulators is None else self._accumulators.nbytes
+        )
+        memory_usage["total"] += memory_usage["accumulators"]
+
+        return memory_usage
+
+    def load_yearly_rainfall(
+        self, raw_data: pd.DataFrame | None = None
+    ) -> pd.DataFrame:
         """
         Load Yearly Rainfall into pandas DataFrame.
 
+        :param raw_data: Rows of raw data to load (optional).
+        If not given, raw_data attribute of instance is loaded.
         :return: A pandas DataFrame displaying rainfall data (in mm) according to year.
         """
 
-        return self.load_rainfall(Month.JANUARY, Month.DECEMBER)
+        return self.load_rainfall(Month.JANUARY, Month.DECEMBER, raw_data=raw_data)
 
     def load_rainfall(
-        self, start_month: Month, end_month: Month | None = None
+        self,
+        start_month: Month,
+        end_month: Month | None = None,
+        *,
+        raw_data: pd.DataFrame | None = None,
     ) -> pd.DataFrame:
         """
         Generic function to load Yearly Rainfall data from raw data stored in pandas DataFrame.
@@ -71,25 +136,71 @@ class YearlyRainfall:
         :param end_month: A Month Enum representing the month
         to end getting our rainfall values (optional).
         If not given, we load rainfall data only for given start_month.
+        :param raw_data: Rows of raw data to load (optional).
+        If not given, raw_data attribute of instance is loaded.
         :return: A pandas DataFrame displaying rainfall data (in mm) according to year.
-        :raise DataFormatError: If raw_data attribute of instance doesn't have exactly 13 columns.
+        :raise DataFormatError: If raw data doesn't have exactly 13 columns.
         1 for the year; 12 for every monthly rainfall.
         """
-        if not isinstance(self.raw_data, pd.DataFrame) or len(
-            self.raw_data.columns
-        ) != 1 + len(Month):
+        if raw_data is None:
+            raw_data = self.raw_data
+
+        if not isinstance(raw_data, pd.DataFrame) or len(raw_data.columns) != 1 + len(
+            Month
+        ):
             raise DataFormatError(
                 "[Year, Jan_rain, Feb_rain, ..., Dec_rain] (pandas DataFrame)"
             )
 
         return df_opr.retrieve_rainfall_data_with_constraints(
-            self.raw_data,
+            raw_data,
             starting_year=self.starting_year,
             round_precision=self.round_precision,
             start_month=start_month.get_rank(),
             end_month=end_month.get_rank() if end_month else None,
         )
 
+    def apply_update(
+        self, raw_data: pd.DataFrame, updated_raw_data: pd.DataFrame
+    ) -> Self:
+        """
+        Build a model upon updated raw data by loading updated rows only:
+        years already loaded are patched, later ones are appended.
+        Derived columns are not carried over as they depend on every year;
+        accumulators, if already built, are updated from the first changed year.
+
+        :param raw_data: Every row of raw data, once updated.
+        :param updated_raw_data: Rows of raw data that have been patched or appended.
+        :return: A model of the same class; the present instance is left untouched.
+        """
+        updated_data = self._load_updated_yearly_rainfall(raw_data, updated_raw_data)
+        base_data = self.derived_columns.base_data
+        loaded_years = base_data[Label.YEAR.value].to_numpy()
+        years = updated_data[Label.YEAR.value].to_numpy()
+        rainfall = updated_data[Label.RAINFALL.value].to_numpy()
+
+        positions = np.searchsorted(loaded_years, years)
+        is_patched = positions < len(loaded_years)
+        data = base_data.copy()
+        data.iloc[positions[is_patched], data.columns.get_loc(Label.RAINFALL.value)] = (
+            rainfall[is_patched]
+        )
+        data = pd.concat([data, updated_data[~is_patched]])
+
+        model = copy.copy(self)
+        model.raw_data = raw_data
+        model.derived_columns = DerivedColumns(data)
+        if self._accumulators is not None:
+            model._accumulators = self._accumulators.update(years, rainfall)
+
+        return model
+
+    def _load_updated_yearly_rainfall(
+        self, raw_data: pd.DataFrame, updated_raw_data: pd.DataFrame
+    ) -> pd.DataFrame:
+        # Rainfall of a year only depends upon its own row
+        return self.load_yearly_rainfall(updated_raw_data)
+
     def get_yearly_rainfall(self, begin_year: int, end_year: int) -> pd.DataFrame:
         """
         Retrieves Yearly Rainfall within a specific year range.
@@ -139,6 +250,10 @@ class YearlyRainfall:
         to end getting our rainfall values.
         :return: A float representing the average Rainfall.
         """
+        average = self.accumulators.get_average(begin_year, end_year)
+        # Rounding of sums near a tie may depend on summation order: pandas decides
+        if not is_near_rounding_tie(average, self.round_precision):
+            return np.round(average, self.round_precision)
 
         return rain.get_average_rainfall(
             self.get_yearly_rainfall(begin_year, end_year),
@@ -153,6 +268,9 @@ class YearlyRainfall:
         to start from to compute our normal.
         :return: A float storing the normal.
         """
+        normal = self.accumulators.get_normal(begin_year)
+        if not is_near_rounding_tie(normal, self.round_precision):
+            return np.round(normal, self.round_precision)
 
         return rain.get_normal(
             self.data, begin_year, round_precision=self.round_precision
@@ -315,10 +433,12 @@ class YearlyRainfall:
         :return: The standard deviation as a float.
         Nothing if the specified column does not exist.
         """
-        if label not in self.data.columns:
+        if label not in (yearly_rainfall := self.data).columns:
             return None
 
-        data = self.get_yearly_rainfall(begin_year, end_year)[label]
+        data = df_opr.get_rainfall_within_year_interval(
+            yearly_rainfall, begin_year=begin_year, end_year=end_year
+        )[label]
 
         standard_deviation = data.std()
         if weigh_by_average:
@@ -343,6 +463,9 @@ class YearlyRainfall:
         :return: a tuple containing a tuple of floats (r2 score, slope)
         and a list of rainfall values computed by the linear regression.
         """
+        from sklearn.linear_model import LinearRegression
+        from sklearn.metrics import r2_score
+
         data = self.get_yearly_rainfall(begin_year, end_year)
 
         years = data[Label.YEAR.value].values.reshape(-1, 1)  # type: ignore
@@ -360,6 +483,164 @@ class YearlyRainfall:
             round(lin_reg.coef_[0], self.round_precision),
         ), predicted_rainfalls
 
+    def get_confidence_interval(
+        self,
+        statistic: boot.Statistic,
+        begin_year: int,
+        end_year: int,
+        *,
+        replicates=1000,
+        confidence=0.95,
+        seed=0,
+        executor: Executor | None = None,
+    ) -> tuple[float, float]:
+        """
+        Computes bootstrap confidence interval of rainfall average or of linear regression slope
+        for a given time interval; for a normal, time interval spans 30 years.
+        Values are memoized per year range and bootstrap parameters.
+
+        :param statistic: A Statistic Enum: ['average', 'linear_regression'].
+        :param begin_year: An integer representing the year
+        to start getting our rainfall values.
+        :param end_year: An integer representing the year
+        to end getting our rainfall values.
+        :param replicates: Number of bootstrap replicates. Defaults to 1000.
+        :param confidence: Probability covered by confidence interval. Defaults to 0.95.
+        :param seed: Seed of the random generator. Defaults to 0.
+        :param executor: An executor, e.g. a process pool, to run chunks of replicates in parallel (optional).
+        :return: A tuple of floats: lower and upper bounds. NaN if statistic cannot be computed.
+        """
+
+        def compute_confidence_interval() -> list[float]:
+            data = self.get_yearly_rainfall(begin_year, end_year)
+            lower_bounds, upper_bounds = boot.get_confidence_intervals(
+                data[Label.YEAR.value].to_numpy(),
+                data[Label.RAINFALL.value].to_numpy(),
+                statistic,
+                replicates=replicates,
+                confidence=confidence,
+                seed=seed,
+                executor=executor,
+            )
+
+            return [
+                round(lower_bounds[0], self.round_precision),
+                round(upper_bounds[0], self.round_precision),
+            ]
+
+        lower_bound, upper_bound = self.derived_columns.get(
+            Label.CONFIDENCE_INTERVAL,
+            compute_confidence_interval,
+            statistic=statistic.value,
+            begin_year=begin_year,
+            end_year=end_year,
+            replicates=replicates,
+            confidence=confidence,
+            seed=seed,
+        ).tolist()
+
+        return lower_bound, upper_bound
+
+    def get_change_points(
+        self, begin_year: int, end_year: int, *, penalty_factor=1.0
+    ) -> pd.DataFrame:
+        """
+        Detects regime shifts of rainfall for a given time interval with PELT:
+        rainfall is split into segments of at least 5 years with different averages.
+
+        :param begin_year: An integer representing the year
+        to start getting our rainfall values.
+        :param end_year: An integer representing the year
+        to end getting our rainfall values.
+        :param penalty_factor: A factor of the default penalty of a change:
+        the higher, the fewer changes. Defaults to 1.0.
+        :return: A pandas DataFrame with a row per segment: its first and last years and its average rainfall.
+        The first year of every segment but the first one is a change year.
+        """
+        segments = cp.get_segments(
+            {"": self.get_yearly_rainfall(begin_year, end_year)},
+            penalty_factors=(penalty_factor,),
+            round_precision=self.round_precision,
+        )
+
+        return segments.drop(columns=Label.PENALTY_FACTOR.value).reset_index(drop=True)
+
+    def get_percentage_of_normal(
+        self, begin_year: int, end_year: int
+    ) -> np.ndarray | None:
+        """
+        Computes the percentage of rainfall compared with normal for every year,
+        normal being the average rainfall of a specific year range.
+        Values are memoized per year range.
+
+        :param begin_year: An integer representing the year
+        to start getting our rainfall values.
+        :param end_year: An integer representing the year
+        to end getting our rainfall values.
+        :return: A read-only numpy array of percentages, one per year.
+        None if normal is null.
+        """
+        normal = self.get_average_yearly_rainfall(begin_year, end_year)
+        if normal == 0.0:
+            return None
+
+        return self.derived_columns.get(
+            Label.PERCENTAGE_OF_NORMAL,
+            lambda: round(
+                self.derived_columns.snapshot[Label.RAINFALL.value] / normal * 100.0,
+                self.round_precision,
+            ),
+            begin_year=begin_year,
+            end_year=end_year,
+        )
+
+    def get_linear_regression_values(self) -> np.ndarray:
+        """
+        Computes Linear Regression of Rainfall according to Year for every year.
+        Values are memoized.
+
+        :return: A read-only numpy array of rainfall values computed by the linear regression, one per year.
+        """
+
+        return self.derived_columns.get(
+            Label.LINEAR_REGRESSION,
+            lambda: self.get_linear_regression(
+                self.starting_year, self.get_last_year()
+            )[1],
+        )
+
+    def get_savgol_filter(self) -> np.ndarray:
+        """
+        Computes Savitzky–Golay filter of Rainfall according to Year for every year.
+        Values are memoized.
+
+        :return: A read-only numpy array of filtered rainfall values, one per year.
+        """
+
+        return self.derived_columns.get(
+            Label.SAVITZKY_GOLAY_FILTER,
+            lambda: rain.get_savgol_filter(
+                self.derived_columns.snapshot, round_precision=self.round_precision
+            ),
+        )
+
+    def get_kmeans_labels(self, kmeans_clusters=4) -> np.ndarray:
+        """
+        Computes K-Mean clustering of Rainfall according to Year.
+        Values are memoized per number of clusters.
+
+        :param kmeans_clusters: The number of clusters to compute. Defaults to 4.
+        :return: A read-only numpy array of cluster labels, one per year.
+        """
+
+        return self.derived_columns.get(
+            Label.KMEANS,
+            lambda: rain.get_kmeans_labels(
+                self.derived_columns.snapshot, kmeans_clusters=kmeans_clusters
+            ),
+            kmeans_clusters=kmeans_clusters,
+        )
+
     def add_percentage_of_normal(self, begin_year: int, end_year: int) -> None:
         """
         Add the percentage of rainfall compared with normal
@@ -371,13 +652,11 @@ class YearlyRainfall:
         to end getting our rainfall values.
         :return: None
         """
-        normal = self.get_average_yearly_rainfall(begin_year, end_year)
-        if normal == 0.0:
+        percentage_of_normal = self.get_percentage_of_normal(begin_year, end_year)
+        if percentage_of_normal is None:
             return None
 
-        self.data[Label.PERCENTAGE_OF_NORMAL.value] = round(
-            self.data[Label.RAINFALL.value] / normal * 100.0, self.round_precision
-        )
+        self.derived_columns.publish(Label.PERCENTAGE_OF_NORMAL, percentage_of_normal)
 
     def add_linear_regression(self) -> tuple[float, float]:
         """
@@ -386,19 +665,15 @@ class YearlyRainfall:
 
         :return: a tuple containing two floats (r2 score, slope).
         """
-        years = self.data[Label.YEAR.value].values.reshape(-1, 1)  # type: ignore
-        rainfalls = self.data[Label.RAINFALL.value].values
+        (r2, slope), _ = self.get_linear_regression(
+            self.starting_year, self.get_last_year()
+        )
 
-        reg = LinearRegression()
-        reg.fit(years, rainfalls)
-        self.data[Label.LINEAR_REGRESSION.value] = reg.predict(years)
-        self.data[Label.LINEAR_REGRESSION.value] = round(
-            self.data[Label.LINEAR_REGRESSION.value], self.round_precision
+        self.derived_columns.publish(
+            Label.LINEAR_REGRESSION, self.get_linear_regression_values()
         )
 
-        return r2_score(
-            rainfalls, self.data[Label.LINEAR_REGRESSION.value].values
-        ), round(reg.coef_[0], self.round_precision)
+        return r2, slope
 
     def add_savgol_filter(self) -> None:
         """
@@ -407,14 +682,8 @@ class YearlyRainfall:
 
         :return: None
         """
-        self.data[Label.SAVITZKY_GOLAY_FILTER.value] = signal.savgol_filter(
-            self.data[Label.RAINFALL.value],
-            window_length=len(self.data),
-            polyorder=len(self.data) // 10,
-        )
-
-        self.data[Label.SAVITZKY_GOLAY_FILTER.value] = round(
-            self.data[Label.SAVITZKY_GOLAY_FILTER.value], self.round_precision
+        self.derived_columns.publish(
+            Label.SAVITZKY_GOLAY_FILTER, self.get_savgol_filter()
         )
 
     def add_kmeans(self, kmeans_clusters=4) -> int:
@@ -425,15 +694,11 @@ class YearlyRainfall:
         :param kmeans_clusters: The number of clusters to compute. Defaults to 4.
         :return: The number of computed clusters as an integer
         """
-        fit_data: np.ndarray = self.data[
-            [Label.YEAR.value, Label.RAINFALL.value]
-        ].values
-
-        kmeans = KMeans(n_init=10, n_clusters=kmeans_clusters)
-        kmeans.fit(fit_data)
-        self.data[Label.KMEANS.value] = kmeans.predict(fit_data)
+        self.derived_columns.publish(
+            Label.KMEANS, self.get_kmeans_labels(kmeans_clusters)
+        )
 
-        return kmeans.n_clusters
+        return kmeans_clusters
 
     def remove_column(self, label: Label) -> bool:
         """
@@ -444,7 +709,7 @@ class YearlyRainfall:
         :return: A boolean set to whether the operation passed or not.
         """
 
-        return df_opr.remove_column(self.data, label=label)
+        return self.derived_columns.discard(label)
 
     def get_bar_figure_of_rainfall_according_to_year(
         self,
@@ -455,7 +720,10 @@ class YearlyRainfall:
         trace_label: str | None = None,
         plot_average=False,
         plot_linear_regression=False,
-    ) -> go.Figure | None:
+        plot_change_points=False,
+        penalty_factor=1.0,
+        max_points: int | None = None,
+    ) -> "go.Figure | None":
         """
         Return bar figure of Rainfall data according to year.
 
@@ -471,9 +739,22 @@ class YearlyRainfall:
         Defaults to False.
         :param plot_linear_regression: Whether to plot linear regression of rainfall or not.
         Defaults to False.
+        :param plot_change_points: Whether to plot averages of regimes between change points or not.
+        Defaults to False.
+        :param penalty_factor: A factor of the default penalty of a change point:
+        the higher, the fewer changes. Defaults to 1.0.
+        :param max_points: Maximum number of years to plot (optional).
+        If set, rainfall is downsampled with the Largest-Triangle-Three-Buckets algorithm,
+        and the ratio between original and plotted years is stored in figure layout meta as 'decimation_ratio'.
         :return: A plotly Figure object if data has been successfully plotted, None otherwise.
         """
-        yearly_rainfall = self.get_yearly_rainfall(begin_year, end_year)
+        yearly_rainfall = original_yearly_rainfall = self.get_yearly_rainfall(
+            begin_year, end_year
+        )
+        if max_points is not None:
+            yearly_rainfall = df_opr.downsample_with_lttb(
+                original_yearly_rainfall, max_points=max_points
+            )
 
         figure = plot.get_figure_of_column_according_to_year(
             yearly_rainfall,
@@ -503,6 +784,16 @@ class YearlyRainfall:
                     linear_regression_values,
                 ) = self.get_linear_regression(begin_year, end_year)
 
+                if max_points is not None:
+                    linear_regression_values = (
+                        pd.Series(
+                            linear_regression_values,
+                            index=original_yearly_rainfall.index,
+                        )
+                        .loc[yearly_rainfall.index]
+                        .tolist()
+                    )
+
                 figure.add_trace(
                     go.Scatter(
                         x=yearly_rainfall[Label.YEAR.value],
@@ -513,15 +804,45 @@ class YearlyRainfall:
                     )
                 )
 
+            if plot_change_points:
+                segments = self.get_change_points(
+                    begin_year, end_year, penalty_factor=penalty_factor
+                )
+                x: list[float | None] = []
+                y: list[float | None] = []
+                for begin, end, average in segments.itertuples(index=False):
+                    x.extend([begin - 0.5, end + 0.5, None])
+                    y.extend([average, average, None])
+
+                change_years = segments[Label.BEGIN_YEAR.value].iloc[1:].tolist()
+                figure.add_trace(
+                    go.Scatter(
+                        x=x,
+                        y=y,
+                        mode="lines",
+                        name=f"{Label.AVERAGE_RAINFALL.value} between change points"
+                        f"<br><i>change years:</i> {', '.join(map(str, change_years)) or 'none'}",
+                    )
+                )
+
             figure.update_yaxes(title_text=f"{Label.RAINFALL.value} (mm)")
 
+            if max_points is not None:
+                figure.update_layout(
+                    meta={
+                        "decimation_ratio": round(
+                            len(original_yearly_rainfall) / len(yearly_rainfall), 2
+                        )
+                    }
+                )
+
         return figure
 
     def get_scatter_figure_of_linear_regression(
         self,
         begin_year: int,
         end_year: int,
-    ) -> go.Figure | None:
+    ) -> "go.Figure | None":
         """
         Return plotly figure with scatter trace of rainfall linear regression according to year.
 
@@ -549,7 +870,7 @@ class YearlyRainfall:
 
         return figure
 
-    def get_scatter_figure_of_savgol_filter(self) -> go.Figure | None:
+    def get_scatter_figure_of_savgol_filter(self) -> "go.Figure | None":
         """
         Return plotly figure with scatter trace of Savitzky-Golay filter according to year.
 
@@ -563,7 +884,9 @@ class YearlyRainfall:
             figure_label=f"{Label.SAVITZKY_GOLAY_FILTER.value} (mm)",
         )
 
-    def get_scatter_figure_of_normal(self, display_clusters=False) -> go.Figure | None:
+    def get_scatter_figure_of_normal(
+        self, display_clusters=False
+    ) -> "go.Figure | None":
         """
         Return plotly figure with horizontal line of normal rainfall according to year and scatter rainfall values.
 
@@ -572,27 +895,31 @@ class YearlyRainfall:
         :return: A plotly Figure object if data has been successfully plotted, None otherwise.
         """
 
+        yearly_rainfall = self.data
+
         figure = go.Figure(
             go.Scatter(
-                x=self.data[Label.YEAR.value],
-                y=[100.0] * len(self.data),
+                x=yearly_rainfall[Label.YEAR.value],
+                y=[100.0] * len(yearly_rainfall),
                 name="Normal rainfall (%)",
             )
         )
 
         if not display_clusters:
             if fig_normal := plot.get_figure_of_column_according_to_year(
-                self.data, Label.PERCENTAGE_OF_NORMAL, figure_type="scatter"
+                yearly_rainfall, Label.PERCENTAGE_OF_NORMAL, figure_type="scatter"
             ):
                 figure.add_traces(list(fig_normal.select_traces()))
             else:
                 return None
         else:
-            for label_value in range(rain.get_clusters_number(self.data)):
+            for label_value in range(rain.get_clusters_number(yearly_rainfall)):
                 if (
                     fig_normal_kmeans_subplot
                     := plot.get_figure_of_column_according_to_year(
-                        self.data[self.data[Label.KMEANS.value] == label_value],
+                        yearly_rainfall[
+                            yearly_rainfall[Label.KMEANS.value] == label_value
+                        ],
                         Label.PERCENTAGE_OF_NORMAL,
                         figure_type="scatter",
                     )
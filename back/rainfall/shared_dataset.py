@@ -0,0 +1,240 @@
+"""
+Provides a read-only rainfall dataset stored in a file that processes map in memory,
+so that API workers share one copy of raw data, rainfall series and their accumulators.
+
+A loader writes the file once; workers attach zero-copy read-only numpy views upon it.
+Writing a new file replaces the former one atomically: processes that attached the former one
+keep reading it until they attach again.
+"""
+
+import json
+import mmap
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+import pandas as pd
+
+from back.rainfall.utils import Label
+from back.rainfall.utils.accumulators import RainfallAccumulators
+
+if TYPE_CHECKING:
+    from back.rainfall import AllRainfall
+
+# Set by the process that wrote the shared dataset, for worker processes to attach it
+SHARED_DATASET_PATH_ENV = "BCN_RAINFALL_SHARED_DATASET_PATH"
+
+# Format version is last byte: files of version 1 hold winters of December of the same year,
+# files of version 2 hold prefix sums of rainfall only instead of accumulators
+MAGIC = b"BCNRAIN\x03"
+ALIGNMENT = 64
+
+
+def _align(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def _get_arrays_start(header_size: int) -> int:
+    # Magic bytes, header size on 8 bytes, then header
+    return _align(len(MAGIC) + 8 + header_size)
+
+
+def write_shared_dataset(all_rainfall: "AllRainfall", path: str | Path) -> Path:
+    """
+    Write raw data and rainfall series of every model into a file to be shared,
+    along with prefix sums and normals of their accumulators.
+    File is written aside then renamed, to atomically replace any former one.
+
+    :param all_rainfall: An AllRainfall instance whose models have not been altered.
+    :param path: Path to the shared dataset file.
+    :return: Path to the shared dataset file.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    data_by_key = {
+        key: model.load_yearly_rainfall()
+        for key, model in all_rainfall.get_rainfall_models().items()
+    }
+    first_data = next(iter(data_by_key.values()))
+    years = first_data[Label.YEAR.value].to_numpy(dtype=np.int64)
+    series = np.stack(
+        [
+            data[Label.RAINFALL.value].to_numpy(dtype=float)
+            for data in data_by_key.values()
+        ]
+    )
+    accumulators = [RainfallAccumulators(years, rainfall) for rainfall in series]
+
+    raw_data = all_rainfall.raw_data
+    arrays = {
+        "raw_years": raw_data.iloc[:, 0].to_numpy(dtype=np.int64),
+        "raw_rainfall": raw_data.iloc[:, 1:].to_numpy(dtype=float),
+        "index": first_data.index.to_numpy(dtype=np.int64),
+        "years": years,
+        "series": series,
+        "prefix_sums": np.stack(
+            [accumulator.prefix_sums for accumulator in accumulators]
+        ),
+        "normals": np.stack([accumulator.normals for accumulator in accumulators]),
+    }
+
+    header: dict[str, Any] = {
+        "version": all_rainfall.version,
+        "start_year": all_rainfall.starting_year,
+        "round_precision": all_rainfall.round_precision,
+        "raw_columns": [str(column) for column in raw_data.columns],
+        "series_keys": list(data_by_key),
+        "arrays": {},
+    }
+    # Offsets are relative to the start of arrays, which follows header
+    offset = 0
+    for name, array in arrays.items():
+        header["arrays"][name] = {
+            "dtype": array.dtype.str,
+            "shape": list(array.shape),
+            "offset": offset,
+        }
+        offset = _align(offset + array.nbytes)
+
+    header_bytes = json.dumps(header).encode()
+    arrays_start = _get_arrays_start(len(header_bytes))
+
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as file:
+        file.write(MAGIC)
+        file.write(len(header_bytes).to_bytes(8, "little"))
+        file.write(header_bytes)
+        for name, array in arrays.items():
+            file.seek(arrays_start + header["arrays"][name]["offset"])
+            file.write(np.ascontiguousarray(array).tobytes())
+
+        file.truncate(arrays_start + offset)
+        file.flush()
+        os.fsync(file.fileno())
+
+    os.replace(tmp_path, path)
+
+    return path
+
+
+def write_shared_dataset_from_config(path: str | Path, from_file=False) -> Path:
+    """
+    Load rainfall data as configured, then write it into a file to be shared.
+    Meant to be run by a loader process, whose memory is released once done.
+
+    :param path: Path to the shared dataset file.
+    :param from_file: Whether to load data from local file instead of file URL. Defaults to False.
+    :return: Path to the shared dataset file.
+    """
+    from back.rainfall import AllRainfall
+
+    return write_shared_dataset(AllRainfall.from_config(from_file=from_file), path)
+
+
+class SharedDataset:
+    """
+    Read-only rainfall dataset mapped in memory from a file written by write_shared_dataset.
+    Arrays are zero-copy views upon the mapping, which is released once no view remains.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        with open(self.path, "rb") as file:
+            self._inode = os.fstat(file.fileno()).st_ino
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._mmap[: len(MAGIC)] != MAGIC:
+            raise ValueError(f"{self.path} is not a shared rainfall dataset.")
+
+        header_size = int.from_bytes(self._mmap[len(MAGIC) : len(MAGIC) + 8], "little")
+        header = json.loads(self._mmap[len(MAGIC) + 8 : len(MAGIC) + 8 + header_size])
+
+        self.version: str = header["version"]
+        self.start_year: int = header["start_year"]
+        self.round_precision: int = header["round_precision"]
+        self.raw_columns: list[str] = header["raw_columns"]
+        self.series_keys: list[str] = header["series_keys"]
+        arrays_start = _get_arrays_start(header_size)
+        self.arrays: dict[str, np.ndarray] = {
+            name: np.frombuffer(
+                self._mmap,
+                dtype=np.dtype(spec["dtype"]),
+                count=int(np.prod(spec["shape"])),
+                offset=arrays_start + spec["offset"],
+            ).reshape(spec["shape"])
+            for name, spec in header["arrays"].items()
+        }
+
+    @property
+    def years(self) -> np.ndarray:
+        """Years of rainfall series, from start year onwards."""
+        return self.arrays["years"]
+
+    @property
+    def series(self) -> np.ndarray:
+        """Rainfall series, one row per series key, one column per year."""
+        return self.arrays["series"]
+
+    def is_stale(self) -> bool:
+        """
+        Tell whether the shared dataset file has been replaced since it was attached.
+
+        :return: True if another file is now found at the same path, False otherwise.
+        """
+        try:
+            return os.stat(self.path).st_ino != self._inode
+        except FileNotFoundError:
+            return False
+
+    def get_raw_data(self) -> pd.DataFrame:
+        """
+        Build raw data upon shared arrays, without copying them.
+
+        :return: A pandas DataFrame with year and rainfall of each month, as read from the original CSV.
+        """
+        raw_rainfall = self.arrays["raw_rainfall"]
+
+        return pd.DataFrame(
+            {
+                self.raw_columns[0]: self.arrays["raw_years"],
+                **{
+                    column: raw_rainfall[:, rank]
+                    for rank, column in enumerate(self.raw_columns[1:])
+                },
+            },
+            copy=False,
+        )
+
+    def get_data(self, key: str) -> pd.DataFrame:
+        """
+        Build rainfall according to year of a series upon shared arrays, without copying them.
+
+        :param key: Series key, i.e. 'yearly', a month or a season.
+        :return: A pandas DataFrame displaying rainfall data (in mm) according to year.
+        """
+        return pd.DataFrame(
+            {
+                Label.YEAR.value: self.years,
+                Label.RAINFALL.value: self.series[self.series_keys.index(key)],
+            },
+            index=pd.Index(self.arrays["index"]),
+            copy=False,
+        )
+
+    def get_accumulators(self, key: str) -> RainfallAccumulators:
+        """
+        Build accumulators of a series upon shared arrays, without summing nor copying them.
+
+        :param key: Series key, i.e. 'yearly', a month or a season.
+        :return: A RainfallAccumulators instance.
+        """
+        rank = self.series_keys.index(key)
+
+        return RainfallAccumulators.from_arrays(
+            self.years,
+            self.series[rank],
+            self.arrays["prefix_sums"][rank],
+            self.arrays["normals"][rank],
+        )
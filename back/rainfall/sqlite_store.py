@@ -0,0 +1,502 @@
+"""
+Provides an optional storage of rainfall of many weather stations in a local SQLite database.
+
+Monthly rainfall is stored in a table keyed by (station, year, month), which is itself a covering index
+for year ranges, along with a covering index by (station, month, year) for a month or a season.
+Aggregates over year ranges are computed by SQLite, only their results being read:
+a station need not be loaded in memory to be queried.
+Results match those of rainfall models loaded in memory upon the same raw data.
+"""
+
+import json
+import sqlite3
+from itertools import repeat
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from back.rainfall.utils import Label, Month, Season, TimeMode
+from back.rainfall.utils import rainfall_metrics as rain
+from back.rainfall.utils.accumulators import NORMAL_YEARS, is_near_rounding_tie
+from back.rainfall.utils.month_windows import MonthWindow
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS station (
+    station TEXT PRIMARY KEY,
+    raw_columns TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS rainfall (
+    station TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    month INTEGER NOT NULL,
+    rainfall REAL,
+    PRIMARY KEY (station, year, month)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS rainfall_by_month ON rainfall (station, month, year, rainfall);
+"""
+
+
+def _round(value: float | None, round_precision: int) -> float | None:
+    # SQLite rounds half away from zero, models in memory round half to even as numpy does:
+    # numpy scales value then rounds it to an integer, which plain Python does faster upon a single float
+    if value is None:
+        return None
+
+    scale = 10.0**round_precision
+
+    return round(value * scale) / scale
+
+
+class SQLiteRainfallStore:
+    """
+    Rainfall of weather stations persisted in a SQLite database file.
+    A store holds a connection: it should not be shared between threads.
+    """
+
+    def __init__(self, path: str | Path, *, round_precision: int):
+        self.path = Path(path)
+        self.round_precision = round_precision
+        self.connection = sqlite3.connect(self.path)
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute("PRAGMA synchronous = NORMAL")
+        self.connection.executescript(SCHEMA)
+        self.connection.create_function("np_round", 2, _round, deterministic=True)
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def get_stations(self) -> list[str]:
+        """
+        List stored weather stations.
+
+        :return: A list of station identifiers, sorted.
+        """
+        return [
+            station
+            for (station,) in self.connection.execute(
+                "SELECT station FROM station ORDER BY station"
+            )
+        ]
+
+    def insert_raw_data(self, station: str, raw_data: pd.DataFrame) -> int:
+        """
+        Insert raw data of a weather station within a single transaction,
+        replacing months already stored for the same years.
+
+        :param station: A station identifier.
+        :param raw_data: A pandas DataFrame shaped as the original CSV: the year, then rainfall for every month.
+        :return: Number of monthly rows inserted.
+        """
+        years = raw_data.iloc[:, 0].to_numpy(dtype=np.int64)
+        values = raw_data.iloc[:, 1:].to_numpy(dtype=float)
+        # Missing values are stored as NULL
+        objects = values.astype(object)
+        objects[np.isnan(values)] = None
+
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO station VALUES (?, ?)",
+                (station, json.dumps([str(column) for column in raw_data.columns])),
+            )
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO rainfall VALUES (?, ?, ?, ?)",
+                zip(
+                    repeat(station),
+                    np.repeat(years, len(Month)).tolist(),
+                    np.tile(np.arange(1, len(Month) + 1), len(years)).tolist(),
+                    objects.ravel().tolist(),
+                ),
+            )
+
+        return values.size
+
+    def get_raw_data(self, station: str) -> pd.DataFrame:
+        """
+        Read raw data of a weather station back.
+
+        :param station: A station identifier.
+        :return: A pandas DataFrame shaped as the original CSV, with its column labels.
+        :raise KeyError: If station is not stored.
+        """
+        row = self.connection.execute(
+            "SELECT raw_columns FROM station WHERE station = ?", (station,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(station)
+
+        raw_columns = json.loads(row[0])
+        rows = self.connection.execute(
+            "SELECT year, month, rainfall FROM rainfall WHERE station = ? ORDER BY year, month",
+            (station,),
+        ).fetchall()
+        years = np.array([year for year, _, _ in rows], dtype=np.int64)
+        unique_years, positions = np.unique(years, return_inverse=True)
+        values = np.full((len(unique_years), len(Month)), np.nan)
+        values[positions, [month - 1 for _, month, _ in rows]] = np.array(
+            [rainfall for _, _, rainfall in rows], dtype=float
+        )
+
+        return pd.DataFrame(
+            {
+                raw_columns[0]: unique_years,
+                **{
+                    column: values[:, rank]
+                    for rank, column in enumerate(raw_columns[1:])
+                },
+            }
+        )
+
+    def get_all_rainfall(self, station: str, *, start_year: int):
+        """
+        Load rainfall models of a weather station in memory.
+
+        :param station: A station identifier.
+        :param start_year: An integer representing the year to start getting our rainfall values.
+        :return: An AllRainfall instance.
+        """
+        from back.rainfall import AllRainfall
+
+        return AllRainfall.from_raw_data(
+            self.get_raw_data(station),
+            start_year=start_year,
+            round_precision=self.round_precision,
+            dataset_url=f"{self.path}#{station}",
+        )
+
+    @staticmethod
+    def _get_window(
+        time_mode: TimeMode, month: Month | None, season: Season | None
+    ) -> MonthWindow | None:
+        if time_mode == TimeMode.YEARLY:
+            return MonthWindow(Month.DECEMBER, len(Month))
+        if time_mode == TimeMode.MONTHLY and month:
+            return MonthWindow(month, 1)
+        if time_mode == TimeMode.SEASONAL and season:
+            months = season.get_months()
+
+            return MonthWindow.from_months(months[0], months[-1])
+
+        return None
+
+    def _query_yearly_rainfall(
+        self,
+        select: str,
+        station: str,
+        window: MonthWindow,
+        *,
+        begin_year: int,
+        end_year: int,
+        parameters: tuple = (),
+    ) -> sqlite3.Cursor:
+        # Rainfall of each year is rounded before being aggregated, as in models loaded in memory;
+        # months after the last one of a window spanning two years belong to the next year,
+        # whose rainfall is missing if the former year is
+        months = [month.get_rank() for month in window.get_months()]
+        is_spanning = window.spans_two_years
+
+        return self.connection.execute(
+            f"""
+            WITH yearly_rainfall (year, rainfall) AS (
+                SELECT
+                    year + (month > ?) AS window_year,
+                    CASE WHEN COUNT(*) = ? THEN np_round(TOTAL(rainfall), ?) END
+                FROM rainfall
+                WHERE station = ? AND month IN ({", ".join("?" * len(months))})
+                AND year BETWEEN ? AND ?
+                GROUP BY window_year
+                HAVING window_year BETWEEN ? AND ?
+            )
+            SELECT {select} FROM yearly_rainfall
+            """,
+            (
+                window.end_month.get_rank() if is_spanning else len(Month),
+                window.length,
+                self.round_precision,
+                station,
+                *months,
+                begin_year - is_spanning,
+                end_year,
+                begin_year,
+                end_year,
+                *parameters,
+            ),
+        )
+
+    def _get_average(
+        self,
+        station: str,
+        window: MonthWindow,
+        *,
+        begin_year: int,
+        end_year: int,
+        round_precision: int,
+    ) -> float:
+        average = self._query_yearly_rainfall(
+            "AVG(rainfall)", station, window, begin_year=begin_year, end_year=end_year
+        ).fetchone()[0]
+        if average is None:
+            return float("nan")
+
+        # Rounding of sums near a tie may depend on summation order: pandas decides
+        if not is_near_rounding_tie(average, round_precision):
+            return float(np.round(average, round_precision))
+
+        return float(
+            rain.get_average_rainfall(
+                self._get_yearly_rainfall(
+                    station, window, begin_year=begin_year, end_year=end_year
+                ),
+                round_precision=round_precision,
+            )
+        )
+
+    def _get_yearly_rainfall(
+        self, station: str, window: MonthWindow, *, begin_year: int, end_year: int
+    ) -> pd.DataFrame:
+        rows = self._query_yearly_rainfall(
+            "year, rainfall", station, window, begin_year=begin_year, end_year=end_year
+        ).fetchall()
+
+        return (
+            pd.DataFrame(rows, columns=[Label.YEAR.value, Label.RAINFALL.value])
+            .astype({Label.YEAR.value: np.int64, Label.RAINFALL.value: float})
+            .sort_values(Label.YEAR.value, ignore_index=True)
+        )
+
+    def get_yearly_rainfall(
+        self,
+        station: str,
+        time_mode: TimeMode,
+        *,
+        begin_year: int,
+        end_year: int,
+        month: Month | None = None,
+        season: Season | None = None,
+    ) -> pd.DataFrame | None:
+        """
+        Read rainfall according to year of a weather station for a specific year range and time mode.
+
+        :param station: A station identifier.
+        :param time_mode: A TimeMode Enum: ['yearly', 'monthly', 'seasonal'].
+        :param begin_year: An integer representing the year
+        to start getting our rainfall values.
+        :param end_year: An integer representing the year
+        to end getting our rainfall values.
+        :param month: A Month Enum: ['January', 'February', ..., 'December']
+        Set if time_mode is 'monthly' (optional).
+        :param season: A Season Enum: ['winter', 'spring', 'summer', 'fall'].
+        Set if time_mode is 'seasonal' (optional).
+        :return: A pandas DataFrame displaying rainfall data (in mm) according to year.
+        None if month or season is missing for time mode.
+        """
+        window = self._get_window(time_mode, month, season)
+        if window is None:
+            return None
+
+        return self._get_yearly_rainfall(
+            station, window, begin_year=begin_year, end_year=end_year
+        )
+
+    def get_rainfall_average(
+        self,
+        station: str,
+        time_mode: TimeMode,
+        *,
+        begin_year: int,
+        end_year: int,
+        month: Month | None = None,
+        season: Season | None = None,
+    ) -> float | None:
+        """
+        Computes Rainfall average of a weather station for a specific year range and time mode.
+
+        :param station: A station identifier.
+        :param time_mode: A TimeMode Enum: ['yearly', 'monthly', 'seasonal'].
+        :param begin_year: An integer representing the year
+        to start getting our rainfall values.
+        :param end_year: An integer representing the year
+        to end getting our rainfall values.
+        :param month: A Month Enum: ['January', 'February', ..., 'December']
+        Set if time_mode is 'monthly' (optional).
+        :param season: A Season Enum: ['winter', 'spring', 'summer', 'fall'].
+        Set if time_mode is 'seasonal' (optional).
+        :return: A float representing the average Rainfall, NaN if no year is within range.
+        None if month or season is missing for time mode.
+        """
+        window = self._get_window(time_mode, month, season)
+        if window is None:
+            return None
+
+        return self._get_average(
+            station,
+            window,
+            begin_year=begin_year,
+            end_year=end_year,
+            round_precision=self.round_precision,
+        )
+
+    def get_normal(
+        self,
+        station: str,
+        time_mode: TimeMode,
+        *,
+        begin_year: int,
+        month: Month | None = None,
+        season: Season | None = None,
+    ) -> float | None:
+        """
+        Computes Rainfall normal of a weather station from a specific year and time mode.
+
+        :param station: A station identifier.
+        :param time_mode: A TimeMode Enum: ['yearly', 'monthly', 'seasonal'].
+        :param begin_year: An integer representing the year
+        to start computing rainfall normal.
+        :param month: A Month Enum: ['January', 'February', ..., 'December']
+        Set if time_mode is 'monthly' (optional).
+        :param season: A Season Enum: ['winter', 'spring', 'summer', 'fall'].
+        Set if time_mode is 'seasonal' (optional).
+        :return: A float representing the Rainfall normal.
+        """
+        return self.get_rainfall_average(
+            station,
+            time_mode,
+            begin_year=begin_year,
+            end_year=begin_year + NORMAL_YEARS - 1,
+            month=month,
+            season=season,
+        )
+
+    def get_rainfall_sum(
+        self,
+        station: str,
+        time_mode: TimeMode,
+        *,
+        begin_year: int,
+        end_year: int,
+        month: Month | None = None,
+        season: Season | None = None,
+    ) -> float | None:
+        """
+        Computes total Rainfall of a weather station for a specific year range and time mode.
+
+        :param station: A station identifier.
+        :param time_mode: A TimeMode Enum: ['yearly', 'monthly', 'seasonal'].
+        :param begin_year: An integer representing the year
+        to start getting our rainfall values.
+        :param end_year: An integer representing the year
+        to end getting our rainfall values.
+        :param month: A Month Enum: ['January', 'February', ..., 'December']
+        Set if time_mode is 'monthly' (optional).
+        :param season: A Season Enum: ['winter', 'spring', 'summer', 'fall'].
+        Set if time_mode is 'seasonal' (optional).
+        :return: A float representing the total Rainfall, 0 if no year is within range.
+        None if month or season is missing for time mode.
+        """
+        window = self._get_window(time_mode, month, season)
+        if window is None:
+            return None
+
+        return self._query_yearly_rainfall(
+            "np_round(TOTAL(rainfall), ?)",
+            station,
+            window,
+            begin_year=begin_year,
+            end_year=end_year,
+            parameters=(self.round_precision,),
+        ).fetchone()[0]
+
+    def get_years_above(
+        self,
+        station: str,
+        time_mode: TimeMode,
+        rainfall_value: float,
+        *,
+        begin_year: int,
+        end_year: int,
+        month: Month | None = None,
+        season: Season | None = None,
+    ) -> int | None:
+        """
+        Computes the number of years of a weather station above a rainfall value
+        for a specific year range and time mode.
+
+        :param station: A station identifier.
+        :param time_mode: A TimeMode Enum: ['yearly', 'monthly', 'seasonal'].
+        :param rainfall_value: A float representing the rainfall value (in mm).
+        :param begin_year: An integer representing the year
+        to start getting our rainfall values.
+        :param end_year: An integer representing the year
+        to end getting our rainfall values.
+        :param month: A Month Enum: ['January', 'February', ..., 'December']
+        Set if time_mode is 'monthly' (optional).
+        :param season: A Season Enum: ['winter', 'spring', 'summer', 'fall'].
+        Set if time_mode is 'seasonal' (optional).
+        :return: The number of years above the rainfall value as an integer.
+        None if month or season is missing for time mode.
+        """
+        window = self._get_window(time_mode, month, season)
+        if window is None:
+            return None
+
+        return self._query_yearly_rainfall(
+            "COUNT(*) FILTER (WHERE rainfall > ?)",
+            station,
+            window,
+            begin_year=begin_year,
+            end_year=end_year,
+            parameters=(rainfall_value,),
+        ).fetchone()[0]
+
+    def get_years_above_normal(
+        self,
+        station: str,
+        time_mode: TimeMode,
+        *,
+        normal_year: int,
+        begin_year: int,
+        end_year: int,
+        month: Month | None = None,
+        season: Season | None = None,
+    ) -> int | None:
+        """
+        Computes the number of years of a weather station above normal
+        for a specific year range and time mode.
+
+        :param station: A station identifier.
+        :param time_mode: A TimeMode Enum: ['yearly', 'monthly', 'seasonal'].
+        :param normal_year: An integer representing the year
+        to start computing the 30 years normal of the rainfall.
+        :param begin_year: An integer representing the year
+        to start getting our rainfall values.
+        :param end_year: An integer representing the year
+        to end getting our rainfall values.
+        :param month: A Month Enum: ['January', 'February', ..., 'December']
+        Set if time_mode is 'monthly' (optional).
+        :param season: A Season Enum: ['winter', 'spring', 'summer', 'fall'].
+        Set if time_mode is 'seasonal' (optional).
+        :return: The number of years above the normal as an integer.
+        None if month or season is missing for time mode.
+        """
+        window = self._get_window(time_mode, month, season)
+        if window is None:
+            return None
+
+        # As models in memory do, normal is compared once rounded to 1 decimal
+        normal = self._get_average(
+            station,
+            window,
+            begin_year=normal_year,
+            end_year=normal_year + NORMAL_YEARS - 1,
+            round_precision=1,
+        )
+
+        return self.get_years_above(
+            station,
+            time_mode,
+            normal,
+            begin_year=begin_year,
+            end_year=end_year,
+            month=month,
+            season=season,
+        )
@@ -0,0 +1,308 @@
+"""
+Provides running sums of rainfall according to year, from which averages, normals
+and linear regressions over any year range are derived in constant time.
+Appending or patching years updates them without summing every year again.
+"""
+
+import numpy as np
+import pandas as pd
+
+from back.rainfall.utils import Label
+
+NORMAL_YEARS = 30
+
+# Rows of prefix sums
+COUNT, RAINFALL, SQUARED_RAINFALL, YEAR, SQUARED_YEAR, YEAR_RAINFALL = range(6)
+
+
+class RainfallAccumulators:
+    """
+    Prefix sums, for each year, of terms over every former year:
+    count of known rainfall values, rainfall, squared rainfall, year, squared year and year times rainfall.
+    Years are offset by the first one to keep sums of squares accurate;
+    years whose rainfall is missing are skipped, as pandas does.
+    Normals, i.e. averages over the 30 years starting from each year, are kept alongside.
+
+    Instances are never mutated: updating them builds another one.
+    """
+
+    def __init__(self, years: np.ndarray, rainfall: np.ndarray):
+        self.years = np.asarray(years, dtype=np.int64)
+        self.rainfall = np.asarray(rainfall, dtype=float)
+        self.origin = int(self.years[0]) if len(self.years) else 0
+
+        self.prefix_sums = np.zeros((6, len(self.years) + 1))
+        np.cumsum(
+            self._get_terms(self.years, self.rainfall),
+            axis=1,
+            out=self.prefix_sums[:, 1:],
+        )
+        self.normals = self._compute_normals(0)
+
+        for array in (self.years, self.rainfall, self.prefix_sums, self.normals):
+            array.flags.writeable = False
+
+    @property
+    def nbytes(self) -> int:
+        return (
+            self.years.nbytes
+            + self.rainfall.nbytes
+            + self.prefix_sums.nbytes
+            + self.normals.nbytes
+        )
+
+    @classmethod
+    def from_data(cls, data: pd.DataFrame):
+        """
+        Instantiate class upon rainfall according to year.
+
+        :param data: A pandas DataFrame displaying rainfall data (in mm) according to year, sorted by year.
+        :return: A RainfallAccumulators instance.
+        """
+        return cls(
+            data[Label.YEAR.value].to_numpy(dtype=np.int64),
+            data[Label.RAINFALL.value].to_numpy(dtype=float),
+        )
+
+    @classmethod
+    def from_arrays(
+        cls,
+        years: np.ndarray,
+        rainfall: np.ndarray,
+        prefix_sums: np.ndarray,
+        normals: np.ndarray,
+    ):
+        """
+        Instantiate class upon arrays of former accumulators, e.g. mapped from a shared dataset file,
+        without summing nor copying them.
+
+        :param years: A numpy array of sorted years.
+        :param rainfall: A numpy array of rainfall values of these years.
+        :param prefix_sums: A numpy array of prefix sums of shape (6, years + 1), as in prefix_sums attribute.
+        :param normals: A numpy array of normals from every year, as in normals attribute.
+        :return: A RainfallAccumulators instance.
+        """
+        accumulators = cls.__new__(cls)
+        accumulators.years = years
+        accumulators.rainfall = rainfall
+        accumulators.origin = int(years[0]) if len(years) else 0
+        accumulators.prefix_sums = prefix_sums
+        accumulators.normals = normals
+
+        for array in (years, rainfall, prefix_sums, normals):
+            array.flags.writeable = False
+
+        return accumulators
+
+    def _get_terms(self, years: np.ndarray, rainfall: np.ndarray) -> np.ndarray:
+        is_known = ~np.isnan(rainfall)
+        x = np.where(is_known, years - self.origin, 0).astype(float)
+        y = np.where(is_known, rainfall, 0.0)
+
+        return np.stack([is_known.astype(float), y, y * y, x, x * x, x * y])
+
+    def _get_positions(self, begin_year: int, end_year: int) -> tuple[int, int]:
+        return (
+            int(np.searchsorted(self.years, begin_year, side="left")),
+            int(np.searchsorted(self.years, end_year, side="right")),
+        )
+
+    def _compute_normals(self, start: int) -> np.ndarray:
+        starts = np.arange(start, len(self.years))
+        ends = np.searchsorted(
+            self.years, self.years[starts] + NORMAL_YEARS - 1, side="right"
+        )
+        sums = self.prefix_sums[:, ends] - self.prefix_sums[:, starts]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return sums[RAINFALL] / sums[COUNT]
+
+    def get_sums(self, begin_year: int, end_year: int) -> np.ndarray:
+        """
+        Sum terms over a year range.
+
+        :param begin_year: An integer representing the year to start summing.
+        :param end_year: An integer representing the year to end summing.
+        :return: A numpy array of 6 sums: count, rainfall, squared rainfall,
+        year, squared year and year times rainfall, years being offset by origin.
+        """
+        begin, end = self._get_positions(begin_year, end_year)
+        if end <= begin:
+            return np.zeros(6)
+
+        return self.prefix_sums[:, end] - self.prefix_sums[:, begin]
+
+    def get_average(self, begin_year: int, end_year: int) -> float:
+        """
+        Compute unrounded average rainfall over a year range.
+
+        :param begin_year: An integer representing the year to start getting rainfall values.
+        :param end_year: An integer representing the year to end getting rainfall values.
+        :return: Average rainfall, NaN if no rainfall value is known within range.
+        """
+        sums = self.get_sums(begin_year, end_year)
+        if sums[COUNT] == 0:
+            return float("nan")
+
+        return float(sums[RAINFALL] / sums[COUNT])
+
+    def get_normal(self, begin_year: int) -> float:
+        """
+        Compute unrounded normal, i.e. average rainfall over 30 years from a given year.
+
+        :param begin_year: A year to start the time frame.
+        :return: The normal, NaN if no rainfall value is known within time frame.
+        """
+        begin = int(np.searchsorted(self.years, begin_year))
+        if begin < len(self.years) and self.years[begin] == begin_year:
+            return float(self.normals[begin])
+
+        return self.get_average(begin_year, begin_year + NORMAL_YEARS - 1)
+
+    def get_linear_regression(
+        self, begin_year: int, end_year: int
+    ) -> tuple[float, float, float] | None:
+        """
+        Compute least squares linear regression of rainfall according to year over a year range.
+
+        :param begin_year: An integer representing the year to start getting rainfall values.
+        :param end_year: An integer representing the year to end getting rainfall values.
+        :return: A tuple of unrounded slope, intercept and coefficient of determination (R²).
+        None if fewer than 2 distinct years are within range.
+        """
+        n, s_y, s_yy, s_x, s_xx, s_xy = self.get_sums(begin_year, end_year)
+        x_variance = n * s_xx - s_x * s_x
+        if n < 2 or x_variance <= 0:
+            return None
+
+        covariance = n * s_xy - s_x * s_y
+        slope = covariance / x_variance
+        intercept = (s_y - slope * s_x) / n - slope * self.origin
+        y_variance = n * s_yy - s_y * s_y
+        r2 = covariance * covariance / (x_variance * y_variance) if y_variance else 1.0
+
+        return float(slope), float(intercept), float(r2)
+
+    def get_linear_regression_matrices(
+        self, begin_year: int, end_year: int
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Compute least squares linear regression of rainfall according to year
+        over every sub-range of a year range at once, as in get_linear_regression:
+        sums over each sub-range are differences of prefix sums, broadcast between all first and last years.
+
+        :param begin_year: An integer representing the year to start getting rainfall values.
+        :param end_year: An integer representing the year to end getting rainfall values.
+        :return: A tuple of years within range and of unrounded slopes and coefficients of determination (R²)
+        as square numpy arrays, row i and column j standing for the sub-range from years[i] to years[j].
+        Values are NaN below the diagonal and for sub-ranges with fewer than 2 distinct years.
+        """
+        begin, end = self._get_positions(begin_year, end_year)
+        years = self.years[begin:end]
+        starts = self.prefix_sums[:, begin:end, np.newaxis]
+        ends = self.prefix_sums[:, np.newaxis, begin + 1 : end + 1]
+        n, s_y, s_yy, s_x, s_xx, s_xy = ends - starts
+
+        x_variance = n * s_xx - s_x * s_x
+        covariance = n * s_xy - s_x * s_y
+        y_variance = n * s_yy - s_y * s_y
+        is_defined = (n >= 2) & (x_variance > 0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            slopes = np.where(is_defined, covariance / x_variance, np.nan)
+            r2 = np.where(
+                y_variance != 0,
+                covariance * covariance / (x_variance * y_variance),
+                1.0,
+            )
+
+        r2[~is_defined] = np.nan
+
+        return years, slopes, r2
+
+    def update(self, years: np.ndarray, rainfall: np.ndarray) -> "RainfallAccumulators":
+        """
+        Build accumulators with some years patched or appended.
+        Work is proportional to the number of years from the first changed one:
+        only a few when latest years are revised or new ones are appended.
+        Arrays are copied so that the present instance is left untouched.
+
+        :param years: A numpy array of unique years, either already accumulated or after last one.
+        :param rainfall: A numpy array of rainfall values of these years.
+        :return: A new RainfallAccumulators instance.
+        :raise ValueError: If a year is neither accumulated nor after last one.
+        """
+        years = np.asarray(years, dtype=np.int64)
+        rainfall = np.asarray(rainfall, dtype=float)
+        order = np.argsort(years)
+        years, rainfall = years[order], rainfall[order]
+
+        last_year = self.years[-1] if len(self.years) else None
+        is_appended = (
+            years > last_year if last_year is not None else np.ones(len(years), bool)
+        )
+        positions = np.searchsorted(self.years, years[~is_appended])
+        if np.any(positions >= len(self.years)) or np.any(
+            self.years[np.minimum(positions, len(self.years) - 1)]
+            != years[~is_appended]
+        ):
+            raise ValueError(
+                "Updated years should either be accumulated or follow the last one."
+            )
+
+        updated = RainfallAccumulators.__new__(RainfallAccumulators)
+        updated.origin = self.origin if len(self.years) else int(years[0])
+        updated.years = np.concatenate([self.years, years[is_appended]])
+        updated.rainfall = np.concatenate([self.rainfall, rainfall[is_appended]])
+        updated.rainfall[positions] = rainfall[~is_appended]
+
+        n = len(self.years)
+        updated.prefix_sums = np.empty((6, len(updated.years) + 1))
+        updated.prefix_sums[:, : n + 1] = self.prefix_sums
+        first = int(positions.min()) if len(positions) else n
+        if len(positions):
+            deltas = np.zeros((6, n - first))
+            deltas[:, positions - first] = updated._get_terms(
+                years[~is_appended], rainfall[~is_appended]
+            ) - updated._get_terms(years[~is_appended], self.rainfall[positions])
+            updated.prefix_sums[:, first + 1 : n + 1] += np.cumsum(deltas, axis=1)
+
+        updated.prefix_sums[:, n + 1 :] = updated.prefix_sums[:, n : n + 1] + np.cumsum(
+            updated._get_terms(years[is_appended], rainfall[is_appended]), axis=1
+        )
+
+        # Only normals whose time frame includes a changed year are computed again
+        start = (
+            int(
+                np.searchsorted(
+                    updated.years, updated.years[first] - NORMAL_YEARS + 1, side="left"
+                )
+            )
+            if first < len(updated.years)
+            else len(updated.years)
+        )
+        updated.normals = np.concatenate(
+            [self.normals[:start], updated._compute_normals(start)]
+        )
+
+        for array in (
+            updated.years,
+            updated.rainfall,
+            updated.prefix_sums,
+            updated.normals,
+        ):
+            array.flags.writeable = False
+
+        return updated
+
+
+def is_near_rounding_tie(value: float, round_precision: int) -> bool:
+    """
+    Tell whether a value is so close to halfway between two rounded values
+    that summing its terms in another order could round it differently.
+
+    :param value: A float to be rounded.
+    :param round_precision: Number of decimals it is rounded to.
+    :return: True if value is near a rounding tie, False otherwise or if value is NaN.
+    """
+    fraction = (value * 10**round_precision) % 1
+
+    return bool(abs(fraction - 0.5) < 1e-6)
@@ -0,0 +1,229 @@
+"""
+Provides bootstrap confidence intervals of rainfall averages and linear regression slopes.
+Each chunk of replicates draws a single (replicates, values) resampling index matrix,
+turned into counts of draws of every value: statistics of all replicates are then matrix products.
+"""
+
+from concurrent.futures import Executor
+from typing import Any, Callable
+
+import numpy as np
+
+from back.rainfall.utils import BaseEnum
+from back.rainfall.utils.accumulators import NORMAL_YEARS
+
+# Replicates drawn at once, in a single process
+BOOTSTRAP_CHUNK_SIZE = 10_000
+
+
+class Statistic(str, BaseEnum):
+    """
+    An Enum listing statistics whose confidence intervals can be bootstrapped.
+    """
+
+    AVERAGE = "average"
+    LINEAR_REGRESSION = "linear_regression"
+
+
+def map_replicate_chunks(
+    function: Callable[..., np.ndarray],
+    *arguments: Any,
+    replicates: int,
+    seed: int,
+    executor: Executor | None = None,
+) -> list[np.ndarray]:
+    """
+    Split replicates into chunks, each with its own random stream spawned from the seed,
+    so that results are the same whether chunks run in the current process or across an executor.
+
+    :param function: A function of arguments followed by a number of replicates and a numpy SeedSequence.
+    It should be defined at module level to be run by a process pool.
+    :param arguments: Arguments passed to function for every chunk.
+    :param replicates: Number of replicates.
+    :param seed: Seed random streams are spawned from.
+    :param executor: An executor, e.g. a process pool, to run chunks in parallel (optional).
+    It is only used for more than one chunk.
+    :return: A list of results of function, one per chunk.
+    """
+    chunk_sizes = [
+        min(BOOTSTRAP_CHUNK_SIZE, replicates - start)
+        for start in range(0, replicates, BOOTSTRAP_CHUNK_SIZE)
+    ]
+    chunk_arguments = [
+        (*arguments, chunk_size, seed_sequence)
+        for chunk_size, seed_sequence in zip(
+            chunk_sizes, np.random.SeedSequence(seed).spawn(len(chunk_sizes))
+        )
+    ]
+    if executor is not None and len(chunk_arguments) > 1:
+        return list(executor.map(function, *zip(*chunk_arguments)))
+
+    return [function(*chunk) for chunk in chunk_arguments]
+
+
+def get_resampling_counts(
+    size: int, replicates: int, seed_sequence: np.random.SeedSequence
+) -> np.ndarray:
+    """
+    Resample values with replacement for every replicate at once.
+
+    :param size: Number of values to resample.
+    :param replicates: Number of replicates.
+    :param seed_sequence: A numpy SeedSequence seeding the random generator.
+    :return: A numpy array of shape (replicates, size): how many times each value is drawn in every replicate.
+    """
+    indexes = np.random.default_rng(seed_sequence).integers(0, size, (replicates, size))
+    offsets = np.arange(replicates)[:, np.newaxis] * size
+
+    return (
+        np.bincount((indexes + offsets).ravel(), minlength=replicates * size)
+        .reshape(replicates, size)
+        .astype(float)
+    )
+
+
+def _get_bootstrap_statistics(
+    years: np.ndarray,
+    rainfall: np.ndarray,
+    statistic: Statistic,
+    replicates: int,
+    seed_sequence: np.random.SeedSequence,
+) -> np.ndarray:
+    """
+    Compute a statistic of every series for every replicate, series sharing the same resampling.
+    Executed in worker processes: it should only rely on its arguments.
+    """
+    counts = get_resampling_counts(rainfall.shape[1], replicates, seed_sequence).T
+    is_known = ~np.isnan(rainfall)
+    y = np.where(is_known, rainfall, 0.0)
+
+    n = is_known @ counts
+    s_y = y @ counts
+    with np.errstate(invalid="ignore", divide="ignore"):
+        if statistic == Statistic.AVERAGE:
+            return s_y / n
+
+        # Years are centered to keep sums of squares accurate
+        x = np.where(is_known, years - years.mean(), 0.0)
+        s_x = x @ counts
+        x_variance = n * ((x * x) @ counts) - s_x * s_x
+
+        return np.where(
+            x_variance > 0, (n * ((x * y) @ counts) - s_x * s_y) / x_variance, np.nan
+        )
+
+
+def get_confidence_intervals(
+    years: np.ndarray,
+    rainfall: np.ndarray,
+    statistic: Statistic,
+    *,
+    replicates=1000,
+    confidence=0.95,
+    seed=0,
+    executor: Executor | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Compute percentile bootstrap confidence intervals of a statistic of rainfall according to year.
+    Missing values are skipped; replicates whose statistic is undefined are ignored.
+
+    :param years: A numpy array of years.
+    :param rainfall: A numpy array of rainfall values (in mm), either of one series
+    or of several series of shape (series, years) sharing the same resampling.
+    :param statistic: A Statistic Enum: ['average', 'linear_regression'], the latter being the slope.
+    :param replicates: Number of bootstrap replicates. Defaults to 1000.
+    :param confidence: Probability covered by confidence intervals. Defaults to 0.95.
+    :param seed: Seed of the random generator. Defaults to 0.
+    :param executor: An executor, e.g. a process pool, to run chunks of replicates in parallel (optional).
+    :return: A tuple of numpy arrays, one value per series: lower and upper bounds.
+    NaN if the statistic is undefined for every replicate.
+    """
+    years = np.asarray(years, dtype=float)
+    rainfall = np.atleast_2d(np.asarray(rainfall, dtype=float))
+
+    # A single series is resampled among its known values only
+    if len(rainfall) == 1:
+        is_known = ~np.isnan(rainfall[0])
+        years, rainfall = years[is_known], rainfall[:, is_known]
+
+    if rainfall.shape[1] == 0:
+        return np.full(len(rainfall), np.nan), np.full(len(rainfall), np.nan)
+
+    statistics = np.concatenate(
+        map_replicate_chunks(
+            _get_bootstrap_statistics,
+            years,
+            rainfall,
+            statistic,
+            replicates=replicates,
+            seed=seed,
+            executor=executor,
+        ),
+        axis=1,
+    )
+    with np.errstate(invalid="ignore"):
+        is_defined = ~np.isnan(statistics).all(axis=1)
+        bounds = np.full((2, len(rainfall)), np.nan)
+        bounds[:, is_defined] = np.nanquantile(
+            statistics[is_defined],
+            [(1 - confidence) / 2, (1 + confidence) / 2],
+            axis=1,
+        )
+
+    return bounds[0], bounds[1]
+
+
+def get_confidence_intervals_of_normals(
+    years: np.ndarray,
+    rainfall: np.ndarray,
+    *,
+    replicates=1000,
+    confidence=0.95,
+    seed=0,
+    executor: Executor | None = None,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Compute normals, i.e. averages over 30 years, starting from every year with 30 following years,
+    along with their bootstrap confidence intervals, all time frames sharing the same resampling.
+    Years missing within a time frame are skipped.
+
+    :param years: A numpy array of years, sorted.
+    :param rainfall: A numpy array of rainfall values (in mm) of these years.
+    :param replicates: Number of bootstrap replicates. Defaults to 1000.
+    :param confidence: Probability covered by confidence intervals. Defaults to 0.95.
+    :param seed: Seed of the random generator. Defaults to 0.
+    :param executor: An executor, e.g. a process pool, to run chunks of replicates in parallel (optional).
+    :return: A tuple of numpy arrays, one value per starting year: starting years, normals, lower and upper bounds.
+    """
+    years = np.asarray(years, dtype=np.int64)
+    if len(years) == 0 or years[-1] - years[0] + 1 < NORMAL_YEARS:
+        empty = np.array([])
+        return years[:0], empty, empty, empty
+
+    all_years = np.arange(years[0], years[-1] + 1)
+    all_rainfall = np.full(len(all_years), np.nan)
+    all_rainfall[years - years[0]] = rainfall
+
+    time_frames = np.lib.stride_tricks.sliding_window_view(all_rainfall, NORMAL_YEARS)
+    is_known = ~np.isnan(time_frames)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        normals = np.where(is_known, time_frames, 0.0).sum(axis=1) / is_known.sum(
+            axis=1
+        )
+
+    lower_bounds, upper_bounds = get_confidence_intervals(
+        np.arange(NORMAL_YEARS),
+        time_frames,
+        Statistic.AVERAGE,
+        replicates=replicates,
+        confidence=confidence,
+        seed=seed,
+        executor=executor,
+    )
+
+    return (
+        all_years[: len(time_frames)],
+        normals,
+        lower_bounds,
+        upper_bounds,
+    )
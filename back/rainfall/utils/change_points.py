@@ -0,0 +1,192 @@
+"""
+Provides regime shift detection in rainfall according to year with PELT (Killick et al., 2012):
+series are split into segments of different average rainfall, each change costing a penalty.
+Costs of segments are derived from cumulative sums, and many series are segmented at once.
+"""
+
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from back.rainfall.utils import Label
+
+# Shorter regimes are rather wet or dry spells
+MIN_SEGMENT_YEARS = 5
+
+
+def get_default_penalty(rainfall: np.ndarray) -> float:
+    """
+    Compute the Bayesian Information Criterion penalty of a change, 2σ²·log(n),
+    variance σ² being estimated from differences between consecutive years
+    with the median absolute deviation, so that it is not inflated by shifts themselves.
+
+    :param rainfall: A numpy array of rainfall values (in mm), without missing values.
+    :return: The penalty, in squared mm; 0 if fewer than 2 values are given.
+    """
+    if len(rainfall) < 2:
+        return 0.0
+
+    differences = np.diff(rainfall)
+    sigma = (
+        1.4826 * np.median(np.abs(differences - np.median(differences))) / np.sqrt(2)
+    )
+
+    return float(2 * sigma * sigma * np.log(len(rainfall)))
+
+
+def get_change_points(
+    rainfall: list[np.ndarray],
+    penalties: np.ndarray,
+    *,
+    min_size=MIN_SEGMENT_YEARS,
+) -> list[list[np.ndarray]]:
+    """
+    Segment every series at once with PELT, for several penalties per series,
+    minimizing the sum of squared deviations from segment averages plus a penalty per change.
+    Costs of all candidate segments ending at a year are computed at once from cumulative sums,
+    and shared by every penalty; candidates that cannot start an optimal segment anymore are pruned,
+    as soon as a later change that beats them may end a segment of the minimum size.
+
+    :param rainfall: A list of numpy arrays of rainfall values (in mm) without missing values,
+    possibly of different lengths.
+    :param penalties: A numpy array of penalties of a change, in squared mm, of shape (series, penalties).
+    :param min_size: Minimum number of years of a segment. Defaults to 5.
+    :return: A list with, for every series, a list with, for every penalty, a numpy array
+    of exclusive end positions of segments, the last one being the length of the series.
+    """
+    penalties = np.asarray(penalties, dtype=float)
+    rows, penalty_count = penalties.shape
+    lengths = np.array([len(values) for values in rainfall], dtype=int)
+    n = int(lengths.max()) if rows else 0
+
+    # Series are padded with zeros: segmentation of a series only looks back from its own end
+    sums = np.zeros((rows, n + 1))
+    squared_sums = np.zeros((rows, n + 1))
+    for row, values in enumerate(rainfall):
+        np.cumsum(values, out=sums[row, 1 : len(values) + 1])
+        np.cumsum(values * values, out=squared_sums[row, 1 : len(values) + 1])
+        sums[row, len(values) + 1 :] = sums[row, len(values)]
+        squared_sums[row, len(values) + 1 :] = squared_sums[row, len(values)]
+
+    costs = np.full((rows, penalty_count, n + 1), np.inf)
+    costs[:, :, 0] = -penalties
+    # Costs of pruned candidates are infinite
+    candidate_costs = costs.copy()
+    last_changes = np.zeros((rows, penalty_count, n + 1), dtype=int)
+    row_indexes = np.arange(rows)[:, np.newaxis]
+    penalty_indexes = np.arange(penalty_count)
+
+    # A start beaten by a change at end can only be pruned once end can start a segment itself
+    pending_prunings: deque[tuple[int, int, np.ndarray]] = deque()
+    first = 0
+    for end in range(min_size, n + 1):
+        last = end - min_size + 1
+        candidate_costs[:, :, last - 1] = costs[:, :, last - 1]
+        if len(pending_prunings) == min_size:
+            pruned_first, pruned_last, is_pruned = pending_prunings.popleft()
+            np.putmask(
+                candidate_costs[:, :, pruned_first:pruned_last], is_pruned, np.inf
+            )
+
+        # Starts pruned for every series and penalty are skipped
+        while first < last - 1 and np.isinf(candidate_costs[:, :, first]).all():
+            first += 1
+
+        segment_sums = sums[:, end, np.newaxis] - sums[:, first:last]
+        segment_sums *= segment_sums
+        segment_sums /= np.arange(end - first, end - last, -1)
+        segment_costs = squared_sums[:, end, np.newaxis] - squared_sums[:, first:last]
+        segment_costs -= segment_sums
+
+        total_costs = candidate_costs[:, :, first:last] + segment_costs[:, np.newaxis]
+        best = np.argmin(total_costs, axis=2)
+        costs[:, :, end] = total_costs[row_indexes, penalty_indexes, best] + penalties
+        last_changes[:, :, end] = first + best
+        pending_prunings.append(
+            (first, last, total_costs > costs[:, :, end, np.newaxis])
+        )
+
+    change_points: list[list[np.ndarray]] = []
+    for row, length in enumerate(lengths):
+        change_points.append([])
+        for penalty_index in penalty_indexes:
+            ends: list[int] = []
+            end = int(length)
+            while end > 0:
+                ends.append(end)
+                end = (
+                    int(last_changes[row, penalty_index, end]) if end >= min_size else 0
+                )
+
+            change_points[row].append(np.array(ends[::-1], dtype=int))
+
+    return change_points
+
+
+def get_segments(
+    yearly_rainfalls: dict[str, pd.DataFrame],
+    *,
+    penalty_factors: tuple[float, ...] = (1.0,),
+    round_precision: int,
+    min_size=MIN_SEGMENT_YEARS,
+) -> pd.DataFrame:
+    """
+    Detect regime shifts of several series of rainfall according to year at once, for several penalties,
+    each being a factor of the default penalty of its series. Years of missing rainfall are skipped.
+
+    :param yearly_rainfalls: A dict of pandas DataFrames displaying rainfall data (in mm) according to year,
+    keyed by a label, e.g. 'yearly', a month or a season.
+    :param penalty_factors: A tuple of factors of the default penalty of a change:
+    the higher, the fewer changes. Defaults to (1.0,).
+    :param round_precision: Number of decimals averages are rounded to.
+    :param min_size: Minimum number of years of a segment. Defaults to 5.
+    :return: A pandas DataFrame indexed by label of series, with a row per segment of each series and penalty factor:
+    penalty factor, first and last years of segment and its average rainfall.
+    The first year of every segment but the first one is a change year.
+    """
+    columns = [
+        Label.PENALTY_FACTOR.value,
+        Label.BEGIN_YEAR.value,
+        Label.END_YEAR.value,
+        Label.AVERAGE_RAINFALL.value,
+    ]
+    if not yearly_rainfalls or not penalty_factors:
+        return pd.DataFrame(columns=columns)
+
+    years: list[np.ndarray] = []
+    rainfall: list[np.ndarray] = []
+    for yearly_rainfall in yearly_rainfalls.values():
+        yearly_rainfall = yearly_rainfall.dropna(subset=[Label.RAINFALL.value])
+        years.append(yearly_rainfall[Label.YEAR.value].to_numpy())
+        rainfall.append(yearly_rainfall[Label.RAINFALL.value].to_numpy(dtype=float))
+
+    change_points = get_change_points(
+        rainfall,
+        np.outer([get_default_penalty(values) for values in rainfall], penalty_factors),
+        min_size=min_size,
+    )
+
+    keys: list[str] = []
+    segments: list[list[np.ndarray]] = [[] for _ in columns]
+    for key, series_years, values, ends_by_penalty in zip(
+        yearly_rainfalls.keys(), years, rainfall, change_points
+    ):
+        sums = np.concatenate([[0.0], np.cumsum(values)])
+        for penalty_factor, ends in zip(penalty_factors, ends_by_penalty):
+            starts = np.concatenate([[0], ends[:-1]]).astype(int)
+            keys.extend([key] * len(ends))
+            segments[0].append(np.full(len(ends), penalty_factor, dtype=float))
+            segments[1].append(series_years[starts[: len(ends)]])
+            segments[2].append(series_years[ends - 1])
+            segments[3].append(
+                np.round((sums[ends] - sums[starts]) / (ends - starts), round_precision)
+            )
+
+    return pd.DataFrame(
+        {
+            column: np.concatenate(column_segments)
+            for column, column_segments in zip(columns, segments)
+        },
+        index=pd.Index(keys),
+    )
@@ -3,9 +3,13 @@ Provides functions to do operations on DataFrame objects
 containing rainfall data over years.
 """
 
+import hashlib
+
+import numpy as np
 import pandas as pd
 
 from back.rainfall.utils import Label
+from back.rainfall.utils.month_windows import CumulativeMonthlyRainfall, MonthWindow
 
 
 def get_rainfall_within_year_interval(
@@ -48,6 +52,30 @@ def remove_column(yearly_rainfall: pd.DataFrame, *, label: Label) -> bool:
     return True
 
 
+def get_content_hash(data: pd.DataFrame) -> str:
+    """
+    Computes a hash of DataFrame content, column labels and index included.
+    Two DataFrames with the same hash hold the same data.
+
+    :param data: A pandas DataFrame.
+    :return: The hexadecimal SHA-256 digest as a string.
+    """
+    content_hash = hashlib.sha256(",".join(map(str, data.columns)).encode())
+    content_hash.update(pd.util.hash_pandas_object(data, index=True).values.tobytes())
+
+    return content_hash.hexdigest()
+
+
+def get_deep_size(data: pd.DataFrame) -> int:
+    """
+    Compute memory used by a pandas DataFrame, including its index and Python objects it holds.
+
+    :param data: A pandas DataFrame.
+    :return: Size in bytes.
+    """
+    return int(data.memory_usage(index=True, deep=True).sum())
+
+
 def concat_columns(data_frames: list[pd.DataFrame | pd.Series]) -> pd.DataFrame:
     """
     Concatenate pandas DataFrame objects along the column axis.
@@ -59,6 +87,78 @@ def concat_columns(data_frames: list[pd.DataFrame | pd.Series]) -> pd.DataFrame:
     return pd.concat(data_frames, axis="columns")
 
 
+def _get_lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Select indices of points to keep with the Largest-Triangle-Three-Buckets algorithm.
+    First and last points are always kept; inner points are split into n_out - 2 buckets
+    and the point forming the largest triangle with the previously selected point
+    and the average of the next bucket is kept for each of them.
+
+    :param x: A numpy array of sorted x-values.
+    :param y: A numpy array of y-values, same length as x.
+    :param n_out: Number of points to keep, should be at least 3.
+    :return: A numpy array of sorted indices.
+    """
+    n_points = len(x)
+    edges = np.linspace(1, n_points - 1, n_out - 1).astype(int)
+    starts, ends = edges[:-1], edges[1:]
+
+    cum_x = np.concatenate(([0.0], np.cumsum(x, dtype=float)))
+    cum_y = np.concatenate(([0.0], np.cumsum(y, dtype=float)))
+    bucket_sizes = ends - starts
+    next_avg_x = np.append(((cum_x[ends] - cum_x[starts]) / bucket_sizes)[1:], x[-1])
+    next_avg_y = np.append(((cum_y[ends] - cum_y[starts]) / bucket_sizes)[1:], y[-1])
+
+    indices = np.empty(n_out, dtype=int)
+    indices[0], indices[-1] = 0, n_points - 1
+    selected = 0
+    for bucket, (start, end) in enumerate(zip(starts, ends)):
+        areas = np.abs(
+            (x[selected] - next_avg_x[bucket]) * (y[start:end] - y[selected])
+            - (x[selected] - x[start:end]) * (next_avg_y[bucket] - y[selected])
+        )
+        selected = start + int(np.argmax(areas))
+        indices[bucket + 1] = selected
+
+    return indices
+
+
+def downsample_with_lttb(
+    yearly_rainfall: pd.DataFrame,
+    *,
+    max_points: int,
+    label: Label = Label.RAINFALL,
+) -> pd.DataFrame:
+    """
+    Downsample a DataFrame to at most max_points rows with the Largest-Triangle-Three-Buckets algorithm,
+    computed upon the column specified by its label according to year.
+    Rows holding the minimum and the maximum of this column are always kept.
+
+    :param yearly_rainfall: A pandas DataFrame displaying rainfall data
+    under various shapes according to year.
+    :param max_points: Maximum number of rows to keep, should be at least 4.
+    :param label: A Label enum designating the column to be downsampled (optional).
+    Defaults to 'Rainfall'.
+    :return: A pandas DataFrame made of the kept rows, in the same order.
+    :raise ValueError: If max_points is lower than 4.
+    """
+    if max_points < 4:
+        raise ValueError(f"{max_points=} should be at least 4.")
+
+    if len(yearly_rainfall) <= max_points:
+        return yearly_rainfall
+
+    x = yearly_rainfall[Label.YEAR.value].to_numpy(dtype=float)
+    y = yearly_rainfall[label.value].to_numpy(dtype=float)
+
+    if max_points - 2 >= 3:
+        indices = _get_lttb_indices(x, y, max_points - 2)
+    else:
+        indices = np.array([0, len(x) - 1])
+
+    return yearly_rainfall.iloc[np.union1d(indices, [np.nanargmin(y), np.nanargmax(y)])]
+
+
 def retrieve_rainfall_data_with_constraints(
     monthly_rainfall: pd.DataFrame,
     *,
@@ -107,3 +207,39 @@ def retrieve_rainfall_data_with_constraints(
     )
 
     return yearly_rainfall
+
+
+def retrieve_rainfall_data_within_window(
+    monthly_rainfall: pd.DataFrame,
+    *,
+    window: MonthWindow,
+    starting_year: int,
+    round_precision: int,
+) -> pd.DataFrame:
+    """
+    Sum rainfall over a window of consecutive months for each year of a pandas DataFrame
+    depicting Yearly Rainfall data for each month of the year.
+    A window spanning two years belongs to the year of its last month:
+    former years are read even before starting year, and rainfall is missing if the former year is.
+
+    :param monthly_rainfall: A DataFrame representing Yearly Rainfall data for each month
+    :param window: A MonthWindow representing months to sum.
+    :param starting_year: An integer representing the year we should start get value from
+    :param round_precision: A integer representing decimal precision for Rainfall data
+    :return: A pandas DataFrame displaying rainfall data (in mm) according to year.
+    """
+    years = monthly_rainfall.iloc[:, 0]
+    cumulative_rainfall = CumulativeMonthlyRainfall.from_raw_data(monthly_rainfall)
+    rainfall = cumulative_rainfall.get_window_rainfall(window)[
+        years.to_numpy(dtype=np.int64) - cumulative_rainfall.first_year
+    ]
+
+    yearly_rainfall = pd.DataFrame(
+        {
+            Label.YEAR.value: years,
+            Label.RAINFALL.value: np.round(rainfall, round_precision),
+        },
+        index=monthly_rainfall.index,
+    )
+
+    return get_rainfall_within_year_interval(yearly_rainfall, begin_year=starting_year)
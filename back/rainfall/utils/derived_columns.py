@@ -0,0 +1,138 @@
+"""
+Provides a thread-safe store of columns derived from rainfall data according to year.
+"""
+
+import threading
+from typing import Any, Callable
+
+import numpy as np
+import pandas as pd
+
+from back.rainfall.utils import Label
+from back.rainfall.utils import dataframe_operations as df_opr
+
+
+class DerivedColumns:
+    """
+    Copy-on-write store of columns derived from a base pandas DataFrame displaying rainfall data according to year.
+
+    Derived values are computed lazily, exactly once per label and parameters,
+    and are returned as read-only numpy arrays.
+    Base DataFrame is never mutated: publishing or discarding a column builds a new snapshot
+    that is swapped in atomically, so readers holding a snapshot always see a consistent DataFrame.
+    """
+
+    def __init__(self, base_data: pd.DataFrame):
+        self._base_data = base_data
+        self._snapshot = base_data
+        self._values_by_key: dict[tuple[Label, tuple], np.ndarray] = {}
+        self._published_values_by_label: dict[Label, np.ndarray] = {}
+        self._lock = threading.Lock()
+        self._lock_by_key: dict[tuple[Label, tuple], threading.Lock] = {}
+
+    @property
+    def base_data(self) -> pd.DataFrame:
+        """
+        Base DataFrame, without any derived column: do not mutate it.
+        """
+        return self._base_data
+
+    @property
+    def snapshot(self) -> pd.DataFrame:
+        """
+        Current DataFrame made of base columns and published derived columns.
+        It is replaced, never modified, when columns are published or discarded: do not mutate it.
+        """
+        return self._snapshot
+
+    def get(self, label: Label, compute: Callable[[], Any], **parameters) -> np.ndarray:
+        """
+        Retrieve derived values for a label and its parameters, computing them on first access only.
+
+        :param label: A Label enum designating the derived column.
+        :param compute: A function without argument returning derived values, one per row of base DataFrame.
+        :param parameters: Keyword parameters the derived values depend upon; they are part of the memoization key.
+        :return: A read-only numpy array of derived values.
+        """
+        key = (label, tuple(sorted(parameters.items())))
+        if (values := self._values_by_key.get(key)) is not None:
+            return values
+
+        with self._lock:
+            key_lock = self._lock_by_key.setdefault(key, threading.Lock())
+
+        with key_lock:
+            if (values := self._values_by_key.get(key)) is None:
+                values = np.array(compute())
+                values.flags.writeable = False
+                self._values_by_key[key] = values
+
+        return values
+
+    def publish(self, label: Label, values: np.ndarray) -> None:
+        """
+        Make derived values visible as a column of the snapshot, replacing any column with the same label.
+
+        :param label: A Label enum designating the derived column.
+        :param values: A numpy array of derived values, one per row of base DataFrame.
+        :return: None
+        """
+        with self._lock:
+            self._published_values_by_label[label] = values
+            self._snapshot = self._build_snapshot()
+
+    def discard(self, label: Label) -> bool:
+        """
+        Remove a published derived column from the snapshot. Memoized values are kept.
+        Base columns cannot be discarded.
+
+        :param label: A Label enum designating the derived column.
+        :return: A boolean set to whether the operation passed or not.
+        """
+        with self._lock:
+            if self._published_values_by_label.pop(label, None) is None:
+                return False
+
+            self._snapshot = self._build_snapshot()
+
+        return True
+
+    def _build_snapshot(self) -> pd.DataFrame:
+        return self._base_data.assign(
+            **{
+                label.value: values
+                for label, values in self._published_values_by_label.items()
+            }
+        )
+
+    def get_memory_usage(self) -> dict[str, Any]:
+        """
+        Compute memory used by base DataFrame, snapshot and memoized derived values, in bytes.
+        Snapshot is only accounted for once it differs from base DataFrame.
+
+        :return: A dict with bytes of base data, of snapshot, of each memoized derived values and their total.
+        """
+        snapshot = self._snapshot
+        memoized_values = {
+            label.value
+            + (
+                f" ({', '.join(f'{name}={value}' for name, value in parameters)})"
+                if parameters
+                else ""
+            ): values.nbytes
+            for (label, parameters), values in list(self._values_by_key.items())
+        }
+        memory_usage: dict[str, Any] = {
+            "base_data": df_opr.get_deep_size(self._base_data),
+            "snapshot": 0
+            if snapshot is self._base_data
+            else df_opr.get_deep_size(snapshot),
+            "memoized_values": memoized_values,
+        }
+        memory_usage["total"] = (
+            memory_usage["base_data"]
+            + memory_usage["snapshot"]
+            + sum(memoized_values.values())
+        )
+
+        return memory_usage
@@ -35,11 +35,27 @@ class Label(str, BaseEnum):
     """
 
     YEAR = "Year"
+    MONTH = "Month"
     RAINFALL = "Rainfall"
     PERCENTAGE_OF_NORMAL = "Percentage of normal"
     LINEAR_REGRESSION = "Linear regression"
+    SENS_SLOPE = "Sen's slope"
+    MANN_KENDALL_Z_SCORE = "Mann-Kendall Z score"
+    P_VALUE = "p-value"
+    STANDARDIZED_PRECIPITATION_INDEX = "Standardized precipitation index"
+    RETURN_PERIOD = "Return period"
+    RETURN_LEVEL = "Return level"
+    LOWER_BOUND = "Lower bound"
+    UPPER_BOUND = "Upper bound"
+    CONFIDENCE_INTERVAL = "Confidence interval"
+    BEGIN_YEAR = "Begin year"
+    END_YEAR = "End year"
+    AVERAGE_RAINFALL = "Average rainfall"
+    PENALTY_FACTOR = "Penalty factor"
     SAVITZKY_GOLAY_FILTER = "Savitzky–Golay filter"
     KMEANS = "K-Means"
+    MAX_DAILY_RAINFALL = "Max daily rainfall"
+    RAINY_DAYS = "Rainy days"
 
 
 class TimeMode(BaseEnum):
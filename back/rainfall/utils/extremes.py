@@ -0,0 +1,185 @@
+"""
+Provides return levels of maximum rainfall, i.e. values exceeded once every 10, 50 or 100 years on average,
+from Generalized Extreme Value (GEV) or Gumbel distributions fitted to maxima of every year,
+along with confidence intervals from a parametric bootstrap.
+Distributions are fitted with L-moments, in closed form: thousands of bootstrap replicates are fitted at once.
+"""
+
+from concurrent.futures import Executor
+
+import numpy as np
+
+from back.rainfall.utils import BaseEnum
+from back.rainfall.utils.bootstrap import map_replicate_chunks
+
+RETURN_PERIODS = (10, 50, 100)
+
+EULER_GAMMA = 0.5772156649015329
+
+# Below, a GEV distribution is a Gumbel one
+MIN_GEV_SHAPE = 1e-6
+
+
+class Distribution(str, BaseEnum):
+    """
+    An Enum listing extreme value distributions maxima can be fitted to.
+    """
+
+    GEV = "gev"
+    GUMBEL = "gumbel"
+
+
+def fit_distributions(
+    maxima: np.ndarray, distribution: Distribution
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Fit an extreme value distribution to every row of maxima at once, with L-moments (Hosking, 1985).
+    Shape follows scipy.stats.genextreme convention: positive for a bounded upper tail;
+    it is zero for a Gumbel distribution.
+
+    :param maxima: A numpy array of maxima of shape (series, years), without missing values.
+    :param distribution: A Distribution Enum: ['gev', 'gumbel'].
+    :return: A tuple of numpy arrays, one value per row: location, scale and shape.
+    """
+    maxima = np.sort(np.atleast_2d(maxima), axis=1)
+    n = maxima.shape[1]
+    ranks = np.arange(n)
+
+    b0 = maxima.mean(axis=1)
+    b1 = (maxima * ranks).mean(axis=1) / (n - 1)
+    l2 = 2 * b1 - b0
+
+    if distribution == Distribution.GUMBEL:
+        scales = l2 / np.log(2)
+        return b0 - EULER_GAMMA * scales, scales, np.zeros(len(maxima))
+
+    from scipy import special
+
+    b2 = (maxima * ranks * (ranks - 1)).mean(axis=1) / ((n - 1) * (n - 2))
+    l3 = 6 * b2 - 6 * b1 + b0
+    c = 2 / (3 + l3 / l2) - np.log(2) / np.log(3)
+    shapes = 7.8590 * c + 2.9554 * c * c
+
+    is_gumbel = np.abs(shapes) < MIN_GEV_SHAPE
+    safe_shapes = np.where(is_gumbel, 1.0, shapes)
+    gamma = special.gamma(1 + safe_shapes)
+    scales = np.where(
+        is_gumbel,
+        l2 / np.log(2),
+        l2 * safe_shapes / ((1 - 2**-safe_shapes) * gamma),
+    )
+    locations = np.where(
+        is_gumbel,
+        b0 - EULER_GAMMA * scales,
+        b0 - scales * (1 - gamma) / safe_shapes,
+    )
+
+    return locations, scales, np.where(is_gumbel, 0.0, shapes)
+
+
+def get_quantiles(
+    locations: np.ndarray,
+    scales: np.ndarray,
+    shapes: np.ndarray,
+    probabilities: np.ndarray,
+) -> np.ndarray:
+    """
+    Compute quantiles of extreme value distributions, broadcasting parameters against probabilities.
+
+    :param locations: A numpy array of locations.
+    :param scales: A numpy array of scales.
+    :param shapes: A numpy array of shapes, zero for Gumbel distributions.
+    :param probabilities: A numpy array of non-exceedance probabilities.
+    :return: A numpy array of quantiles.
+    """
+    reduced_variates = -np.log(probabilities)
+    is_gumbel = np.abs(shapes) < MIN_GEV_SHAPE
+    safe_shapes = np.where(is_gumbel, 1.0, shapes)
+
+    return locations + scales * np.where(
+        is_gumbel,
+        -np.log(reduced_variates),
+        (1 - reduced_variates**safe_shapes) / safe_shapes,
+    )
+
+
+def _get_bootstrap_return_levels(
+    parameters: tuple[float, float, float],
+    years: int,
+    distribution: Distribution,
+    return_periods: tuple[int, ...],
+    replicates: int,
+    seed_sequence: np.random.SeedSequence,
+) -> np.ndarray:
+    """
+    Draw replicates of maxima from a fitted distribution, fit them all at once and compute their return levels.
+    Executed in worker processes: it should only rely on its arguments.
+    """
+    location, scale, shape = np.array(parameters)
+    samples = get_quantiles(
+        location,
+        scale,
+        shape,
+        np.random.default_rng(seed_sequence).random((replicates, years)),
+    )
+    locations, scales, shapes = fit_distributions(samples, distribution)
+
+    return get_quantiles(
+        locations[:, np.newaxis],
+        scales[:, np.newaxis],
+        shapes[:, np.newaxis],
+        1 - 1 / np.array(return_periods),
+    )
+
+
+def get_return_levels(
+    maxima: np.ndarray,
+    *,
+    distribution: Distribution = Distribution.GEV,
+    return_periods: tuple[int, ...] = RETURN_PERIODS,
+    replicates=1000,
+    confidence=0.95,
+    seed=0,
+    executor: Executor | None = None,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Compute return levels of maxima and their confidence intervals with a parametric bootstrap:
+    replicates drawn from the fitted distribution are fitted in turn.
+    Replicates are split into chunks with their own random streams derived from the seed.
+
+    :param maxima: A numpy array of maxima of every year; missing values are skipped.
+    :param distribution: A Distribution Enum: ['gev', 'gumbel']. Defaults to 'gev'.
+    :param return_periods: A tuple of return periods, in years. Defaults to (10, 50, 100).
+    :param replicates: Number of bootstrap replicates. Defaults to 1000.
+    :param confidence: Probability covered by confidence intervals. Defaults to 0.95.
+    :param seed: Seed of the random generator. Defaults to 0.
+    :param executor: An executor, e.g. a process pool, to run chunks of replicates in parallel (optional).
+    :return: A tuple of numpy arrays, one value per return period: return level, lower and upper bounds.
+    NaN if fewer than 3 maxima are known.
+    """
+    maxima = np.asarray(maxima, dtype=float)
+    maxima = maxima[~np.isnan(maxima)]
+    if len(maxima) < 3:
+        return tuple(np.full(len(return_periods), np.nan) for _ in range(3))  # type: ignore
+
+    locations, scales, shapes = fit_distributions(maxima, distribution)
+    return_levels = get_quantiles(
+        locations, scales, shapes, 1 - 1 / np.array(return_periods)
+    )
+
+    chunks = map_replicate_chunks(
+        _get_bootstrap_return_levels,
+        (float(locations[0]), float(scales[0]), float(shapes[0])),
+        len(maxima),
+        distribution,
+        return_periods,
+        replicates=replicates,
+        seed=seed,
+        executor=executor,
+    )
+
+    bounds = np.quantile(
+        np.concatenate(chunks), [(1 - confidence) / 2, (1 + confidence) / 2], axis=0
+    )
+
+    return return_levels, bounds[0], bounds[1]
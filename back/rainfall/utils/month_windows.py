@@ -0,0 +1,210 @@
+"""
+Provides windows of consecutive months, possibly spanning two years like true winters or hydrological years,
+and a cumulative series of monthly rainfall that sums rainfall over any window in constant time.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from back.rainfall.utils.enums import Month
+
+MONTHS = list(Month)
+
+# Running sums are rounded to clear float noise before rainfall is rounded to its precision
+SUM_DECIMALS = 9
+
+
+@dataclass(frozen=True)
+class MonthWindow:
+    """
+    Consecutive months, from 1 to 12, ending with a given month.
+    A window spanning two years belongs to the year of its last month:
+    winter 2021 lasts from December 2020 to February 2021,
+    hydrological year 2021 from October 2020 to September 2021.
+    """
+
+    end_month: Month
+    length: int
+
+    def __post_init__(self):
+        if not 1 <= self.length <= len(MONTHS):
+            raise ValueError(
+                f"Window length should be between 1 and {len(MONTHS)}, not {self.length}."
+            )
+
+    @classmethod
+    def from_months(cls, start_month: Month, end_month: Month | None = None):
+        """
+        Instantiate class from first and last months, the latter possibly preceding the former.
+
+        :param start_month: A Month Enum representing the first month.
+        :param end_month: A Month Enum representing the last month (optional).
+        If not given, window is start month only.
+        :return: A MonthWindow instance.
+        """
+        if end_month is None:
+            end_month = start_month
+
+        return cls(
+            end_month,
+            (end_month.get_rank() - start_month.get_rank()) % len(MONTHS) + 1,
+        )
+
+    @classmethod
+    def from_string(cls, value: str):
+        """
+        Instantiate class from first and last months separated by a dash, e.g. 'October-September',
+        or from a single month.
+
+        :param value: A string made of Month values.
+        :return: A MonthWindow instance.
+        :raise ValueError: If a month is unknown.
+        """
+        start_month, _, end_month = value.partition("-")
+
+        return cls.from_months(
+            Month(start_month.strip().capitalize()),
+            Month(end_month.strip().capitalize()) if end_month else None,
+        )
+
+    def __str__(self) -> str:
+        if self.length == 1:
+            return self.end_month.value
+
+        return f"{self.start_month.value}-{self.end_month.value}"
+
+    @property
+    def start_month(self) -> Month:
+        return MONTHS[(self.end_month.get_rank() - self.length) % len(MONTHS)]
+
+    @property
+    def spans_two_years(self) -> bool:
+        return self.length > self.end_month.get_rank()
+
+    def get_months(self) -> list[Month]:
+        """
+        List months of the window in chronological order.
+
+        :return: A list of Month Enum.
+        """
+        end = self.end_month.get_rank()
+
+        return [MONTHS[rank % len(MONTHS)] for rank in range(end - self.length, end)]
+
+
+HYDROLOGICAL_YEAR = MonthWindow(Month.SEPTEMBER, 12)
+
+
+class CumulativeMonthlyRainfall:
+    """
+    Monthly rainfall of consecutive years flattened into a single series,
+    along with running sums of rainfall and of months present in raw data:
+    rainfall over any window of consecutive months, even across years, is the difference of two running sums.
+    Missing values are skipped, as pandas does, but windows reaching a year missing from raw data,
+    or before the first one, are missing.
+    """
+
+    def __init__(self, years: np.ndarray, monthly_rainfall: np.ndarray):
+        """
+        :param years: A numpy array of sorted and unique years.
+        :param monthly_rainfall: A numpy array of rainfall (in mm) for every month of every year, of shape (years, 12).
+        """
+        years = np.asarray(years, dtype=np.int64)
+        self.first_year = int(years[0]) if len(years) else 0
+        self.years = np.arange(
+            self.first_year, int(years[-1]) + 1 if len(years) else 0, dtype=np.int64
+        )
+
+        rows = years - self.first_year
+        self.monthly_rainfall = np.full((len(self.years), len(MONTHS)), np.nan)
+        self.monthly_rainfall[rows] = monthly_rainfall
+        is_present = np.zeros((len(self.years), len(MONTHS)), dtype=np.int64)
+        is_present[rows] = 1
+
+        rainfall = np.nan_to_num(self.monthly_rainfall)
+        self.rainfall_sums = np.concatenate(([0.0], np.cumsum(rainfall)))
+        self.present_counts = np.concatenate(([0], np.cumsum(is_present)))
+
+    @property
+    def nbytes(self) -> int:
+        return (
+            self.years.nbytes
+            + self.monthly_rainfall.nbytes
+            + self.rainfall_sums.nbytes
+            + self.present_counts.nbytes
+        )
+
+    @classmethod
+    def from_raw_data(cls, raw_data: pd.DataFrame):
+        """
+        Instantiate class upon raw data.
+
+        :param raw_data: A pandas DataFrame shaped as the original CSV: the year, then rainfall for every month.
+        :return: A CumulativeMonthlyRainfall instance.
+        """
+        raw_data = raw_data.sort_values(raw_data.columns[0])
+
+        return cls(
+            raw_data.iloc[:, 0].to_numpy(dtype=np.int64),
+            raw_data.iloc[:, 1:].to_numpy(dtype=float),
+        )
+
+    def _get_sums(self, ends: np.ndarray, length: int) -> np.ndarray:
+        starts = ends - length
+        is_within = starts >= 0
+        starts = np.maximum(starts, 0)
+
+        sums = np.round(
+            self.rainfall_sums[ends] - self.rainfall_sums[starts], SUM_DECIMALS
+        )
+        sums[
+            ~is_within
+            | (self.present_counts[ends] - self.present_counts[starts] < length)
+        ] = np.nan
+
+        return sums
+
+    def get_window_rainfall(self, window: MonthWindow) -> np.ndarray:
+        """
+        Sum rainfall over a window for every year.
+
+        :param window: A MonthWindow.
+        :return: A numpy array of rainfall (in mm) for each year of years attribute,
+        NaN if window reaches a year missing from raw data.
+        """
+        ends = np.arange(len(self.years)) * len(MONTHS) + window.end_month.get_rank()
+
+        return self._get_sums(ends, window.length)
+
+    def get_rolling_rainfall(self, length: int) -> np.ndarray:
+        """
+        Sum rainfall over a rolling window ending at every month, e.g. 3, 6 or 12-month totals.
+
+        :param length: Number of months summed, possibly more than 12.
+        :return: A numpy array of rainfall (in mm) of shape (years, 12),
+        NaN for windows reaching a year missing from raw data.
+        """
+        ends = np.arange(1, len(self.years) * len(MONTHS) + 1)
+
+        return self._get_sums(ends, length).reshape(-1, len(MONTHS))
+
+    def get_window_maxima(self, window: MonthWindow) -> np.ndarray:
+        """
+        Find maximum monthly rainfall over a window for every year.
+
+        :param window: A MonthWindow.
+        :return: A numpy array of maximum monthly rainfall (in mm) for each year of years attribute,
+        NaN if window reaches a year missing from raw data or if rainfall of every month is missing.
+        """
+        ends = np.arange(len(self.years)) * len(MONTHS) + window.end_month.get_rank()
+        months = ends[:, np.newaxis] + np.arange(-window.length, 0)
+
+        maxima = np.fmax.reduce(
+            self.monthly_rainfall.ravel()[np.maximum(months, 0)], axis=1
+        )
+        # Same missing windows as sums
+        maxima[np.isnan(self._get_sums(ends, window.length))] = np.nan
+
+        return maxima
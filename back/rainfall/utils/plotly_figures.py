@@ -2,27 +2,39 @@
 Provides useful functions for plotting rainfall data in all shapes.
 """
 
-from typing import Union
+from typing import TYPE_CHECKING, Union
 
+import numpy as np
 import pandas as pd
+
+# Plotly loads its graph objects lazily, upon first attribute access
 import plotly.graph_objs as go
-from plotly.basedatatypes import BaseTraceType
 
 import back.rainfall.models as models
-from back.rainfall.utils import Label, TimeMode
+from back.rainfall.utils import Label, Month, TimeMode
+from back.rainfall.utils import rainfall_metrics as rain
+
+if TYPE_CHECKING:
+    from plotly.basedatatypes import BaseTraceType
 
-FIGURE_TYPE_TO_PLOTLY_TRACE: dict[str, type[BaseTraceType]] = {
-    "bar": go.Bar,
-    "scatter": go.Scatter,
+# Names of graph objects rather than classes, not to load them along with this module
+FIGURE_TYPE_TO_PLOTLY_TRACE: dict[str, str] = {
+    "bar": "Bar",
+    "scatter": "Scatter",
 }
 
 
-def _get_plotly_trace_by_figure_type(figure_type: str) -> type[BaseTraceType] | None:
-    return FIGURE_TYPE_TO_PLOTLY_TRACE.get(figure_type.casefold())
+def _get_plotly_trace_by_figure_type(
+    figure_type: str,
+) -> "type[BaseTraceType] | None":
+    if trace_name := FIGURE_TYPE_TO_PLOTLY_TRACE.get(figure_type.casefold()):
+        return getattr(go, trace_name)
+
+    return None
 
 
 def _update_plotly_figure_layout(
-    figure: go.Figure,
+    figure: "go.Figure",
     *,
     title: str,
     xaxis_title: str | None = None,
@@ -62,7 +74,7 @@ def get_figure_of_column_according_to_year(
     figure_type="bar",
     figure_label: str | None = None,
     trace_label: str | None = None,
-) -> go.Figure | None:
+) -> "go.Figure | None":
     """
     Return plotly figure for specified column data according to year.
 
@@ -110,7 +122,7 @@ def get_bar_figure_of_rainfall_averages(
     time_mode: TimeMode,
     begin_year: int,
     end_year: int,
-) -> go.Figure:
+) -> "go.Figure":
     """
     Return plotly bar figure displaying average rainfall for each month or for each season passed through the dict.
 
@@ -154,10 +166,11 @@ def get_bar_figure_of_rainfall_linreg_slopes(
     time_mode: TimeMode,
     begin_year: int,
     end_year: int,
-) -> go.Figure:
+) -> "go.Figure":
     """
     Return plotly bar figure displaying rainfall linear regression slopes for each month or
-    for each season passed through the dict.
+    for each season passed through the dict, next to Sen's slopes along with Mann–Kendall p-values,
+    which are computed for every month or season at once.
 
     :param rainfall_instance_by_label: A dict of months respectively mapped with instances of MonthlyRainfall
     or a dict of seasons respectively mapped with instances of SeasonalRainfall.
@@ -166,11 +179,12 @@ def get_bar_figure_of_rainfall_linreg_slopes(
     to start getting our rainfall values.
     :param end_year: An integer representing the year
     to end getting our rainfall values.
-    :return: A plotly Figure object of the rainfall LinReg slopes for each month.
+    :return: A plotly Figure object of the rainfall LinReg and Sen's slopes for each month.
     """
     labels: list[str] = []
     slopes: list[float] = []
     r2_scores: list[float] = []
+    yearly_rainfall_by_label: dict[str, pd.DataFrame] = {}
     for label, rainfall_instance in rainfall_instance_by_label.items():
         labels.append(label)
 
@@ -180,20 +194,95 @@ def get_bar_figure_of_rainfall_linreg_slopes(
 
         slopes.append(slope)
         r2_scores.append(r2_score)
+        yearly_rainfall_by_label[label] = rainfall_instance.get_yearly_rainfall(
+            begin_year, end_year
+        )
+
+    trend_tests = rain.get_trend_tests(
+        yearly_rainfall_by_label,
+        round_precision=next(iter(rainfall_instance_by_label.values())).round_precision,
+    )
 
     figure = go.Figure(
-        go.Bar(
-            x=labels,
-            y=slopes,
-            name=time_mode.value.capitalize(),
-        )
+        [
+            go.Bar(
+                x=labels,
+                y=slopes,
+                name=Label.LINEAR_REGRESSION.value,
+                customdata=[round(r2_score, 2) for r2_score in r2_scores],
+                hovertemplate="%{x}: %{y} mm/year<br>R2 score: %{customdata}",
+            ),
+            go.Bar(
+                x=labels,
+                y=trend_tests[Label.SENS_SLOPE.value],
+                name=Label.SENS_SLOPE.value,
+                customdata=trend_tests[Label.P_VALUE.value],
+                hovertemplate="%{x}: %{y} mm/year<br>Mann-Kendall p-value: %{customdata}",
+            ),
+        ]
     )
 
     _update_plotly_figure_layout(
         figure,
-        title=f"{Label.LINEAR_REGRESSION.value} slope (mm/year) between {begin_year} and {end_year}",
+        title=f"{Label.LINEAR_REGRESSION.value} and {Label.SENS_SLOPE.value} (mm/year) between {begin_year} and {end_year}",
         xaxis_title=time_mode.value.capitalize()[:-2],
-        yaxis_title=f"{Label.LINEAR_REGRESSION.value} slope (mm/year)",
+        yaxis_title="Slope (mm/year)",
+    )
+
+    return figure
+
+
+def get_heatmap_figure_of_rainfall_linreg_slopes(
+    rainfall_instance: Union[
+        "models.YearlyRainfall", "models.MonthlyRainfall", "models.SeasonalRainfall"
+    ],
+    *,
+    begin_year: int,
+    end_year: int,
+) -> "go.Figure":
+    """
+    Return plotly heat map figure displaying rainfall linear regression slope
+    for every pair of first and last years between the given years, along with R2 scores.
+
+    :param rainfall_instance: An instance of one these 3 classes: [YearlyRainfall, MonthlyRainfall, SeasonalRainfall].
+    :param begin_year: An integer representing the year
+    to start getting our rainfall values.
+    :param end_year: An integer representing the year
+    to end getting our rainfall values.
+    :return: A plotly Figure object of the rainfall LinReg slopes, first years as rows and last years as columns.
+    """
+    years, slopes, r2_scores = (
+        rainfall_instance.accumulators.get_linear_regression_matrices(
+            begin_year, end_year
+        )
+    )
+
+    figure = go.Figure(
+        go.Heatmap(
+            x=years,
+            y=years,
+            z=slopes.round(rainfall_instance.round_precision),
+            customdata=r2_scores.round(2),
+            colorscale="RdBu",
+            zmid=0,
+            colorbar={"title": {"text": "mm/year"}},
+            hovertemplate="%{y}-%{x}<br>slope: %{z} mm/year<br>R2 score: %{customdata}<extra></extra>",
+        )
+    )
+
+    figure_title = f"{Label.LINEAR_REGRESSION.value} slope (mm/year) between {begin_year} and {end_year}"
+    if isinstance(rainfall_instance, models.MonthlyRainfall):
+        figure_title = f"{figure_title} for {rainfall_instance.month.value}"
+    elif isinstance(rainfall_instance, models.SeasonalRainfall):
+        figure_title = f"{figure_title} for {rainfall_instance.season.value}"
+    elif isinstance(rainfall_instance, models.WindowRainfall):
+        figure_title = f"{figure_title} for {rainfall_instance.window}"
+
+    _update_plotly_figure_layout(
+        figure,
+        title=figure_title,
+        xaxis_title="Last year",
+        yaxis_title="First year",
     )
 
     return figure
@@ -207,7 +296,7 @@ def get_bar_figure_of_relative_distances_to_normal(
     normal_year: int,
     begin_year: int,
     end_year: int,
-) -> go.Figure:
+) -> "go.Figure":
     """
     Return plotly bar figure displaying relative distances to normal for each month or
     for each season passed through the dict.
@@ -251,6 +340,49 @@ def get_bar_figure_of_relative_distances_to_normal(
     return figure
 
 
+def get_bar_figure_of_standardized_precipitation_index(
+    spi_data: pd.DataFrame,
+    *,
+    months: int,
+    normal_year: int,
+) -> "go.Figure":
+    """
+    Return plotly bar figure displaying the Standardized Precipitation Index (SPI) according to month,
+    droughts and wet spells being colored differently.
+
+    :param spi_data: A pandas DataFrame displaying SPI according to year and month.
+    :param months: Number of months rainfall has been summed over.
+    :param normal_year: An integer representing the year
+    to start the 30 years distributions have been fitted upon.
+    :return: A plotly Figure object of the SPI according to month.
+    """
+    spi = spi_data[Label.STANDARDIZED_PRECIPITATION_INDEX.value]
+    month_ranks = spi_data[Label.MONTH.value].map(
+        {month.value: month.get_rank() for month in Month}
+    )
+
+    figure = go.Figure(
+        go.Bar(
+            x=spi_data[Label.YEAR.value].astype(str)
+            + "-"
+            + month_ranks.astype(str).str.zfill(2),
+            y=spi,
+            marker={"color": np.where(spi < 0, "crimson", "dodgerblue")},
+            name=f"SPI-{months}",
+        )
+    )
+
+    _update_plotly_figure_layout(
+        figure,
+        title=f"{Label.STANDARDIZED_PRECIPITATION_INDEX.value} over {months} months "
+        f"compared to {normal_year}-{normal_year + 29}",
+        xaxis_title=Label.MONTH.value,
+        yaxis_title=f"SPI-{months}",
+    )
+
+    return figure
+
+
 def get_pie_figure_of_years_above_and_below_normal(
     rainfall_instance: Union[
         "models.YearlyRainfall", "models.MonthlyRainfall", "models.SeasonalRainfall"
@@ -259,7 +391,7 @@ def get_pie_figure_of_years_above_and_below_normal(
     normal_year: int,
     begin_year: int,
     end_year: int,
-) -> go.Figure:
+) -> "go.Figure":
     """
     Return plotly pie figure displaying the percentage of years above and below normal for the given time mode,
     between the given years, and for the normal computed from the given year.
@@ -5,6 +5,7 @@ over DataFrame containing rainfall data over years.
 
 from typing import Callable
 
+import numpy as np
 import pandas as pd
 
 from back.rainfall.utils import Label
@@ -75,3 +76,137 @@ def get_normal(
         ),
         round_precision=round_precision,
     )
+
+
+def get_savgol_filter(
+    yearly_rainfall: pd.DataFrame,
+    *,
+    round_precision=1,
+    window_length: int | None = None,
+    polyorder: int | None = None,
+) -> np.ndarray:
+    """
+    Computes Savitzky–Golay filter of rainfall according to year.
+
+    :param yearly_rainfall: A pandas DataFrame displaying rainfall data (in mm) according to year.
+    :param round_precision: A float representing the rainfall precision (optional). Defaults to 1.
+    :param window_length: Length of the filter window (optional). Defaults to the number of years.
+    :param polyorder: Order of the polynomial used to fit the samples (optional).
+    Defaults to a tenth of the window length.
+    :return: A numpy array of filtered rainfall values, one per year.
+    """
+    from scipy import signal
+
+    window_length = window_length or len(yearly_rainfall)
+
+    return np.round(
+        signal.savgol_filter(
+            yearly_rainfall[Label.RAINFALL.value],
+            window_length=window_length,
+            polyorder=window_length // 10 if polyorder is None else polyorder,
+        ),
+        round_precision,
+    )
+
+
+def get_kmeans_labels(
+    yearly_rainfall: pd.DataFrame, *, kmeans_clusters=4
+) -> np.ndarray:
+    """
+    Computes K-Mean clustering of rainfall according to year.
+
+    :param yearly_rainfall: A pandas DataFrame displaying rainfall data (in mm) according to year.
+    :param kmeans_clusters: The number of clusters to compute. Defaults to 4.
+    :return: A numpy array of cluster labels, one per year.
+    """
+    from sklearn.cluster import KMeans
+
+    fit_data: np.ndarray = yearly_rainfall[
+        [Label.YEAR.value, Label.RAINFALL.value]
+    ].values
+
+    kmeans = KMeans(n_init=10, n_clusters=kmeans_clusters)
+    kmeans.fit(fit_data)
+
+    return kmeans.predict(fit_data)
+
+
+def get_mann_kendall_tests(
+    years: np.ndarray, rainfall: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Computes Theil–Sen slope and Mann–Kendall trend test, corrected for ties,
+    of several rainfall series according to the same years at once.
+    Differences between every pair of years are computed for all series together;
+    ties are counted upon rainfall values sorted within each series.
+    Missing rainfall values are skipped.
+
+    :param years: A numpy array of distinct years.
+    :param rainfall: A numpy array of rainfall values (in mm) of shape (series, years).
+    :return: A tuple of numpy arrays, one value per series: Sen's slope (mm/year), Mann–Kendall Z score
+    and two-sided p-value of the test. NaN if fewer than 2 rainfall values are known.
+    """
+    from scipy import special
+
+    rainfall = np.atleast_2d(np.asarray(rainfall, dtype=float))
+    firsts, lasts = np.triu_indices(len(years), k=1)
+    differences = rainfall[:, lasts] - rainfall[:, firsts]
+
+    sen_slopes = np.full(len(rainfall), np.nan)
+    is_computable = (~np.isnan(differences)).any(axis=1)
+    sen_slopes[is_computable] = np.nanmedian(
+        differences[is_computable] / (years[lasts] - years[firsts]), axis=1
+    )
+    s = np.nansum(np.sign(differences), axis=1)
+
+    # A tie of t values lowers variance by t(t-1)(2t+5), i.e. by 6k² - 6 for its k-th value
+    sorted_rainfall = np.sort(rainfall, axis=1)
+    positions = np.arange(rainfall.shape[1])
+    is_tie_start = np.ones(rainfall.shape, dtype=bool)
+    is_tie_start[:, 1:] = sorted_rainfall[:, 1:] != sorted_rainfall[:, :-1]
+    ranks_within_ties = positions - np.maximum.accumulate(
+        np.where(is_tie_start, positions, 0), axis=1
+    )
+    is_known = ~np.isnan(sorted_rainfall)
+    ties = np.sum(6 * ranks_within_ties * (ranks_within_ties + 2) * is_known, axis=1)
+
+    n = is_known.sum(axis=1)
+    variance = (n * (n - 1) * (2 * n + 5) - ties) / 18
+    with np.errstate(invalid="ignore", divide="ignore"):
+        z_scores = np.where(variance > 0, (s - np.sign(s)) / np.sqrt(variance), np.nan)
+
+    return sen_slopes, z_scores, special.erfc(np.abs(z_scores) / np.sqrt(2))
+
+
+def get_trend_tests(
+    yearly_rainfall_by_label: dict[str, pd.DataFrame], *, round_precision=1
+) -> pd.DataFrame:
+    """
+    Computes Theil–Sen slope and Mann–Kendall trend test of several rainfall series at once,
+    aligned upon their years.
+
+    :param yearly_rainfall_by_label: A dict of pandas DataFrame displaying rainfall data (in mm) according to year.
+    :param round_precision: A float representing the rainfall precision (optional). Defaults to 1.
+    :return: A pandas DataFrame indexed by labels of the dict, displaying Sen's slope (mm/year),
+    Mann–Kendall Z score and p-value.
+    """
+    rainfall = pd.concat(
+        {
+            label: yearly_rainfall.set_index(Label.YEAR.value)[Label.RAINFALL.value]
+            for label, yearly_rainfall in yearly_rainfall_by_label.items()
+        },
+        axis=1,
+    ).sort_index()
+
+    sen_slopes, z_scores, p_values = get_mann_kendall_tests(
+        rainfall.index.to_numpy(dtype=float), rainfall.to_numpy(dtype=float).T
+    )
+
+    return pd.DataFrame(
+        {
+            Label.SENS_SLOPE.value: np.round(sen_slopes, round_precision) + 0.0,
+            Label.MANN_KENDALL_Z_SCORE.value: np.round(z_scores, 3),
+            Label.P_VALUE.value: np.round(p_values, 4),
+        },
+        index=list(yearly_rainfall_by_label),
+    )
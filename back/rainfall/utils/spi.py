@@ -0,0 +1,78 @@
+"""
+Provides the Standardized Precipitation Index (SPI) of rainfall summed over several months:
+rainfall of every calendar month is fitted to a gamma distribution, whose probabilities are mapped to a standard normal one.
+Negative values tell droughts, positive ones wet spells.
+"""
+
+import numpy as np
+
+# Numbers of months rainfall is commonly summed over
+SPI_SCALES = (1, 3, 6, 12, 24)
+
+# Probabilities beyond are too far in tails to be estimated upon a few decades
+SPI_BOUND = 3.09
+
+# Fewer positive rainfall values would not fit a distribution
+MIN_POSITIVE_VALUES = 3
+
+
+def fit_gamma_distributions(
+    rainfall: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Fit a gamma distribution to positive rainfall of every column at once, with Thom's maximum likelihood estimate,
+    along with the probability of no rainfall, as gamma distributions do not cover zero.
+    Missing values are skipped.
+
+    :param rainfall: A numpy array of rainfall values (in mm) of shape (years, columns), e.g. one column per month.
+    :return: A tuple of numpy arrays, one value per column: shape and scale of gamma distributions
+    and probability of no rainfall. NaN if too few positive rainfall values are known.
+    """
+    rainfall = np.asarray(rainfall, dtype=float)
+    is_known = ~np.isnan(rainfall)
+    is_positive = is_known & (rainfall > 0)
+    positive_counts = is_positive.sum(axis=0)
+    zero_probabilities = 1 - positive_counts / np.maximum(is_known.sum(axis=0), 1)
+
+    # Non-positive values are replaced by 1, whose logarithm adds nothing
+    positive_rainfall = np.where(is_positive, rainfall, 1.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = np.where(is_positive, rainfall, 0.0).sum(axis=0) / positive_counts
+        log_means = np.log(positive_rainfall).sum(axis=0) / positive_counts
+        a = np.log(means) - log_means
+        shapes = (1 + np.sqrt(1 + 4 * a / 3)) / (4 * a)
+        scales = means / shapes
+
+    is_fitted = (positive_counts >= MIN_POSITIVE_VALUES) & (a > 0)
+    shapes[~is_fitted] = np.nan
+    scales[~is_fitted] = np.nan
+    zero_probabilities[~is_fitted] = np.nan
+
+    return shapes, scales, zero_probabilities
+
+
+def get_standardized_precipitation_index(
+    rainfall: np.ndarray, reference_rainfall: np.ndarray | None = None
+) -> np.ndarray:
+    """
+    Compute the Standardized Precipitation Index of rainfall, distributions being fitted
+    for every column at once upon a reference period, e.g. 30 years of a normal.
+
+    :param rainfall: A numpy array of rainfall values (in mm) of shape (years, columns), e.g. one column per month.
+    :param reference_rainfall: A numpy array of rainfall values (in mm) to fit distributions upon,
+    with the same columns (optional). If not given, rainfall is used.
+    :return: A numpy array of indexes of the same shape as rainfall, bounded by ±3.09,
+    NaN where rainfall is missing or distribution could not be fitted.
+    """
+    from scipy import stats
+
+    rainfall = np.asarray(rainfall, dtype=float)
+    shapes, scales, zero_probabilities = fit_gamma_distributions(
+        rainfall if reference_rainfall is None else reference_rainfall
+    )
+
+    probabilities = zero_probabilities + (1 - zero_probabilities) * stats.gamma.cdf(
+        np.maximum(rainfall, 0.0), shapes, scale=scales
+    )
+
+    return np.clip(stats.norm.ppf(probabilities), -SPI_BOUND, SPI_BOUND)
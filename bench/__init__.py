@@ -0,0 +1,3 @@
+"""
+Benchmarks of rainfall models and API, run through `run.py bench`.
+"""
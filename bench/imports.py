@@ -0,0 +1,151 @@
+"""
+Benchmark of import time of CLI, API app and rainfall models, measured in fresh interpreters
+with `python -X importtime` and parsed into a report of slowest modules and packages.
+"""
+
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+from bench.utils import get_metadata
+
+# Statements importing what is loaded upon startup of each entry point
+DEFAULT_TARGETS = {
+    "run.py": "import run",
+    "api": "import back.api.app",
+    "models": "import back.rainfall",
+}
+
+# Packages only needed by some features, which should not be loaded upon startup
+HEAVY_PACKAGES = ("scipy", "sklearn", "plotly")
+
+IMPORT_TIME_PATTERN = re.compile(
+    r"^import time:\s+(?P<self>\d+) \|\s+(?P<cumulative>\d+) \| (?P<indent>\s*)(?P<module>\S+)$"
+)
+
+ROOT_FOLDER = Path(__file__).parents[1]
+
+
+def parse_import_time(output: str) -> list[dict[str, Any]]:
+    """
+    Parse output of `python -X importtime` into a list of imported modules.
+
+    :param output: Standard error of an interpreter run with `-X importtime`.
+    :return: A list of dicts, one per module in import completion order,
+    with its name, its nesting level and its self and cumulative import times in microseconds.
+    """
+    modules: list[dict[str, Any]] = []
+    for line in output.splitlines():
+        if match := IMPORT_TIME_PATTERN.match(line):
+            modules.append(
+                {
+                    "module": match["module"],
+                    "level": len(match["indent"]) // 2,
+                    "self_us": int(match["self"]),
+                    "cumulative_us": int(match["cumulative"]),
+                }
+            )
+
+    return modules
+
+
+def get_import_report(modules: list[dict[str, Any]], *, top=10) -> dict[str, Any]:
+    """
+    Summarize modules imported by an interpreter.
+
+    :param modules: Imported modules, as parsed by parse_import_time.
+    :param top: Number of slowest modules and packages to report. Defaults to 10.
+    :return: A dict with total import time (in ms), number of modules,
+    slowest modules and top-level packages by self time (in ms)
+    and self time (in ms) of each heavy package, 0 if not loaded.
+    """
+    self_us_by_package: dict[str, int] = {}
+    for module in modules:
+        package = module["module"].partition(".")[0]
+        self_us_by_package[package] = (
+            self_us_by_package.get(package, 0) + module["self_us"]
+        )
+
+    return {
+        "total_ms": sum(
+            module["cumulative_us"] for module in modules if module["level"] == 0
+        )
+        / 1e3,
+        "module_count": len(modules),
+        "slowest_modules": {
+            module["module"]: module["self_us"] / 1e3
+            for module in sorted(modules, key=lambda module: -module["self_us"])[:top]
+        },
+        "slowest_packages": {
+            package: self_us / 1e3
+            for package, self_us in sorted(
+                self_us_by_package.items(), key=lambda item: -item[1]
+            )[:top]
+        },
+        "heavy_packages_ms": {
+            package: self_us_by_package.get(package, 0) / 1e3
+            for package in HEAVY_PACKAGES
+        },
+    }
+
+
+def measure_import_time(statement: str) -> tuple[float, list[dict[str, Any]]]:
+    """
+    Run a statement in a fresh interpreter, from repository root, with import time tracing.
+
+    :param statement: Python statement to run, e.g. 'import back.rainfall'.
+    :return: A tuple with wall-clock duration of the interpreter (in seconds) and imported modules.
+    """
+    start = time.perf_counter()
+    completed_process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=ROOT_FOLDER,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    wall_s = time.perf_counter() - start
+
+    return wall_s, parse_import_time(completed_process.stderr)
+
+
+def run_imports_benchmark(
+    targets: dict[str, str] | None = None, *, repeat=5, top=10
+) -> dict[str, Any]:
+    """
+    Run import time benchmark: each target is imported several times in fresh interpreters,
+    and the fastest run is reported to lessen noise.
+
+    :param targets: A dict of statements to run by target name (optional). Defaults to DEFAULT_TARGETS.
+    :param repeat: Number of runs per target. Defaults to 5.
+    :param top: Number of slowest modules and packages to report. Defaults to 10.
+    :return: A dict with metadata and results, JSON serializable.
+    """
+    if repeat < 1:
+        raise ValueError(f"Repeat should be at least 1, got {repeat}.")
+
+    targets = targets or DEFAULT_TARGETS
+
+    results: dict[str, Any] = {}
+    for name, statement in targets.items():
+        runs = [measure_import_time(statement) for _ in range(repeat)]
+        reports = [get_import_report(modules, top=top) for _, modules in runs]
+        fastest_report = min(reports, key=lambda report: report["total_ms"])
+
+        results[name] = {
+            "statement": statement,
+            "wall_s_min": min(wall_s for wall_s, _ in runs),
+            "total_ms_median": statistics.median(
+                report["total_ms"] for report in reports
+            ),
+            **fastest_report,
+        }
+
+    return {
+        "metadata": get_metadata(targets=targets, repeat=repeat, top=top),
+        "targets": results,
+    }
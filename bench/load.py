@@ -0,0 +1,299 @@
+"""
+Load test of the FastAPI app, driven in-process through ASGI without any network:
+concurrent requests drawn from a weighted mix of routes, with throughput, latency percentiles
+and error rate reported per route. Two runs can be compared.
+"""
+
+import asyncio
+import random
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Callable
+from urllib.parse import urlencode
+
+import numpy as np
+
+from back.api.utils import send_get_request_in_process
+from back.rainfall.utils import Month, Season, TimeMode
+from bench.utils import get_metadata
+
+PERCENTILES = (50, 95, 99)
+
+
+@dataclass
+class RouteMix:
+    """
+    A route of the request mix: its path, its share of traffic
+    and the time modes it is queried with.
+    """
+
+    path: str
+    weight: float
+    time_modes: tuple[TimeMode, ...] = (
+        TimeMode.YEARLY,
+        TimeMode.MONTHLY,
+        TimeMode.SEASONAL,
+    )
+    with_normal_year: bool = False
+    with_end_year: bool = True
+
+
+# Mirrors traffic of the webapp, which mostly displays figures, and of API users
+DEFAULT_MIX = [
+    RouteMix("/rainfall/average", 15),
+    RouteMix("/rainfall/normal", 10, with_end_year=False),
+    RouteMix("/rainfall/relative_distance_to_normal", 5, with_normal_year=True),
+    RouteMix("/rainfall/standard_deviation", 5),
+    RouteMix("/year/below_normal", 5, with_normal_year=True),
+    RouteMix("/year/above_normal", 5, with_normal_year=True),
+    RouteMix("/graph/rainfall_by_year", 20),
+    RouteMix(
+        "/graph/rainfall_averages", 10, time_modes=(TimeMode.MONTHLY, TimeMode.SEASONAL)
+    ),
+    RouteMix(
+        "/graph/rainfall_linreg_slopes",
+        5,
+        time_modes=(TimeMode.MONTHLY, TimeMode.SEASONAL),
+    ),
+    RouteMix(
+        "/graph/relative_distances_to_normal",
+        5,
+        time_modes=(TimeMode.MONTHLY, TimeMode.SEASONAL),
+        with_normal_year=True,
+    ),
+    RouteMix(
+        "/graph/percentage_of_years_above_and_below_normal", 5, with_normal_year=True
+    ),
+    RouteMix("/csv/rainfall_by_year", 10),
+]
+
+
+def generate_targets(
+    mix: list[RouteMix],
+    *,
+    n_requests: int,
+    distinct_queries: int,
+    min_year: int,
+    max_year: int,
+    seed: int = 0,
+) -> list[str]:
+    """
+    Generate targets, i.e. paths with query strings, of requests to send.
+    Requests are drawn from a pool of distinct queries, to mimic users asking for the same data.
+
+    :param mix: A list of routes with their share of traffic.
+    :param n_requests: Number of requests.
+    :param distinct_queries: Number of distinct queries in the pool.
+    :param min_year: First year available.
+    :param max_year: Last year available.
+    :param seed: Seed of the random generator.
+    :return: A list of targets.
+    """
+    rng = random.Random(seed)
+    max_normal_year = max_year - 29
+
+    def get_target(route_mix: RouteMix) -> str:
+        time_mode = rng.choice(route_mix.time_modes)
+        params: dict[str, Any] = {"time_mode": time_mode.value}
+        if time_mode == TimeMode.MONTHLY:
+            params["month"] = rng.choice(list(Month)).value
+        elif time_mode == TimeMode.SEASONAL:
+            params["season"] = rng.choice(list(Season)).value
+
+        if route_mix.with_normal_year:
+            params["normal_year"] = rng.randint(min_year, max_normal_year)
+
+        if route_mix.with_end_year:
+            params["begin_year"] = rng.randint(min_year, max_year - 1)
+            params["end_year"] = rng.randint(params["begin_year"] + 1, max_year)
+        else:
+            params["begin_year"] = rng.randint(min_year, max_normal_year)
+
+        return f"{route_mix.path}?{urlencode(params)}"
+
+    route_mixes = rng.choices(
+        mix, weights=[route.weight for route in mix], k=distinct_queries
+    )
+    pool = [get_target(route_mix) for route_mix in route_mixes]
+
+    return [rng.choice(pool) for _ in range(n_requests)]
+
+
+def get_route_stats(
+    latencies: list[float], error_count: int, *, duration: float
+) -> dict[str, float | int]:
+    """
+    Compute statistics of requests sent to a route.
+
+    :param latencies: Latencies (in seconds) of requests.
+    :param error_count: Number of requests that failed or did not answer 200.
+    :param duration: Duration (in seconds) of the whole run.
+    :return: A dict of statistics; latencies are in milliseconds.
+    """
+    latencies_ms = np.array(latencies) * 1e3
+
+    return {
+        "requests": len(latencies),
+        "throughput_rps": len(latencies) / duration,
+        "error_rate": error_count / len(latencies),
+        "mean_ms": float(latencies_ms.mean()),
+        **{
+            f"p{percentile}_ms": float(np.percentile(latencies_ms, percentile))
+            for percentile in PERCENTILES
+        },
+    }
+
+
+async def run_load_test_async(
+    app: Callable[..., Any], targets: list[str], *, concurrency: int
+) -> dict[str, Any]:
+    """
+    Send requests to an ASGI app from concurrent clients, each one waiting for its response before sending next request.
+
+    :param app: An ASGI app.
+    :param targets: Targets of requests to send, in order.
+    :param concurrency: Number of concurrent clients.
+    :return: A dict with duration of the run and statistics per route and in total.
+    """
+    queue: asyncio.Queue[str] = asyncio.Queue()
+    for target in targets:
+        queue.put_nowait(target)
+
+    latencies_by_route: dict[str, list[float]] = defaultdict(list)
+    error_count_by_route: dict[str, int] = defaultdict(int)
+
+    async def client():
+        while not queue.empty():
+            target = queue.get_nowait()
+            route = target.partition("?")[0]
+            start = time.perf_counter()
+            try:
+                status_code, _ = await send_get_request_in_process(app, target)
+            except Exception:  # Server errors are re-raised once responded
+                status_code = 500
+
+            latencies_by_route[route].append(time.perf_counter() - start)
+            if status_code != 200:
+                error_count_by_route[route] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    duration = time.perf_counter() - start
+
+    return {
+        "duration_s": duration,
+        "routes": {
+            route: get_route_stats(
+                latencies, error_count_by_route[route], duration=duration
+            )
+            for route, latencies in sorted(latencies_by_route.items())
+        },
+        "total": get_route_stats(
+            [
+                latency
+                for latencies in latencies_by_route.values()
+                for latency in latencies
+            ],
+            sum(error_count_by_route.values()),
+            duration=duration,
+        ),
+    }
+
+
+def run_load_test(
+    *,
+    n_requests: int = 1000,
+    concurrency: int = 8,
+    distinct_queries: int = 200,
+    mix: list[RouteMix] | None = None,
+    use_cache: bool = True,
+    seed: int = 0,
+) -> dict[str, Any]:
+    """
+    Run load test of the FastAPI app in-process, response cache being emptied beforehand.
+
+    :param n_requests: Number of requests.
+    :param concurrency: Number of concurrent clients.
+    :param distinct_queries: Number of distinct queries requests are drawn from.
+    :param mix: A list of routes with their share of traffic (optional). Defaults to DEFAULT_MIX.
+    :param use_cache: Whether responses are cached in memory, as in production, or always computed.
+    :param seed: Seed of the random generator.
+    :return: A dict with metadata and results, JSON serializable.
+    """
+    from back.api.app import fastapi_app
+    from back.api.routes import rainfall_dataset, response_cache
+
+    snapshot = rainfall_dataset.snapshot
+    targets = generate_targets(
+        mix or DEFAULT_MIX,
+        n_requests=n_requests,
+        distinct_queries=distinct_queries,
+        min_year=snapshot.min_year,
+        max_year=snapshot.max_year,
+        seed=seed,
+    )
+
+    # The persisted store is detached before clearing, so that it is neither
+    # wiped nor filled by the benchmark
+    max_entries, store = response_cache.max_entries, response_cache.store
+    response_cache.store = None
+    response_cache.clear()
+    if not use_cache:
+        # Every value put is evicted at once
+        response_cache.max_entries = 0
+
+    try:
+        results = asyncio.run(
+            run_load_test_async(fastapi_app, targets, concurrency=concurrency)
+        )
+    finally:
+        response_cache.clear()
+        response_cache.max_entries, response_cache.store = max_entries, store
+
+    return {
+        "metadata": get_metadata(
+            n_requests=n_requests,
+            concurrency=concurrency,
+            distinct_queries=distinct_queries,
+            use_cache=use_cache,
+            seed=seed,
+        ),
+        **results,
+    }
+
+
+def compare_load_test_results(
+    baseline: dict[str, Any], candidate: dict[str, Any]
+) -> dict[str, dict[str, dict[str, float]]]:
+    """
+    Compare statistics of two load test runs, route by route and in total.
+    Only routes requested in both runs are compared.
+
+    :param baseline: Results of the reference run.
+    :param candidate: Results of the run to compare to the reference one.
+    :return: A dict giving, for each route then each statistic,
+    baseline and candidate values along with relative change (in %) when baseline is not zero.
+    """
+    stats_by_route = {
+        route: (stats, candidate["routes"][route])
+        for route, stats in baseline["routes"].items()
+        if route in candidate["routes"]
+    }
+    stats_by_route["total"] = (baseline["total"], candidate["total"])
+
+    comparison: dict[str, dict[str, dict[str, float]]] = {}
+    for route, (baseline_stats, candidate_stats) in stats_by_route.items():
+        comparison[route] = {}
+        for name, baseline_value in baseline_stats.items():
+            candidate_value = candidate_stats[name]
+            comparison[route][name] = {
+                "baseline": baseline_value,
+                "candidate": candidate_value,
+            }
+            if baseline_value:
+                comparison[route][name]["change_pct"] = (
+                    (candidate_value - baseline_value) / baseline_value * 100
+                )
+
+    return comparison
@@ -0,0 +1,301 @@
+"""
+Benchmark of memory allocated, traced with tracemalloc, while constructing AllRainfall
+upon Barcelona and synthetic datasets, and while serving each API route.
+Also measures private memory of worker processes holding a dataset,
+either loaded by each of them or mapped from a shared dataset file.
+"""
+
+import asyncio
+import gc
+import multiprocessing
+import os
+import tempfile
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from back.api.utils import send_get_request_in_process
+from back.rainfall import AllRainfall
+from back.rainfall.shared_dataset import write_shared_dataset
+from bench import synthetic
+from bench.load import DEFAULT_MIX, generate_targets
+from bench.utils import get_metadata
+
+DEFAULT_SIZES = (10**3, 10**4, 10**5)
+DEFAULT_WORKER_COUNTS = (1, 2, 4)
+
+
+@contextmanager
+def trace_allocations() -> Iterator[dict[str, int]]:
+    """
+    Trace memory allocations with tracemalloc within a context.
+
+    :return: A dict filled on exit with peak and retained bytes allocated within the context.
+    """
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+
+    gc.collect()
+    tracemalloc.reset_peak()
+    size_before, _ = tracemalloc.get_traced_memory()
+    allocations: dict[str, int] = {}
+    try:
+        yield allocations
+    finally:
+        _, peak_size = tracemalloc.get_traced_memory()
+        # Garbage held by reference cycles is not retained
+        gc.collect()
+        size_after, _ = tracemalloc.get_traced_memory()
+        allocations["peak_bytes"] = peak_size - size_before
+        allocations["retained_bytes"] = size_after - size_before
+        if not was_tracing:
+            tracemalloc.stop()
+
+
+def benchmark_construction(
+    csv_path: str | Path, *, start_year: int, round_precision: int
+) -> dict[str, Any]:
+    """
+    Trace allocations while constructing AllRainfall, then report its deep memory usage.
+
+    :param csv_path: Path to CSV of raw rainfall data.
+    :param start_year: An integer representing the year to start getting our rainfall values.
+    :param round_precision: An integer representing the rainfall precision.
+    :return: A dict with peak and retained bytes allocated, along with AllRainfall memory report.
+    """
+    with trace_allocations() as allocations:
+        all_rainfall = AllRainfall(
+            str(csv_path), start_year=start_year, round_precision=round_precision
+        )
+
+    return {**allocations, "memory_report": all_rainfall.memory_report()}
+
+
+def benchmark_routes(*, seed: int = 0) -> dict[str, dict[str, Any]]:
+    """
+    Trace allocations while serving a request per API route, once a first identical request has been served.
+    Response cache is disabled.
+    Requests are sent to the FastAPI app in-process.
+
+    :param seed: Seed of the random generator drawing request parameters.
+    :return: A dict giving for each route the request target and the peak and retained bytes allocated.
+    """
+    from back.api.app import fastapi_app
+    from back.api.routes import rainfall_dataset, response_cache
+
+    snapshot = rainfall_dataset.snapshot
+
+    target_by_route: dict[str, str] = {}
+    for target in generate_targets(
+        DEFAULT_MIX,
+        n_requests=len(DEFAULT_MIX) * 20,
+        distinct_queries=len(DEFAULT_MIX) * 20,
+        min_year=snapshot.min_year,
+        max_year=snapshot.max_year,
+        seed=seed,
+    ):
+        target_by_route.setdefault(target.partition("?")[0], target)
+
+    async def trace_routes() -> dict[str, dict[str, Any]]:
+        results: dict[str, dict[str, Any]] = {}
+        for route, target in sorted(target_by_route.items()):
+            # Lazy imports and one-off initialisations of first request are not accounted for
+            await send_get_request_in_process(fastapi_app, target)
+            with trace_allocations() as allocations:
+                status_code, _ = await send_get_request_in_process(fastapi_app, target)
+
+            results[route] = {
+                "target": target,
+                "status_code": status_code,
+                **allocations,
+            }
+
+        return results
+
+    # The persisted store is detached before clearing, so that it is not wiped
+    max_entries, store = response_cache.max_entries, response_cache.store
+    response_cache.store = None
+    response_cache.clear()
+    response_cache.max_entries = 0
+    try:
+        return asyncio.run(trace_routes())
+    finally:
+        response_cache.max_entries, response_cache.store = max_entries, store
+
+
+def get_private_bytes(pid: int) -> int | None:
+    """
+    Read memory of a process that is not shared with any other, clean or dirty.
+    Only available on Linux.
+
+    :param pid: Process ID.
+    :return: Size in bytes, None if not available.
+    """
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as smaps:
+            sizes_kb = {
+                name: int(value.split()[0])
+                for name, _, value in (line.partition(":") for line in smaps)
+                if name in ("Private_Clean", "Private_Dirty")
+            }
+    except (FileNotFoundError, ValueError):
+        return None
+
+    return sum(sizes_kb.values()) * 1024
+
+
+def _hold_all_rainfall(load: Callable[[], AllRainfall], ready: Any, stop: Any) -> None:
+    all_rainfall = load()
+    for model in all_rainfall.get_rainfall_models().values():
+        model.get_average_yearly_rainfall(
+            all_rainfall.starting_year, all_rainfall.get_last_year()
+        )
+
+    ready.put(os.getpid())
+    stop.wait()
+
+
+def benchmark_workers(
+    csv_path: str | Path,
+    shared_dataset_path: str | Path,
+    *,
+    worker_count: int,
+    start_year: int,
+    round_precision: int,
+) -> dict[str, int | None]:
+    """
+    Measure private memory of forked worker processes holding AllRainfall,
+    either loaded from CSV by each worker or mapped from a shared dataset file.
+
+    :param csv_path: Path to CSV of raw rainfall data.
+    :param shared_dataset_path: Path to the shared dataset file written from the same data.
+    :param worker_count: Number of worker processes.
+    :param start_year: An integer representing the year to start getting our rainfall values.
+    :param round_precision: An integer representing the rainfall precision.
+    :return: A dict giving for each loading mode the total private bytes of workers, None if not available.
+    """
+    loaders: dict[str, Callable[[], AllRainfall]] = {
+        "csv": lambda: AllRainfall(
+            str(csv_path), start_year=start_year, round_precision=round_precision
+        ),
+        "shared": lambda: AllRainfall.from_shared_dataset(shared_dataset_path),
+    }
+    # Workers are forked, as by `run.py api --production`
+    context = multiprocessing.get_context("fork")
+
+    private_bytes: dict[str, int | None] = {}
+    for mode, load in loaders.items():
+        ready, stop = context.Queue(), context.Event()
+        workers = [
+            context.Process(target=_hold_all_rainfall, args=(load, ready, stop))
+            for _ in range(worker_count)
+        ]
+        for worker in workers:
+            worker.start()
+
+        try:
+            pids = [ready.get(timeout=300) for _ in workers]
+            sizes = [get_private_bytes(pid) for pid in pids]
+            private_bytes[mode] = (
+                None if None in sizes else sum(size or 0 for size in sizes)
+            )
+        finally:
+            stop.set()
+            for worker in workers:
+                worker.join()
+
+    return private_bytes
+
+
+def run_memory_benchmark(
+    sizes: tuple[int, ...] = DEFAULT_SIZES,
+    *,
+    seed: int = 0,
+    worker_counts: tuple[int, ...] = DEFAULT_WORKER_COUNTS,
+) -> dict[str, Any]:
+    """
+    Run memory benchmark: construction of AllRainfall upon Barcelona dataset
+    and synthetic datasets of increasing sizes, then one request per API route.
+    Finally, private memory of an increasing number of workers holding the largest synthetic dataset,
+    loaded by each of them or shared.
+
+    :param sizes: Numbers of rows, i.e. of years, of synthetic datasets.
+    :param seed: Seed of random generators.
+    :param worker_counts: Numbers of worker processes.
+    :return: A dict with metadata and results, JSON serializable.
+    """
+    from back.rainfall.config import Config
+
+    data_settings = Config().get_data_settings
+    dataset_url_or_path = data_settings.local_file_path or data_settings.file_url
+    # Lazy imports and one-off initialisations of first construction are not accounted for
+    AllRainfall(
+        dataset_url_or_path,
+        start_year=data_settings.start_year,
+        round_precision=data_settings.rainfall_precision,
+    )
+    construction = [
+        {
+            "dataset": "barcelona",
+            **benchmark_construction(
+                dataset_url_or_path,
+                start_year=data_settings.start_year,
+                round_precision=data_settings.rainfall_precision,
+            ),
+        }
+    ]
+
+    workers = []
+    with tempfile.TemporaryDirectory() as folder_path:
+        for size in sizes:
+            csv_path = synthetic.write_raw_data_as_csv(
+                synthetic.generate_raw_data(size, seed=seed),
+                Path(folder_path, f"{size}.csv"),
+            )
+            construction.append(
+                {
+                    "dataset": "synthetic",
+                    "rows": size,
+                    **benchmark_construction(
+                        csv_path,
+                        start_year=1,
+                        round_precision=data_settings.rainfall_precision,
+                    ),
+                }
+            )
+
+        size = max(sizes)
+        csv_path = Path(folder_path, f"{size}.csv")
+        shared_dataset_path = write_shared_dataset(
+            AllRainfall(
+                str(csv_path),
+                start_year=1,
+                round_precision=data_settings.rainfall_precision,
+            ),
+            Path(folder_path, f"{size}.bin"),
+        )
+        for worker_count in worker_counts:
+            workers.append(
+                {
+                    "rows": size,
+                    "workers": worker_count,
+                    "private_bytes": benchmark_workers(
+                        csv_path,
+                        shared_dataset_path,
+                        worker_count=worker_count,
+                        start_year=1,
+                        round_precision=data_settings.rainfall_precision,
+                    ),
+                }
+            )
+
+    return {
+        "metadata": get_metadata(
+            sizes=list(sizes), seed=seed, worker_counts=list(worker_counts)
+        ),
+        "construction": construction,
+        "workers": workers,
+        "routes": benchmark_routes(seed=seed),
+    }
@@ -0,0 +1,237 @@
+"""
+Benchmark of rainfall models over synthetic datasets of increasing sizes:
+construction of AllRainfall, its incremental update by a new year,
+and every public method of YearlyRainfall, MonthlyRainfall and SeasonalRainfall.
+"""
+
+import inspect
+import tempfile
+import warnings
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable
+
+import pandas as pd
+
+from back.rainfall import AllRainfall
+from back.rainfall.models import YearlyRainfall
+from back.rainfall.utils import Label, Month, Season
+from back.rainfall.utils.bootstrap import Statistic
+from bench import synthetic
+from bench.utils import get_metadata, time_calls
+
+DEFAULT_SIZES = (10**3, 10**4, 10**5, 10**6)
+DEFAULT_SERIES_COUNTS = (1, 8)
+ROUND_PRECISION = 1
+
+
+def get_arguments(
+    method: Callable[..., Any],
+    *,
+    begin_year: int,
+    end_year: int,
+    raw_data: pd.DataFrame | None = None,
+) -> dict[str, Any]:
+    """
+    Return arguments to call a public method of a rainfall model with, over the whole year range.
+    Optional parameters keep their default values.
+
+    :param method: A method of YearlyRainfall or of one of its subclasses.
+    :param begin_year: First year of data.
+    :param end_year: Last year of data.
+    :param raw_data: Raw data of the model (optional).
+    If set, updates of raw data patch its last row.
+    :return: A dict of keyword arguments.
+    :raise ValueError: If method has a required parameter the benchmark cannot fill.
+    """
+    argument_by_name: dict[str, Any] = {
+        "begin_year": begin_year,
+        "end_year": end_year,
+        "normal_year": begin_year,
+        "percentage": 80.0,
+        "start_month": Month.JANUARY,
+        "label": Label.PERCENTAGE_OF_NORMAL,
+        "statistic": Statistic.LINEAR_REGRESSION,
+    }
+    if raw_data is not None:
+        argument_by_name["raw_data"] = raw_data
+        argument_by_name["updated_raw_data"] = raw_data.iloc[-1:]
+
+    arguments: dict[str, Any] = {}
+    for name, parameter in inspect.signature(method).parameters.items():
+        if name == "self" or parameter.default is not inspect.Parameter.empty:
+            continue
+
+        if name not in argument_by_name:
+            raise ValueError(
+                f"Cannot benchmark {method.__qualname__}: no value for its parameter '{name}'."
+            )
+
+        arguments[name] = argument_by_name[name]
+
+    return arguments
+
+
+def get_public_methods(
+    model_class: type[YearlyRainfall],
+) -> list[tuple[str, Callable[..., Any]]]:
+    """
+    Return public methods of a rainfall model class, sorted by name.
+
+    :param model_class: YearlyRainfall or one of its subclasses.
+    :return: A list of tuples (name, function).
+    """
+    return [
+        (name, method)
+        for name, method in inspect.getmembers(model_class, inspect.isfunction)
+        if not name.startswith("_")
+    ]
+
+
+def _call_upon_models(
+    method: Callable[..., Any], models: list[YearlyRainfall], arguments: dict[str, Any]
+):
+    for model in models:
+        method(model, **arguments)
+
+
+def benchmark_dataset(
+    csv_paths: list[Path], *, start_year: int, repeat: int
+) -> list[dict[str, Any]]:
+    """
+    Benchmark construction of AllRainfall, its update by a new year appended,
+    and public methods of its models for a dataset made of one or several series.
+    Each timing covers a call upon every series.
+    Methods raising an error are reported with it instead of timings.
+
+    :param csv_paths: Paths to CSVs of raw rainfall data, one per series.
+    :param start_year: First year of data.
+    :param repeat: Number of calls to time.
+    :return: A list of results, one per benchmark.
+    """
+    all_rainfalls: list[AllRainfall] = []
+
+    def construct_all_rainfalls():
+        all_rainfalls[:] = [
+            AllRainfall(
+                str(csv_path), start_year=start_year, round_precision=ROUND_PRECISION
+            )
+            for csv_path in csv_paths
+        ]
+
+    results = [
+        {
+            "benchmark": f"{AllRainfall.__name__}.__init__",
+            **time_calls(construct_all_rainfalls, repeat=repeat),
+        }
+    ]
+    end_year = all_rainfalls[0].get_last_year()
+
+    def append_year():
+        for all_rainfall in all_rainfalls:
+            rows = all_rainfall.raw_data.iloc[-1:].copy()
+            rows.iloc[0, 0] += 1
+            all_rainfall.apply_update(rows)
+
+    results.append(
+        {
+            "benchmark": f"{AllRainfall.__name__}.apply_update",
+            **time_calls(append_year, repeat=repeat),
+        }
+    )
+
+    for get_model in [
+        lambda all_rainfall: all_rainfall.yearly_rainfall,
+        lambda all_rainfall: all_rainfall.monthly_rainfalls[Month.JANUARY.value],
+        lambda all_rainfall: all_rainfall.seasonal_rainfalls[Season.WINTER.value],
+    ]:
+        models = [get_model(all_rainfall) for all_rainfall in all_rainfalls]
+        model_class = type(models[0])
+        for name, method in get_public_methods(model_class):
+            arguments = get_arguments(
+                method,
+                begin_year=start_year,
+                end_year=end_year,
+                raw_data=all_rainfalls[0].raw_data,
+            )
+
+            result: dict[str, Any] = {"benchmark": f"{model_class.__name__}.{name}"}
+            try:
+                result.update(
+                    time_calls(
+                        partial(_call_upon_models, method, models, arguments),
+                        repeat=repeat,
+                    )
+                )
+            except Exception as exc:  # A method failing at scale is a result too
+                result["error"] = repr(exc)
+
+            results.append(result)
+
+    return results
+
+
+def run_models_benchmark(
+    sizes: tuple[int, ...] = DEFAULT_SIZES,
+    *,
+    series_counts: tuple[int, ...] = DEFAULT_SERIES_COUNTS,
+    repeat: int = 3,
+    seed: int = 0,
+    on_result: Callable[[dict[str, Any]], None] | None = None,
+) -> dict[str, Any]:
+    """
+    Run benchmark of rainfall models over synthetic datasets.
+
+    :param sizes: Numbers of rows, i.e. of years, of each series.
+    :param series_counts: Numbers of series per dataset; 1 for a single series,
+    more for multi-series variants where each timing covers all series.
+    :param repeat: Number of calls to time per benchmark.
+    :param seed: Seed of the synthetic data generator.
+    :param on_result: A function called with each result as soon as it is available (optional).
+    :return: A dict with metadata and results, JSON serializable.
+    """
+    start_year = 1
+    results: list[dict[str, Any]] = []
+    with tempfile.TemporaryDirectory() as folder_path, warnings.catch_warnings():
+        # Numerical warnings of ill-conditioned fits at scale would flood the output
+        warnings.simplefilter("ignore")
+        for series_count in series_counts:
+            for size in sizes:
+                if series_count == 1:
+                    raw_datasets = [
+                        synthetic.generate_raw_data(
+                            size, seed=seed, start_year=start_year
+                        )
+                    ]
+                else:
+                    raw_datasets = synthetic.generate_multi_series_raw_data(
+                        size, series_count, seed=seed, start_year=start_year
+                    )
+
+                csv_paths = [
+                    synthetic.write_raw_data_as_csv(
+                        raw_data, Path(folder_path, f"{size}_{series_count}_{idx}.csv")
+                    )
+                    for idx, raw_data in enumerate(raw_datasets)
+                ]
+
+                for result in benchmark_dataset(
+                    csv_paths, start_year=start_year, repeat=repeat
+                ):
+                    result = {"rows": size, "series": series_count, **result}
+                    results.append(result)
+                    if on_result is not None:
+                        on_result(result)
+
+                for csv_path in csv_paths:
+                    csv_path.unlink()
+
+    return {
+        "metadata": get_metadata(
+            sizes=list(sizes),
+            series_counts=list(series_counts),
+            repeat=repeat,
+            seed=seed,
+        ),
+        "results": results,
+    }
@@ -0,0 +1,255 @@
+"""
+Benchmark of rainfall storage backends upon synthetic multi-station datasets of increasing sizes:
+models loaded in memory against the SQLite store, which aggregates year ranges in SQL.
+Loading, opening then answering a first query, and answering many range queries are timed for each.
+"""
+
+import os
+import random
+import tempfile
+from pathlib import Path
+from typing import Any, Callable
+
+from back.rainfall import AllRainfall
+from back.rainfall.sqlite_store import SQLiteRainfallStore
+from back.rainfall.utils import Month, TimeMode
+from bench import synthetic
+from bench.utils import get_metadata, time_calls
+
+DEFAULT_SIZES = (10**2, 10**3, 10**4)
+DEFAULT_STATION_COUNT = 8
+DEFAULT_QUERY_COUNT = 200
+ROUND_PRECISION = 1
+
+
+def generate_queries(
+    stations: list[str], *, end_year: int, query_count: int, seed: int
+) -> list[dict[str, Any]]:
+    """
+    Draw range queries upon random stations, time modes and year ranges.
+
+    :param stations: Station identifiers.
+    :param end_year: Last year of data, first one being 1.
+    :param query_count: Number of queries.
+    :param seed: Seed of the random generator.
+    :return: A list of dicts of station, time mode, month, begin and end years.
+    """
+    generator = random.Random(seed)
+    queries = []
+    for _ in range(query_count):
+        begin_year = generator.randint(1, end_year)
+        is_monthly = generator.random() < 0.5
+        queries.append(
+            {
+                "station": generator.choice(stations),
+                "time_mode": TimeMode.MONTHLY if is_monthly else TimeMode.YEARLY,
+                "month": generator.choice(list(Month)) if is_monthly else None,
+                "begin_year": begin_year,
+                "end_year": generator.randint(begin_year, end_year),
+            }
+        )
+
+    return queries
+
+
+def benchmark_backends(
+    folder_path: Path,
+    *,
+    size: int,
+    station_count: int,
+    query_count: int,
+    repeat: int,
+    seed: int,
+) -> list[dict[str, Any]]:
+    """
+    Benchmark both backends upon a synthetic dataset of several stations.
+
+    :param folder_path: Folder where CSVs and the database are written.
+    :param size: Number of years of each station.
+    :param station_count: Number of stations.
+    :param query_count: Number of range queries of the query benchmark.
+    :param repeat: Number of calls to time per benchmark.
+    :param seed: Seed of random generators.
+    :return: A list of results, one per benchmark and backend.
+    """
+    raw_data_by_station = {
+        f"station_{rank}": synthetic.generate_raw_data(
+            size, seed=seed + rank, scale=0.5 + rank / station_count
+        )
+        for rank in range(station_count)
+    }
+    csv_paths = {
+        station: synthetic.write_raw_data_as_csv(
+            raw_data, folder_path / f"{station}.csv"
+        )
+        for station, raw_data in raw_data_by_station.items()
+    }
+    database_path = folder_path / f"{size}.db"
+    queries = generate_queries(
+        list(raw_data_by_station), end_year=size, query_count=query_count, seed=seed
+    )
+    first_query = queries[0]
+
+    all_rainfalls: dict[str, AllRainfall] = {}
+
+    def load_in_memory():
+        all_rainfalls.update(
+            {
+                station: AllRainfall.from_raw_data(
+                    raw_data, start_year=1, round_precision=ROUND_PRECISION
+                )
+                for station, raw_data in raw_data_by_station.items()
+            }
+        )
+
+    def load_in_sqlite():
+        store = SQLiteRainfallStore(database_path, round_precision=ROUND_PRECISION)
+        for station, raw_data in raw_data_by_station.items():
+            store.insert_raw_data(station, raw_data)
+
+        store.close()
+
+    def query_in_memory(query: dict[str, Any], all_rainfall: AllRainfall):
+        all_rainfall.get_rainfall_average(
+            query["time_mode"],
+            begin_year=query["begin_year"],
+            end_year=query["end_year"],
+            month=query["month"],
+        )
+
+    def query_in_sqlite(query: dict[str, Any], store: SQLiteRainfallStore):
+        store.get_rainfall_average(
+            query["station"],
+            query["time_mode"],
+            begin_year=query["begin_year"],
+            end_year=query["end_year"],
+            month=query["month"],
+        )
+
+    # A first query needs only its station, read from CSV in memory
+    def open_and_query_in_memory():
+        query_in_memory(
+            first_query,
+            AllRainfall(
+                str(csv_paths[first_query["station"]]),
+                start_year=1,
+                round_precision=ROUND_PRECISION,
+            ),
+        )
+
+    def open_and_query_in_sqlite():
+        store = SQLiteRainfallStore(database_path, round_precision=ROUND_PRECISION)
+        query_in_sqlite(first_query, store)
+        store.close()
+
+    # Store is opened upon first call, as models are loaded upon first query
+    stores: list[SQLiteRainfallStore] = []
+
+    def query_all_in_memory():
+        for query in queries:
+            query_in_memory(query, all_rainfalls[query["station"]])
+
+    def query_all_in_sqlite():
+        if not stores:
+            stores.append(
+                SQLiteRainfallStore(database_path, round_precision=ROUND_PRECISION)
+            )
+
+        for query in queries:
+            query_in_sqlite(query, stores[0])
+
+    benchmarks: dict[str, dict[str, Callable[[], Any]]] = {
+        "load": {"memory": load_in_memory, "sqlite": load_in_sqlite},
+        "open_and_query": {
+            "memory": open_and_query_in_memory,
+            "sqlite": open_and_query_in_sqlite,
+        },
+        "range_queries": {"memory": query_all_in_memory, "sqlite": query_all_in_sqlite},
+    }
+
+    results = []
+    for benchmark, func_by_backend in benchmarks.items():
+        for backend, func in func_by_backend.items():
+            results.append(
+                {
+                    "benchmark": benchmark,
+                    "backend": backend,
+                    "rows": size,
+                    "stations": station_count,
+                    **time_calls(func, repeat=repeat),
+                }
+            )
+
+    for store in stores:
+        store.close()
+
+    results.append(
+        {
+            "benchmark": "size",
+            "backend": "memory",
+            "rows": size,
+            "stations": station_count,
+            "bytes": sum(
+                all_rainfall.memory_report()["total"]
+                for all_rainfall in all_rainfalls.values()
+            ),
+        }
+    )
+    results.append(
+        {
+            "benchmark": "size",
+            "backend": "sqlite",
+            "rows": size,
+            "stations": station_count,
+            "bytes": os.path.getsize(database_path),
+        }
+    )
+
+    return results
+
+
+def run_storage_benchmark(
+    sizes: tuple[int, ...] = DEFAULT_SIZES,
+    *,
+    station_count: int = DEFAULT_STATION_COUNT,
+    query_count: int = DEFAULT_QUERY_COUNT,
+    repeat: int = 3,
+    seed: int = 0,
+    on_result: Callable[[dict[str, Any]], None] | None = None,
+) -> dict[str, Any]:
+    """
+    Run benchmark of storage backends over synthetic multi-station datasets.
+
+    :param sizes: Numbers of years of each station.
+    :param station_count: Number of stations per dataset.
+    :param query_count: Number of range queries of the query benchmark.
+    :param repeat: Number of calls to time per benchmark.
+    :param seed: Seed of random generators.
+    :param on_result: A function called with each result as soon as it is available (optional).
+    :return: A dict with metadata and results, JSON serializable.
+    """
+    results: list[dict[str, Any]] = []
+    with tempfile.TemporaryDirectory() as folder_path:
+        for size in sizes:
+            for result in benchmark_backends(
+                Path(folder_path),
+                size=size,
+                station_count=station_count,
+                query_count=query_count,
+                repeat=repeat,
+                seed=seed,
+            ):
+                results.append(result)
+                if on_result is not None:
+                    on_result(result)
+
+    return {
+        "metadata": get_metadata(
+            sizes=list(sizes),
+            station_count=station_count,
+            query_count=query_count,
+            repeat=repeat,
+            seed=seed,
+        ),
+        "results": results,
+    }
@@ -0,0 +1,122 @@
+"""
+Provides a seeded generator of synthetic rainfall datasets,
+shaped as the Barcelona open data CSV: one row per year, one column for the year and 12 for monthly rainfall.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from back.rainfall.utils import Month
+
+COLUMNS = [
+    "Any",
+    *(
+        f"Precip_Acum_{month}"
+        for month in [
+            "Gener",
+            "Febrer",
+            "Marc",
+            "Abril",
+            "Maig",
+            "Juny",
+            "Juliol",
+            "Agost",
+            "Setembre",
+            "Octubre",
+            "Novembre",
+            "Desembre",
+        ]
+    ),
+]
+
+# Mean monthly rainfall (mm) of Barcelona, from January to December
+MONTHLY_MEANS = np.array(
+    [41.0, 36.0, 42.0, 48.0, 50.0, 33.0, 20.0, 44.0, 78.0, 92.0, 58.0, 47.0]
+)
+DRY_MONTH_PROBABILITY = 0.05
+GAMMA_SHAPE = 1.6
+
+
+def generate_raw_data(
+    n_rows: int,
+    *,
+    seed: int = 0,
+    start_year: int = 1,
+    scale: float = 1.0,
+    trend: float = 0.0,
+) -> pd.DataFrame:
+    """
+    Generate raw rainfall data according to year, with a seasonal cycle and some dry months.
+    Same seed and parameters always give the same data.
+
+    :param n_rows: Number of years, i.e. of rows.
+    :param seed: Seed of the random generator.
+    :param start_year: First year of data.
+    :param scale: Factor applied to mean monthly rainfall, to mimic wetter or drier stations.
+    :param trend: Relative change of mean rainfall per year, e.g. -0.001 for a 0.1% decrease per year.
+    :return: A pandas DataFrame with 13 columns: year and rainfall (in mm) of each month.
+    """
+    rng = np.random.default_rng(seed)
+    years = np.arange(start_year, start_year + n_rows)
+    means = (
+        scale
+        * MONTHLY_MEANS[np.newaxis, :]
+        * np.clip(1 + trend * (years - start_year), 0.1, None)[:, np.newaxis]
+    )
+    rainfall = rng.gamma(GAMMA_SHAPE, means / GAMMA_SHAPE)
+    rainfall[rng.random(rainfall.shape) < DRY_MONTH_PROBABILITY] = 0.0
+
+    return pd.DataFrame(
+        np.column_stack([years, rainfall.round(1)]), columns=COLUMNS
+    ).astype({COLUMNS[0]: int})
+
+
+def generate_multi_series_raw_data(
+    n_rows: int, n_series: int, *, seed: int = 0, start_year: int = 1
+) -> list[pd.DataFrame]:
+    """
+    Generate several independent raw rainfall datasets, as if they came from distinct stations.
+    Each series gets its own seed, rainfall scale and trend, drawn from the given seed.
+
+    :param n_rows: Number of years, i.e. of rows, of each series.
+    :param n_series: Number of series.
+    :param seed: Seed of the random generator.
+    :param start_year: First year of data.
+    :return: A list of pandas DataFrames with 13 columns: year and rainfall (in mm) of each month.
+    """
+    rng = np.random.default_rng(seed)
+    series_seeds = rng.integers(0, 2**32, size=n_series)
+    scales = rng.uniform(0.5, 2.0, size=n_series)
+    # Mean rainfall changes by at most 10% over the whole series
+    trends = rng.uniform(-0.1, 0.1, size=n_series) / n_rows
+
+    return [
+        generate_raw_data(
+            n_rows,
+            seed=int(series_seed),
+            start_year=start_year,
+            scale=float(scale),
+            trend=float(trend),
+        )
+        for series_seed, scale, trend in zip(series_seeds, scales, trends)
+    ]
+
+
+def write_raw_data_as_csv(raw_data: pd.DataFrame, path: str | Path) -> Path:
+    """
+    Write raw rainfall data as a CSV readable by AllRainfall.
+
+    :param raw_data: A pandas DataFrame with 13 columns: year and rainfall of each month.
+    :param path: Path of the CSV file to write.
+    :return: Path of the written CSV file.
+    """
+    if len(raw_data.columns) != 1 + len(Month):
+        raise ValueError(f"Raw data should have {1 + len(Month)} columns.")
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    raw_data.to_csv(path, index=False)
+
+    return path
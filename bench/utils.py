@@ -0,0 +1,83 @@
+"""
+Collection of utility functions shared by benchmarks: timing and writing of results.
+"""
+
+import json
+import platform
+import statistics
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+import numpy as np
+import pandas as pd
+
+RESULTS_FOLDER = "bench_results"
+
+
+def time_calls(func: Callable[[], Any], *, repeat: int) -> dict[str, float | int]:
+    """
+    Time successive calls of a function.
+    First call is reported on its own: it includes lazy computations that following calls may reuse.
+
+    :param func: A function without argument to call.
+    :param repeat: Number of calls; should be positive.
+    :return: A dict of timings (in seconds): first, min, median and mean of all calls.
+    """
+    if repeat < 1:
+        raise ValueError(f"{repeat=} should be positive.")
+
+    durations: list[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+
+    return {
+        "first_s": durations[0],
+        "min_s": min(durations),
+        "median_s": statistics.median(durations),
+        "mean_s": statistics.fmean(durations),
+        "repeat": repeat,
+    }
+
+
+def get_metadata(**parameters) -> dict[str, Any]:
+    """
+    Return metadata describing the environment a benchmark has been run in.
+
+    :param parameters: Parameters of the benchmark, to be stored along.
+    :return: A dict of metadata.
+    """
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "parameters": parameters,
+    }
+
+
+def write_results(
+    results: dict[str, Any], *, name: str, path: str | Path | None = None
+) -> Path:
+    """
+    Write benchmark results as JSON.
+
+    :param results: A dict of results, JSON serializable.
+    :param name: Name of the benchmark, used to name the file if no path is given.
+    :param path: Path of the JSON file (optional).
+    If not given, a timestamped file is written in the results folder.
+    :return: Path of the written JSON file.
+    """
+    if path is None:
+        timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+        path = Path(RESULTS_FOLDER, f"{name}_{timestamp}.json")
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=2))
+
+    return path
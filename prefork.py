@@ -0,0 +1,121 @@
+"""
+Provides functions to serve an app from preforked worker processes sharing one listening socket.
+Whatever is loaded before forking, e.g. rainfall data, is shared between workers instead of being loaded by each of them.
+"""
+
+import gc
+import os
+import signal
+import socket
+import sys
+import time
+import traceback
+from typing import Callable
+
+
+def create_listening_socket(host: str, port: int, *, backlog: int) -> socket.socket:
+    """
+    Create a TCP socket bound to an address and listening for connections,
+    to be inherited by worker processes.
+
+    :param host: Host to bind to, either an IPv4 or an IPv6 address.
+    :param port: Port to bind to.
+    :param backlog: Maximum number of pending connections not yet accepted by any worker.
+    :return: A listening socket.
+    """
+    listening_socket = socket.socket(
+        socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM
+    )
+    listening_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    listening_socket.bind((host, port))
+    listening_socket.listen(backlog)
+    listening_socket.set_inheritable(True)
+
+    return listening_socket
+
+
+def _run_worker(serve: Callable[[], None]) -> None:
+    # Workers stop upon signals instead of forwarding them
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+    exit_code = 0
+    try:
+        serve()
+    except KeyboardInterrupt:
+        pass
+    except BaseException:
+        traceback.print_exc()
+        exit_code = 1
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        # Do not run cleanups of parent process, e.g. atexit handlers
+        os._exit(exit_code)
+
+
+def run_preforked_workers(
+    serve: Callable[[], None], *, workers: int, restart_delay=1.0
+) -> None:
+    """
+    Fork worker processes running a serving function, and fork a new one whenever one exits,
+    until SIGINT or SIGTERM is received; workers are then sent SIGTERM and waited for.
+    Objects allocated beforehand are frozen out of garbage collection:
+    collecting them would write to memory pages shared with workers, which would then be copied.
+
+    :param serve: Function serving requests until the worker is stopped, e.g. upon an inherited listening socket.
+    :param workers: Number of worker processes.
+    :param restart_delay: Seconds to wait before replacing a worker that exited. Defaults to 1.
+    """
+    if not hasattr(os, "fork"):
+        raise RuntimeError("Preforked workers are not supported on this platform.")
+
+    gc.freeze()
+
+    pids: set[int] = set()
+    stopping = False
+
+    def fork_worker():
+        if pid := os.fork():
+            pids.add(pid)
+        else:
+            _run_worker(serve)
+
+    def stop(_signum, _frame):
+        nonlocal stopping
+        stopping = True
+        for pid in pids:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    previous_handlers = {
+        signum: signal.signal(signum, stop)
+        for signum in (signal.SIGINT, signal.SIGTERM)
+    }
+    try:
+        for _ in range(workers):
+            fork_worker()
+
+        while pids:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+
+            pids.discard(pid)
+            if not stopping:
+                print(
+                    f"Worker {pid} exited with code {os.waitstatus_to_exitcode(status)}, forking a new one.",
+                    file=sys.stderr,
+                )
+                time.sleep(restart_delay)
+                # Stopping may have been requested meanwhile
+                if not stopping:
+                    fork_worker()
+    finally:
+        for signum, handler in previous_handlers.items():
+            signal.signal(signum, handler)
+
+        gc.unfreeze()
@@ -1,38 +1,463 @@
 #!/usr/bin/env python
 
 """
-CLI to run FastAPI or Flask servers.
+CLI to run FastAPI or Flask servers, benchmarks, or ingestion of rainfall data.
 """
 
 import click
-import uvicorn  # type: ignore
 
 
 @click.group()
 def run():
     """
-    Run either FastAPI or Flask servers.
+    Run either FastAPI or Flask servers, benchmarks, or ingestion of rainfall data.
     """
 
 
 @run.command()
+@click.option(
+    "--production",
+    is_flag=True,
+    help="Serve with preforked workers sharing data loaded once, instead of a single process.",
+)
 @click.pass_context
-def api(ctx):
+def api(ctx, production):
+    import uvicorn  # type: ignore
+
     from back.api.config import Config
 
-    uvicorn.run(
-        "back.api.app:fastapi_app",
-        **ctx.ensure_object(Config).get_api_settings.server.model_dump(),
+    api_settings = ctx.ensure_object(Config).get_api_settings
+    if not production:
+        uvicorn.run("back.api.app:fastapi_app", **api_settings.server.model_dump())
+
+        return
+
+    production_settings = api_settings.production
+    if production_settings.shared_dataset_path is not None:
+        import multiprocessing
+        import os
+
+        from back.rainfall.shared_dataset import (
+            SHARED_DATASET_PATH_ENV,
+            write_shared_dataset_from_config,
+        )
+
+        # Rainfall data is loaded by a short-lived process, then mapped by API workers
+        loader = multiprocessing.get_context("spawn").Process(
+            target=write_shared_dataset_from_config,
+            args=(
+                production_settings.shared_dataset_path,
+                api_settings.reload.from_file,
+            ),
+        )
+        loader.start()
+        loader.join()
+        if loader.exitcode != 0:
+            raise click.ClickException("Rainfall data could not be loaded.")
+
+        os.environ[SHARED_DATASET_PATH_ENV] = production_settings.shared_dataset_path
+
+    from back.api.app import fastapi_app
+    from prefork import create_listening_socket, run_preforked_workers
+
+    listening_socket = create_listening_socket(
+        api_settings.server.host,
+        api_settings.server.port,
+        backlog=production_settings.backlog,
+    )
+    server_config = uvicorn.Config(
+        fastapi_app,
+        host=api_settings.server.host,
+        port=api_settings.server.port,
+        backlog=production_settings.backlog,
+        timeout_keep_alive=production_settings.keep_alive,
+    )
+
+    click.echo(
+        f"Serving API on {api_settings.server.host}:{api_settings.server.port} "
+        f"with {production_settings.workers} workers"
+    )
+    run_preforked_workers(
+        lambda: uvicorn.Server(server_config).run(sockets=[listening_socket]),
+        workers=production_settings.workers,
     )
 
 
 @run.command()
+@click.option(
+    "--production",
+    is_flag=True,
+    help="Serve with preforked WSGI workers instead of Flask development server.",
+)
 @click.pass_context
-def webapp(ctx):
+def webapp(ctx, production):
     from webapp.app import flask_app
     from webapp.config import Config
 
-    flask_app.run(**ctx.ensure_object(Config).get_webapp_server_settings.model_dump())
+    config = ctx.ensure_object(Config)
+    server_settings = config.get_webapp_server_settings
+    if not production:
+        flask_app.run(**server_settings.model_dump())
+
+        return
+
+    from werkzeug.serving import WSGIRequestHandler, make_server
+
+    from prefork import create_listening_socket, run_preforked_workers
+
+    production_settings = config.get_webapp_production_server_settings
+    listening_socket = create_listening_socket(
+        server_settings.host, server_settings.port, backlog=production_settings.backlog
+    )
+
+    class RequestHandler(WSGIRequestHandler):
+        # Idle keep-alive connections are closed once timed out
+        timeout = production_settings.keep_alive
+
+    click.echo(
+        f"Serving webapp on {server_settings.host}:{server_settings.port} "
+        f"with {production_settings.workers} workers"
+    )
+    run_preforked_workers(
+        lambda: make_server(
+            server_settings.host,
+            server_settings.port,
+            flask_app,
+            threaded=production_settings.threaded,
+            request_handler=RequestHandler,
+            fd=listening_socket.fileno(),
+        ).serve_forever(),
+        workers=production_settings.workers,
+    )
+
+
+@run.command()
+@click.argument("csv_path", type=click.Path(exists=True, dir_okay=False))
+@click.argument("output_path", type=click.Path(file_okay=False))
+@click.option(
+    "--start-year",
+    type=int,
+    default=None,
+    help="Year to start getting rainfall values; defaults to the configured one.",
+)
+@click.option(
+    "--chunk-rows",
+    default=500_000,
+    type=click.IntRange(min=1),
+    help="Number of CSV rows parsed at once.",
+)
+@click.option(
+    "--sorted-by-station",
+    is_flag=True,
+    help="Rows of each station are contiguous: stations are written as they end, holding one in memory.",
+)
+def ingest(csv_path, output_path, start_year, chunk_rows, sorted_by_station):
+    """
+    Ingest a CSV of monthly rainfall of many weather stations chunk by chunk,
+    writing a shared dataset file per station.
+    """
+    from back.rainfall.config import Config
+    from back.rainfall.ingestion import ingest_multi_station_csv
+
+    data_settings = Config().get_data_settings
+
+    def echo_progress(progress):
+        click.echo(
+            f"{progress.fraction:>4.0%} | {progress.rows} rows, {progress.rows_per_second:,.0f} rows/s, "
+            f"{progress.stations} stations, {progress.written_stations} written"
+        )
+
+    paths = ingest_multi_station_csv(
+        csv_path,
+        output_path,
+        start_year=start_year if start_year is not None else data_settings.start_year,
+        round_precision=data_settings.rainfall_precision,
+        chunk_rows=chunk_rows,
+        sorted_by_station=sorted_by_station,
+        on_progress=echo_progress,
+    )
+    click.echo(f"{len(paths)} stations written to {output_path}")
+
+
+def _parse_integers(_ctx, _param, value: str) -> tuple[int, ...]:
+    try:
+        return tuple(int(float(item)) for item in value.split(","))
+    except ValueError:
+        raise click.BadParameter(f"{value} should be comma-separated integers.")
+
+
+@run.group()
+def bench():
+    """
+    Run benchmarks and write their results as JSON.
+    """
+
+
+@bench.command()
+@click.option(
+    "--sizes",
+    default="1e3,1e4,1e5,1e6",
+    callback=_parse_integers,
+    help="Comma-separated numbers of years of synthetic series.",
+)
+@click.option(
+    "--series",
+    default="1,8",
+    callback=_parse_integers,
+    help="Comma-separated numbers of series per dataset; above 1 for multi-series variants.",
+)
+@click.option("--repeat", default=3, type=click.IntRange(min=1))
+@click.option("--seed", default=0, type=int)
+@click.option("--output", type=click.Path(dir_okay=False), default=None)
+def models(sizes, series, repeat, seed, output):
+    """
+    Time AllRainfall construction and public methods of rainfall models upon synthetic data.
+    """
+    from bench.models import run_models_benchmark
+    from bench.utils import write_results
+
+    def echo_result(result):
+        timing = (
+            f"error {result['error']}"
+            if "error" in result
+            else f"median {result['median_s'] * 1e3:.2f} ms"
+        )
+        click.echo(
+            f"{result['rows']:>9} rows x {result['series']} series | {result['benchmark']}: {timing}"
+        )
+
+    results = run_models_benchmark(
+        sizes, series_counts=series, repeat=repeat, seed=seed, on_result=echo_result
+    )
+    click.echo(
+        f"Results written to {write_results(results, name='models', path=output)}"
+    )
+
+
+def _echo_load_test_comparison(comparison):
+    for route, stats in comparison.items():
+        changes = ", ".join(
+            f"{name} {stat['baseline']:.4g} -> {stat['candidate']:.4g}"
+            + (f" ({stat['change_pct']:+.1f}%)" if "change_pct" in stat else "")
+            for name, stat in stats.items()
+            if name != "requests"
+        )
+        click.echo(f"{route}: {changes}")
+
+
+@bench.command()
+@click.option("--requests", "n_requests", default=1000, type=click.IntRange(min=1))
+@click.option("--concurrency", default=8, type=click.IntRange(min=1))
+@click.option(
+    "--distinct-queries",
+    default=200,
+    type=click.IntRange(min=1),
+    help="Number of distinct queries requests are drawn from.",
+)
+@click.option(
+    "--cache/--no-cache",
+    default=True,
+    help="Whether responses are cached as in production, or always computed.",
+)
+@click.option("--seed", default=0, type=int)
+@click.option("--output", type=click.Path(dir_okay=False), default=None)
+@click.option(
+    "--compare-to",
+    type=click.Path(exists=True, dir_okay=False),
+    default=None,
+    help="JSON results of a former run to compare to.",
+)
+def load(n_requests, concurrency, distinct_queries, cache, seed, output, compare_to):
+    """
+    Load test FastAPI app in-process with a mix of requests upon every route.
+    """
+    import json
+
+    from bench.load import compare_load_test_results, run_load_test
+    from bench.utils import write_results
+
+    results = run_load_test(
+        n_requests=n_requests,
+        concurrency=concurrency,
+        distinct_queries=distinct_queries,
+        use_cache=cache,
+        seed=seed,
+    )
+
+    for route, stats in {**results["routes"], "total": results["total"]}.items():
+        click.echo(
+            f"{route}: {stats['requests']} requests, {stats['throughput_rps']:.1f} req/s, "
+            f"p50 {stats['p50_ms']:.1f} ms, p95 {stats['p95_ms']:.1f} ms, p99 {stats['p99_ms']:.1f} ms, "
+            f"errors {stats['error_rate']:.1%}"
+        )
+
+    click.echo(f"Results written to {write_results(results, name='load', path=output)}")
+
+    if compare_to is not None:
+        with open(compare_to) as baseline_file:
+            _echo_load_test_comparison(
+                compare_load_test_results(json.load(baseline_file), results)
+            )
+
+
+@bench.command()
+@click.argument("baseline", type=click.Path(exists=True, dir_okay=False))
+@click.argument("candidate", type=click.Path(exists=True, dir_okay=False))
+def compare_load(baseline, candidate):
+    """
+    Compare JSON results of two load tests, route by route.
+    """
+    import json
+
+    from bench.load import compare_load_test_results
+
+    with open(baseline) as baseline_file, open(candidate) as candidate_file:
+        _echo_load_test_comparison(
+            compare_load_test_results(
+                json.load(baseline_file), json.load(candidate_file)
+            )
+        )
+
+
+@bench.command()
+@click.option(
+    "--sizes",
+    default="1e3,1e4,1e5",
+    callback=_parse_integers,
+    help="Comma-separated numbers of years of synthetic datasets.",
+)
+@click.option(
+    "--workers",
+    default="1,2,4",
+    callback=_parse_integers,
+    help="Comma-separated numbers of worker processes holding the largest dataset.",
+)
+@click.option("--seed", default=0, type=int)
+@click.option("--output", type=click.Path(dir_okay=False), default=None)
+def memory(sizes, workers, seed, output):
+    """
+    Trace memory allocated while constructing AllRainfall and while serving each API route,
+    then measure private memory of workers holding a dataset loaded by each of them or shared.
+    """
+    from bench.memory import run_memory_benchmark
+    from bench.utils import write_results
+
+    results = run_memory_benchmark(sizes, seed=seed, worker_counts=workers)
+
+    for construction in results["construction"]:
+        click.echo(
+            f"AllRainfall({construction['dataset']}{', ' + str(construction['rows']) + ' rows' if 'rows' in construction else ''}): "
+            f"peak {construction['peak_bytes'] / 2**20:.2f} MiB, "
+            f"retained {construction['retained_bytes'] / 2**20:.2f} MiB, "
+            f"deep size {construction['memory_report']['total'] / 2**20:.2f} MiB"
+        )
+
+    for route, allocations in results["routes"].items():
+        click.echo(
+            f"{route}: peak {allocations['peak_bytes'] / 2**10:.1f} KiB, "
+            f"retained {allocations['retained_bytes'] / 2**10:.1f} KiB"
+        )
+
+    for result in results["workers"]:
+        private_memory = ", ".join(
+            f"{mode} {private_bytes / 2**20:.1f} MiB"
+            if private_bytes is not None
+            else f"{mode} n/a"
+            for mode, private_bytes in result["private_bytes"].items()
+        )
+        click.echo(
+            f"{result['workers']} workers x {result['rows']} rows: private memory {private_memory}"
+        )
+
+    click.echo(
+        f"Results written to {write_results(results, name='memory', path=output)}"
+    )
+
+
+@bench.command()
+@click.option(
+    "--sizes",
+    default="1e2,1e3,1e4",
+    callback=_parse_integers,
+    help="Comma-separated numbers of years of each synthetic station.",
+)
+@click.option("--stations", default=8, type=click.IntRange(min=1))
+@click.option(
+    "--queries",
+    default=200,
+    type=click.IntRange(min=1),
+    help="Number of range queries of the query benchmark.",
+)
+@click.option("--repeat", default=3, type=click.IntRange(min=1))
+@click.option("--seed", default=0, type=int)
+@click.option("--output", type=click.Path(dir_okay=False), default=None)
+def storage(sizes, stations, queries, repeat, seed, output):
+    """
+    Compare rainfall models loaded in memory with the SQLite store: loading, first query and range queries.
+    """
+    from bench.storage import run_storage_benchmark
+    from bench.utils import write_results
+
+    def echo_result(result):
+        measure = (
+            f"{result['bytes'] / 2**20:.2f} MiB"
+            if "bytes" in result
+            else f"median {result['median_s'] * 1e3:.2f} ms"
+        )
+        click.echo(
+            f"{result['rows']:>7} rows x {result['stations']} stations | "
+            f"{result['benchmark']} ({result['backend']}): {measure}"
+        )
+
+    results = run_storage_benchmark(
+        sizes,
+        station_count=stations,
+        query_count=queries,
+        repeat=repeat,
+        seed=seed,
+        on_result=echo_result,
+    )
+    click.echo(
+        f"Results written to {write_results(results, name='storage', path=output)}"
+    )
+
+
+@bench.command()
+@click.option("--repeat", default=5, type=click.IntRange(min=1))
+@click.option(
+    "--top",
+    default=10,
+    type=click.IntRange(min=1),
+    help="Number of slowest modules and packages to report.",
+)
+@click.option("--output", type=click.Path(dir_okay=False), default=None)
+def imports(repeat, top, output):
+    """
+    Measure import time of CLI, API app and rainfall models with `python -X importtime`.
+    """
+    from bench.imports import run_imports_benchmark
+    from bench.utils import write_results
+
+    results = run_imports_benchmark(repeat=repeat, top=top)
+
+    for name, report in results["targets"].items():
+        heavy_packages = ", ".join(
+            f"{package} {self_ms:.0f} ms"
+            for package, self_ms in report["heavy_packages_ms"].items()
+        )
+        slowest_packages = ", ".join(
+            f"{package} {self_ms:.0f} ms"
+            for package, self_ms in list(report["slowest_packages"].items())[:3]
+        )
+        click.echo(
+            f"{name} ({report['statement']}): {report['total_ms']:.0f} ms, "
+            f"{report['module_count']} modules, heavy packages: {heavy_packages}, "
+            f"slowest packages: {slowest_packages}"
+        )
+
+    click.echo(
+        f"Results written to {write_results(results, name='imports', path=output)}"
+    )
 
 
 if __name__ == "__main__":
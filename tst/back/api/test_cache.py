@@ -0,0 +1,283 @@
+import asyncio
+
+from back.api.app import fastapi_app
+from back.api.cache import (
+    CacheWarmer,
+    ResponseCache,
+    get_hashable_argument,
+    get_webapp_queries,
+    get_year_ranges,
+    learn_queries_from_access_log,
+)
+from back.api.response_store import ResponseStore
+from back.api.routes import response_cache
+from back.rainfall.utils import Month, Season, TimeMode
+
+
+class TestResponseCache:
+    @staticmethod
+    def test_get_and_put():
+        cache = ResponseCache(max_entries=2, get_version=lambda _: "version")
+
+        assert cache.get("a") == (False, None)
+
+        cache.put("a", 1)
+        cache.put("b", 2)
+
+        assert cache.get("a") == (True, 1)
+
+        cache.put("c", 3)
+
+        assert len(cache) == 2
+        assert cache.get("b") == (False, None)
+        assert cache.get("a") == (True, 1)
+        assert cache.get("c") == (True, 3)
+        assert (cache.hits, cache.misses) == (3, 2)
+
+        cache.clear()
+
+        assert len(cache) == 0
+
+    @staticmethod
+    def test_cached():
+        version = "version"
+        cache = ResponseCache(max_entries=8, get_version=lambda _: version)
+        calls: list[tuple] = []
+
+        @cache.cached
+        def endpoint(time_mode: TimeMode, begin_year: int, end_year: int | None = None):
+            calls.append((time_mode, begin_year, end_year))
+
+            return f"{time_mode.value}_{begin_year}_{end_year}"
+
+        @cache.cached
+        async def async_endpoint(time_mode: TimeMode, begin_year: int):
+            calls.append((time_mode, begin_year))
+
+            return f"{time_mode.value}_{begin_year}"
+
+        assert endpoint(TimeMode.YEARLY, 1995) == "yearly_1995_None"
+        assert (
+            endpoint(begin_year=1995, time_mode=TimeMode.YEARLY) == "yearly_1995_None"
+        )
+        assert endpoint(TimeMode.YEARLY, 1995, end_year=2020) == "yearly_1995_2020"
+        assert len(calls) == 2
+
+        assert asyncio.run(async_endpoint(TimeMode.MONTHLY, 1995)) == "monthly_1995"
+        assert asyncio.run(async_endpoint(TimeMode.MONTHLY, 1995)) == "monthly_1995"
+        assert len(calls) == 3
+
+        version = "other_version"
+        endpoint(TimeMode.YEARLY, 1995)
+
+        assert len(calls) == 4
+        assert endpoint.__name__ == "endpoint"
+
+    @staticmethod
+    def test_carry_over():
+        version = "former"
+        cache = ResponseCache(max_entries=8, get_version=lambda _: version)
+
+        @cache.cached
+        def endpoint(begin_year: int, end_year: int | None = None):
+            return f"{begin_year}_{end_year}"
+
+        @cache.cached
+        def normal_endpoint(begin_year: int):
+            return f"{begin_year}"
+
+        endpoint(1991, 2020)
+        endpoint(1991, 2023)
+        endpoint(1991)
+        normal_endpoint(1971)
+        normal_endpoint(1994)
+        version = "current"
+
+        assert (
+            cache.carry_over(
+                "former", "current", changed_begin_year=2023, changed_end_year=2024
+            )
+            == 2
+        )
+        assert len(cache) == 2
+
+        assert endpoint(1991, 2020) == "1991_2020"
+        assert normal_endpoint(1971) == "1971"
+        assert (cache.hits, cache.misses) == (2, 5)
+
+    @staticmethod
+    def test_carry_over_sums_over_months():
+        version = "former"
+        cache = ResponseCache(max_entries=8, get_version=lambda _: version)
+
+        @cache.cached
+        def spi_endpoint(months: int, normal_year: int, begin_year: int, end_year: int):
+            return f"{months}_{normal_year}_{begin_year}_{end_year}"
+
+        spi_endpoint(48, 1992, 1995, 2000)
+        spi_endpoint(3, 1992, 1995, 2000)
+        version = "current"
+
+        assert (
+            cache.carry_over(
+                "former", "current", changed_begin_year=1990, changed_end_year=1991
+            )
+            == 0
+        )
+
+        version = "former"
+        spi_endpoint(48, 1992, 1995, 2000)
+        spi_endpoint(3, 1992, 1995, 2000)
+        version = "current"
+
+        assert (
+            cache.carry_over(
+                "former", "current", changed_begin_year=1989, changed_end_year=1990
+            )
+            == 1
+        )
+        assert spi_endpoint(3, 1992, 1995, 2000) == "3_1992_1995_2000"
+        assert cache.hits == 1
+
+    @staticmethod
+    def test_remove_version():
+        version = "station_a"
+        cache = ResponseCache(max_entries=8, get_version=lambda _: version)
+
+        @cache.cached
+        def endpoint(begin_year: int):
+            return f"{version}_{begin_year}"
+
+        endpoint(1991)
+        endpoint(1992)
+        version = "station_b"
+        endpoint(1991)
+
+        cache.remove_version("station_a")
+
+        assert len(cache) == 1
+        assert endpoint(1991) == "station_b_1991"
+        assert cache.hits == 1
+
+    @staticmethod
+    def test_store(tmp_path):
+        calls: list[int] = []
+
+        def get_endpoint(cache: ResponseCache):
+            @cache.cached
+            def endpoint(begin_year: int):
+                calls.append(begin_year)
+
+                return f"{begin_year}"
+
+            return endpoint
+
+        cache = ResponseCache(
+            max_entries=8,
+            get_version=lambda _: "version",
+            store=ResponseStore(tmp_path / "responses.db", max_bytes=10**6),
+        )
+        get_endpoint(cache)(1991)
+
+        # Upon restart, values are found in store then kept in memory
+        cache = ResponseCache(
+            max_entries=8,
+            get_version=lambda _: "version",
+            store=ResponseStore(tmp_path / "responses.db", max_bytes=10**6),
+        )
+        endpoint = get_endpoint(cache)
+
+        assert endpoint(1991) == endpoint(1991) == "1991"
+        assert calls == [1991]
+        assert (cache.hits, cache.store_hits, cache.misses) == (1, 1, 0)
+
+        cache.remove_version("version")
+
+        assert endpoint(1991) == "1991"
+        assert calls == [1991, 1991]
+
+
+def test_get_hashable_argument():
+    assert get_hashable_argument(TimeMode.YEARLY) == "yearly"
+    assert get_hashable_argument([1.0, TimeMode.MONTHLY]) == (1.0, "monthly")
+    assert get_hashable_argument(1995) == 1995
+
+
+def test_get_year_ranges():
+    assert get_year_ranges({"begin_year": 1991, "end_year": 2020}) == [(1991, 2020)]
+    assert get_year_ranges({"begin_year": 1991, "end_year": None}) == [
+        (1991, float("inf"))
+    ]
+    assert get_year_ranges({"begin_year": 1991}) == [(1991, 2020)]
+    assert get_year_ranges(
+        {"normal_year": 1971, "begin_year": 1991, "end_year": 2020}
+    ) == [(1991, 2020), (1971, 2000)]
+    assert get_year_ranges(
+        {"months": 48, "normal_year": 1992, "begin_year": 1995, "end_year": 2000}
+    ) == [(1991, 2000), (1988, 2021)]
+    assert get_year_ranges({"time_mode": "yearly"}) == []
+
+
+def test_get_webapp_queries():
+    queries = get_webapp_queries(normal_year=1981, begin_year=1995, end_year=2024)
+
+    assert len(queries) == len(set(queries)) == 1 + len(Month) + len(Season) + 6
+    assert all(query.startswith("/graph/") for query in queries)
+    assert all("begin_year=1995&end_year=2024" in query for query in queries)
+
+
+def test_learn_queries_from_access_log(tmp_path):
+    access_log_path = tmp_path / "access.log"
+    access_log_path.write_text(
+        '127.0.0.1:1 - "GET /rest/graph/rainfall_averages?time_mode=monthly&begin_year=1995 HTTP/1.1" 200 OK\n'
+        '127.0.0.1:2 - "GET /rest/rainfall/average?time_mode=yearly&begin_year=1971 HTTP/1.1" 200 OK\n'
+        '127.0.0.1:3 - "GET /rest/rainfall/average?time_mode=yearly&begin_year=1971 HTTP/1.1" 200 OK\n'
+        '127.0.0.1:4 - "GET /rest/rainfall/average?time_mode=yearly&begin_year=1700 HTTP/1.1" 422 Unprocessable\n'
+        '127.0.0.1:5 - "GET /rest/csv/rainfall_by_year?time_mode=yearly&begin_year=1971 HTTP/1.1" 200 OK\n'
+        '127.0.0.1:6 - "POST /rest/jobs HTTP/1.1" 202 Accepted\n'
+    )
+
+    assert learn_queries_from_access_log(
+        str(access_log_path), root_path="/rest", max_queries=8
+    ) == [
+        "/rainfall/average?time_mode=yearly&begin_year=1971",
+        "/graph/rainfall_averages?time_mode=monthly&begin_year=1995",
+    ]
+    assert (
+        len(
+            learn_queries_from_access_log(
+                str(access_log_path), root_path="/rest", max_queries=1
+            )
+        )
+        == 1
+    )
+    assert (
+        learn_queries_from_access_log(str(tmp_path / "missing.log"), max_queries=8)
+        == []
+    )
+
+
+class TestCacheWarmer:
+    @staticmethod
+    def test_start_and_wait():
+        queries = [
+            "/rainfall/average?time_mode=yearly&begin_year=1995&end_year=2024",
+            "/graph/rainfall_averages?time_mode=seasonal&begin_year=1995&end_year=2024",
+            "/rainfall/average?time_mode=yearly&begin_year=1000",
+        ]
+        cache_warmer = CacheWarmer(queries + queries[:1])
+
+        assert cache_warmer.queries == queries
+        assert not cache_warmer.is_ready
+
+        async def warm_up():
+            cache_warmer.start(fastapi_app)
+            await cache_warmer.wait()
+
+        response_cache.clear()
+        asyncio.run(warm_up())
+
+        assert cache_warmer.is_ready
+        assert cache_warmer.warmed_up_queries == 2
+        assert cache_warmer.failed_queries == queries[2:]
+        assert len(response_cache) == 2
@@ -0,0 +1,167 @@
+import json
+from typing import cast
+
+import requests
+from fastapi.testclient import TestClient
+from pytest import fixture
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+from back.api import APIClient, routes
+from back.api.app import fastapi_app
+
+
+class AppAdapter(BaseAdapter):
+    """
+    Transport adapter sending requests of the client to the app in-process.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.test_client = TestClient(fastapi_app)
+
+    def send(
+        self,
+        request: requests.PreparedRequest,
+        stream=False,
+        timeout: float | tuple[float | None, float | None] | None = None,
+        verify: bool | str = True,
+        cert: str | tuple[str, str] | None = None,
+        proxies: dict[str, str] | None = None,
+    ) -> requests.Response:
+        url = str(request.url)
+        app_response = self.test_client.request(
+            str(request.method),
+            url,
+            content=cast(bytes | None, request.body),
+            headers={name: str(value) for name, value in request.headers.items()},
+        )
+        response = requests.Response()
+        response.status_code = app_response.status_code
+        response.headers = CaseInsensitiveDict(app_response.headers)
+        response._content = app_response.content
+        response.url = url
+        response.request = request
+
+        return response
+
+    def close(self):
+        self.test_client.close()
+
+
+@fixture
+def api_client():
+    api_client = APIClient("http://testserver")
+    api_client.mount("http://testserver", AppAdapter())
+    yield api_client
+    api_client.close()
+
+
+def test_get_rainfall_average(api_client):
+    average = api_client.get_rainfall_average(
+        time_mode="seasonal",
+        begin_year=1991,
+        end_year=2020,
+        window="October-March",
+        ci=True,
+        replicates=200,
+        station=routes.rainfall_dataset.station,
+    )
+
+    assert average["window"] == "October-March"
+    assert average["lower_bound"] <= average["value"] <= average["upper_bound"]
+
+    normal = api_client.get_rainfall_normal(
+        time_mode="yearly", begin_year=1991, ci=True, replicates=200
+    )
+
+    assert normal["lower_bound"] <= normal["value"] <= normal["upper_bound"]
+
+
+def test_get_rainfall_trends(api_client):
+    trends = api_client.get_rainfall_trends(
+        begin_year=1991, end_year=2020, time_mode="monthly", ci=True, replicates=200
+    )
+
+    assert len(trends) == 12
+    for trend in trends:
+        assert (
+            trend["linear_regression_lower_bound"]
+            <= trend["linear_regression_upper_bound"]
+        )
+
+
+def test_get_rainfall_change_points(api_client):
+    segments = api_client.get_rainfall_change_points(
+        begin_year=1971,
+        end_year=2020,
+        time_mode="yearly",
+        penalty_factors=[0.5, 2.0],
+        station=routes.rainfall_dataset.station,
+    )
+
+    assert {segment["penalty_factor"] for segment in segments} == {0.5, 2.0}
+
+
+def test_get_rainfall_return_levels(api_client):
+    return_levels = api_client.get_rainfall_return_levels(
+        time_mode="monthly",
+        begin_year=1971,
+        end_year=2020,
+        month="October",
+        distribution="gumbel",
+        replicates=200,
+    )
+
+    return_periods = [return_level["return_period"] for return_level in return_levels]
+
+    assert return_periods == [10, 50, 100]
+
+
+def test_get_years_relative_to_normal_of_window(api_client):
+    for get_years in (
+        api_client.get_years_below_normal,
+        api_client.get_years_above_normal,
+    ):
+        assert (
+            get_years(
+                time_mode="seasonal",
+                normal_year=1991,
+                begin_year=1991,
+                end_year=2020,
+                window="December-February",
+            )["window"]
+            == "December-February"
+        )
+
+
+def test_get_standardized_precipitation_index(api_client):
+    figure = json.loads(
+        api_client.get_standardized_precipitation_index_as_plotly_json(
+            normal_year=1991,
+            begin_year=2000,
+            end_year=2010,
+            months=12,
+            station=routes.rainfall_dataset.station,
+        )
+    )
+
+    assert figure["data"]
+
+    response = api_client.get_standardized_precipitation_index_as_csv(
+        normal_year=1991, begin_year=2000, end_year=2010, months=12
+    )
+
+    assert response.status_code == 200
+    # Header then a row per month
+    assert len(response.text.strip().splitlines()) == 1 + 11 * 12
+
+
+def test_get_rainfall_linreg_slope_matrix_as_plotly_json(api_client):
+    figure = json.loads(
+        api_client.get_rainfall_linreg_slope_matrix_as_plotly_json(
+            time_mode="seasonal", begin_year=1991, end_year=2020, window="June-August"
+        )
+    )
+
+    assert figure["data"]
@@ -0,0 +1,307 @@
+import asyncio
+import os
+
+from fastapi import HTTPException, Request
+from pytest import raises
+
+from back.api.app import fastapi_app
+from back.api.config import Config
+from back.api.dataset import (
+    DatasetSnapshot,
+    DatasetWatcher,
+    RainfallDataset,
+    RawRainfallRow,
+    validate_all_rainfall,
+)
+from back.api.routes import cache_warmer, rainfall_dataset, response_cache
+from back.api.routes.admin import reload_dataset, update_dataset
+from back.api.utils import send_get_request_in_process
+from back.rainfall import AllRainfall
+from back.rainfall.shared_dataset import write_shared_dataset
+from tst.back.rainfall.models.test_all_rainfall import ALL_RAINFALL
+
+
+def write_raw_data_until(path, end_year: int, *, negative=False) -> str:
+    raw_data = ALL_RAINFALL.raw_data
+    raw_data = raw_data[raw_data.iloc[:, 0] <= end_year].copy()
+    if negative:
+        raw_data.iloc[-1, 1] = -1.0
+
+    raw_data.to_csv(path, index=False)
+
+    return str(path)
+
+
+def get_raw_rows(begin_year: int, end_year: int) -> list[RawRainfallRow]:
+    raw_data = ALL_RAINFALL.raw_data
+    raw_data = raw_data[raw_data.iloc[:, 0].between(begin_year, end_year)]
+
+    return [
+        RawRainfallRow(year=row[0], monthly_rainfall=list(row[1:]))
+        for row in raw_data.itertuples(index=False)
+    ]
+
+
+def load_until(path, end_year: int, *, negative=False) -> AllRainfall:
+    return AllRainfall(
+        write_raw_data_until(path, end_year, negative=negative),
+        start_year=ALL_RAINFALL.starting_year,
+        round_precision=ALL_RAINFALL.round_precision,
+    )
+
+
+def test_validate_all_rainfall(tmp_path):
+    validate_all_rainfall(ALL_RAINFALL)
+
+    with raises(ValueError):
+        validate_all_rainfall(
+            load_until(tmp_path / "negative.csv", 2020, negative=True)
+        )
+
+    with raises(ValueError):
+        validate_all_rainfall(load_until(tmp_path / "short.csv", 1990))
+
+
+class TestDatasetSnapshot:
+    @staticmethod
+    def test_check_year():
+        snapshot = DatasetSnapshot(ALL_RAINFALL)
+
+        assert snapshot.min_year == ALL_RAINFALL.starting_year
+        assert snapshot.max_year == ALL_RAINFALL.get_last_year()
+        assert snapshot.max_normal_year == snapshot.max_year - 29
+        assert snapshot.check_year(snapshot.max_year) == snapshot.max_year
+        assert snapshot.check_normal_year(snapshot.min_year) == snapshot.min_year
+
+        with raises(ValueError):
+            snapshot.check_year(snapshot.max_year + 1)
+
+        with raises(ValueError):
+            snapshot.check_normal_year(snapshot.max_normal_year + 1)
+
+
+class TestRainfallDataset:
+    @staticmethod
+    def test_reload(tmp_path):
+        csv_path = tmp_path / "rainfall.csv"
+        end_year = 2020
+        dataset = RainfallDataset(
+            ALL_RAINFALL, load=lambda: load_until(csv_path, end_year)
+        )
+        snapshot = dataset.snapshot
+
+        reload = dataset.reload()
+
+        assert reload.reloaded
+        assert reload.previous_version == ALL_RAINFALL.version
+        assert reload.dataset_version == dataset.snapshot.version
+        assert reload.max_year == dataset.snapshot.max_year == 2020
+        # Former snapshot is left untouched for requests still using it
+        assert snapshot.all_rainfall is ALL_RAINFALL
+        assert snapshot.max_year == ALL_RAINFALL.get_last_year()
+
+        assert not dataset.reload().reloaded
+
+        end_year = 1990
+        with raises(HTTPException) as exc_info:
+            dataset.reload()
+
+        assert exc_info.value.status_code == 422
+        assert dataset.snapshot.max_year == 2020
+
+    @staticmethod
+    def test_refresh_watched_file(tmp_path):
+        csv_path = write_raw_data_until(tmp_path / "rainfall.csv", 2020)
+        dataset = RainfallDataset(
+            load_until(tmp_path / "initial.csv", 2020),
+            load=lambda: AllRainfall(
+                csv_path,
+                start_year=ALL_RAINFALL.starting_year,
+                round_precision=ALL_RAINFALL.round_precision,
+            ),
+            watched_path=csv_path,
+        )
+
+        assert dataset.refresh() is None
+
+        write_raw_data_until(csv_path, 2010)
+        mtime_ns = os.stat(csv_path).st_mtime_ns + 10**9
+        os.utime(csv_path, ns=(mtime_ns, mtime_ns))
+        reload = dataset.refresh()
+
+        assert reload is not None and reload.reloaded
+        assert dataset.snapshot.max_year == 2010
+        assert dataset.refresh() is None
+
+    @staticmethod
+    def test_refresh_shared_dataset(tmp_path):
+        shared_dataset_path = write_shared_dataset(
+            ALL_RAINFALL, tmp_path / "rainfall.bin"
+        )
+        # Two workers attach the same shared dataset
+        datasets = [
+            RainfallDataset(
+                AllRainfall.from_shared_dataset(shared_dataset_path),
+                load=lambda: load_until(tmp_path / "rainfall.csv", 2020),
+                shared_dataset_path=shared_dataset_path,
+            )
+            for _ in range(2)
+        ]
+
+        assert datasets[1].refresh() is None
+
+        assert datasets[0].reload().reloaded
+        assert datasets[0].snapshot.all_rainfall.shared_dataset is not None
+        assert datasets[1].snapshot.version == ALL_RAINFALL.version
+
+        reload = datasets[1].refresh()
+
+        assert reload is not None and reload.reloaded
+        assert datasets[1].snapshot.version == datasets[0].snapshot.version
+        assert datasets[1].snapshot.max_year == 2020
+        assert datasets[1].refresh() is None
+
+    @staticmethod
+    def test_apply_update(tmp_path):
+        shared_dataset_path = write_shared_dataset(
+            load_until(tmp_path / "rainfall.csv", 2020), tmp_path / "rainfall.bin"
+        )
+        dataset = RainfallDataset(
+            AllRainfall.from_shared_dataset(shared_dataset_path),
+            load=lambda: ALL_RAINFALL,
+            shared_dataset_path=shared_dataset_path,
+        )
+
+        reload = dataset.apply_update(get_raw_rows(2020, 2022))
+
+        assert reload.reloaded
+        assert (reload.changed_begin_year, reload.changed_end_year) == (2021, 2022)
+        assert dataset.snapshot.max_year == 2022
+        assert dataset.snapshot.all_rainfall.shared_dataset is not None
+
+        assert not dataset.apply_update(get_raw_rows(2021, 2021)).reloaded
+
+        rows = get_raw_rows(2022, 2022)
+        rows[0].monthly_rainfall[0] = -1.0
+        with raises(HTTPException) as exc_info:
+            dataset.apply_update(rows)
+
+        assert exc_info.value.status_code == 422
+
+        rows[0].year = 1700
+        with raises(HTTPException) as exc_info:
+            dataset.apply_update(rows)
+
+        assert exc_info.value.status_code == 422
+        assert dataset.snapshot.max_year == 2022
+
+
+class TestDatasetWatcher:
+    @staticmethod
+    def test_check(tmp_path):
+        shared_dataset_path = write_shared_dataset(
+            ALL_RAINFALL, tmp_path / "rainfall.bin"
+        )
+        dataset = RainfallDataset(
+            AllRainfall.from_shared_dataset(shared_dataset_path),
+            load=lambda: ALL_RAINFALL,
+            shared_dataset_path=shared_dataset_path,
+        )
+        watcher = DatasetWatcher(dataset, poll_interval=1)
+        reloads: list[str] = []
+
+        assert watcher.is_enabled
+        assert not DatasetWatcher(dataset, poll_interval=None).is_enabled
+        assert (
+            asyncio.run(
+                watcher.check(lambda reload: reloads.append(reload.dataset_version))
+            )
+            is None
+        )
+
+        write_shared_dataset(
+            load_until(tmp_path / "rainfall.csv", 2020), shared_dataset_path
+        )
+        reload = asyncio.run(
+            watcher.check(lambda reload: reloads.append(reload.dataset_version))
+        )
+
+        assert reload is not None and reload.reloaded
+        assert reloads == [dataset.snapshot.version]
+        assert watcher.last_error is None
+
+
+def test_reload_dataset(tmp_path, monkeypatch):
+    reload_settings = Config().get_api_settings.reload
+    load = rainfall_dataset.load
+    snapshot = rainfall_dataset.snapshot
+    request = Request({"type": "http", "app": fastapi_app})
+    target = "/rainfall/average?time_mode=yearly&begin_year=2015&end_year=2022"
+
+    async def reload_and_request(x_admin_token: str | None):
+        reload = await reload_dataset(request, x_admin_token=x_admin_token)
+        status_code, _ = await send_get_request_in_process(fastapi_app, target)
+        cache_warmer.stop()
+
+        return reload, status_code
+
+    try:
+        with raises(HTTPException) as exc_info:
+            asyncio.run(reload_and_request(None))
+
+        assert exc_info.value.status_code == 403
+
+        monkeypatch.setattr(reload_settings, "admin_token", "secret")
+        rainfall_dataset.load = lambda: load_until(tmp_path / "rainfall.csv", 2020)
+
+        with raises(HTTPException) as exc_info:
+            asyncio.run(reload_and_request("wrong"))
+
+        assert exc_info.value.status_code == 401
+        assert asyncio.run(send_get_request_in_process(fastapi_app, target))[0] == 200
+
+        reload, status_code = asyncio.run(reload_and_request("secret"))
+
+        assert reload.reloaded
+        assert reload.max_year == 2020
+        assert "2020" in fastapi_app.openapi()["info"]["description"]
+        # Year bounds of validation follow reloaded data
+        assert status_code == 422
+    finally:
+        rainfall_dataset.load = load
+        rainfall_dataset._snapshot = snapshot
+        fastapi_app.set_description()
+
+
+def test_update_dataset(tmp_path, monkeypatch):
+    reload_settings = Config().get_api_settings.reload
+    snapshot = rainfall_dataset.snapshot
+    request = Request({"type": "http", "app": fastapi_app})
+    target = "/rainfall/average?time_mode=yearly&begin_year=1991&end_year=2020"
+    monkeypatch.setattr(reload_settings, "admin_token", "secret")
+
+    async def update_and_request(rows: list[RawRainfallRow]):
+        reload = await update_dataset(request, rows, x_admin_token="secret")
+        cache_warmer.stop()
+
+        return reload
+
+    try:
+        rainfall_dataset._snapshot = DatasetSnapshot(
+            load_until(tmp_path / "rainfall.csv", 2022)
+        )
+        response_cache.clear()
+        asyncio.run(send_get_request_in_process(fastapi_app, target))
+        cached_responses = len(response_cache)
+
+        reload = asyncio.run(update_and_request(get_raw_rows(2023, 2023)))
+
+        assert reload.reloaded
+        assert reload.max_year == 2023
+        # Responses about years before update are kept
+        assert len(response_cache) == cached_responses
+        assert asyncio.run(send_get_request_in_process(fastapi_app, target))[0] == 200
+    finally:
+        rainfall_dataset._snapshot = snapshot
+        response_cache.clear()
+        fastapi_app.set_description()
@@ -0,0 +1,203 @@
+import time
+
+from _pytest.python_api import raises
+from fastapi import HTTPException
+
+from back.api.jobs import (
+    MAX_KEPT_JOBS,
+    Analysis,
+    JobManager,
+    JobModel,
+    JobRequest,
+    JobResult,
+    JobStatus,
+    ResultStore,
+)
+from back.rainfall.utils import Season, TimeMode
+from tst.back.rainfall.models.test_all_rainfall import ALL_RAINFALL
+
+
+def _wait_for_job(job_manager: JobManager, job_id: str, timeout=60.0) -> JobModel:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = job_manager.get(job_id)
+        assert job is not None
+        if job.status not in (JobStatus.PENDING, JobStatus.RUNNING):
+            return job
+
+        time.sleep(0.1)
+
+    raise TimeoutError(f"Job {job_id} did not end within {timeout} seconds.")
+
+
+class TestResultStore:
+    @staticmethod
+    def test_get_and_put(tmp_path):
+        result_store = ResultStore(tmp_path)
+        parameters = {"analysis": Analysis.KMEANS.value, "kmeans_clusters": 3}
+
+        assert result_store.get("version", parameters) is None
+
+        result = JobResult(years=[1971, 1972], values=[0.0, 1.0])
+        result_store.put("version", parameters, result)
+
+        assert result_store.get("version", parameters) == result
+        assert result_store.get("other_version", parameters) is None
+        assert result_store.get("version", {**parameters, "kmeans_clusters": 4}) is None
+        assert not list(tmp_path.rglob("*.tmp"))
+
+
+class TestJobManager:
+    @staticmethod
+    def test_submit_and_get(tmp_path):
+        job_manager = JobManager(
+            max_workers=1, max_pending_jobs=4, result_store_path=tmp_path
+        )
+        try:
+            for job_request in [
+                JobRequest(analysis=Analysis.KMEANS, kmeans_clusters=3),
+                JobRequest(
+                    analysis=Analysis.SAVITZKY_GOLAY_FILTER,
+                    time_mode=TimeMode.SEASONAL,
+                    season=Season.FALL,
+                ),
+                JobRequest(analysis=Analysis.BOOTSTRAP_NORMALS, replicates=200),
+            ]:
+                job = job_manager.submit(job_request, all_rainfall=ALL_RAINFALL)
+
+                assert job.dataset_version == ALL_RAINFALL.version
+                assert job.status != JobStatus.FAILED
+
+                job = _wait_for_job(job_manager, job.id)
+
+                assert job.status == JobStatus.DONE
+                assert job.result is not None
+                assert len(job.result.years) == len(job.result.values) > 0
+                if job_request.analysis == Analysis.BOOTSTRAP_NORMALS:
+                    assert job.result.lower_bounds is not None
+                    assert len(job.result.lower_bounds) == len(job.result.values)
+
+                stored_job = job_manager.submit(job_request, all_rainfall=ALL_RAINFALL)
+
+                assert stored_job.id != job.id
+                assert stored_job.status == JobStatus.DONE
+                assert stored_job.result == job.result
+
+            assert job_manager.get("unknown_job_id") is None
+        finally:
+            job_manager.shutdown()
+
+    @staticmethod
+    def test_submit_too_many_jobs(tmp_path):
+        job_manager = JobManager(
+            max_workers=1, max_pending_jobs=1, result_store_path=tmp_path
+        )
+        try:
+            job_manager.submit(
+                JobRequest(analysis=Analysis.KMEANS), all_rainfall=ALL_RAINFALL
+            )
+            with raises(HTTPException):
+                job_manager.submit(
+                    JobRequest(analysis=Analysis.KMEANS, kmeans_clusters=2),
+                    all_rainfall=ALL_RAINFALL,
+                )
+        finally:
+            job_manager.shutdown()
+
+    @staticmethod
+    def test_cancel(tmp_path):
+        job_manager = JobManager(
+            max_workers=1, max_pending_jobs=4, result_store_path=tmp_path
+        )
+        try:
+            job = job_manager.submit(
+                JobRequest(analysis=Analysis.KMEANS), all_rainfall=ALL_RAINFALL
+            )
+            cancelled_job = job_manager.cancel(job.id)
+
+            assert cancelled_job is not None
+            assert cancelled_job.status == JobStatus.CANCELLED
+            assert _wait_for_job(job_manager, job.id).status == JobStatus.CANCELLED
+            assert job_manager.cancel("unknown_job_id") is None
+        finally:
+            job_manager.shutdown()
+
+    @staticmethod
+    def test_forget_oldest_finished_jobs(tmp_path):
+        job_manager = JobManager(
+            max_workers=1, max_pending_jobs=4, result_store_path=tmp_path
+        )
+        try:
+            job_request = JobRequest(analysis=Analysis.KMEANS)
+            job = job_manager.submit(job_request, all_rainfall=ALL_RAINFALL)
+            job_ids = [_wait_for_job(job_manager, job.id).id]
+            # Results are stored: further jobs are finished upon submission
+            while len(job_ids) < 600:
+                job_ids.append(
+                    job_manager.submit(job_request, all_rainfall=ALL_RAINFALL).id
+                )
+
+            assert all(job_manager.get(job_id) is not None for job_id in job_ids)
+
+            while len(job_ids) < MAX_KEPT_JOBS + 10:
+                job_ids.append(
+                    job_manager.submit(job_request, all_rainfall=ALL_RAINFALL).id
+                )
+
+            assert all(job_manager.get(job_id) is None for job_id in job_ids[:10])
+            assert all(job_manager.get(job_id) is not None for job_id in job_ids[10:])
+        finally:
+            job_manager.shutdown()
+
+    @staticmethod
+    def test_replace_broken_executor(tmp_path):
+        job_manager = JobManager(
+            max_workers=1, max_pending_jobs=4, result_store_path=tmp_path
+        )
+        try:
+            job = job_manager.submit(
+                JobRequest(analysis=Analysis.BOOTSTRAP_NORMALS, replicates=100_000),
+                all_rainfall=ALL_RAINFALL,
+            )
+            broken_executor = job_manager.executor
+            for process in list(broken_executor._processes.values()):
+                process.kill()
+
+            failed_job = _wait_for_job(job_manager, job.id)
+
+            assert failed_job.status == JobStatus.FAILED
+            assert failed_job.error is not None
+            assert "BrokenProcessPool" in failed_job.error
+
+            job = job_manager.submit(
+                JobRequest(analysis=Analysis.KMEANS), all_rainfall=ALL_RAINFALL
+            )
+
+            assert job_manager.executor is not broken_executor
+            assert _wait_for_job(job_manager, job.id).status == JobStatus.DONE
+        finally:
+            job_manager.shutdown()
+
+    @staticmethod
+    def test_fail_if_result_cannot_be_stored(tmp_path, monkeypatch):
+        job_manager = JobManager(
+            max_workers=1, max_pending_jobs=4, result_store_path=tmp_path
+        )
+
+        def put(*args):
+            raise OSError("No space left on device")
+
+        monkeypatch.setattr(job_manager.result_store, "put", put)
+        try:
+            job = job_manager.submit(
+                JobRequest(analysis=Analysis.KMEANS), all_rainfall=ALL_RAINFALL
+            )
+            failed_job = _wait_for_job(job_manager, job.id)
+
+            assert failed_job.status == JobStatus.FAILED
+            assert failed_job.result is None
+            assert failed_job.error is not None
+            assert "No space left on device" in failed_job.error
+            assert job.id not in job_manager._futures
+        finally:
+            job_manager.shutdown()
@@ -0,0 +1,110 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from back.api.response_store import ResponseStore, get_hashed_key
+from back.api.utils import RainfallModel
+
+
+def get_key(begin_year: int, version: str = "version") -> tuple:
+    return version, "get_rainfall_average", (("begin_year", begin_year),)
+
+
+def put_values(path: str, begin_years: range):
+    store = ResponseStore(path, max_bytes=10**6)
+    for begin_year in begin_years:
+        store.put(get_key(begin_year), begin_year)
+
+    store.close()
+
+
+class TestResponseStore:
+    @staticmethod
+    def test_get_and_put(tmp_path):
+        store = ResponseStore(tmp_path / "responses.db", max_bytes=10**6)
+        value = RainfallModel(
+            name="rainfall average (mm)", value=650.1, begin_year=1991, end_year=2020
+        )
+
+        assert store.get(get_key(1991)) == (False, None)
+
+        store.put(get_key(1991), value)
+        store.put(get_key(1991), "ignored")
+        store.close()
+
+        # Values survive restarts
+        store = ResponseStore(tmp_path / "responses.db", max_bytes=10**6)
+
+        assert store.get(get_key(1991)) == (True, value)
+        assert store.get(get_key(1991, version="other_version")) == (False, None)
+        assert len(store) == 1
+
+        store.clear()
+
+        assert (len(store), store.size) == (0, 0)
+
+    @staticmethod
+    def test_evict(tmp_path):
+        store = ResponseStore(
+            tmp_path / "responses.db", max_bytes=110, access_resolution=0.0
+        )
+        for begin_year in range(1991, 1994):
+            store.put(get_key(begin_year), b"x" * 20)
+
+        # Pickled values weigh 35 bytes
+        store.get(get_key(1991))
+        store.put(get_key(1994), b"x" * 20)
+        store.put(get_key(1995), b"x" * 1000)
+
+        assert store.size == 105
+        assert store.get(get_key(1991))[0]
+        assert not store.get(get_key(1992))[0]
+        assert not store.get(get_key(1995))[0]
+
+    @staticmethod
+    def test_remove_version_and_carry_over(tmp_path):
+        store = ResponseStore(tmp_path / "responses.db", max_bytes=10**6)
+        for begin_year in [1991, 2020]:
+            store.put(get_key(begin_year, version="former"), begin_year)
+
+        assert (
+            store.carry_over(
+                "former",
+                "current",
+                is_kept=lambda arguments: arguments["begin_year"] < 2000,
+            )
+            == 1
+        )
+        assert store.get(get_key(1991, version="current")) == (True, 1991)
+        assert store.get(get_key(2020, version="current")) == (False, None)
+        assert len(store) == 1
+
+        store.remove_version("current")
+
+        assert len(store) == 0
+
+    @staticmethod
+    def test_share_between_processes(tmp_path):
+        path = str(tmp_path / "responses.db")
+        with ProcessPoolExecutor(
+            max_workers=4, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            for future in [
+                executor.submit(put_values, path, range(begin_year, begin_year + 50))
+                for begin_year in range(1900, 2000, 25)
+            ]:
+                future.result()
+
+        store = ResponseStore(path, max_bytes=10**6)
+
+        assert len(store) == 125
+        assert all(
+            store.get(get_key(begin_year)) == (True, begin_year)
+            for begin_year in range(1900, 2025)
+        )
+
+
+def test_get_hashed_key():
+    assert get_hashed_key(*get_key(1991)) == get_hashed_key(
+        "version", "get_rainfall_average", [["begin_year", 1991]]
+    )
+    assert get_hashed_key(*get_key(1991)) != get_hashed_key(*get_key(1992))
@@ -0,0 +1,152 @@
+import asyncio
+
+from fastapi import HTTPException
+from pytest import raises
+
+from back.api import routes
+from back.api.app import fastapi_app
+from back.api.dataset import RainfallDataset
+from back.api.routes.rainfall import get_rainfall_average
+from back.api.stations import StationRegistry
+from back.api.utils import send_get_request_in_process
+from back.rainfall import AllRainfall
+from back.rainfall.utils import TimeMode
+from tst.back.api.test_dataset import load_until
+from tst.back.rainfall.models.test_all_rainfall import ALL_RAINFALL
+
+
+def get_registry(tmp_path, stations: list[str], **kwargs) -> StationRegistry:
+    loaded_stations: list[str] = []
+
+    def load_dataset(station: str) -> RainfallDataset:
+        loaded_stations.append(station)
+        all_rainfall: AllRainfall = (
+            ALL_RAINFALL
+            if station == stations[0]
+            else load_until(tmp_path / f"{station}.csv", 2000)
+        )
+
+        return RainfallDataset(all_rainfall, load=lambda: all_rainfall, station=station)
+
+    registry = StationRegistry(
+        stations, default_station=stations[0], load_dataset=load_dataset, **kwargs
+    )
+    registry.loaded_stations = loaded_stations  # type: ignore
+
+    return registry
+
+
+class TestStationRegistry:
+    @staticmethod
+    def test_get(tmp_path):
+        registry = get_registry(tmp_path, ["barcelona", "girona"])
+
+        assert registry.loaded_stations == ["barcelona"]  # type: ignore
+        assert registry.get() is registry.default_dataset
+        assert [model.loaded for model in registry.get_station_models()] == [
+            True,
+            False,
+        ]
+
+        dataset = asyncio.run(registry.get_async("girona"))
+
+        assert dataset.snapshot.station == "girona"
+        assert dataset.snapshot.max_year == 2000
+        assert registry.get("girona") is dataset
+        assert registry.loaded_stations == ["barcelona", "girona"]  # type: ignore
+
+        station_model = registry.get_station_models()[1]
+
+        assert station_model.loaded and not station_model.default
+        assert station_model.max_year == 2000
+        assert station_model.memory_bytes
+
+        with raises(HTTPException) as exc_info:
+            registry.get("lleida")
+
+        assert exc_info.value.status_code == 404
+
+    @staticmethod
+    def test_get_failing_station(tmp_path):
+        def load_dataset(station: str) -> RainfallDataset:
+            if station != "barcelona":
+                raise FileNotFoundError(station)
+
+            return RainfallDataset(ALL_RAINFALL, load=lambda: ALL_RAINFALL)
+
+        registry = StationRegistry(
+            ["barcelona", "girona"],
+            default_station="barcelona",
+            load_dataset=load_dataset,
+        )
+
+        with raises(HTTPException) as exc_info:
+            registry.get("girona")
+
+        assert exc_info.value.status_code == 503
+
+    @staticmethod
+    def test_evict(tmp_path):
+        registry = get_registry(
+            tmp_path, ["barcelona", "girona", "lleida"], memory_budget=1
+        )
+
+        registry.get("girona")
+        registry.get("lleida")
+
+        assert registry.evictions == 1
+        # Default station is never unloaded, nor the station just requested
+        assert [model.loaded for model in registry.get_station_models()] == [
+            True,
+            False,
+            True,
+        ]
+
+        registry.get("girona")
+
+        assert registry.evictions == 2
+        assert registry.loaded_stations == [  # type: ignore
+            "barcelona",
+            "girona",
+            "lleida",
+            "girona",
+        ]
+
+
+def test_request_station(tmp_path, monkeypatch):
+    registry = get_registry(
+        tmp_path, [routes.rainfall_dataset.station, "girona"], memory_budget=None
+    )
+    monkeypatch.setattr(routes, "station_registry", registry)
+    target = "/rainfall/average?time_mode=yearly&begin_year=1995&end_year=2010"
+
+    assert asyncio.run(send_get_request_in_process(fastapi_app, target))[0] == 200
+
+    status_code, _ = asyncio.run(
+        send_get_request_in_process(fastapi_app, f"{target}&station=girona")
+    )
+
+    # Years are validated against bounds of requested station data
+    assert status_code == 422
+
+    # Missing end year is the last one of requested station data, cached apart
+    for station, end_year in (
+        (None, ALL_RAINFALL.get_last_year()),
+        ("girona", 2000),
+    ):
+        rainfall_average = asyncio.run(
+            get_rainfall_average(
+                TimeMode.YEARLY,
+                snapshot=registry.get(station).snapshot,
+                begin_year=1995,
+            )
+        )
+
+        assert rainfall_average.end_year == end_year
+
+    assert (
+        asyncio.run(
+            send_get_request_in_process(fastapi_app, f"{target}&station=lleida")
+        )[0]
+        == 404
+    )
@@ -1,8 +1,11 @@
+import asyncio
+
 from _pytest.python_api import raises
 from fastapi import HTTPException
 
 from back.api import utils
 from back.rainfall.utils import Month, Season, TimeMode
+from back.rainfall.utils.month_windows import HYDROLOGICAL_YEAR
 
 
 def test_raise_time_mode_error_or_do_nothing():
@@ -24,9 +27,217 @@ def test_raise_time_mode_error_or_do_nothing():
     with raises(HTTPException):
         utils.raise_time_mode_error_or_do_nothing(TimeMode.SEASONAL, season=None)
 
+    assert (
+        utils.raise_time_mode_error_or_do_nothing(
+            TimeMode.SEASONAL, window=HYDROLOGICAL_YEAR
+        )
+        is None
+    )
+
+
+def test_get_month_window():
+    assert utils.get_month_window("October-September") == HYDROLOGICAL_YEAR
+    assert utils.get_month_window(None) is None
+
+    with raises(HTTPException):
+        utils.get_month_window("October-Brumaire")
+
 
 def test_raise_year_related_error_or_do_nothing():
     assert utils.raise_year_related_error_or_do_nothing(1975, 1995) is None
 
     with raises(HTTPException):
         utils.raise_year_related_error_or_do_nothing(1995, 1975)
+
+
+def test_send_get_request_in_process():
+    from back.api.app import fastapi_app
+
+    status_code, body_size = asyncio.run(
+        utils.send_get_request_in_process(
+            fastapi_app,
+            "/csv/rainfall_by_year?time_mode=yearly&begin_year=1991&end_year=2020",
+        )
+    )
+
+    assert status_code == 200
+    assert body_size > 0
+
+    status_code, _ = asyncio.run(
+        utils.send_get_request_in_process(
+            fastapi_app, "/rainfall/average?time_mode=yearly"
+        )
+    )
+
+    assert status_code == 422
+
+
+def test_send_get_request_with_window():
+    from back.api.app import fastapi_app
+
+    for window, expected_status_code in [
+        ("October-September", 200),
+        ("december-february", 200),
+        ("October-Brumaire", 400),
+    ]:
+        status_code, _ = asyncio.run(
+            utils.send_get_request_in_process(
+                fastapi_app,
+                f"/rainfall/average?time_mode=seasonal&begin_year=1991&window={window}",
+            )
+        )
+
+        assert status_code == expected_status_code
+
+
+def test_send_get_request_for_linreg_slope_matrix():
+    from back.api.app import fastapi_app
+
+    for query, expected_status_code in [
+        ("time_mode=yearly&begin_year=1991&end_year=2020", 200),
+        ("time_mode=monthly&begin_year=1991&month=May", 200),
+        ("time_mode=seasonal&begin_year=1991&window=October-September", 200),
+        ("time_mode=monthly&begin_year=1991", 400),
+    ]:
+        status_code, _ = asyncio.run(
+            utils.send_get_request_in_process(
+                fastapi_app, f"/graph/linreg_slope_matrix?{query}"
+            )
+        )
+
+        assert status_code == expected_status_code
+
+
+def test_get_rainfall_trends():
+    from back.api.app import fastapi_app
+    from back.api.routes import rainfall_dataset
+    from back.api.routes.rainfall import get_rainfall_trends
+
+    trends = asyncio.run(
+        get_rainfall_trends(rainfall_dataset.snapshot, 1991, 2020)  # type: ignore
+    )
+
+    assert len(trends) == 1 + len(Month) + len(Season)
+    assert trends[0].time_mode == TimeMode.YEARLY
+    assert trends[1].month == Month.JANUARY
+    assert trends[-1].season == Season.FALL
+
+    trends = asyncio.run(
+        get_rainfall_trends(
+            rainfall_dataset.snapshot,  # type: ignore
+            1991,
+            2020,
+            time_mode=TimeMode.SEASONAL,
+        )
+    )
+
+    assert [trend.season for trend in trends] == list(Season)
+
+    status_code, _ = asyncio.run(
+        utils.send_get_request_in_process(
+            fastapi_app, "/rainfall/trends?begin_year=1991"
+        )
+    )
+
+    assert status_code == 200
+
+
+def test_send_get_request_for_spi():
+    from back.api.app import fastapi_app
+
+    for target, expected_status_code in [
+        ("/graph/spi?normal_year=1991&begin_year=1991&months=12", 200),
+        ("/csv/spi?normal_year=1991&begin_year=2000&end_year=2020", 200),
+        ("/csv/spi?normal_year=1991&begin_year=2000&months=0", 422),
+    ]:
+        status_code, _ = asyncio.run(
+            utils.send_get_request_in_process(fastapi_app, target)
+        )
+
+        assert status_code == expected_status_code
+
+
+def test_send_get_request_for_return_levels():
+    from back.api.app import fastapi_app
+
+    for target, expected_status_code in [
+        ("/rainfall/return_levels?time_mode=yearly&begin_year=1991", 200),
+        (
+            "/rainfall/return_levels?time_mode=seasonal&season=fall&begin_year=1991"
+            "&distribution=gumbel&replicates=500",
+            200,
+        ),
+        ("/rainfall/return_levels?time_mode=monthly&begin_year=1991", 400),
+        ("/rainfall/return_levels?time_mode=yearly&begin_year=1991&replicates=10", 422),
+    ]:
+        status_code, _ = asyncio.run(
+            utils.send_get_request_in_process(fastapi_app, target)
+        )
+
+        assert status_code == expected_status_code
+
+
+def test_send_get_request_for_confidence_intervals():
+    from back.api.app import fastapi_app
+    from back.api.routes import rainfall_dataset
+    from back.api.routes.rainfall import get_rainfall_normal, get_rainfall_trends
+
+    normal = asyncio.run(
+        get_rainfall_normal(
+            TimeMode.YEARLY,
+            rainfall_dataset.snapshot,  # type: ignore
+            1991,
+            ci=True,
+        )
+    )
+
+    assert normal.lower_bound < normal.value < normal.upper_bound
+
+    trends = asyncio.run(
+        get_rainfall_trends(
+            rainfall_dataset.snapshot,  # type: ignore
+            1991,
+            2020,
+            time_mode=TimeMode.YEARLY,
+            ci=True,
+        )
+    )
+
+    assert trends[0].linear_regression_lower_bound is not None
+
+    for target, expected_status_code in [
+        ("/rainfall/average?time_mode=yearly&begin_year=1991&ci=true", 200),
+        (
+            "/rainfall/average?time_mode=yearly&begin_year=1991&ci=true&replicates=1",
+            422,
+        ),
+    ]:
+        status_code, _ = asyncio.run(
+            utils.send_get_request_in_process(fastapi_app, target)
+        )
+
+        assert status_code == expected_status_code
+
+
+def test_send_get_request_for_change_points():
+    from back.api.app import fastapi_app
+
+    for target, expected_status_code in [
+        ("/rainfall/change_points?begin_year=1991", 200),
+        (
+            "/rainfall/change_points?begin_year=1991&time_mode=monthly"
+            "&penalty_factor=0.5&penalty_factor=2",
+            200,
+        ),
+        ("/rainfall/change_points?begin_year=1991&penalty_factor=0", 422),
+        (
+            "/graph/rainfall_by_year?time_mode=yearly&begin_year=1991"
+            "&plot_change_points=true&penalty_factor=0.5",
+            200,
+        ),
+    ]:
+        status_code, _ = asyncio.run(
+            utils.send_get_request_in_process(fastapi_app, target)
+        )
+
+        assert status_code == expected_status_code
@@ -1,13 +1,25 @@
 from pathlib import Path
 from shutil import rmtree
 
+import numpy as np
+import pandas as pd
+from pytest import approx, raises
+
 from back.rainfall import AllRainfall
 from back.rainfall.models import (
     MonthlyRainfall,
     SeasonalRainfall,
+    WindowRainfall,
     YearlyRainfall,
 )
+from back.rainfall.models.all_rainfall import (
+    MAX_MEMOIZED_RETURN_LEVELS,
+    MAX_MEMOIZED_SPI,
+)
 from back.rainfall.utils import Label, Month, Season, TimeMode
+from back.rainfall.utils.bootstrap import Statistic
+from back.rainfall.utils.extremes import Distribution
+from back.rainfall.utils.month_windows import HYDROLOGICAL_YEAR, MonthWindow
 
 ALL_RAINFALL = AllRainfall.from_config()
 
@@ -140,6 +152,319 @@ class TestAllRainfall:
 
             assert isinstance(std, float)
 
+    @staticmethod
+    def test_from_shared_dataset(tmp_path):
+        from back.rainfall.shared_dataset import write_shared_dataset
+
+        all_rainfall = AllRainfall.from_shared_dataset(
+            write_shared_dataset(ALL_RAINFALL, tmp_path / "rainfall.bin")
+        )
+
+        assert all_rainfall.shared_dataset is not None
+        assert all_rainfall.version == ALL_RAINFALL.version
+        # Accumulators are not built again by every process attaching the dataset
+        for model in all_rainfall.get_rainfall_models().values():
+            assert np.shares_memory(
+                model.accumulators.prefix_sums,
+                all_rainfall.shared_dataset.arrays["prefix_sums"],
+            )
+
+        assert all_rainfall.get_last_year() == ALL_RAINFALL.get_last_year()
+        assert all_rainfall.get_rainfall_average(
+            TimeMode.SEASONAL, begin_year=1991, end_year=2020, season=Season.WINTER
+        ) == ALL_RAINFALL.get_rainfall_average(
+            TimeMode.SEASONAL, begin_year=1991, end_year=2020, season=Season.WINTER
+        )
+        assert (
+            all_rainfall.get_bar_figure_of_rainfall_according_to_year(
+                TimeMode.YEARLY,
+                begin_year=1991,
+                end_year=2020,
+                plot_linear_regression=True,
+            )
+            is not None
+        )
+
+    @staticmethod
+    def test_apply_update(tmp_path):
+        from back.rainfall.shared_dataset import write_shared_dataset
+
+        raw_data = ALL_RAINFALL.raw_data
+        raw_data[raw_data.iloc[:, 0] <= 2020].to_csv(
+            tmp_path / "rainfall.csv", index=False
+        )
+        all_rainfall = AllRainfall.from_shared_dataset(
+            write_shared_dataset(
+                AllRainfall(
+                    str(tmp_path / "rainfall.csv"),
+                    start_year=ALL_RAINFALL.starting_year,
+                    round_precision=ALL_RAINFALL.round_precision,
+                ),
+                tmp_path / "rainfall.bin",
+            )
+        )
+        all_rainfall.yearly_rainfall.accumulators
+
+        # Year 2020 is revised and later years are appended
+        rows = raw_data[raw_data.iloc[:, 0] >= 2019].copy()
+        rows.iloc[1, 1] += 10.0
+        updated_all_rainfall, changed_years = all_rainfall.apply_update(rows)
+        expected_raw_data = raw_data.copy()
+        expected_raw_data.loc[rows.index[1], expected_raw_data.columns[1]] += 10.0
+        expected_raw_data.to_csv(tmp_path / "expected.csv", index=False)
+        expected_all_rainfall = AllRainfall(
+            str(tmp_path / "expected.csv"),
+            start_year=ALL_RAINFALL.starting_year,
+            round_precision=ALL_RAINFALL.round_precision,
+        )
+
+        assert changed_years == (2020, ALL_RAINFALL.get_last_year())
+        assert updated_all_rainfall.version == expected_all_rainfall.version
+        assert updated_all_rainfall.shared_dataset is None
+        assert all_rainfall.get_last_year() == 2020
+        for key, model in expected_all_rainfall.get_rainfall_models().items():
+            updated_model = updated_all_rainfall.get_rainfall_models()[key]
+            pd.testing.assert_frame_equal(updated_model.data, model.data)
+            assert updated_model.get_normal(1991) == model.get_normal(1991)
+            assert updated_model.get_average_yearly_rainfall(
+                2000, 2024
+            ) == model.get_average_yearly_rainfall(2000, 2024)
+
+        assert all_rainfall.apply_update(rows.iloc[:1]) == (all_rainfall, None)
+
+        with raises(ValueError):
+            all_rainfall.apply_update(rows.iloc[[0, 0]])
+
+        with raises(ValueError):
+            all_rainfall.apply_update(rows.iloc[:1].assign(**{rows.columns[0]: 1700}))
+
+        # Year 2021 is missing between the last year and appended ones
+        with raises(ValueError):
+            all_rainfall.apply_update(rows.iloc[3:])
+
+        with raises(ValueError):
+            all_rainfall.apply_update(rows.iloc[:1].assign(**{rows.columns[0]: 2022}))
+
+    @staticmethod
+    def test_get_rainfall_models():
+        rainfall_models = ALL_RAINFALL.get_rainfall_models()
+
+        assert len(rainfall_models) == 1 + len(Month) + len(Season)
+        assert rainfall_models[TimeMode.YEARLY.value] is ALL_RAINFALL.yearly_rainfall
+        assert all(
+            isinstance(model, YearlyRainfall) for model in rainfall_models.values()
+        )
+
+    @staticmethod
+    def test_get_trend_tests():
+        trend_tests = ALL_RAINFALL.get_trend_tests(begin_year, end_year)
+
+        assert list(trend_tests.index) == list(ALL_RAINFALL.get_rainfall_models())
+        assert trend_tests.loc[
+            TimeMode.YEARLY.value, Label.LINEAR_REGRESSION.value
+        ] == approx(
+            ALL_RAINFALL.yearly_rainfall.get_linear_regression(begin_year, end_year)[0][
+                1
+            ]
+        )
+        assert trend_tests[Label.P_VALUE.value].between(0, 1).all()
+
+    @staticmethod
+    def test_get_change_points():
+        change_points = ALL_RAINFALL.get_change_points(
+            begin_year, end_year, penalty_factors=(0.5, 2.0)
+        )
+
+        assert list(change_points.index.unique()) == list(
+            ALL_RAINFALL.get_rainfall_models()
+        )
+        assert set(change_points[Label.PENALTY_FACTOR.value]) == {0.5, 2.0}
+        assert (
+            change_points[Label.BEGIN_YEAR.value] <= change_points[Label.END_YEAR.value]
+        ).all()
+
+        yearly_change_points = change_points.loc[TimeMode.YEARLY.value]
+        yearly_segments = ALL_RAINFALL.yearly_rainfall.get_change_points(
+            begin_year, end_year, penalty_factor=0.5
+        )
+
+        assert (
+            yearly_segments.values
+            == yearly_change_points[
+                yearly_change_points[Label.PENALTY_FACTOR.value] == 0.5
+            ]
+            .drop(columns=Label.PENALTY_FACTOR.value)
+            .values
+        ).all()
+
+        figure = ALL_RAINFALL.get_bar_figure_of_rainfall_according_to_year(
+            TimeMode.SEASONAL,
+            begin_year=begin_year,
+            end_year=end_year,
+            season=Season.FALL,
+            plot_change_points=True,
+        )
+
+        assert figure is not None
+        assert len(figure.data) == 2
+
+    @staticmethod
+    def test_get_confidence_interval():
+        average = ALL_RAINFALL.get_rainfall_average(
+            TimeMode.MONTHLY, begin_year=begin_year, end_year=end_year, month=Month.MAY
+        )
+        confidence_interval = ALL_RAINFALL.get_confidence_interval(
+            Statistic.AVERAGE,
+            TimeMode.MONTHLY,
+            begin_year=begin_year,
+            end_year=end_year,
+            month=Month.MAY,
+        )
+
+        assert confidence_interval is not None
+        assert confidence_interval[0] < average < confidence_interval[1]  # type: ignore
+        # Memoized per query
+        assert confidence_interval == ALL_RAINFALL.get_confidence_interval(
+            Statistic.AVERAGE,
+            TimeMode.MONTHLY,
+            begin_year=begin_year,
+            end_year=end_year,
+            month=Month.MAY,
+        )
+
+        slope = ALL_RAINFALL.yearly_rainfall.get_linear_regression(
+            begin_year, end_year
+        )[0][1]
+        lower_bound, upper_bound = ALL_RAINFALL.yearly_rainfall.get_confidence_interval(
+            Statistic.LINEAR_REGRESSION, begin_year, end_year
+        )
+
+        assert lower_bound < slope < upper_bound
+
+    @staticmethod
+    def test_get_return_levels():
+        return_levels = ALL_RAINFALL.get_return_levels(
+            TimeMode.SEASONAL,
+            begin_year=begin_year,
+            end_year=end_year,
+            season=Season.FALL,
+            replicates=200,
+        )
+
+        assert return_levels is not None
+        assert return_levels[Label.RETURN_PERIOD.value].tolist() == [10, 50, 100]
+        assert (
+            return_levels[Label.LOWER_BOUND.value]
+            <= return_levels[Label.RETURN_LEVEL.value]
+        ).all()
+        assert (
+            return_levels[Label.RETURN_LEVEL.value]
+            <= return_levels[Label.UPPER_BOUND.value]
+        ).all()
+        assert len(ALL_RAINFALL.return_levels_by_key) > 0
+
+        # Maxima of a single month are those of its monthly rainfall
+        assert (
+            ALL_RAINFALL.get_return_levels(
+                TimeMode.MONTHLY,
+                begin_year=begin_year,
+                end_year=end_year,
+                month=Month.MAY,
+                replicates=200,
+            )
+            is not None
+        )
+
+        rows = ALL_RAINFALL.raw_data.iloc[-1:]
+        updated_all_rainfall, _ = ALL_RAINFALL.apply_update(
+            rows.assign(**{rows.columns[6]: 0.0})
+        )
+
+        assert updated_all_rainfall.return_levels_by_key == {}
+
+    @staticmethod
+    def test_get_return_levels_memoizes_latest():
+        all_rainfall = AllRainfall.from_raw_data(
+            ALL_RAINFALL.raw_data,
+            start_year=ALL_RAINFALL.starting_year,
+            round_precision=ALL_RAINFALL.round_precision,
+        )
+        for replicates in range(100, 100 + MAX_MEMOIZED_RETURN_LEVELS + 2):
+            all_rainfall.get_return_levels(
+                TimeMode.YEARLY,
+                begin_year=1991,
+                end_year=2020,
+                distribution=Distribution.GUMBEL,
+                replicates=replicates,
+            )
+            # Memoized values in use are kept
+            all_rainfall.get_return_levels(
+                TimeMode.YEARLY,
+                begin_year=1991,
+                end_year=2020,
+                distribution=Distribution.GUMBEL,
+                replicates=100,
+            )
+
+        replicates_memoized = [key[-1] for key in all_rainfall.return_levels_by_key]
+
+        assert len(replicates_memoized) == MAX_MEMOIZED_RETURN_LEVELS
+        assert replicates_memoized[-1] == 100
+        assert 101 not in replicates_memoized
+        assert 102 not in replicates_memoized
+
+    @staticmethod
+    def test_memory_report():
+        all_rainfall = AllRainfall.from_raw_data(
+            ALL_RAINFALL.raw_data,
+            start_year=ALL_RAINFALL.starting_year,
+            round_precision=ALL_RAINFALL.round_precision,
+        )
+        memory_report = all_rainfall.memory_report()
+
+        assert memory_report["raw_data"] > 0
+        assert len(memory_report["models"]) == 1 + len(Month) + len(Season)
+        assert memory_report["window_models"] == {}
+        assert memory_report["spi"] == memory_report["return_levels"] == 0
+        assert memory_report["total"] == memory_report["raw_data"] + sum(
+            model_report["total"] for model_report in memory_report["models"].values()
+        )
+
+        all_rainfall.get_rainfall_average(
+            TimeMode.YEARLY, begin_year=1991, end_year=2020
+        )
+        all_rainfall.get_standardized_precipitation_index(
+            12, normal_year=1991, begin_year=1991, end_year=2020
+        )
+        all_rainfall.get_return_levels(
+            TimeMode.SEASONAL,
+            begin_year=1991,
+            end_year=2020,
+            window=MonthWindow.from_months(Month.OCTOBER, Month.SEPTEMBER),
+            replicates=100,
+        )
+        updated_memory_report = all_rainfall.memory_report()
+
+        assert (
+            updated_memory_report["models"]["yearly"]["accumulators"]
+            == all_rainfall.yearly_rainfall.accumulators.nbytes
+        )
+        assert list(updated_memory_report["window_models"]) == ["October-September"]
+        assert (
+            updated_memory_report["cumulative_rainfall"]
+            == all_rainfall.cumulative_rainfall.nbytes
+        )
+        assert updated_memory_report["spi"] > 0
+        assert updated_memory_report["return_levels"] > 0
+        assert updated_memory_report["total"] == (
+            memory_report["total"]
+            + updated_memory_report["models"]["yearly"]["accumulators"]
+            + updated_memory_report["window_models"]["October-September"]["total"]
+            + updated_memory_report["cumulative_rainfall"]
+            + updated_memory_report["spi"]
+            + updated_memory_report["return_levels"]
+        )
+
     @staticmethod
     def test_get_entity_for_time_mode():
         assert isinstance(
@@ -153,4 +478,81 @@ class TestAllRainfall:
             ALL_RAINFALL.get_entity_for_time_mode(TimeMode.MONTHLY, month=month),
             MonthlyRainfall,
         )
+        assert isinstance(
+            ALL_RAINFALL.get_entity_for_time_mode(
+                TimeMode.SEASONAL, season=season, window=HYDROLOGICAL_YEAR
+            ),
+            WindowRainfall,
+        )
         assert ALL_RAINFALL.get_entity_for_time_mode("unknown_time_mode") is None
+
+    @staticmethod
+    def test_get_rolling_rainfall():
+        rolling_rainfall = ALL_RAINFALL.get_rolling_rainfall(
+            12, begin_year=begin_year, end_year=end_year
+        )
+
+        assert len(rolling_rainfall) == (end_year - begin_year + 1) * len(Month)
+        assert rolling_rainfall.columns.tolist() == [
+            Label.YEAR.value,
+            Label.MONTH.value,
+            Label.RAINFALL.value,
+        ]
+        # 12 months until December are the whole year
+        december = rolling_rainfall[rolling_rainfall[Label.MONTH.value] == "December"]
+
+        assert (
+            december[Label.RAINFALL.value].tolist()
+            == ALL_RAINFALL.yearly_rainfall.get_yearly_rainfall(begin_year, end_year)[
+                Label.RAINFALL.value
+            ].tolist()
+        )
+
+    @staticmethod
+    def test_get_standardized_precipitation_index():
+        spi = ALL_RAINFALL.get_standardized_precipitation_index(
+            3, normal_year=normal_year, begin_year=begin_year, end_year=end_year
+        )
+
+        assert len(spi) == (end_year - begin_year + 1) * len(Month)
+        assert spi.columns.tolist() == [
+            Label.YEAR.value,
+            Label.MONTH.value,
+            Label.STANDARDIZED_PRECIPITATION_INDEX.value,
+        ]
+        assert spi[Label.STANDARDIZED_PRECIPITATION_INDEX.value].abs().max() <= 3.09
+        assert (3, normal_year) in ALL_RAINFALL.spi_by_key
+
+        # Updated data is not fitted upon memoized distributions
+        rows = ALL_RAINFALL.raw_data.iloc[-1:]
+        updated_all_rainfall, _ = ALL_RAINFALL.apply_update(
+            rows.assign(**{rows.columns[6]: 0.0})
+        )
+
+        assert updated_all_rainfall.spi_by_key == {}
+
+    @staticmethod
+    def test_get_standardized_precipitation_index_memoizes_latest():
+        all_rainfall = AllRainfall.from_raw_data(
+            ALL_RAINFALL.raw_data,
+            start_year=ALL_RAINFALL.starting_year,
+            round_precision=ALL_RAINFALL.round_precision,
+        )
+        for months in range(1, MAX_MEMOIZED_SPI + 3):
+            all_rainfall.get_standardized_precipitation_index(
+                months,
+                normal_year=normal_year,
+                begin_year=begin_year,
+                end_year=end_year,
+            )
+            # Memoized values in use are kept
+            all_rainfall.get_standardized_precipitation_index(
+                1, normal_year=normal_year, begin_year=begin_year, end_year=end_year
+            )
+
+        months_memoized = [months for months, _ in all_rainfall.spi_by_key]
+
+        assert len(months_memoized) == MAX_MEMOIZED_SPI
+        assert months_memoized[-1] == 1
+        assert 2 not in months_memoized
+        assert 3 not in months_memoized
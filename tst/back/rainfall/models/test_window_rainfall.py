@@ -0,0 +1,112 @@
+import pandas as pd
+from pytest import raises
+
+from back.rainfall import AllRainfall
+from back.rainfall.models import WindowRainfall
+from back.rainfall.utils import DataFormatError, Label, Month, Season, TimeMode
+from back.rainfall.utils.month_windows import HYDROLOGICAL_YEAR, MonthWindow
+from tst.back.rainfall.models.test_all_rainfall import (
+    ALL_RAINFALL,
+    begin_year,
+    end_year,
+)
+
+
+def get_raw_rainfall(month: Month) -> pd.Series:
+    raw_data = ALL_RAINFALL.raw_data
+
+    return raw_data.set_index(raw_data.columns[0]).iloc[:, month.get_rank() - 1]
+
+
+class TestWindowRainfall:
+    @staticmethod
+    def test_load_yearly_rainfall():
+        window_rainfall = ALL_RAINFALL.get_window_rainfall(HYDROLOGICAL_YEAR)
+        data = window_rainfall.get_yearly_rainfall(begin_year, end_year)
+        expected = sum(
+            get_raw_rainfall(month).shift(1 if month.get_rank() >= 10 else 0)
+            for month in HYDROLOGICAL_YEAR.get_months()
+        )
+
+        assert ALL_RAINFALL.get_window_rainfall(HYDROLOGICAL_YEAR) is window_rainfall
+        assert len(data) == end_year - begin_year + 1
+        assert (
+            data[Label.RAINFALL.value].tolist()
+            == expected.loc[begin_year:end_year].round(1).tolist()
+        )
+
+    @staticmethod
+    def test_winter_begins_in_former_december():
+        winter = ALL_RAINFALL.seasonal_rainfalls[Season.WINTER.value]
+        expected = (
+            get_raw_rainfall(Month.DECEMBER).shift(1)
+            + get_raw_rainfall(Month.JANUARY)
+            + get_raw_rainfall(Month.FEBRUARY)
+        )
+
+        assert (
+            winter.get_yearly_rainfall(begin_year, end_year)[
+                Label.RAINFALL.value
+            ].tolist()
+            == expected.loc[begin_year:end_year].round(1).tolist()
+        )
+        assert ALL_RAINFALL.get_rainfall_average(
+            TimeMode.SEASONAL,
+            begin_year=begin_year,
+            end_year=end_year,
+            window=MonthWindow.from_months(Month.DECEMBER, Month.FEBRUARY),
+        ) == ALL_RAINFALL.get_rainfall_average(
+            TimeMode.SEASONAL,
+            begin_year=begin_year,
+            end_year=end_year,
+            season=Season.WINTER,
+        )
+
+    @staticmethod
+    def test_apply_update():
+        raw_data = ALL_RAINFALL.raw_data.iloc[:, :13]
+        all_rainfall = AllRainfall.from_raw_data(
+            raw_data,
+            start_year=ALL_RAINFALL.starting_year,
+            round_precision=ALL_RAINFALL.round_precision,
+        )
+        all_rainfall.get_window_rainfall(HYDROLOGICAL_YEAR)
+
+        # December 2010 belongs to winter and hydrological year 2011
+        rows = raw_data[raw_data.iloc[:, 0] == 2010].copy()
+        rows.iloc[0, 12] += 100.0
+        updated_all_rainfall, changed_years = all_rainfall.apply_update(rows)
+        expected_all_rainfall = AllRainfall.from_raw_data(
+            updated_all_rainfall.raw_data,
+            start_year=ALL_RAINFALL.starting_year,
+            round_precision=ALL_RAINFALL.round_precision,
+        )
+
+        assert changed_years == (2010, 2011)
+        for window in [HYDROLOGICAL_YEAR, MonthWindow(Month.FEBRUARY, 3)]:
+            pd.testing.assert_frame_equal(
+                updated_all_rainfall.get_window_rainfall(window).data,
+                expected_all_rainfall.get_window_rainfall(window).data,
+            )
+
+    @staticmethod
+    def test_load_rainfall_fails_because_data_format_error():
+        with raises(DataFormatError):
+            WindowRainfall(
+                pd.DataFrame(),
+                HYDROLOGICAL_YEAR,
+                start_year=ALL_RAINFALL.starting_year,
+                round_precision=ALL_RAINFALL.round_precision,
+            )
+
+    @staticmethod
+    def test_get_bar_figure_of_rainfall_according_to_year():
+        figure = ALL_RAINFALL.get_bar_figure_of_rainfall_according_to_year(
+            TimeMode.SEASONAL,
+            begin_year=begin_year,
+            end_year=end_year,
+            window=HYDROLOGICAL_YEAR,
+        )
+
+        assert figure is not None
+        assert "October-September" in figure.layout.title.text
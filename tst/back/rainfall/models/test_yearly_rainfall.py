@@ -204,6 +204,17 @@ class TestYearlyRainfall:
         )
         assert isinstance(bar_fig, go.Figure)
 
+        bar_fig = YEARLY_RAINFALL.get_bar_figure_of_rainfall_according_to_year(
+            begin_year,
+            end_year,
+            plot_average=True,
+            plot_linear_regression=True,
+            max_points=10,
+        )
+        assert isinstance(bar_fig, go.Figure)
+        assert all(len(trace.x) <= 10 for trace in bar_fig.data)
+        assert bar_fig.layout.meta["decimation_ratio"] >= 1.0
+
         scatter_fig = YEARLY_RAINFALL.get_scatter_figure_of_linear_regression(
             begin_year, end_year
         )
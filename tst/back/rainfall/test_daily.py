@@ -0,0 +1,120 @@
+import numpy as np
+import pandas as pd
+from pytest import raises
+
+from back.rainfall import AllRainfall
+from back.rainfall.daily import DailyRainfall
+from back.rainfall.utils import DataFormatError, Label, Month, TimeMode
+
+DAYS = np.arange(np.datetime64("2000-03-01"), np.datetime64("2003-01-01"))
+RAINFALL = np.random.default_rng(0).gamma(0.3, 8.0, len(DAYS)).round(1)
+
+
+def get_daily_rainfall() -> DailyRainfall:
+    return DailyRainfall(DAYS, RAINFALL)
+
+
+class TestDailyRainfall:
+    @staticmethod
+    def test_get_monthly_rainfall():
+        daily_rainfall = get_daily_rainfall()
+        expected = (
+            pd.Series(RAINFALL, index=pd.DatetimeIndex(DAYS)).resample("MS").sum()
+        )
+        monthly_rainfall = daily_rainfall.get_monthly_rainfall()
+
+        assert monthly_rainfall.shape == (3, 12)
+        # Months before the first day are missing
+        assert np.isnan(monthly_rainfall[0, :2]).all()
+        assert np.allclose(monthly_rainfall.ravel()[2:], expected.to_numpy())
+
+    @staticmethod
+    def test_missing_days():
+        daily_rainfall = DailyRainfall(np.delete(DAYS, 40), np.delete(RAINFALL, 40))
+
+        # 40 days after March 1st is in April 2000
+        monthly_rainfall = daily_rainfall.get_monthly_rainfall()
+
+        assert np.isnan(monthly_rainfall[0, 3])
+        assert not np.isnan(monthly_rainfall[0, 4])
+
+    @staticmethod
+    def test_to_raw_data():
+        raw_data = get_daily_rainfall().to_raw_data()
+
+        assert list(raw_data.columns) == [
+            Label.YEAR.value,
+            *(month.value for month in Month),
+        ]
+        assert raw_data[Label.YEAR.value].tolist() == [2000, 2001, 2002]
+
+        all_rainfall = AllRainfall.from_raw_data(
+            raw_data, start_year=2001, round_precision=1
+        )
+
+        assert all_rainfall.get_rainfall_average(
+            TimeMode.YEARLY, begin_year=2001, end_year=2002
+        ) == round(RAINFALL[DAYS >= np.datetime64("2001-01-01")].sum() / 2, 1)
+
+    @staticmethod
+    def test_get_max_daily_rainfall():
+        daily_rainfall = get_daily_rainfall()
+        max_daily_rainfall = daily_rainfall.get_max_daily_rainfall(begin_year=2001)
+        is_2001 = (DAYS >= np.datetime64("2001-01-01")) & (
+            DAYS < np.datetime64("2002-01-01")
+        )
+
+        assert max_daily_rainfall[Label.YEAR.value].tolist() == [2001, 2002]
+        assert (
+            max_daily_rainfall[Label.MAX_DAILY_RAINFALL.value].iloc[0]
+            == RAINFALL[is_2001].max()
+        )
+
+        january = daily_rainfall.get_max_daily_rainfall(month=Month.JANUARY)
+
+        assert np.isnan(january[Label.MAX_DAILY_RAINFALL.value].iloc[0])
+        assert (
+            january[Label.MAX_DAILY_RAINFALL.value].iloc[1]
+            == RAINFALL[is_2001][:31].max()
+        )
+
+    @staticmethod
+    def test_get_rainy_days():
+        rainy_days = get_daily_rainfall().get_rainy_days(end_year=2000, threshold=0.1)
+
+        assert rainy_days[Label.RAINY_DAYS.value].tolist() == [
+            int((RAINFALL[DAYS < np.datetime64("2001-01-01")] >= 0.1).sum())
+        ]
+
+    @staticmethod
+    def test_from_csv(tmp_path):
+        csv_path = tmp_path / "daily.csv"
+        pd.DataFrame({"Date": DAYS.astype(str), "Rainfall": RAINFALL}).to_csv(
+            csv_path, index=False
+        )
+
+        daily_rainfall = DailyRainfall.from_csv(csv_path, chunk_rows=100)
+
+        assert np.array_equal(
+            daily_rainfall.get_monthly_rainfall(),
+            get_daily_rainfall().get_monthly_rainfall(),
+            equal_nan=True,
+        )
+
+        pd.DataFrame({"Date": ["yesterday"], "Rainfall": [1.0]}).to_csv(
+            csv_path, index=False
+        )
+        with raises(DataFormatError):
+            DailyRainfall.from_csv(csv_path)
+
+        pd.DataFrame(
+            {"Date": ["2000-01-01", None, "2000-01-03"], "Rainfall": [1.0, 2.0, 3.0]}
+        ).to_csv(csv_path, index=False)
+        with raises(DataFormatError):
+            DailyRainfall.from_csv(csv_path)
+
+        with raises(DataFormatError):
+            DailyRainfall(
+                np.array(["2000-01-01", "NaT"], dtype="datetime64[D]"),
+                np.array([1.0, 2.0]),
+            )
@@ -0,0 +1,131 @@
+import numpy as np
+import pandas as pd
+from pytest import approx, raises
+
+from back.rainfall import AllRainfall
+from back.rainfall.ingestion import (
+    IngestionProgress,
+    StationMatrix,
+    ingest_multi_station_csv,
+)
+from back.rainfall.utils import DataFormatError, TimeMode
+from tst.back.rainfall.models.test_all_rainfall import ALL_RAINFALL
+
+
+def get_multi_station_data() -> pd.DataFrame:
+    raw_data = ALL_RAINFALL.raw_data
+    wetter_raw_data = raw_data.copy()
+    wetter_raw_data.iloc[:, 1:] *= 2
+
+    return pd.concat(
+        [
+            raw_data.assign(Station="barcelona"),
+            wetter_raw_data.assign(Station="montseny"),
+        ]
+    )[["Station", *raw_data.columns]]
+
+
+def ingest(tmp_path, data: pd.DataFrame, **kwargs):
+    csv_path = tmp_path / "stations.csv"
+    data.to_csv(csv_path, index=False)
+    progresses: list[IngestionProgress] = []
+
+    paths = ingest_multi_station_csv(
+        csv_path,
+        tmp_path / "stations",
+        start_year=ALL_RAINFALL.starting_year,
+        round_precision=ALL_RAINFALL.round_precision,
+        chunk_rows=50,
+        on_progress=progresses.append,
+        **kwargs,
+    )
+
+    return paths, progresses
+
+
+def test_station_matrix():
+    matrix = StationMatrix()
+    matrix.put(np.array([2001, 2000]), np.arange(24.0).reshape(2, 12))
+    matrix.put(np.array([1990, 2003]), np.array([5.0, 7.0]), months=np.array([0, 11]))
+
+    raw_data = matrix.get_raw_data(["Year", *(str(month) for month in range(12))])
+
+    assert raw_data["Year"].tolist() == [1990, 2000, 2001, 2003]
+    assert raw_data["0"].tolist()[:3] == [5.0, 12.0, 0.0]
+    assert raw_data["11"].iloc[-1] == 7.0
+    assert np.isnan(raw_data["0"].iloc[-1])
+
+
+class TestIngestMultiStationCsv:
+    @staticmethod
+    def test_wide(tmp_path):
+        data = get_multi_station_data()
+        # Rows of stations are interleaved
+        paths, progresses = ingest(tmp_path, data.sample(frac=1.0, random_state=0))
+
+        assert sorted(paths) == ["barcelona", "montseny"]
+        all_rainfall = AllRainfall.from_shared_dataset(paths["barcelona"])
+
+        assert all_rainfall.version == ALL_RAINFALL.version
+        assert AllRainfall.from_shared_dataset(paths["montseny"]).get_rainfall_average(
+            TimeMode.YEARLY, begin_year=1991, end_year=2020
+        ) == approx(
+            2
+            * ALL_RAINFALL.get_rainfall_average(
+                TimeMode.YEARLY, begin_year=1991, end_year=2020
+            ),
+            abs=0.2,
+        )
+
+        assert len(progresses) == -(-len(data) // 50) + 1
+        assert progresses[-1].rows == len(data)
+        assert progresses[-1].fraction == 1.0
+        assert progresses[-1].rows_per_second > 0
+        assert (progresses[-2].written_stations, progresses[-1].written_stations) == (
+            0,
+            2,
+        )
+
+    @staticmethod
+    def test_long(tmp_path):
+        data = get_multi_station_data()
+        long_data = data.melt(
+            id_vars=list(data.columns[:2]), var_name="Month", value_name="Rainfall"
+        )
+        long_data["Month"] = long_data["Month"].map(
+            {column: rank for rank, column in enumerate(data.columns[2:], start=1)}
+        )
+        paths, _ = ingest(tmp_path, long_data)
+
+        raw_data = AllRainfall.from_shared_dataset(paths["barcelona"]).raw_data
+
+        assert (
+            raw_data.iloc[:, 1:].to_numpy() == ALL_RAINFALL.raw_data.iloc[:, 1:]
+        ).all(axis=None)
+
+    @staticmethod
+    def test_sorted_by_station(tmp_path):
+        data = get_multi_station_data()
+        paths, progresses = ingest(tmp_path, data, sorted_by_station=True)
+
+        assert list(paths) == ["barcelona", "montseny"]
+        # First station is written as soon as rows of the second one arrive
+        assert progresses[len(ALL_RAINFALL.raw_data) // 50 + 1].written_stations == 1
+
+        with raises(DataFormatError):
+            ingest(
+                tmp_path, data.sample(frac=1.0, random_state=0), sorted_by_station=True
+            )
+
+    @staticmethod
+    def test_invalid(tmp_path):
+        data = get_multi_station_data()
+
+        with raises(DataFormatError):
+            ingest(tmp_path, data.iloc[:, :5])
+
+        with raises(DataFormatError):
+            ingest(tmp_path, data.assign(Station="../barcelona"))
+
+        with raises(DataFormatError):
+            ingest(tmp_path, data.astype({data.columns[1]: float}).assign(Any=0.5))
@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+from pytest import approx, raises
+
+from back.rainfall import AllRainfall
+from back.rainfall.shared_dataset import SharedDataset, write_shared_dataset
+from back.rainfall.utils import Label
+from tst.back.rainfall.models.test_all_rainfall import ALL_RAINFALL
+
+
+class TestSharedDataset:
+    @staticmethod
+    def test_write_and_attach(tmp_path):
+        path = write_shared_dataset(ALL_RAINFALL, tmp_path / "rainfall.bin")
+        shared_dataset = SharedDataset(path)
+
+        assert shared_dataset.version == ALL_RAINFALL.version
+        assert shared_dataset.start_year == ALL_RAINFALL.starting_year
+        assert shared_dataset.round_precision == ALL_RAINFALL.round_precision
+        assert shared_dataset.series_keys == list(ALL_RAINFALL.get_rainfall_models())
+        assert not list(tmp_path.glob("*.tmp"))
+
+        pd.testing.assert_frame_equal(
+            shared_dataset.get_raw_data(), ALL_RAINFALL.raw_data
+        )
+        for key, model in ALL_RAINFALL.get_rainfall_models().items():
+            data = shared_dataset.get_data(key)
+
+            pd.testing.assert_frame_equal(data, model.load_yearly_rainfall())
+            assert np.shares_memory(
+                data[Label.RAINFALL.value].to_numpy(), shared_dataset.series
+            )
+
+        for array in shared_dataset.arrays.values():
+            assert not array.flags.writeable
+
+    @staticmethod
+    def test_get_accumulators(tmp_path):
+        shared_dataset = SharedDataset(
+            write_shared_dataset(ALL_RAINFALL, tmp_path / "rainfall.bin")
+        )
+
+        for key, model in ALL_RAINFALL.get_rainfall_models().items():
+            accumulators = shared_dataset.get_accumulators(key)
+
+            assert np.shares_memory(
+                accumulators.prefix_sums, shared_dataset.arrays["prefix_sums"]
+            )
+            assert (accumulators.years == model.accumulators.years).all()
+            assert accumulators.origin == model.accumulators.origin
+            np.testing.assert_array_equal(
+                accumulators.prefix_sums, model.accumulators.prefix_sums
+            )
+            np.testing.assert_array_equal(
+                accumulators.normals, model.accumulators.normals
+            )
+            # Missing values are skipped, as by models
+            assert accumulators.get_average(1991, 2020) == approx(
+                model.data.set_index(Label.YEAR.value)[Label.RAINFALL.value]
+                .loc[1991:2020]
+                .mean()
+            )
+
+    @staticmethod
+    def test_swap(tmp_path):
+        path = write_shared_dataset(ALL_RAINFALL, tmp_path / "rainfall.bin")
+        shared_dataset = SharedDataset(path)
+        series = shared_dataset.series.copy()
+
+        assert not shared_dataset.is_stale()
+
+        csv_path = tmp_path / "rainfall.csv"
+        raw_data = ALL_RAINFALL.raw_data.copy()
+        raw_data.iloc[:, 1:] += 1.0
+        raw_data.to_csv(csv_path, index=False)
+        write_shared_dataset(
+            AllRainfall(
+                str(csv_path),
+                start_year=ALL_RAINFALL.starting_year,
+                round_precision=ALL_RAINFALL.round_precision,
+            ),
+            path,
+        )
+
+        # Attached dataset keeps reading the former file
+        assert shared_dataset.is_stale()
+        assert (shared_dataset.series == series).all()
+
+        new_shared_dataset = SharedDataset(path)
+
+        assert not new_shared_dataset.is_stale()
+        assert new_shared_dataset.version != shared_dataset.version
+        assert (new_shared_dataset.series > series).all()
+
+    @staticmethod
+    def test_attach_invalid_file(tmp_path):
+        path = tmp_path / "rainfall.csv"
+        ALL_RAINFALL.raw_data.to_csv(path, index=False)
+
+        with raises(ValueError):
+            SharedDataset(path)
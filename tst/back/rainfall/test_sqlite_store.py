@@ -0,0 +1,90 @@
+from pytest import fixture, raises
+
+from back.rainfall.sqlite_store import SQLiteRainfallStore
+from back.rainfall.utils import Month, Season, TimeMode
+from tst.back.rainfall.models.test_all_rainfall import ALL_RAINFALL
+
+STATION = "barcelona"
+TIME_MODES = [
+    (TimeMode.YEARLY, None, None),
+    *((TimeMode.MONTHLY, month, None) for month in Month),
+    *((TimeMode.SEASONAL, None, season) for season in Season),
+]
+YEAR_RANGES = [(1971, 2000), (1991, 2020), (1995, 2024), (2010, 2012)]
+
+
+@fixture
+def store(tmp_path):
+    store = SQLiteRainfallStore(
+        tmp_path / "rainfall.db", round_precision=ALL_RAINFALL.round_precision
+    )
+    store.insert_raw_data(STATION, ALL_RAINFALL.raw_data)
+    yield store
+    store.close()
+
+
+class TestSQLiteRainfallStore:
+    @staticmethod
+    def test_insert_and_get_raw_data(store):
+        assert store.get_stations() == [STATION]
+        # Inserting again replaces stored rows
+        assert store.insert_raw_data(STATION, ALL_RAINFALL.raw_data.iloc[-2:]) == 24
+
+        all_rainfall = store.get_all_rainfall(
+            STATION, start_year=ALL_RAINFALL.starting_year
+        )
+
+        assert all_rainfall.version == ALL_RAINFALL.version
+
+        with raises(KeyError):
+            store.get_raw_data("girona")
+
+    @staticmethod
+    def test_match_models_in_memory(store):
+        for time_mode, month, season in TIME_MODES:
+            entity = ALL_RAINFALL.get_entity_for_time_mode(time_mode, month, season)
+            assert entity is not None
+
+            for begin_year, end_year in YEAR_RANGES:
+                arguments = dict(
+                    begin_year=begin_year, end_year=end_year, month=month, season=season
+                )
+
+                assert store.get_rainfall_average(
+                    STATION, time_mode, **arguments
+                ) == ALL_RAINFALL.get_rainfall_average(time_mode, **arguments)
+                assert store.get_years_above_normal(
+                    STATION, time_mode, normal_year=1971, **arguments
+                ) == entity.get_years_above_normal(1971, begin_year, end_year)
+                assert store.get_rainfall_sum(STATION, time_mode, **arguments) == round(
+                    entity.get_yearly_rainfall(begin_year, end_year)["Rainfall"].sum(),
+                    ALL_RAINFALL.round_precision,
+                )
+                assert store.get_yearly_rainfall(
+                    STATION, time_mode, **arguments
+                ).equals(
+                    entity.get_yearly_rainfall(begin_year, end_year)[
+                        ["Year", "Rainfall"]
+                    ].reset_index(drop=True)
+                )
+
+            assert store.get_normal(
+                STATION, time_mode, begin_year=1981, month=month, season=season
+            ) == ALL_RAINFALL.get_normal(
+                time_mode, begin_year=1981, month=month, season=season
+            )
+
+    @staticmethod
+    def test_missing_month_or_season(store):
+        assert (
+            store.get_rainfall_average(
+                STATION, TimeMode.MONTHLY, begin_year=1991, end_year=2020
+            )
+            is None
+        )
+        assert (
+            store.get_years_above(
+                STATION, TimeMode.SEASONAL, 100.0, begin_year=1991, end_year=2020
+            )
+            is None
+        )
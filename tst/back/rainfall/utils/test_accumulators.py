@@ -0,0 +1,105 @@
+import numpy as np
+from pytest import approx, raises
+
+from back.rainfall.utils.accumulators import (
+    RainfallAccumulators,
+    is_near_rounding_tie,
+)
+from tst.back.rainfall.models.test_all_rainfall import ALL_RAINFALL
+
+YEARS = np.arange(1900, 2000)
+RAINFALL = np.random.default_rng(0).gamma(4.0, 150.0, len(YEARS))
+
+
+class TestRainfallAccumulators:
+    @staticmethod
+    def test_get_average():
+        accumulators = RainfallAccumulators(YEARS, RAINFALL)
+
+        assert not accumulators.prefix_sums.flags.writeable
+        assert accumulators.get_average(1920, 1950) == approx(RAINFALL[20:51].mean())
+        assert accumulators.get_average(1800, 1910) == approx(RAINFALL[:11].mean())
+        assert np.isnan(accumulators.get_average(2001, 2010))
+
+    @staticmethod
+    def test_get_normal():
+        accumulators = RainfallAccumulators(YEARS, RAINFALL)
+
+        assert accumulators.get_normal(1931) == approx(RAINFALL[31:61].mean())
+        assert accumulators.get_normal(1990) == approx(RAINFALL[90:].mean())
+        assert accumulators.get_normal(1890) == approx(RAINFALL[:20].mean())
+
+    @staticmethod
+    def test_skip_missing_rainfall():
+        rainfall = RAINFALL.copy()
+        rainfall[[3, 5]] = np.nan
+        accumulators = RainfallAccumulators(YEARS, rainfall)
+
+        assert accumulators.get_average(1900, 1910) == approx(np.nanmean(rainfall[:11]))
+
+    @staticmethod
+    def test_get_linear_regression():
+        accumulators = RainfallAccumulators(YEARS, RAINFALL)
+        slope, intercept = np.polyfit(YEARS[10:60], RAINFALL[10:60], 1)
+        r2 = np.corrcoef(YEARS[10:60], RAINFALL[10:60])[0, 1] ** 2
+
+        assert accumulators.get_linear_regression(1910, 1959) == approx(
+            (slope, intercept, r2)
+        )
+        assert accumulators.get_linear_regression(1910, 1910) is None
+
+    @staticmethod
+    def test_get_linear_regression_matrices():
+        rainfall = RAINFALL.copy()
+        rainfall[[13, 14]] = np.nan
+        accumulators = RainfallAccumulators(YEARS, rainfall)
+        years, slopes, r2 = accumulators.get_linear_regression_matrices(1910, 1959)
+
+        assert list(years) == list(range(1910, 1960))
+        assert slopes.shape == r2.shape == (50, 50)
+        for begin, end in [(0, 49), (0, 1), (2, 5), (10, 30), (48, 49)]:
+            assert (slopes[begin, end], r2[begin, end]) == approx(
+                accumulators.get_linear_regression(years[begin], years[end])[::2]  # type: ignore
+            )
+
+        # Below diagonal, single years and years whose rainfall is missing only
+        assert np.isnan(slopes[np.tril_indices(50)]).all()
+        assert np.isnan(r2[np.tril_indices(50)]).all()
+        assert np.isnan(slopes[2, 4]) and np.isnan(slopes[3, 4])
+        assert not np.isnan(slopes[np.triu_indices(50, k=5)]).any()
+
+    @staticmethod
+    def test_update():
+        accumulators = RainfallAccumulators(YEARS[:-5], RAINFALL[:-5])
+        rainfall = RAINFALL.copy()
+        rainfall[[80, 94]] += 100.0
+
+        updated = accumulators.update(
+            YEARS[[80, 94, 95, 96, 97, 98, 99]], rainfall[[80, 94, 95, 96, 97, 98, 99]]
+        )
+        expected = RainfallAccumulators(YEARS, rainfall)
+
+        assert np.allclose(updated.prefix_sums, expected.prefix_sums)
+        assert np.allclose(updated.normals, expected.normals)
+        assert updated.get_normal(1960) == approx(rainfall[60:90].mean())
+        # Former accumulators are left untouched
+        assert accumulators.get_normal(1960) == approx(RAINFALL[60:90].mean())
+
+        with raises(ValueError):
+            accumulators.update(np.array([1850]), np.array([1.0]))
+
+    @staticmethod
+    def test_from_data():
+        data = ALL_RAINFALL.yearly_rainfall.data
+        accumulators = RainfallAccumulators.from_data(data)
+
+        assert accumulators.get_average(1971, 2000) == approx(
+            data[(data["Year"] >= 1971) & (data["Year"] <= 2000)]["Rainfall"].mean()
+        )
+
+
+def test_is_near_rounding_tie():
+    assert is_near_rounding_tie(600.05, 1)
+    assert is_near_rounding_tie(600.5, 0)
+    assert not is_near_rounding_tie(600.04, 1)
+    assert not is_near_rounding_tie(float("nan"), 1)
@@ -0,0 +1,90 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from pytest import approx
+
+from back.rainfall.utils.bootstrap import (
+    BOOTSTRAP_CHUNK_SIZE,
+    Statistic,
+    _get_bootstrap_statistics,
+    get_confidence_intervals,
+    get_confidence_intervals_of_normals,
+    get_resampling_counts,
+)
+
+YEARS = np.arange(1950, 2020)
+RAINFALL = np.random.default_rng(0).gamma(4.0, 150.0, len(YEARS)) + 2.0 * (YEARS - 1950)
+
+
+def test_get_resampling_counts():
+    counts = get_resampling_counts(len(YEARS), 50, np.random.SeedSequence(0))
+
+    assert counts.shape == (50, len(YEARS))
+    assert (counts.sum(axis=1) == len(YEARS)).all()
+
+
+def test_get_bootstrap_statistics():
+    seed_sequence = np.random.SeedSequence(0)
+    indexes = np.random.default_rng(seed_sequence).integers(
+        0, len(YEARS), (5, len(YEARS))
+    )
+
+    # Counts of draws give statistics of replicates drawn one by one
+    assert _get_bootstrap_statistics(
+        YEARS, RAINFALL[np.newaxis], Statistic.AVERAGE, 5, seed_sequence
+    )[0] == approx(RAINFALL[indexes].mean(axis=1))
+    assert _get_bootstrap_statistics(
+        YEARS, RAINFALL[np.newaxis], Statistic.LINEAR_REGRESSION, 5, seed_sequence
+    )[0] == approx(
+        [np.polyfit(YEARS[index], RAINFALL[index], 1)[0] for index in indexes]
+    )
+
+
+def test_get_confidence_intervals():
+    lower_bounds, upper_bounds = get_confidence_intervals(
+        YEARS, RAINFALL, Statistic.AVERAGE
+    )
+
+    assert lower_bounds[0] < RAINFALL.mean() < upper_bounds[0]
+
+    rainfall = RAINFALL.copy()
+    rainfall[3] = np.nan
+    lower_bounds, upper_bounds = get_confidence_intervals(
+        YEARS, rainfall, Statistic.LINEAR_REGRESSION
+    )
+
+    assert lower_bounds[0] < np.polyfit(YEARS, RAINFALL, 1)[0] < upper_bounds[0]
+
+    # Same seeded chunks of replicates whether they are run across an executor or not
+    replicates = BOOTSTRAP_CHUNK_SIZE + 1
+    with ThreadPoolExecutor(2) as executor:
+        assert np.array_equal(
+            get_confidence_intervals(
+                YEARS,
+                RAINFALL,
+                Statistic.AVERAGE,
+                replicates=replicates,
+                executor=executor,
+            ),
+            get_confidence_intervals(
+                YEARS, RAINFALL, Statistic.AVERAGE, replicates=replicates
+            ),
+        )
+
+    assert np.isnan(
+        get_confidence_intervals(YEARS[:1], RAINFALL[:1], Statistic.LINEAR_REGRESSION)
+    ).all()
+
+
+def test_get_confidence_intervals_of_normals():
+    years, normals, lower_bounds, upper_bounds = get_confidence_intervals_of_normals(
+        np.delete(YEARS, 10), np.delete(RAINFALL, 10), replicates=200
+    )
+
+    assert years.tolist() == list(range(1950, 1991))
+    assert normals[0] == approx(np.delete(RAINFALL[:30], 10).mean())
+    assert normals[11] == approx(RAINFALL[11:41].mean())
+    assert (lower_bounds < normals).all()
+    assert (normals < upper_bounds).all()
+
+    assert len(get_confidence_intervals_of_normals(YEARS[:29], RAINFALL[:29])[0]) == 0
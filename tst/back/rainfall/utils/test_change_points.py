@@ -0,0 +1,157 @@
+import numpy as np
+import pandas as pd
+
+from back.rainfall.utils import Label
+from back.rainfall.utils.change_points import (
+    MIN_SEGMENT_YEARS,
+    get_change_points,
+    get_default_penalty,
+    get_segments,
+)
+
+RNG = np.random.default_rng(0)
+RAINFALL = [
+    RNG.gamma(4.0, 150.0, size) + np.where(np.arange(size) < size // 2, 0.0, 400.0)
+    for size in (3, 12, 60, 120)
+]
+
+
+def _get_optimal_partition(
+    rainfall: np.ndarray, penalty: float, min_size=MIN_SEGMENT_YEARS
+) -> tuple[list[int], float]:
+    # Optimal partitioning without pruning, one candidate at a time
+    sums = np.concatenate([[0.0], np.cumsum(rainfall)])
+    squared_sums = np.concatenate([[0.0], np.cumsum(rainfall * rainfall)])
+    costs = np.full(len(rainfall) + 1, np.inf)
+    costs[0] = -penalty
+    last_changes = np.zeros(len(rainfall) + 1, dtype=int)
+    for end in range(min_size, len(rainfall) + 1):
+        for start in range(end - min_size + 1):
+            cost = (
+                costs[start]
+                + squared_sums[end]
+                - squared_sums[start]
+                - (sums[end] - sums[start]) ** 2 / (end - start)
+                + penalty
+            )
+            if cost < costs[end]:
+                costs[end], last_changes[end] = cost, start
+
+    ends: list[int] = []
+    end = len(rainfall)
+    while end > 0:
+        ends.append(end)
+        end = last_changes[end] if end >= min_size else 0
+
+    return ends[::-1], costs[len(rainfall)]
+
+
+def _get_partition_cost(
+    rainfall: np.ndarray, ends: np.ndarray, penalty: float
+) -> float:
+    starts = np.concatenate([[0], ends[:-1]])
+
+    return sum(
+        ((rainfall[start:end] - rainfall[start:end].mean()) ** 2).sum()
+        for start, end in zip(starts, ends)
+    ) + penalty * (len(ends) - 1)
+
+
+def test_get_default_penalty():
+    assert get_default_penalty(np.array([1.0])) == 0.0
+    # Shifts do not inflate variance estimate
+    assert get_default_penalty(RAINFALL[3]) < 2 * RAINFALL[3].var() * np.log(120)
+
+
+def test_get_change_points():
+    penalty_factors = [0.2, 1.0, 5.0]
+    penalties = np.outer(
+        [get_default_penalty(rainfall) for rainfall in RAINFALL], penalty_factors
+    )
+
+    change_points = get_change_points(RAINFALL, penalties)
+
+    assert len(change_points) == len(RAINFALL)
+    for rainfall, row_penalties, ends_by_penalty in zip(
+        RAINFALL, penalties, change_points
+    ):
+        assert len(ends_by_penalty) == len(penalty_factors)
+        for penalty, ends in zip(row_penalties, ends_by_penalty):
+            assert ends.tolist() == _get_optimal_partition(rainfall, penalty)[0]
+            assert ends[-1] == len(rainfall)
+            assert (np.diff(ends) >= MIN_SEGMENT_YEARS).all()
+
+        # The higher the penalty, the fewer changes
+        assert len(ends_by_penalty[0]) >= len(ends_by_penalty[2])
+
+    # Shift in the middle is detected, give or take a few years of noise
+    assert np.abs(change_points[3][1][:-1] - 60).min() <= 3
+
+
+def test_get_change_points_is_optimal():
+    rng = np.random.default_rng(1)
+    for min_size in (1, 2, 5):
+        rainfall = [rng.gamma(4.0, 150.0, size) for size in rng.integers(1, 40, 100)]
+        penalty_factors = [0.25, 1.0, 4.0]
+        penalties = np.outer(
+            [get_default_penalty(values) for values in rainfall], penalty_factors
+        )
+
+        change_points = get_change_points(rainfall, penalties, min_size=min_size)
+
+        for values, row_penalties, ends_by_penalty in zip(
+            rainfall, penalties, change_points
+        ):
+            for penalty, ends in zip(row_penalties, ends_by_penalty):
+                optimal_ends, optimal_cost = _get_optimal_partition(
+                    values, penalty, min_size
+                )
+                if len(values) < min_size:
+                    assert ends.tolist() == optimal_ends
+                    continue
+
+                assert (np.diff(np.concatenate([[0], ends])) >= min_size).all()
+                assert np.isclose(
+                    _get_partition_cost(values, ends, penalty), optimal_cost
+                )
+
+
+def test_get_segments():
+    yearly_rainfall = pd.DataFrame(
+        {
+            Label.YEAR.value: np.arange(1900, 1960),
+            Label.RAINFALL.value: RAINFALL[2],
+        }
+    )
+    yearly_rainfall.loc[3, Label.RAINFALL.value] = np.nan
+
+    segments = get_segments(
+        {"yearly": yearly_rainfall, "short": yearly_rainfall.iloc[:3]},
+        penalty_factors=(1.0, 100.0),
+        round_precision=1,
+    )
+
+    assert segments.columns.tolist() == [
+        Label.PENALTY_FACTOR.value,
+        Label.BEGIN_YEAR.value,
+        Label.END_YEAR.value,
+        Label.AVERAGE_RAINFALL.value,
+    ]
+    assert set(segments.index) == {"yearly", "short"}
+
+    yearly_segments = segments.loc["yearly"]
+    yearly_segments = yearly_segments[
+        yearly_segments[Label.PENALTY_FACTOR.value] == 1.0
+    ]
+
+    assert yearly_segments[Label.BEGIN_YEAR.value].iloc[0] == 1900
+    assert yearly_segments[Label.END_YEAR.value].iloc[-1] == 1959
+    assert 1930 in yearly_segments[Label.BEGIN_YEAR.value].tolist()
+
+    # A single segment of series shorter than a minimum segment, whatever the penalty
+    assert (
+        segments.loc["short", Label.AVERAGE_RAINFALL.value].tolist()
+        == [round(np.nanmean(RAINFALL[2][:3]), 1)] * 2
+    )
+
+    assert get_segments({}, round_precision=1).empty
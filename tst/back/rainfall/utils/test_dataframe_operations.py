@@ -1,6 +1,7 @@
 from datetime import datetime
 
 import pandas as pd
+from pytest import raises
 
 import back.rainfall.utils.dataframe_operations as df_opr
 from back.rainfall.utils import Label, Month
@@ -21,20 +22,28 @@ class TestDataframeOperations:
 
     @staticmethod
     def test_remove_column():
-        removed = df_opr.remove_column(YEARLY_RAINFALL.data, label=Label.YEAR)
+        YEARLY_RAINFALL.add_savgol_filter()
+        yearly_rainfall = YEARLY_RAINFALL.data.copy()
+
+        removed = df_opr.remove_column(yearly_rainfall, label=Label.YEAR)
 
-        assert Label.YEAR in YEARLY_RAINFALL.data.columns
+        assert Label.YEAR in yearly_rainfall.columns
         assert not removed
 
-        YEARLY_RAINFALL.add_savgol_filter()
         removed = df_opr.remove_column(
-            YEARLY_RAINFALL.data, label=Label.SAVITZKY_GOLAY_FILTER
+            yearly_rainfall, label=Label.SAVITZKY_GOLAY_FILTER
         )
 
-        assert Label.SAVITZKY_GOLAY_FILTER not in YEARLY_RAINFALL.data.columns
+        assert Label.SAVITZKY_GOLAY_FILTER not in yearly_rainfall.columns
+        assert Label.SAVITZKY_GOLAY_FILTER in YEARLY_RAINFALL.data.columns
         assert removed
 
-        YEARLY_RAINFALL.add_savgol_filter()
+    @staticmethod
+    def test_get_deep_size():
+        data = pd.DataFrame(data={"col1": [1, 2, 3], "col2": ["a", "b", "c"]})
+
+        assert df_opr.get_deep_size(data) > data.memory_usage(deep=False).sum()
+        assert df_opr.get_deep_size(data.head(1)) < df_opr.get_deep_size(data)
 
     @staticmethod
     def test_concat_columns():
@@ -61,3 +70,36 @@ class TestDataframeOperations:
 
         assert isinstance(result, pd.DataFrame)
         assert len(result) <= datetime.now().year - YEARLY_RAINFALL.starting_year + 1
+
+    @staticmethod
+    def test_downsample_with_lttb():
+        max_points = 10
+        result = df_opr.downsample_with_lttb(
+            YEARLY_RAINFALL.data, max_points=max_points
+        )
+
+        assert isinstance(result, pd.DataFrame)
+        assert len(result) <= max_points
+        assert result[Label.YEAR.value].is_monotonic_increasing
+        for year_column_index in [0, -1]:
+            assert (
+                result[Label.YEAR.value].iloc[year_column_index]
+                == YEARLY_RAINFALL.data[Label.YEAR.value].iloc[year_column_index]
+            )
+        assert (
+            result[Label.RAINFALL.value].max()
+            == YEARLY_RAINFALL.data[Label.RAINFALL.value].max()
+        )
+        assert (
+            result[Label.RAINFALL.value].min()
+            == YEARLY_RAINFALL.data[Label.RAINFALL.value].min()
+        )
+
+        result = df_opr.downsample_with_lttb(
+            YEARLY_RAINFALL.data, max_points=len(YEARLY_RAINFALL.data)
+        )
+
+        assert len(result) == len(YEARLY_RAINFALL.data)
+
+        with raises(ValueError):
+            df_opr.downsample_with_lttb(YEARLY_RAINFALL.data, max_points=3)
@@ -0,0 +1,150 @@
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+from pytest import raises
+
+from back.rainfall.models import YearlyRainfall
+from back.rainfall.utils import Label
+from back.rainfall.utils.derived_columns import DerivedColumns
+from tst.back.rainfall.models.test_all_rainfall import ALL_RAINFALL
+
+
+def _get_base_data() -> pd.DataFrame:
+    return pd.DataFrame(
+        {Label.YEAR.value: [2000, 2001, 2002], Label.RAINFALL.value: [1.0, 2.0, 3.0]}
+    )
+
+
+class TestDerivedColumns:
+    @staticmethod
+    def test_get():
+        derived_columns = DerivedColumns(_get_base_data())
+        calls: list[int] = []
+
+        def compute():
+            calls.append(1)
+
+            return [10.0, 20.0, 30.0]
+
+        values = derived_columns.get(Label.PERCENTAGE_OF_NORMAL, compute, year=2000)
+
+        assert isinstance(values, np.ndarray)
+        assert not values.flags.writeable
+        with raises(ValueError):
+            values[0] = 0.0
+
+        assert (
+            derived_columns.get(Label.PERCENTAGE_OF_NORMAL, compute, year=2000)
+            is values
+        )
+        assert len(calls) == 1
+
+        derived_columns.get(Label.PERCENTAGE_OF_NORMAL, compute, year=2001)
+        assert len(calls) == 2
+
+    @staticmethod
+    def test_publish_and_discard():
+        base_data = _get_base_data()
+        derived_columns = DerivedColumns(base_data)
+        snapshot = derived_columns.snapshot
+
+        derived_columns.publish(Label.KMEANS, np.array([0, 1, 0]))
+
+        assert Label.KMEANS in derived_columns.snapshot.columns
+        assert Label.KMEANS not in snapshot.columns
+        assert Label.KMEANS not in base_data.columns
+
+        snapshot = derived_columns.snapshot
+
+        assert derived_columns.discard(Label.KMEANS)
+        assert Label.KMEANS not in derived_columns.snapshot.columns
+        assert Label.KMEANS in snapshot.columns
+
+        assert not derived_columns.discard(Label.KMEANS)
+        assert not derived_columns.discard(Label.YEAR)
+
+    @staticmethod
+    def test_get_memory_usage():
+        derived_columns = DerivedColumns(_get_base_data())
+        memory_usage = derived_columns.get_memory_usage()
+
+        assert memory_usage["base_data"] > 0
+        assert memory_usage["snapshot"] == 0
+        assert memory_usage["memoized_values"] == {}
+        assert memory_usage["total"] == memory_usage["base_data"]
+
+        derived_columns.get(
+            Label.PERCENTAGE_OF_NORMAL, lambda: [1.0, 2.0, 3.0], year=2000
+        )
+        derived_columns.publish(Label.KMEANS, np.array([0, 1, 0]))
+        memory_usage = derived_columns.get_memory_usage()
+
+        assert memory_usage["snapshot"] > memory_usage["base_data"]
+        assert memory_usage["memoized_values"] == {
+            f"{Label.PERCENTAGE_OF_NORMAL.value} (year=2000)": 3 * 8
+        }
+        assert memory_usage["total"] == (
+            memory_usage["base_data"] + memory_usage["snapshot"] + 3 * 8
+        )
+
+    @staticmethod
+    def test_concurrent_access_to_yearly_rainfall():
+        yearly_rainfall = YearlyRainfall(
+            ALL_RAINFALL.raw_data,
+            start_year=ALL_RAINFALL.starting_year,
+            round_precision=ALL_RAINFALL.round_precision,
+        )
+        base_data = yearly_rainfall.data.copy()
+        begin_year, end_year = (
+            yearly_rainfall.starting_year,
+            yearly_rainfall.get_last_year(),
+        )
+        year_ranges = [(begin_year + offset, end_year) for offset in range(5)]
+
+        def run_operation(seed: int):
+            rng = random.Random(seed)
+            operation = rng.randrange(7)
+            if operation == 0:
+                yearly_rainfall.add_percentage_of_normal(*rng.choice(year_ranges))
+            elif operation == 1:
+                yearly_rainfall.add_savgol_filter()
+            elif operation == 2:
+                yearly_rainfall.add_kmeans(rng.choice([2, 3]))
+            elif operation == 3:
+                yearly_rainfall.remove_column(
+                    rng.choice(
+                        [
+                            Label.PERCENTAGE_OF_NORMAL,
+                            Label.SAVITZKY_GOLAY_FILTER,
+                            Label.KMEANS,
+                        ]
+                    )
+                )
+            elif operation == 4:
+                yearly_rainfall.get_standard_deviation(
+                    begin_year, end_year, label=Label.SAVITZKY_GOLAY_FILTER
+                )
+            elif operation == 5:
+                yearly_rainfall.get_scatter_figure_of_normal(
+                    display_clusters=rng.random() < 0.5
+                )
+            else:
+                snapshot = yearly_rainfall.data
+                assert len(snapshot) == len(base_data)
+                for label in snapshot.columns:
+                    assert not snapshot[label].isna().any()
+
+            return yearly_rainfall.get_percentage_of_normal(*rng.choice(year_ranges))
+
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            results = list(executor.map(run_operation, range(1000)))
+
+        assert {id(result) for result in results} == {
+            id(yearly_rainfall.get_percentage_of_normal(*year_range))
+            for year_range in year_ranges
+        }
+        pd.testing.assert_frame_equal(
+            yearly_rainfall.data[[Label.YEAR.value, Label.RAINFALL.value]], base_data
+        )
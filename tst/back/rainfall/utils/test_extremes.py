@@ -0,0 +1,70 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from pytest import approx
+from scipy import stats
+
+from back.rainfall.utils.bootstrap import BOOTSTRAP_CHUNK_SIZE
+from back.rainfall.utils.extremes import (
+    RETURN_PERIODS,
+    Distribution,
+    fit_distributions,
+    get_quantiles,
+    get_return_levels,
+)
+
+MAXIMA = stats.genextreme.rvs(-0.1, loc=100.0, scale=30.0, size=200, random_state=0)
+
+
+def test_fit_distributions():
+    locations, scales, shapes = fit_distributions(MAXIMA, Distribution.GEV)
+    shape, location, scale = stats.genextreme.fit(MAXIMA)
+
+    assert locations[0] == approx(location, rel=0.05)
+    assert scales[0] == approx(scale, rel=0.1)
+    assert shapes[0] == approx(shape, abs=0.1)
+
+    locations, scales, shapes = fit_distributions(MAXIMA, Distribution.GUMBEL)
+
+    assert shapes[0] == 0.0
+    assert get_quantiles(locations, scales, shapes, np.array([0.5, 0.99])) == approx(
+        stats.gumbel_r.ppf([0.5, 0.99], loc=locations[0], scale=scales[0])
+    )
+
+    # Every row is fitted on its own
+    locations, _, _ = fit_distributions(
+        np.stack([MAXIMA, MAXIMA + 10]), Distribution.GEV
+    )
+
+    assert locations[1] - locations[0] == approx(10.0)
+
+
+def test_get_quantiles():
+    probabilities = np.array([0.1, 0.9, 0.99])
+
+    assert get_quantiles(
+        np.array(100.0), np.array(30.0), np.array(-0.1), probabilities
+    ) == approx(stats.genextreme.ppf(probabilities, -0.1, loc=100.0, scale=30.0))
+
+
+def test_get_return_levels():
+    return_levels, lower_bounds, upper_bounds = get_return_levels(MAXIMA)
+
+    assert return_levels.shape == (len(RETURN_PERIODS),)
+    assert (np.diff(return_levels) > 0).all()
+    assert (lower_bounds < return_levels).all()
+    assert (return_levels < upper_bounds).all()
+
+    # Same seeded chunks of replicates whether they are run across an executor or not
+    replicates = 2 * BOOTSTRAP_CHUNK_SIZE + 1
+    with ThreadPoolExecutor(2) as executor:
+        assert np.array_equal(
+            get_return_levels(MAXIMA, replicates=replicates, executor=executor),
+            get_return_levels(MAXIMA, replicates=replicates),
+        )
+
+    return_levels, lower_bounds, upper_bounds = get_return_levels(
+        np.array([np.nan, 10.0, 20.0, np.nan])
+    )
+
+    assert np.isnan([return_levels, lower_bounds, upper_bounds]).all()
@@ -0,0 +1,103 @@
+import numpy as np
+from pytest import approx, raises
+
+from back.rainfall.utils import Month
+from back.rainfall.utils.month_windows import (
+    HYDROLOGICAL_YEAR,
+    CumulativeMonthlyRainfall,
+    MonthWindow,
+)
+
+YEARS = np.array([1990, 1991, 1992, 1994])
+MONTHLY_RAINFALL = np.random.default_rng(0).gamma(2.0, 25.0, (len(YEARS), 12))
+
+
+class TestMonthWindow:
+    @staticmethod
+    def test_from_months():
+        winter = MonthWindow.from_months(Month.DECEMBER, Month.FEBRUARY)
+
+        assert winter == MonthWindow(Month.FEBRUARY, 3)
+        assert winter.start_month == Month.DECEMBER
+        assert winter.spans_two_years
+        assert winter.get_months() == [Month.DECEMBER, Month.JANUARY, Month.FEBRUARY]
+        assert str(winter) == "December-February"
+
+        assert MonthWindow.from_months(Month.MAY) == MonthWindow(Month.MAY, 1)
+        assert not MonthWindow.from_months(
+            Month.JANUARY, Month.DECEMBER
+        ).spans_two_years
+        assert HYDROLOGICAL_YEAR.start_month == Month.OCTOBER
+
+        with raises(ValueError):
+            MonthWindow(Month.MAY, 13)
+
+    @staticmethod
+    def test_from_string():
+        assert MonthWindow.from_string("october-September") == HYDROLOGICAL_YEAR
+        assert MonthWindow.from_string("March") == MonthWindow(Month.MARCH, 1)
+
+        with raises(ValueError):
+            MonthWindow.from_string("Brumaire-Frimaire")
+
+
+class TestCumulativeMonthlyRainfall:
+    @staticmethod
+    def test_get_window_rainfall():
+        cumulative_rainfall = CumulativeMonthlyRainfall(YEARS, MONTHLY_RAINFALL)
+
+        assert cumulative_rainfall.years.tolist() == [1990, 1991, 1992, 1993, 1994]
+
+        spring = cumulative_rainfall.get_window_rainfall(
+            MonthWindow.from_months(Month.MARCH, Month.MAY)
+        )
+
+        assert spring[0] == approx(MONTHLY_RAINFALL[0, 2:5].sum())
+        # Year 1993 is missing from raw data
+        assert np.isnan(spring[3])
+
+        hydrological_years = cumulative_rainfall.get_window_rainfall(HYDROLOGICAL_YEAR)
+
+        assert np.isnan(hydrological_years[0])
+        assert hydrological_years[2] == approx(
+            MONTHLY_RAINFALL[1, 9:].sum() + MONTHLY_RAINFALL[2, :9].sum()
+        )
+        assert np.isnan(hydrological_years[4])
+
+    @staticmethod
+    def test_skip_missing_rainfall():
+        monthly_rainfall = MONTHLY_RAINFALL.copy()
+        monthly_rainfall[1, 0] = np.nan
+        cumulative_rainfall = CumulativeMonthlyRainfall(YEARS, monthly_rainfall)
+
+        assert cumulative_rainfall.get_window_rainfall(MonthWindow(Month.FEBRUARY, 3))[
+            1
+        ] == approx(MONTHLY_RAINFALL[0, 11] + MONTHLY_RAINFALL[1, 1])
+
+    @staticmethod
+    def test_get_rolling_rainfall():
+        cumulative_rainfall = CumulativeMonthlyRainfall(YEARS, MONTHLY_RAINFALL)
+        rolling_rainfall = cumulative_rainfall.get_rolling_rainfall(18)
+
+        assert rolling_rainfall.shape == (5, 12)
+        assert np.isnan(rolling_rainfall[1, 4])
+        assert rolling_rainfall[1, 5] == approx(MONTHLY_RAINFALL[:2].ravel()[:18].sum())
+        assert np.isnan(rolling_rainfall[4, 5])
+
+    @staticmethod
+    def test_get_window_maxima():
+        cumulative_rainfall = CumulativeMonthlyRainfall(YEARS, MONTHLY_RAINFALL)
+        winter_maxima = cumulative_rainfall.get_window_maxima(
+            MonthWindow(Month.FEBRUARY, 3)
+        )
+
+        assert np.isnan(winter_maxima[0])
+        assert winter_maxima[1] == MONTHLY_RAINFALL[[0, 1, 1], [11, 0, 1]].max()
+        # Year 1993 is missing from raw data
+        assert np.isnan(winter_maxima[3])
+        assert np.isnan(winter_maxima[4])
+
+        assert (
+            cumulative_rainfall.get_window_maxima(MonthWindow(Month.DECEMBER, 12))[2]
+            == MONTHLY_RAINFALL[2].max()
+        )
@@ -1,5 +1,6 @@
 import pandas as pd
 import plotly.graph_objs as go
+from pytest import approx
 
 from back.rainfall.utils import Label, Month, Season, TimeMode
 from back.rainfall.utils import plotly_figures as plot
@@ -67,6 +68,40 @@ class TestPlotting:
         )
 
         assert isinstance(figure, go.Figure)
+        assert [trace.name for trace in figure.data] == [
+            Label.LINEAR_REGRESSION.value,
+            Label.SENS_SLOPE.value,
+        ]
+        assert len(figure.data[1].y) == len(Season)
+
+    @staticmethod
+    def test_get_heatmap_figure_of_rainfall_linreg_slopes():
+        figure = plot.get_heatmap_figure_of_rainfall_linreg_slopes(
+            ALL_RAINFALL.monthly_rainfalls[Month.MAY.value],
+            begin_year=begin_year,
+            end_year=end_year,
+        )
+
+        assert isinstance(figure, go.Figure)
+        assert len(figure.data[0].z) == end_year - begin_year + 1
+        assert figure.data[0].z[0][-1] == approx(
+            ALL_RAINFALL.monthly_rainfalls[Month.MAY.value].get_linear_regression(
+                begin_year, end_year
+            )[0][1]
+        )
+
+    @staticmethod
+    def test_get_bar_figure_of_standardized_precipitation_index():
+        spi = ALL_RAINFALL.get_standardized_precipitation_index(
+            12, normal_year=normal_year, begin_year=begin_year, end_year=end_year
+        )
+        figure = plot.get_bar_figure_of_standardized_precipitation_index(
+            spi, months=12, normal_year=normal_year
+        )
+
+        assert isinstance(figure, go.Figure)
+        assert figure.data[0].x[0] == f"{begin_year}-01"
+        assert len(figure.data[0].y) == len(spi)
 
     @staticmethod
     def test_get_bar_figure_of_relative_distances_to_normal():
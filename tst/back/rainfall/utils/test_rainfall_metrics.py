@@ -1,5 +1,8 @@
 from operator import lt
 
+import numpy as np
+from pytest import approx
+
 from back.rainfall.utils import Label
 from back.rainfall.utils import rainfall_metrics as rain
 from tst.back.rainfall.models.test_yearly_rainfall import YEARLY_RAINFALL
@@ -41,3 +44,55 @@ class TestMetrics:
 
         assert isinstance(normal, float)
         assert normal >= 0.0
+
+    @staticmethod
+    def test_get_mann_kendall_tests():
+        from scipy import stats
+
+        years = np.arange(1950, 2000)
+        rainfall = np.round(
+            np.random.default_rng(0).gamma(3.0, 100.0, (3, len(years)))
+            + np.arange(len(years)) * 2.0,
+            -1,
+        )
+        rainfall[1, [4, 8]] = np.nan
+        rainfall[2] = np.nan
+
+        sen_slopes, z_scores, p_values = rain.get_mann_kendall_tests(years, rainfall)
+
+        for series in range(2):
+            is_known = ~np.isnan(rainfall[series])
+            known_years, known_rainfall = years[is_known], rainfall[series][is_known]
+            n = len(known_rainfall)
+            s = sum(
+                np.sign(known_rainfall[j] - known_rainfall[i])
+                for i in range(n)
+                for j in range(i + 1, n)
+            )
+            _, ties = np.unique(known_rainfall, return_counts=True)
+            variance = (
+                n * (n - 1) * (2 * n + 5) - np.sum(ties * (ties - 1) * (2 * ties + 5))
+            ) / 18
+            z_score = (s - np.sign(s)) / np.sqrt(variance)
+
+            assert sen_slopes[series] == approx(
+                stats.theilslopes(known_rainfall, known_years)[0]
+            )
+            assert z_scores[series] == approx(z_score)
+            assert p_values[series] == approx(2 * stats.norm.sf(abs(z_score)))
+
+        assert np.isnan([sen_slopes[2], z_scores[2], p_values[2]]).all()
+
+    @staticmethod
+    def test_get_trend_tests():
+        trend_tests = rain.get_trend_tests(
+            {"whole": YEARLY_RAINFALL.data, "last": YEARLY_RAINFALL.data.iloc[-30:]}
+        )
+
+        assert list(trend_tests.index) == ["whole", "last"]
+        assert list(trend_tests.columns) == [
+            Label.SENS_SLOPE.value,
+            Label.MANN_KENDALL_Z_SCORE.value,
+            Label.P_VALUE.value,
+        ]
+        assert trend_tests[Label.P_VALUE.value].between(0, 1).all()
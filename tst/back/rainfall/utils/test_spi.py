@@ -0,0 +1,52 @@
+import numpy as np
+from pytest import approx
+from scipy import stats
+
+from back.rainfall.utils.spi import (
+    SPI_BOUND,
+    fit_gamma_distributions,
+    get_standardized_precipitation_index,
+)
+
+RAINFALL = np.random.default_rng(0).gamma(2.0, 30.0, (60, 12))
+RAINFALL[RAINFALL < 5.0] = 0.0
+
+
+def test_fit_gamma_distributions():
+    rainfall = RAINFALL.copy()
+    rainfall[3, 4] = np.nan
+    rainfall[:, 11] = 0.0
+
+    shapes, scales, zero_probabilities = fit_gamma_distributions(rainfall)
+
+    for month in range(11):
+        known_rainfall = rainfall[:, month][~np.isnan(rainfall[:, month])]
+        shape, _, scale = stats.gamma.fit(known_rainfall[known_rainfall > 0], floc=0)
+
+        assert shapes[month] == approx(shape, rel=0.01)
+        assert scales[month] == approx(scale, rel=0.01)
+        assert zero_probabilities[month] == approx(np.mean(known_rainfall == 0))
+
+    # Not a single month with rainfall
+    assert np.isnan([shapes[11], scales[11], zero_probabilities[11]]).all()
+
+
+def test_get_standardized_precipitation_index():
+    rainfall = RAINFALL.copy()
+    rainfall[3, 4] = np.nan
+    rainfall[10, 0] = 10_000.0
+
+    spi = get_standardized_precipitation_index(rainfall)
+
+    assert spi.shape == rainfall.shape
+    assert np.isnan(spi[3, 4])
+    assert spi[10, 0] == SPI_BOUND
+    assert np.abs(np.nanmean(spi[:, 1:], axis=0)).max() < 0.2
+    # Ranks of rainfall are kept
+    assert (np.argsort(spi[:, 1]) == np.argsort(rainfall[:, 1], kind="stable")).all()
+
+    reference_spi = get_standardized_precipitation_index(rainfall, rainfall * 2)
+
+    # Rainfall is lower compared to a wetter reference period, except months without rainfall
+    is_positive = rainfall[:, 1:] > 0
+    assert (reference_spi[:, 1:] < spi[:, 1:])[is_positive].all()
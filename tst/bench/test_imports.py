@@ -0,0 +1,59 @@
+from pytest import raises
+
+from bench import imports
+
+IMPORT_TIME_OUTPUT = """import time: self [us] | cumulative | imported package
+import time:       100 |        100 |   numpy._core
+import time:        50 |        150 | numpy
+import time:       300 |        300 |     sklearn.base
+import time:        20 |        320 |   sklearn.utils
+import time:        10 |        330 | sklearn
+Unrelated line
+"""
+
+
+def test_parse_import_time():
+    modules = imports.parse_import_time(IMPORT_TIME_OUTPUT)
+
+    assert [module["module"] for module in modules] == [
+        "numpy._core",
+        "numpy",
+        "sklearn.base",
+        "sklearn.utils",
+        "sklearn",
+    ]
+    assert [module["level"] for module in modules] == [1, 0, 2, 1, 0]
+    assert modules[0] == {
+        "module": "numpy._core",
+        "level": 1,
+        "self_us": 100,
+        "cumulative_us": 100,
+    }
+
+
+def test_get_import_report():
+    report = imports.get_import_report(
+        imports.parse_import_time(IMPORT_TIME_OUTPUT), top=2
+    )
+
+    assert report["total_ms"] == 0.48
+    assert report["module_count"] == 5
+    assert report["slowest_modules"] == {"sklearn.base": 0.3, "numpy._core": 0.1}
+    assert report["slowest_packages"] == {"sklearn": 0.33, "numpy": 0.15}
+    assert report["heavy_packages_ms"] == {"scipy": 0.0, "sklearn": 0.33, "plotly": 0.0}
+
+
+def test_run_imports_benchmark():
+    results = imports.run_imports_benchmark(
+        {"models": imports.DEFAULT_TARGETS["models"]}, repeat=1
+    )
+    report = results["targets"]["models"]
+
+    assert report["total_ms"] > 0
+    assert report["module_count"] > 0
+    # Heavy packages are only loaded once features needing them are used
+    assert report["heavy_packages_ms"]["scipy"] == 0
+    assert report["heavy_packages_ms"]["sklearn"] == 0
+
+    with raises(ValueError):
+        imports.run_imports_benchmark(repeat=0)
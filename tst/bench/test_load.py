@@ -0,0 +1,92 @@
+from urllib.parse import parse_qs
+
+from back.api.response_store import ResponseStore
+from back.api.routes import response_cache
+from bench import load
+
+
+def test_generate_targets():
+    targets = load.generate_targets(
+        load.DEFAULT_MIX,
+        n_requests=200,
+        distinct_queries=20,
+        min_year=1971,
+        max_year=2024,
+        seed=1,
+    )
+
+    assert len(targets) == 200
+    assert len(set(targets)) <= 20
+    assert targets == load.generate_targets(
+        load.DEFAULT_MIX,
+        n_requests=200,
+        distinct_queries=20,
+        min_year=1971,
+        max_year=2024,
+        seed=1,
+    )
+
+    for target in targets:
+        path, _, query_string = target.partition("?")
+        params = parse_qs(query_string)
+
+        assert path in {route_mix.path for route_mix in load.DEFAULT_MIX}
+        assert 1971 <= int(params["begin_year"][0]) <= 2024
+        if "end_year" in params:
+            assert int(params["begin_year"][0]) < int(params["end_year"][0]) <= 2024
+
+
+def test_run_load_test():
+    results = load.run_load_test(
+        n_requests=40, concurrency=4, distinct_queries=10, use_cache=False
+    )
+
+    assert results["total"]["requests"] == 40
+    assert results["total"]["error_rate"] == 0
+    assert sum(stats["requests"] for stats in results["routes"].values()) == 40
+    assert len(response_cache) == 0
+
+    for stats in results["routes"].values():
+        assert stats["p50_ms"] <= stats["p95_ms"] <= stats["p99_ms"]
+
+
+def test_run_load_test_keeps_store(tmp_path):
+    key = ("version", "get_rainfall_average", (("begin_year", 1991),))
+    store = ResponseStore(tmp_path / "responses.db", max_bytes=10**6)
+    store.put(key, 650.1)
+    previous_store, response_cache.store = response_cache.store, store
+    try:
+        for use_cache in (True, False):
+            load.run_load_test(
+                n_requests=10, concurrency=2, distinct_queries=5, use_cache=use_cache
+            )
+    finally:
+        response_cache.store = previous_store
+
+    assert store.get(key) == (True, 650.1)
+    assert len(store) == 1
+    store.close()
+
+
+def test_compare_load_test_results():
+    baseline = {
+        "routes": {
+            "/a": {"requests": 10, "p50_ms": 2.0, "error_rate": 0.0},
+            "/b": {"requests": 10, "p50_ms": 1.0, "error_rate": 0.0},
+        },
+        "total": {"requests": 20, "p50_ms": 1.5, "error_rate": 0.0},
+    }
+    candidate = {
+        "routes": {"/a": {"requests": 10, "p50_ms": 1.0, "error_rate": 0.1}},
+        "total": {"requests": 10, "p50_ms": 1.0, "error_rate": 0.1},
+    }
+
+    comparison = load.compare_load_test_results(baseline, candidate)
+
+    assert set(comparison) == {"/a", "total"}
+    assert comparison["/a"]["p50_ms"] == {
+        "baseline": 2.0,
+        "candidate": 1.0,
+        "change_pct": -50.0,
+    }
+    assert comparison["/a"]["error_rate"] == {"baseline": 0.0, "candidate": 0.1}
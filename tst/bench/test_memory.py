@@ -0,0 +1,44 @@
+import os
+
+from bench import memory
+
+
+def test_trace_allocations():
+    with memory.trace_allocations() as allocations:
+        data = [0] * 10**6
+        del data
+
+    assert allocations["peak_bytes"] >= 8 * 10**6
+    assert allocations["retained_bytes"] < allocations["peak_bytes"]
+
+
+def test_get_private_bytes():
+    private_bytes = memory.get_private_bytes(os.getpid())
+
+    assert private_bytes is None or private_bytes > 0
+
+
+def test_run_memory_benchmark():
+    results = memory.run_memory_benchmark(sizes=(100,), worker_counts=(1, 2))
+
+    assert results["metadata"]["parameters"] == {
+        "sizes": [100],
+        "seed": 0,
+        "worker_counts": [1, 2],
+    }
+    assert [construction["dataset"] for construction in results["construction"]] == [
+        "barcelona",
+        "synthetic",
+    ]
+    for construction in results["construction"]:
+        assert construction["peak_bytes"] > 0
+        assert construction["memory_report"]["total"] > 0
+
+    assert results["routes"]
+    for allocations in results["routes"].values():
+        assert allocations["status_code"] == 200
+        assert allocations["peak_bytes"] >= 0
+
+    assert [result["workers"] for result in results["workers"]] == [1, 2]
+    for result in results["workers"]:
+        assert result["private_bytes"].keys() == {"csv", "shared"}
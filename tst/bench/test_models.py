@@ -0,0 +1,59 @@
+from pytest import raises
+
+from back.rainfall.models import MonthlyRainfall, YearlyRainfall
+from bench import models
+
+
+def test_get_arguments():
+    assert models.get_arguments(
+        YearlyRainfall.get_years_above_percentage_of_normal,
+        begin_year=1,
+        end_year=100,
+    ) == {"normal_year": 1, "begin_year": 1, "end_year": 100, "percentage": 80.0}
+    assert (
+        models.get_arguments(YearlyRainfall.add_kmeans, begin_year=1, end_year=100)
+        == {}
+    )
+
+    def unknown_method(self, unknown_parameter): ...
+
+    with raises(ValueError):
+        models.get_arguments(unknown_method, begin_year=1, end_year=100)
+
+
+def test_get_public_methods():
+    public_methods = dict(models.get_public_methods(MonthlyRainfall))
+
+    assert "get_normal" in public_methods
+    assert "load_yearly_rainfall" in public_methods
+    assert not any(name.startswith("_") for name in public_methods)
+
+
+def test_run_models_benchmark():
+    results_by_series_count: dict[int, list[dict]] = {1: [], 2: []}
+    results = models.run_models_benchmark(
+        (50,),
+        series_counts=(1, 2),
+        repeat=1,
+        on_result=lambda result: results_by_series_count[result["series"]].append(
+            result
+        ),
+    )
+
+    assert results["metadata"]["parameters"]["sizes"] == [50]
+    assert results["results"] == [
+        *results_by_series_count[1],
+        *results_by_series_count[2],
+    ]
+
+    benchmarks = [result["benchmark"] for result in results_by_series_count[1]]
+
+    assert benchmarks[:2] == ["AllRainfall.__init__", "AllRainfall.apply_update"]
+    assert len(benchmarks) == 2 + 3 * len(models.get_public_methods(YearlyRainfall))
+    assert {"YearlyRainfall.get_normal", "SeasonalRainfall.add_kmeans"} <= set(
+        benchmarks
+    )
+
+    for result in results["results"]:
+        assert result["rows"] == 50
+        assert "error" in result or result["min_s"] <= result["median_s"]
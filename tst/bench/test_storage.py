@@ -0,0 +1,32 @@
+from back.rainfall.utils import TimeMode
+from bench import storage
+
+
+def test_generate_queries():
+    queries = storage.generate_queries(["a", "b"], end_year=100, query_count=50, seed=1)
+
+    assert queries == storage.generate_queries(
+        ["a", "b"], end_year=100, query_count=50, seed=1
+    )
+    for query in queries:
+        assert query["station"] in ("a", "b")
+        assert 1 <= query["begin_year"] <= query["end_year"] <= 100
+        assert (query["month"] is None) == (query["time_mode"] == TimeMode.YEARLY)
+
+
+def test_run_storage_benchmark():
+    results: list[dict] = []
+    benchmark = storage.run_storage_benchmark(
+        (40,), station_count=2, query_count=5, repeat=1, on_result=results.append
+    )
+
+    assert benchmark["results"] == results
+    assert {(result["benchmark"], result["backend"]) for result in results} == {
+        (name, backend)
+        for name in ("load", "open_and_query", "range_queries", "size")
+        for backend in ("memory", "sqlite")
+    }
+    for result in results:
+        assert result["rows"] == 40
+        assert result.get("bytes", 1) > 0
+        assert result.get("median_s", 0) >= 0
@@ -0,0 +1,50 @@
+from pathlib import Path
+
+import pandas as pd
+from pytest import raises
+
+from back.rainfall import AllRainfall
+from bench import synthetic
+
+
+def test_generate_raw_data():
+    raw_data = synthetic.generate_raw_data(1000, seed=1, start_year=1900)
+
+    assert list(raw_data.columns) == synthetic.COLUMNS
+    assert len(raw_data) == 1000
+    assert raw_data["Any"].tolist() == list(range(1900, 2900))
+    assert (raw_data.iloc[:, 1:] >= 0).all().all()
+    assert (raw_data.iloc[:, 1:] == 0).any().any()
+
+    pd.testing.assert_frame_equal(
+        raw_data, synthetic.generate_raw_data(1000, seed=1, start_year=1900)
+    )
+    assert not raw_data.equals(synthetic.generate_raw_data(1000, seed=2))
+
+
+def test_generate_multi_series_raw_data():
+    raw_datasets = synthetic.generate_multi_series_raw_data(100, 3, seed=1)
+
+    assert len(raw_datasets) == 3
+    assert all(len(raw_data) == 100 for raw_data in raw_datasets)
+    assert not raw_datasets[0].equals(raw_datasets[1])
+
+    for raw_data, same_raw_data in zip(
+        raw_datasets, synthetic.generate_multi_series_raw_data(100, 3, seed=1)
+    ):
+        pd.testing.assert_frame_equal(raw_data, same_raw_data)
+
+
+def test_write_raw_data_as_csv(tmp_path):
+    raw_data = synthetic.generate_raw_data(100, start_year=1901)
+    csv_path = synthetic.write_raw_data_as_csv(raw_data, tmp_path / "raw_data.csv")
+
+    assert isinstance(csv_path, Path)
+
+    all_rainfall = AllRainfall(str(csv_path), start_year=1901, round_precision=1)
+
+    assert all_rainfall.get_last_year() == 2000
+    assert len(all_rainfall.yearly_rainfall.data) == 100
+
+    with raises(ValueError):
+        synthetic.write_raw_data_as_csv(raw_data.iloc[:, :5], tmp_path / "bad.csv")
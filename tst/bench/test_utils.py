@@ -0,0 +1,26 @@
+import json
+from typing import Any
+
+from pytest import raises
+
+from bench import utils
+
+
+def test_time_calls():
+    calls: list[None] = []
+    timings = utils.time_calls(lambda: calls.append(None), repeat=3)
+
+    assert len(calls) == 3
+    assert timings["repeat"] == 3
+    assert timings["min_s"] <= timings["median_s"] <= timings["mean_s"] * 3
+
+    with raises(ValueError):
+        utils.time_calls(lambda: None, repeat=0)
+
+
+def test_write_results(tmp_path):
+    results: dict[str, Any] = {"metadata": utils.get_metadata(seed=0), "results": []}
+    path = utils.write_results(results, name="test", path=tmp_path / "results.json")
+
+    assert json.loads(path.read_text()) == results
+    assert results["metadata"]["parameters"] == {"seed": 0}
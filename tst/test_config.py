@@ -6,7 +6,7 @@ from back.api.config import Config as APIConfig
 from back.rainfall.config import Config as RainfallConfig
 from base_config import BaseConfig
 from webapp.config import Config as WebappConfig
-from webapp.config import WebappServerSettings
+from webapp.config import WebappProductionServerSettings, WebappServerSettings
 
 
 @fixture(autouse=True)
@@ -40,6 +40,17 @@ class TestConfig:
         assert isinstance(data_settings.start_year, int)
         assert isinstance(data_settings.rainfall_precision, int)
 
+    @staticmethod
+    def test_get_stations_settings():
+        data_settings = RainfallConfig().get_data_settings
+        stations_settings = RainfallConfig().get_stations_settings
+
+        assert stations_settings[data_settings.station] == data_settings
+        assert all(
+            settings.station == station
+            for station, settings in stations_settings.items()
+        )
+
     @staticmethod
     def test_get_api_server_settings():
         api_server_settings = APIConfig().get_api_settings.server
@@ -51,6 +62,52 @@ class TestConfig:
             "reload",
         }
 
+    @staticmethod
+    def test_get_api_production_settings():
+        api_production_settings = APIConfig().get_api_settings.production
+
+        assert isinstance(api_production_settings, APISettings.ProductionServerSettings)
+        assert api_production_settings.workers > 0
+        assert api_production_settings.backlog > 0
+        assert api_production_settings.keep_alive > 0
+        assert api_production_settings.shared_dataset_path is None or isinstance(
+            api_production_settings.shared_dataset_path, str
+        )
+
+        with raises(ValueError):
+            APISettings.ProductionServerSettings(workers=0)
+
+    @staticmethod
+    def test_get_api_jobs_settings():
+        api_jobs_settings = APIConfig().get_api_settings.jobs
+
+        assert isinstance(api_jobs_settings, APISettings.JobsSettings)
+        assert api_jobs_settings.max_workers > 0
+        assert api_jobs_settings.max_pending_jobs > 0
+        assert isinstance(api_jobs_settings.result_store_path, str)
+
+    @staticmethod
+    def test_get_api_reload_settings():
+        api_reload_settings = APIConfig().get_api_settings.reload
+
+        assert isinstance(api_reload_settings, APISettings.ReloadSettings)
+        assert api_reload_settings.admin_token is None
+        assert isinstance(api_reload_settings.from_file, bool)
+        assert (
+            api_reload_settings.poll_interval is None
+            or api_reload_settings.poll_interval > 0
+        )
+
+    @staticmethod
+    def test_get_api_stations_settings():
+        api_stations_settings = APIConfig().get_api_settings.stations
+
+        assert isinstance(api_stations_settings, APISettings.StationsSettings)
+        assert (
+            api_stations_settings.memory_budget_mb is None
+            or api_stations_settings.memory_budget_mb > 0
+        )
+
     @staticmethod
     def test_get_webapp_server_settings():
         webapp_server_settings = WebappConfig().get_webapp_server_settings
@@ -61,3 +118,20 @@ class TestConfig:
             "port",
             "debug",
         }
+
+    @staticmethod
+    def test_get_webapp_production_server_settings():
+        webapp_production_server_settings = (
+            WebappConfig().get_webapp_production_server_settings
+        )
+
+        assert isinstance(
+            webapp_production_server_settings, WebappProductionServerSettings
+        )
+        assert webapp_production_server_settings.workers > 0
+        assert isinstance(webapp_production_server_settings.threaded, bool)
+        assert webapp_production_server_settings.backlog > 0
+        assert webapp_production_server_settings.keep_alive > 0
+
+        with raises(ValueError):
+            WebappProductionServerSettings(backlog=-1)
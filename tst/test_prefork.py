@@ -0,0 +1,46 @@
+import os
+import signal
+import socket
+import time
+
+from prefork import create_listening_socket, run_preforked_workers
+
+
+def test_create_listening_socket():
+    listening_socket = create_listening_socket("127.0.0.1", 0, backlog=8)
+    try:
+        assert listening_socket.get_inheritable()
+
+        with socket.create_connection(listening_socket.getsockname(), timeout=5):
+            connection, _ = listening_socket.accept()
+            connection.close()
+    finally:
+        listening_socket.close()
+
+
+def test_run_preforked_workers(tmp_path):
+    def serve():
+        (tmp_path / str(os.getpid())).touch()
+        # First worker exits at once, to be replaced
+        if len(list(tmp_path.iterdir())) > 1:
+            time.sleep(60)
+
+    start = time.monotonic()
+
+    def stop_once_workers_replaced(_signum, _frame):
+        if len(list(tmp_path.iterdir())) >= 3 or time.monotonic() - start > 30:
+            os.kill(os.getpid(), signal.SIGTERM)
+
+    # Checked from main thread: forking from a multi-threaded process is unsafe
+    previous_alarm_handler = signal.signal(signal.SIGALRM, stop_once_workers_replaced)
+    previous_handler = signal.getsignal(signal.SIGTERM)
+    signal.setitimer(signal.ITIMER_REAL, 0.05, 0.05)
+    try:
+        run_preforked_workers(serve, workers=2, restart_delay=0.0)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous_alarm_handler)
+
+    assert len(list(tmp_path.iterdir())) == 3
+    assert time.monotonic() - start < 30
+    assert signal.getsignal(signal.SIGTERM) is previous_handler
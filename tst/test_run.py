@@ -5,6 +5,6 @@ from run import run
 
 def test_run():
     ctx = click.Context(run)
-    assert run.list_commands(ctx) == ["api", "webapp"]
+    assert run.list_commands(ctx) == ["api", "bench", "ingest", "webapp"]
 
     # TODO(PC): run both servers to check they are viable and stop them afterwards
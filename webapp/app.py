@@ -3,11 +3,11 @@ Webapp run with Flask that communicates with an API (FastAPI/Uvicorn) to display
 Work-in-progress!
 """
 
-from typing import Any
+from typing import Any, Callable
 
 import plotly.graph_objs as go
 import plotly.io
-from flask import Flask, render_template
+from flask import Flask, abort, render_template
 
 from webapp import BEGIN_YEAR, END_YEAR, NORMAL_YEAR, api_client
 from webapp.views import navbar
@@ -46,9 +46,8 @@ def _aggregate_traces_json_as_figure(
     return figure
 
 
-@flask_app.route("/")
-def index():
-    summer_rainfall = api_client.get_rainfall_by_year_as_plotly_json(
+def _get_summer_rainfall_json() -> str:
+    return api_client.get_rainfall_by_year_as_plotly_json(
         time_mode="seasonal",
         begin_year=BEGIN_YEAR,
         end_year=END_YEAR,
@@ -56,8 +55,8 @@ def index():
         plot_average=True,
     )
 
-    ## Averages ##
 
+def _get_averages_json() -> str:
     monthly_averages = api_client.get_rainfall_averages_as_plotly_json(
         time_mode="monthly",
         begin_year=BEGIN_YEAR,
@@ -70,16 +69,16 @@ def index():
         end_year=END_YEAR,
     )
 
-    fig_averages = _aggregate_traces_json_as_figure(
+    return _aggregate_traces_json_as_figure(
         [monthly_averages, seasonal_averages],
         layout={
             "title": f"Average rainfall (mm) between {BEGIN_YEAR} and {END_YEAR}",
             "yaxis": {"title": "Rainfall (mm)"},
         },
-    )
+    ).to_json()
 
-    ## LinReg slopes ##
 
+def _get_linreg_slopes_json() -> str:
     monthly_linreg_slopes = api_client.get_rainfall_linreg_slopes_as_plotly_json(
         time_mode="monthly",
         begin_year=BEGIN_YEAR,
@@ -92,16 +91,16 @@ def index():
         end_year=END_YEAR,
     )
 
-    fig_linreg_slopes = _aggregate_traces_json_as_figure(
+    return _aggregate_traces_json_as_figure(
         [monthly_linreg_slopes, seasonal_linreg_slopes],
         layout={
             "title": f"Average linear regression slope (mm/year) between {BEGIN_YEAR} and {END_YEAR}",
             "yaxis": {"title": "Linear regression slope (mm/year)"},
         },
-    )
+    ).to_json()
 
-    ## Relative distances to normal ##
 
+def _get_relative_distances_to_normal_json() -> str:
     monthly_relative_distances_to_normal = (
         api_client.get_rainfall_relative_distances_to_normal_as_plotly_json(
             time_mode="monthly",
@@ -120,18 +119,36 @@ def index():
         )
     )
 
-    fig_relative_distances_to_normal = _aggregate_traces_json_as_figure(
+    return _aggregate_traces_json_as_figure(
         [monthly_relative_distances_to_normal, seasonal_relative_distances_to_normal],
         layout={
             "title": f"Relative distance to {NORMAL_YEAR}-{NORMAL_YEAR + 29} normal (%) between {BEGIN_YEAR} and {END_YEAR}",
             "yaxis": {"title": "Relative distance to normal (%)"},
         },
-    )
+    ).to_json()
+
+
+CHART_ID_TO_PLOTLY_JSON_GETTER: dict[str, Callable[[], str]] = {
+    "summer_rainfall": _get_summer_rainfall_json,
+    "averages": _get_averages_json,
+    "linreg": _get_linreg_slopes_json,
+    "relative_distance_to_normal": _get_relative_distances_to_normal_json,
+}
 
+
+@flask_app.route("/")
+def index():
     return render_template(
-        "index.html",
-        plotlySummerRainfallJSON=summer_rainfall,
-        plotlyAveragesJSON=fig_averages.to_json(),
-        plotlyLinRegJSON=fig_linreg_slopes.to_json(),
-        plotlyRelativeDistance2NormalJSON=fig_relative_distances_to_normal.to_json(),
+        "index.html", chart_ids=list(CHART_ID_TO_PLOTLY_JSON_GETTER.keys())
     )
+
+
+@flask_app.route("/chart/<chart_id>")
+def chart(chart_id: str):
+    """
+    Serve Plotly JSON of a single chart, for it to be fetched once its placeholder scrolls into view.
+    """
+    if (get_plotly_json := CHART_ID_TO_PLOTLY_JSON_GETTER.get(chart_id)) is None:
+        abort(404)
+
+    return flask_app.response_class(get_plotly_json(), mimetype="application/json")
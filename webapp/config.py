@@ -6,7 +6,7 @@ import os.path
 from functools import cached_property
 from typing import Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PositiveInt
 
 from base_config import BaseConfig
 
@@ -19,6 +19,15 @@ class WebappServerSettings(BaseModel):
     debug: bool | None = Field(None)
 
 
+class WebappProductionServerSettings(BaseModel):
+    """Type definition for settings of preforked WSGI workers serving Flask app in production."""
+
+    workers: PositiveInt = 2
+    threaded: bool = True
+    backlog: PositiveInt = 1024
+    keep_alive: PositiveInt = 5
+
+
 class Config(BaseConfig):
     """
     Provides function to retrieve fields from YAML configuration.
@@ -45,3 +54,21 @@ class Config(BaseConfig):
         """
 
         return WebappServerSettings(**self.yaml_config["webapp"])
+
+    @cached_property
+    def get_webapp_production_server_settings(self) -> WebappProductionServerSettings:
+        """
+        Return settings of WSGI workers serving Flask app in production.
+
+        Example:
+        {
+            "workers": 2,
+            "threaded": True,
+            "backlog": 1024,
+            "keep_alive": 5,
+        }
+        """
+
+        return WebappProductionServerSettings(
+            **self.yaml_config["webapp"].get("production", {})
+        )
@@ -24,4 +24,52 @@ scrollToTopBtn.addEventListener('click', () => {
     });
 });
 
-window.addEventListener('scroll', toggleScrollToTopButton);
\ No newline at end of file
+window.addEventListener('scroll', toggleScrollToTopButton);
+
+/** Lazy loading of Plotly graphs **/
+
+const loadedGraphDivIdToGraphJson = {};
+
+const setGraphFontSize = (graphJson) => {
+    graphJson.layout.font.size = window.screen.width < 768 ? 9 : 11;
+};
+
+const renderLazyGraph = (graphDiv) => {
+    fetch(graphDiv.dataset.chartUrl)
+        .then(response => {
+            if (!response.ok) {
+                throw new Error(`${response.status} ${response.statusText}`);
+            }
+
+            return response.json();
+        })
+        .then(graphJson => {
+            setGraphFontSize(graphJson);
+            graphDiv.classList.remove('lazy-plotly-graph');
+            Plotly.react(graphDiv.id, graphJson, {}, config);
+
+            loadedGraphDivIdToGraphJson[graphDiv.id] = graphJson;
+        })
+        .catch(error => {
+            graphDiv.classList.replace('lazy-plotly-graph', 'failed-plotly-graph');
+            console.error(`Could not load graph "${graphDiv.id}": ${error}`);
+        });
+};
+
+const lazyGraphObserver = new IntersectionObserver((entries, observer) => {
+    entries.forEach(entry => {
+        if (entry.isIntersecting) {
+            observer.unobserve(entry.target);
+            renderLazyGraph(entry.target);
+        }
+    });
+}, {rootMargin: '200px'});
+
+document.querySelectorAll('.lazy-plotly-graph').forEach(graphDiv => lazyGraphObserver.observe(graphDiv));
+
+window.addEventListener('resize', () => {
+    Object.entries(loadedGraphDivIdToGraphJson).forEach(([graphDivId, graphJson]) => {
+        setGraphFontSize(graphJson);
+        Plotly.react(graphDivId, graphJson, {}, config);
+    });
+});